@@ -8,7 +8,8 @@ from .contributor_analyzer import ContributorAnalyzer
 from .financial_analyzer import FinancialAnalyzer
 from .timescale_analyzer import TimescaleAnalyzer
 from .news_analyzer_v2 import NewsAnalyzer
-from .sql_query_engine import SQLQueryEngine
+from .sql_query_engine import SQLQueryEngine, create_sql_engine
+from .duckdb_query_engine import DuckDBQueryEngine
 from .nl_to_sql_translator import NLToSQLTranslator
 from .enhanced_nl_to_sql_translator import EnhancedNLToSQLTranslator
 from .query_router import QueryRouter
@@ -20,6 +21,8 @@ __all__ = [
     'TimescaleAnalyzer',
     'NewsAnalyzer',
     'SQLQueryEngine',
+    'DuckDBQueryEngine',
+    'create_sql_engine',
     'NLToSQLTranslator',
     'EnhancedNLToSQLTranslator',
     'QueryRouter'
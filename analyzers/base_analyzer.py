@@ -3,10 +3,12 @@ Base Analyzer for Quant Commander
 Provides common functionality for all financial analyzers
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, List, Union
 from abc import ABC, abstractmethod
 from config.settings import Settings
+from data.dataset_profile import get_dataset_profile
 
 
 class AnalysisError(Exception):
@@ -14,6 +16,16 @@ class AnalysisError(Exception):
     pass
 
 
+# Column formats understood by AnalysisFormatter.format_column. 'percentage'
+# takes fractions (0.25 -> 25.0%), like format_percentage; 'percent_points'
+# takes values already in percent (25.0 -> 25.0%)
+COLUMN_FORMATS = ('currency', 'amount', 'percentage', 'percent_points', 'number', 'decimal', 'count', 'text')
+
+# format(value, spec) applied element-wise over arrays of values and specs
+_format_values = np.frompyfunc(format, 2, 1)
+_cell_lengths = np.frompyfunc(len, 1, 1)
+
+
 class AnalysisFormatter:
     """
     Centralized formatter for all analysis outputs
@@ -57,10 +69,188 @@ class AnalysisFormatter:
         else:
             return f"{value:.{decimal_places}f}"
     
+    @staticmethod
+    def format_currency_column(values: Any, currency_symbol: str = "$") -> np.ndarray:
+        """
+        Format a whole column as currency, like format_currency on each value
+        
+        Args:
+            values: Array-like of numbers
+            currency_symbol: Currency symbol prefix
+            
+        Returns:
+            Object array of formatted strings
+        """
+        values = np.asarray(values, dtype=float)
+        formatted = currency_symbol + AnalysisFormatter.format_number_column(values, 2)
+        formatted[np.isnan(values)] = "N/A"
+        return formatted
+    
+    @staticmethod
+    def format_percentage_column(values: Any, decimal_places: int = 1, is_fraction: bool = True) -> np.ndarray:
+        """
+        Format a whole column as percentages
+        
+        Args:
+            values: Array-like of numbers
+            decimal_places: Decimal places shown
+            is_fraction: Whether values are fractions (0.25 -> 25.0%) like
+                format_percentage, or already in percent (25 -> 25.0%)
+            
+        Returns:
+            Object array of formatted strings
+        """
+        values = np.asarray(values, dtype=float)
+        if is_fraction:
+            values = values * 100
+        formatted = _format_values(values, f".{decimal_places}f") + "%"
+        formatted[np.isnan(values)] = "N/A"
+        return formatted
+    
+    @staticmethod
+    def format_number_column(values: Any, decimal_places: int = 0) -> np.ndarray:
+        """
+        Format a whole column with K/M/B suffixes, like format_number on each value
+        
+        Args:
+            values: Array-like of numbers
+            decimal_places: Decimal places for values under 1,000
+            
+        Returns:
+            Object array of formatted strings
+        """
+        values = np.asarray(values, dtype=float)
+        magnitude = np.abs(values)
+        scales = [magnitude >= 1_000_000_000, magnitude >= 1_000_000, magnitude >= 1_000]
+        divisors = np.select(scales, [1_000_000_000, 1_000_000, 1_000], 1)
+        suffixes = np.select(scales, ["B", "M", "K"], "").astype(object)
+        specs = np.where(magnitude >= 1_000, ".1f", f".{decimal_places}f")
+        
+        formatted = _format_values(values / divisors, specs) + suffixes
+        formatted[np.isnan(values)] = "N/A"
+        return formatted
+    
+    @staticmethod
+    def format_amount_column(values: Any, decimal_places: int = 2, currency_symbol: str = "$") -> np.ndarray:
+        """
+        Format a whole column as full amounts with thousands separators ($1,234.50)
+        
+        Args:
+            values: Array-like of numbers
+            decimal_places: Decimal places shown
+            currency_symbol: Currency symbol prefix
+            
+        Returns:
+            Object array of formatted strings
+        """
+        values = np.asarray(values, dtype=float)
+        formatted = currency_symbol + _format_values(values, f",.{decimal_places}f")
+        formatted[np.isnan(values)] = "N/A"
+        return formatted
+    
+    @staticmethod
+    def rank_labels(count: int) -> np.ndarray:
+        """Rank labels '1' to str(count) as an object array, for joining with formatted columns"""
+        return np.arange(1, count + 1).astype(str).astype(object)
+    
+    @staticmethod
+    def format_column(values: Any, header: str, column_format: Optional[str] = None) -> np.ndarray:
+        """
+        Format a whole table column
+        
+        Args:
+            values: Array-like column values
+            header: Column header, used to pick a format for numeric columns
+                when none is given (as create_banded_table always has)
+            column_format: One of COLUMN_FORMATS, or None ('percentage' for
+                fractions, 'percent_points' for values already in percent)
+            
+        Returns:
+            Object array of formatted strings
+        """
+        values = pd.Series(values) if not isinstance(values, pd.Series) else values
+        if column_format is None:
+            if not pd.api.types.is_numeric_dtype(values):
+                column_format = 'text'
+            elif header.lower() in ['percentage', 'percent', '%'] or 'pct' in header.lower():
+                column_format = 'percent_points'
+            elif header.lower() in ['value', 'amount', 'total', 'revenue', 'sales', 'cost']:
+                column_format = 'currency'
+            else:
+                column_format = 'decimal'
+        
+        if column_format == 'text':
+            return values.astype(str).to_numpy(dtype=object)
+        
+        formatters = {
+            'currency': AnalysisFormatter.format_currency_column,
+            'amount': AnalysisFormatter.format_amount_column,
+            'percentage': AnalysisFormatter.format_percentage_column,
+            'percent_points': lambda column: AnalysisFormatter.format_percentage_column(column, is_fraction=False),
+            'number': AnalysisFormatter.format_number_column,
+            'decimal': lambda column: AnalysisFormatter.format_number_column(column, 1),
+            'count': lambda column: _format_values(column, ","),
+        }
+        if column_format not in formatters:
+            raise ValueError(f"Unknown column format '{column_format}'. Use one of: {', '.join(COLUMN_FORMATS)}")
+        return formatters[column_format](values.to_numpy())
+    
+    @staticmethod
+    def create_table(data: Union[pd.DataFrame, Dict[str, Any]], formats: Optional[Dict[str, str]] = None,
+                     max_rows: Optional[int] = 10, total_rows: Optional[int] = None) -> str:
+        """
+        Create a Markdown table from columns, formatting each column at once
+        
+        Args:
+            data: DataFrame, or dictionary of header to array-like column
+            formats: Optional header to COLUMN_FORMATS entry; numeric columns
+                without one are formatted by header name, others as text
+            max_rows: Maximum number of rows to display (None for all)
+            total_rows: Row count for the truncation note (default: rows in data)
+            
+        Returns:
+            Formatted table string
+        """
+        data = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        if data.empty or len(data.columns) == 0:
+            return "_No data to display_"
+        
+        total_rows = len(data) if total_rows is None else total_rows
+        display_data = data.iloc[:max_rows] if max_rows is not None else data
+        formats = formats or {}
+        
+        # Format and pad each column as a whole
+        header_cells, separator_cells, columns = [], [], []
+        for position, header in enumerate(display_data.columns):
+            header = str(header)
+            cells = AnalysisFormatter.format_column(display_data.iloc[:, position], header, formats.get(header))
+            width = max(len(header), int(_cell_lengths(cells).max())) if len(cells) else len(header)
+            header_cells.append(header.ljust(width))
+            separator_cells.append("-" * width)
+            columns.append(pd.Series(cells, dtype=object).str.ljust(width).to_numpy(dtype=object))
+        
+        # Join the padded columns into rows
+        rows = "| " + columns[0]
+        for column in columns[1:]:
+            rows = rows + " | " + column
+        rows = rows + " |"
+        
+        table_lines = [
+            "| " + " | ".join(header_cells) + " |",
+            "| " + " | ".join(separator_cells) + " |",
+            *rows.tolist()
+        ]
+        
+        # Add truncation note if data was limited
+        if max_rows is not None and total_rows > max_rows:
+            table_lines.append(f"\n_Showing top {max_rows} of {total_rows} total rows_")
+        
+        return "\n".join(table_lines)
+    
     @staticmethod
     def create_banded_table(data: List[Dict], headers: List[str], max_rows: int = 10) -> str:
         """
-        Create a banded table with alternating row styling for better readability
+        Create a table from a list of row dictionaries
         
         Args:
             data: List of dictionaries with row data
@@ -73,55 +263,17 @@ class AnalysisFormatter:
         if not data or not headers:
             return "_No data to display_"
         
-        # Limit rows if necessary
-        display_data = data[:max_rows]
-        
-        # Calculate column widths
-        col_widths = {}
+        rows = data[:max_rows]
+        display_data = pd.DataFrame.from_records(rows, columns=headers)
+
+        # A row without a text key shows an empty cell, not 'nan'
+        missing = pd.DataFrame([[header not in row for header in headers] for row in rows], columns=headers)
         for header in headers:
-            col_widths[header] = len(header)
-            for row in display_data:
-                if header in row:
-                    value_str = str(row[header])
-                    col_widths[header] = max(col_widths[header], len(value_str))
-        
-        # Create table
-        table_lines = []
-        
-        # Header
-        header_line = "| " + " | ".join(header.ljust(col_widths[header]) for header in headers) + " |"
-        table_lines.append(header_line)
-        
-        # Separator
-        separator = "| " + " | ".join("-" * col_widths[header] for header in headers) + " |"
-        table_lines.append(separator)
-        
-        # Data rows
-        for i, row in enumerate(display_data):
-            row_values = []
-            for header in headers:
-                value = row.get(header, "")
-                if isinstance(value, (int, float)) and not pd.isna(value):
-                    if header.lower() in ['percentage', 'percent', '%'] or 'pct' in header.lower():
-                        value_str = f"{value:.1f}%"
-                    elif header.lower() in ['value', 'amount', 'total', 'revenue', 'sales', 'cost']:
-                        value_str = AnalysisFormatter.format_currency(value)
-                    else:
-                        value_str = AnalysisFormatter.format_number(value, 1)
-                else:
-                    value_str = str(value)
-                row_values.append(value_str.ljust(col_widths[header]))
-            
-            # Add row styling indicator for banded effect
-            row_indicator = "🔸" if i % 2 == 0 else "🔹"
-            row_line = f"| {' | '.join(row_values)} |"
-            table_lines.append(row_line)
-        
-        # Add truncation note if data was limited
-        if len(data) > max_rows:
-            table_lines.append(f"\n_Showing top {max_rows} of {len(data)} total rows_")
-        
-        return "\n".join(table_lines)
+            if missing[header].any() and (not pd.api.types.is_numeric_dtype(display_data[header])
+                                          or missing[header].all()):
+                display_data[header] = display_data[header].astype(object).mask(missing[header], "")
+
+        return AnalysisFormatter.create_table(display_data, max_rows=max_rows, total_rows=len(data))
     
     @staticmethod
     def create_summary_section(title: str, explanation: str, assumptions: List[str] = None) -> str:
@@ -400,14 +552,10 @@ class BaseAnalyzer(ABC):
         """
         results = {}
         
-        # Identify numeric columns for analysis
-        numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
-        
-        # Identify date columns to handle specially
-        date_cols = []
-        for col in data.columns:
-            if any(date_word in col.lower() for date_word in ['date', 'time', 'timestamp', 'created', 'updated', 'day', 'month', 'year']):
-                date_cols.append(col)
+        # Identify numeric and date columns from the dataset profile
+        profile = get_dataset_profile(data)
+        numeric_cols = profile.numeric_columns
+        date_cols = self._profile_date_columns(profile)
         
         # Remove date columns from numeric analysis if requested
         if exclude_date_cols:
@@ -447,14 +595,10 @@ class BaseAnalyzer(ABC):
         """
         results = {}
         
-        # Identify numeric columns for analysis
-        numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
-        
-        # Identify date columns to handle specially  
-        date_cols = []
-        for col in data.columns:
-            if any(date_word in col.lower() for date_word in ['date', 'time', 'timestamp', 'created', 'updated', 'day', 'month', 'year']):
-                date_cols.append(col)
+        # Identify numeric and date columns from the dataset profile
+        profile = get_dataset_profile(data)
+        numeric_cols = profile.numeric_columns
+        date_cols = self._profile_date_columns(profile)
         
         # Remove date columns from numeric analysis if requested
         if exclude_date_cols:
@@ -479,6 +623,24 @@ class BaseAnalyzer(ABC):
         
         return results
 
+    @staticmethod
+    def _profile_date_columns(profile) -> List[str]:
+        """
+        Date columns for Top/Bottom N: parsed dates first, then date-named columns
+        
+        Date-named numeric columns (e.g. 'Year') are still excluded from
+        ranking, but only columns whose values parse as dates are used for
+        the date dimension.
+        
+        Args:
+            profile: DatasetProfile of the analyzed data
+            
+        Returns:
+            List of column names
+        """
+        return profile.date_columns + [col for col in profile.date_named_columns
+                                       if col not in profile.date_columns]
+    
     def _analyze_by_date_dimension(self, data: pd.DataFrame, date_col: str, n: int = 5, 
                                   analysis_type: str = 'top') -> Dict[str, Any]:
         """
@@ -177,7 +177,7 @@ class ContributorAnalyzer(BaseAnalyzer):
             DataFrame with contribution metrics
         """
         # Group by category and sum values
-        contribution_data = data.groupby(category_col).agg({
+        contribution_data = data.groupby(category_col, observed=True).agg({
             value_col: ['sum', 'count', 'mean', 'std']
         }).round(2)
         
@@ -398,19 +398,21 @@ class ContributorAnalyzer(BaseAnalyzer):
             formatted_output += "\n\n🏆 **TOP CONTRIBUTORS TABLE:**\n"
             
             # Prepare table data
-            table_data = []
-            for contributor in pareto['top_contributors']['data'][:10]:  # Top 10
-                table_data.append({
-                    "Rank": contributor['rank'],
-                    "Category": contributor[params['category_col']],
-                    "Total_Value": contributor['total_value'],
-                    "Percentage": f"{contributor['value_percentage']:.1f}%",
-                    "Cumulative_Pct": f"{contributor['cumulative_percentage']:.1f}%",
-                    "Transactions": f"{contributor['transaction_count']:,}"
-                })
+            contributors = pd.DataFrame(pareto['top_contributors']['data'][:10])  # Top 10
+            table_data = pd.DataFrame({
+                "Rank": contributors['rank'],
+                "Category": contributors[params['category_col']],
+                "Total_Value": contributors['total_value'],
+                "Percentage": contributors['value_percentage'],
+                "Cumulative_Pct": contributors['cumulative_percentage'],
+                "Transactions": contributors['transaction_count']
+            })
             
-            headers = ["Rank", "Category", "Total_Value", "Percentage", "Cumulative_Pct", "Transactions"]
-            formatted_output += "\n" + self.formatter.create_banded_table(table_data, headers, max_rows=10)
+            formatted_output += "\n" + self.formatter.create_table(
+                table_data,
+                formats={"Percentage": "percent_points", "Cumulative_Pct": "percent_points", "Transactions": "count"},
+                max_rows=10
+            )
         
         # 4. Insights and recommendations
         key_insights = []
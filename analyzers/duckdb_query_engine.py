@@ -0,0 +1,225 @@
+"""
+DuckDB Query Engine for Quant Commander
+Executes SQL queries directly on the in-memory DataFrame with DuckDB's
+columnar, vectorised engine, falling back to SQLite when needed
+"""
+
+import threading
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .sql_query_engine import SQLQueryEngine, SQLQueryResult
+
+# Optional columnar backend
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+# DuckDB messages raised when a function name or signature is SQLite-only.
+# Function lookups fail in the catalog, binder or parser depending on the
+# function, so the message decides rather than the exception type.
+SQLITE_DIALECT_MARKERS = (
+    "Function with name",
+    "No function matches",
+    "Could not choose a best candidate function",
+    "Wrong number of arguments provided to",
+)
+
+
+class DuckDBQueryEngine(SQLQueryEngine):
+    """
+    SQLQueryEngine backend that scans the pandas DataFrame in place.
+
+    Loading only registers the cleaned DataFrame; nothing is serialised row
+    by row. Each query runs on its own DuckDB cursor, so concurrent queries
+    do not share connection state. Queries DuckDB cannot run because of SQLite
+    dialect (for example SQLite-only functions produced by the NL-to-SQL
+    translators) are retried on the SQLite snapshot, which is only built the
+    first time it is needed. Syntax errors and unknown columns are returned
+    directly.
+    """
+
+    backend = "duckdb"
+
+    def __init__(self, settings: Dict = None):
+        if not DUCKDB_AVAILABLE:
+            raise ImportError("duckdb is not installed. Install with: pip install duckdb")
+
+        super().__init__(settings)
+        self._frame: Optional[pd.DataFrame] = None
+        self._sqlite_loaded = False
+        self._sqlite_build_lock = threading.Lock()  # One SQLite fallback build at a time
+        self._fallback_analyze: Optional[bool] = None
+        self.sqlite_fallback = bool(self.settings.get('sql_sqlite_fallback', True))
+
+        config = {}
+        if self.settings.get('duckdb_threads'):
+            config['threads'] = int(self.settings['duckdb_threads'])
+        self._duckdb = duckdb.connect(database=':memory:', config=config)
+        self._duckdb_lock = threading.Lock()  # Guards cursor creation only
+
+    def _cursor(self):
+        """Create a DuckDB cursor with the current DataFrame registered as the table"""
+        with self._duckdb_lock:
+            cursor = self._duckdb.cursor()
+        if self._frame is not None:
+            cursor.register(self.table_name, self._frame)
+        return cursor
+
+    def load_dataframe_to_sql(self, df: pd.DataFrame, table_name: str = None,
+                              column_info: Optional[Dict] = None,
+                              analyze: Optional[bool] = None) -> bool:
+        """
+        Register a pandas DataFrame for querying without copying it.
+
+        Args:
+            df: DataFrame to query
+            table_name: Table name to use (keeps the current name if omitted)
+            column_info: Optional CSVLoader column analysis, kept for the
+                SQLite fallback's indexes
+            analyze: Passed to the SQLite fallback when it is built
+        """
+        try:
+            if table_name:
+                self.table_name = table_name
+
+            # Clean column names for SQL compatibility without copying the data
+            df_clean = df.copy(deep=False)
+            df_clean.columns = [self._clean_column_name(col) for col in df.columns]
+
+            with self._lock:
+                self._frame = df_clean
+                self.data_df = df
+                self.column_info = column_info
+                self._fallback_analyze = analyze
+
+            # Any SQLite snapshot now describes the previous dataset
+            with self._sqlite_build_lock:
+                if self._sqlite_loaded:
+                    super().close_connection()
+                    self._sqlite_loaded = False
+
+            self.schema_info = self._extract_schema_info(df_clean)
+
+            print(f"[SQL] Registered {len(df)} rows as DuckDB table '{self.table_name}' (thread {threading.get_ident()})")
+            return True
+
+        except Exception as e:
+            print(f"[SQL ERROR] Failed to load data: {str(e)}")
+            return False
+
+    def execute_query(self, sql_query: str) -> SQLQueryResult:
+        """Execute SQL query with DuckDB and return results"""
+        if not self._is_safe_query(sql_query):
+            return SQLQueryResult(
+                success=False,
+                error_message="Query contains potentially unsafe operations"
+            )
+
+        if self._frame is None:
+            return SQLQueryResult(
+                success=False,
+                error_message="SQL Error: Table not found. Please ensure your data is loaded properly."
+            )
+
+        try:
+            cursor = self._cursor()
+            try:
+                result_df = cursor.execute(sql_query).df()
+            finally:
+                cursor.close()
+
+            print(f"[SQL] DuckDB query executed on thread {threading.get_ident()}, returned {len(result_df)} rows")
+            return SQLQueryResult(success=True, data=result_df)
+
+        except duckdb.Error as e:
+            if self.sqlite_fallback and self._is_dialect_error(e):
+                print(f"[SQL] DuckDB could not run query ({str(e).splitlines()[0]}), retrying on SQLite")
+                return self._execute_on_sqlite(sql_query)
+
+            error_msg = str(e)
+            if "does not have a column" in error_msg or "not found in FROM clause" in error_msg:
+                error_msg = f"Column not found. Available columns: {', '.join(self.schema_info.get('columns', []))}"
+            return SQLQueryResult(success=False, error_message=f"SQL Error: {error_msg}")
+
+        except Exception as e:
+            print(f"[SQL ERROR] DuckDB query failed on thread {threading.get_ident()}: {e}")
+            return SQLQueryResult(success=False, error_message=f"SQL Error: {str(e)}")
+
+    @staticmethod
+    def _is_dialect_error(error: Exception) -> bool:
+        """
+        Whether DuckDB rejected a query for SQLite dialect rather than for the query itself
+
+        Missing functions and unsupported constructs are worth retrying on
+        SQLite; syntax errors and unknown columns would only fail again there.
+        """
+        if isinstance(error, duckdb.NotImplementedException):
+            return True
+        message = str(error)
+        return any(marker in message for marker in SQLITE_DIALECT_MARKERS)
+
+    def _execute_on_sqlite(self, sql_query: str) -> SQLQueryResult:
+        """Run a query on the SQLite snapshot, building it on first use"""
+        if not self._sqlite_loaded:
+            with self._sqlite_build_lock:
+                # Another request may have built the snapshot while we waited
+                if not self._sqlite_loaded:
+                    self._sqlite_loaded = super().load_dataframe_to_sql(
+                        self.data_df, column_info=self.column_info, analyze=self._fallback_analyze
+                    )
+        return super().execute_query(sql_query)
+
+    def get_table_schema(self) -> Dict:
+        """Get information about the registered table structure"""
+        if self._frame is None:
+            return {"error": "No database connection available"}
+
+        try:
+            cursor = self._cursor()
+            try:
+                columns = cursor.execute(f'DESCRIBE "{self.table_name}"').fetchall()
+                sample = cursor.execute(f'SELECT * FROM "{self.table_name}" LIMIT 3').df()
+            finally:
+                cursor.close()
+
+            return {
+                "table_name": self.table_name,
+                "columns": [
+                    {"name": col[0], "type": col[1], "nullable": col[2] == "YES"}
+                    for col in columns
+                ],
+                "sample_data": {col: sample[col].tolist() for col in sample.columns}
+            }
+
+        except Exception as e:
+            return {"error": f"Schema extraction failed: {str(e)}"}
+
+    def refresh_connection(self, df: pd.DataFrame = None) -> bool:
+        """Re-register the DataFrame (DuckDB cursors are per query, so nothing goes stale)"""
+        if df is not None:
+            return self.load_dataframe_to_sql(df)
+        return self.is_connection_valid()
+
+    def is_connection_valid(self) -> bool:
+        """Check that DuckDB can run a query"""
+        try:
+            cursor = self._cursor()
+            try:
+                cursor.execute("SELECT 1").fetchone()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def close_connection(self):
+        """Drop the registered DataFrame and any SQLite fallback snapshot"""
+        with self._lock:
+            self._frame = None
+        with self._sqlite_build_lock:
+            self._sqlite_loaded = False
+            super().close_connection()
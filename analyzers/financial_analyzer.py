@@ -8,6 +8,11 @@ import numpy as np
 from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime, timedelta
 from .base_analyzer import BaseAnalyzer, AnalysisError
+from data.rollup_cube import get_rollup_cube
+
+
+# Months in a trailing-twelve-month window
+TTM_MONTHS = 12
 
 
 class FinancialAnalyzer(BaseAnalyzer):
@@ -29,6 +34,8 @@ class FinancialAnalyzer(BaseAnalyzer):
             '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y%m%d',
             '%b %Y', '%B %Y', '%Y-%m', '%m-%Y', '%Y/%m'
         ]
+        # Rollup cube of the data being analyzed, when it can stand in for the rows
+        self._rollup = None
     
     def analyze(self, data: pd.DataFrame, 
                 date_col: str,
@@ -71,6 +78,14 @@ class FinancialAnalyzer(BaseAnalyzer):
             # Process data
             analysis_data = self._prepare_data(data, date_col, value_col, budget_col)
             
+            # Monthly totals come from the dataset's rollup cube unless cleaning
+            # dropped rows (missing or non-finite values), which the cube still counts
+            self._rollup = None
+            if len(analysis_data) == len(data):
+                self._rollup = get_rollup_cube(
+                    data, date_col, [value_col] + ([budget_col] if budget_col else []), category_col
+                )
+            
             # Select analysis type
             if analysis_type == "ttm":
                 results = self._calculate_ttm(analysis_data, date_col, value_col, category_col)
@@ -112,14 +127,14 @@ class FinancialAnalyzer(BaseAnalyzer):
                 raise
             raise AnalysisError(f"Financial analysis failed: {str(e)}")
     
-    def _prepare_data(self, data: pd.DataFrame, date_col: str, value_col: str, budget_col: Optional[str] = None) -> pd.DataFrame:
+    def _prepare_data(self, data: pd.DataFrame, date_col: str, value_col: Union[str, List[str]], budget_col: Optional[str] = None) -> pd.DataFrame:
         """
         Prepare data for financial analysis
         
         Args:
             data: Input DataFrame
             date_col: Date column name
-            value_col: Value column name
+            value_col: Value column name (or names)
             budget_col: Optional budget column name
             
         Returns:
@@ -132,7 +147,8 @@ class FinancialAnalyzer(BaseAnalyzer):
         prepared_data = self._convert_date_column(prepared_data, date_col)
         
         # Clean numeric data
-        numeric_cols = [value_col]
+        value_cols = [value_col] if isinstance(value_col, str) else list(value_col)
+        numeric_cols = list(value_cols)
         if budget_col:
             numeric_cols.append(budget_col)
         
@@ -140,7 +156,7 @@ class FinancialAnalyzer(BaseAnalyzer):
         
         # Remove rows with missing values in key columns
         initial_rows = len(prepared_data)
-        prepared_data = prepared_data.dropna(subset=[date_col, value_col])
+        prepared_data = prepared_data.dropna(subset=[date_col] + value_cols)
         
         if budget_col:
             # For quantitative analysis, keep only rows with budget values
@@ -234,136 +250,80 @@ class FinancialAnalyzer(BaseAnalyzer):
         months_in_data = (max_date.year - min_date.year) * 12 + max_date.month - min_date.month + 1
         
         # Check if we have enough data
-        if months_in_data < 12:
+        if months_in_data < TTM_MONTHS:
             self.warnings.append(
                 f"Data spans only {months_in_data} months. "
-                f"TTM analysis typically requires at least 12 months of data."
+                f"TTM analysis typically requires at least {TTM_MONTHS} months of data."
             )
         
-        # Create month-level aggregation
-        data['year_month'] = data[date_col].dt.to_period('M')
-        
-        # Group by year-month and optional category
-        if category_col:
-            monthly_data = data.groupby(['year_month', category_col]).agg({
-                value_col: 'sum'
-            }).reset_index()
-        else:
-            monthly_data = data.groupby('year_month').agg({
-                value_col: 'sum'
-            }).reset_index()
+        # Month-level aggregation, grouped by optional category
+        monthly_data = self._monthly_totals(data, date_col, [value_col], category_col)
         
-        # Convert year_month to datetime (first day of month)
-        monthly_data['date'] = monthly_data['year_month'].dt.to_timestamp()
+        # Rolling 12-month sums and YoY growth for every category at once
+        final_ttm_data, total_ttm = self._ttm_frame(monthly_data, [value_col], category_col)
         
-        # Sort by date
-        monthly_data = monthly_data.sort_values('date')
-        
-        # Calculate rolling 12-month sum (TTM)
-        if category_col:
-            ttm_data = monthly_data.groupby(category_col).apply(
-                lambda x: x.set_index('date')[value_col].rolling('365D').sum()
-            ).reset_index()
-            ttm_data.columns = [category_col, 'date', f'{value_col}_ttm']
-        else:
-            ttm_data = pd.DataFrame({
-                'date': monthly_data['date'],
-                f'{value_col}_ttm': monthly_data.set_index('date')[value_col].rolling('365D').sum().values
-            })
-        
-        # Filter out rows with NaN TTM (first 11 months)
-        ttm_data = ttm_data.dropna()
-        
-        # Calculate YoY growth rate if we have enough data
-        if len(ttm_data) >= 13:
-            # Calculate year-over-year TTM growth
-            ttm_data['date_shifted'] = ttm_data['date'] - pd.DateOffset(years=1)
-            
-            # Merge current TTM with TTM from a year ago
-            if category_col:
-                ttm_yoy = ttm_data.merge(
-                    ttm_data[[category_col, 'date', f'{value_col}_ttm']],
-                    left_on=[category_col, 'date_shifted'],
-                    right_on=[category_col, 'date'],
-                    suffixes=('', '_prev')
-                )
-            else:
-                ttm_yoy = ttm_data.merge(
-                    ttm_data[['date', f'{value_col}_ttm']],
-                    left_on='date_shifted',
-                    right_on='date',
-                    suffixes=('', '_prev')
-                )
-            
-            # Calculate growth rate
-            ttm_yoy[f'{value_col}_growth'] = (
-                (ttm_yoy[f'{value_col}_ttm'] - ttm_yoy[f'{value_col}_ttm_prev']) / 
-                ttm_yoy[f'{value_col}_ttm_prev']
-            ) * 100
-            
-            # Clean up merged dataframe
-            if category_col:
-                ttm_yoy = ttm_yoy[[category_col, 'date_x', f'{value_col}_ttm', f'{value_col}_ttm_prev', f'{value_col}_growth']]
-                ttm_yoy.columns = [category_col, 'date', f'{value_col}_ttm', f'{value_col}_ttm_prev', f'{value_col}_growth']
-            else:
-                ttm_yoy = ttm_yoy[['date_x', f'{value_col}_ttm', f'{value_col}_ttm_prev', f'{value_col}_growth']]
-                ttm_yoy.columns = ['date', f'{value_col}_ttm', f'{value_col}_ttm_prev', f'{value_col}_growth']
-            
-            final_ttm_data = ttm_yoy
-        else:
+        if months_in_data >= TTM_MONTHS and f'{value_col}_growth' not in final_ttm_data.columns:
             # Not enough data for YoY comparison
             self.warnings.append(
                 "Not enough data for year-over-year growth calculation. "
                 "At least 24 months of data is required."
             )
-            final_ttm_data = ttm_data.drop('date_shifted', axis=1, errors='ignore')
         
-        # Calculate metrics
-        current_ttm = final_ttm_data.iloc[-1][f'{value_col}_ttm']
+        # Calculate metrics (across all categories); no complete window means no TTM yet
+        current_ttm = total_ttm.iloc[-1][f'{value_col}_ttm'] if len(total_ttm) else None
         
         metrics = {
-            'current_ttm': float(current_ttm),
-            'current_ttm_formatted': self.formatter.format_currency(current_ttm),
+            'current_ttm': float(current_ttm) if current_ttm is not None else None,
+            'current_ttm_formatted': (self.formatter.format_currency(current_ttm)
+                                      if current_ttm is not None else "N/A"),
             'ttm_periods': len(final_ttm_data),
             'date_range': f"{min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}",
             'months_covered': months_in_data
         }
         
         # Add growth metrics if available
-        if f'{value_col}_growth' in final_ttm_data.columns:
-            current_growth = final_ttm_data.iloc[-1][f'{value_col}_growth']
+        if f'{value_col}_growth' in total_ttm.columns:
+            growth = total_ttm[f'{value_col}_growth']
+            current_growth = growth.iloc[-1]
             metrics.update({
                 'current_growth': float(current_growth),
                 'current_growth_formatted': self.formatter.format_percentage(current_growth / 100),
-                'max_growth': float(final_ttm_data[f'{value_col}_growth'].max()),
-                'min_growth': float(final_ttm_data[f'{value_col}_growth'].min()),
-                'avg_growth': float(final_ttm_data[f'{value_col}_growth'].mean())
+                'max_growth': float(growth.max()),
+                'min_growth': float(growth.min()),
+                'avg_growth': float(growth.mean())
             })
         
         # Format for response
+        dates = final_ttm_data['date'].dt.strftime('%Y-%m').tolist()
+        ttm_values = final_ttm_data[f'{value_col}_ttm'].tolist()
+        growth_values = (final_ttm_data[f'{value_col}_growth'].tolist()
+                         if f'{value_col}_growth' in final_ttm_data.columns else None)
         if category_col:
+            # Rows are sorted by category, then date: one slice per category
+            codes = final_ttm_data[category_col].factorize()[0]
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+            ends = np.r_[starts[1:], len(codes)]
             result_data = []
-            for category, group in final_ttm_data.groupby(category_col):
-                group_data = group.sort_values('date')
+            for start, end in zip(starts, ends):
                 group_dict = {
-                    'category': category,
-                    'dates': group_data['date'].dt.strftime('%Y-%m').tolist(),
-                    'ttm_values': group_data[f'{value_col}_ttm'].tolist()
+                    'category': final_ttm_data[category_col].iloc[start],
+                    'dates': dates[start:end],
+                    'ttm_values': ttm_values[start:end]
                 }
                 
-                if f'{value_col}_growth' in group_data.columns:
-                    group_dict['growth_values'] = group_data[f'{value_col}_growth'].tolist()
+                if growth_values is not None:
+                    group_dict['growth_values'] = growth_values[start:end]
                 
                 result_data.append(group_dict)
         else:
             # Overall TTM series
             result_data = {
-                'dates': final_ttm_data['date'].dt.strftime('%Y-%m').tolist(),
-                'ttm_values': final_ttm_data[f'{value_col}_ttm'].tolist()
+                'dates': dates,
+                'ttm_values': ttm_values
             }
             
-            if f'{value_col}_growth' in final_ttm_data.columns:
-                result_data['growth_values'] = final_ttm_data[f'{value_col}_growth'].tolist()
+            if growth_values is not None:
+                result_data['growth_values'] = growth_values
         
         return {
             'data': result_data,
@@ -371,6 +331,159 @@ class FinancialAnalyzer(BaseAnalyzer):
             'date_range': f"{min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}"
         }
     
+    def calculate_ttm(self, data: pd.DataFrame,
+                      date_col: str,
+                      value_cols: Union[str, List[str]],
+                      category_col: Optional[str] = None) -> pd.DataFrame:
+        """
+        Trailing twelve month sums and YoY growth of several value columns
+        
+        Args:
+            data: Input DataFrame
+            date_col: Date column name
+            value_cols: Value column name(s)
+            category_col: Optional category column
+            
+        Returns:
+            DataFrame with one row per category and month (see _ttm_frame)
+            
+        Raises:
+            AnalysisError: If the columns are missing or not numeric
+        """
+        value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+        self.reset()
+        self.validate_data(data)
+        self.validate_columns(data, [date_col] + value_cols + ([category_col] if category_col else []))
+        self.validate_numeric_columns(data, value_cols)
+        
+        analysis_data = self._prepare_data(data, date_col, value_cols)
+        self._rollup = None
+        if len(analysis_data) == len(data):
+            self._rollup = get_rollup_cube(data, date_col, value_cols, category_col)
+        
+        monthly_data = self._monthly_totals(analysis_data, date_col, value_cols, category_col)
+        return self._ttm_frame(monthly_data, value_cols, category_col)[0]
+    
+    def _ttm_frame(self, monthly_data: pd.DataFrame, value_cols: List[str],
+                   category_col: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Rolling 12-month sums and YoY growth from monthly totals
+        
+        The totals are laid out as a dense value × category × month array, so
+        every category is summed with one sliding-window reduction. Months a
+        category has no rows for count as 0: its TTM is still reported for
+        them, from its 12th month through its last. With at least 24 months
+        of data, rows are kept only where the TTM of 12 months earlier is a
+        full window too, and carry that value and the growth against it.
+        
+        Args:
+            monthly_data: Monthly totals with 'year_month', optional category and value columns
+            value_cols: Value columns
+            category_col: Optional category column
+            
+        Returns:
+            Tuple of the per-category frame (category, 'date', and per value
+            column '{col}_ttm', '{col}_ttm_prev', '{col}_growth', sorted by
+            category and date) and the same frame for the total of all categories
+        """
+        periods = pd.PeriodIndex(monthly_data['year_month'])
+        month_positions = periods.year * 12 + periods.month
+        month_positions = np.asarray(month_positions - month_positions.min())
+        month_count = int(month_positions.max()) + 1
+        month_dates = pd.period_range(periods.min(), periods=month_count, freq='M').to_timestamp()
+        
+        if category_col:
+            codes, categories = pd.factorize(monthly_data[category_col], sort=True)
+        else:
+            codes, categories = np.zeros(len(monthly_data), dtype=np.int64), None
+        category_count = int(codes.max()) + 1 if len(codes) else 0
+        
+        dense = np.zeros((len(value_cols), category_count, month_count))
+        dense[:, codes, month_positions] = monthly_data[value_cols].to_numpy(dtype=float).T
+        
+        first = np.full(category_count, month_count)
+        np.minimum.at(first, codes, month_positions)
+        last = np.full(category_count, -1)
+        np.maximum.at(last, codes, month_positions)
+        
+        frame = self._ttm_rows(dense, first, last, value_cols, month_dates)
+        if category_col:
+            frame.insert(0, category_col, categories.take(frame.pop('_category').to_numpy()))
+        else:
+            frame = frame.drop(columns='_category')
+        
+        # All categories together span every month
+        total = self._ttm_rows(dense.sum(axis=1, keepdims=True), np.array([0]), np.array([month_count - 1]),
+                               value_cols, month_dates).drop(columns='_category')
+        return frame, total
+    
+    def _ttm_rows(self, dense: np.ndarray, first: np.ndarray, last: np.ndarray,
+                  value_cols: List[str], month_dates: pd.DatetimeIndex) -> pd.DataFrame:
+        """
+        TTM rows of a value × category × month array
+        
+        Args:
+            dense: Monthly totals, 0 where a category has no rows
+            first: First month position of each category
+            last: Last month position of each category
+            value_cols: Value column for each leading slice of dense
+            month_dates: First day of each month position
+            
+        Returns:
+            DataFrame with '_category' (position), 'date' and the TTM columns
+        """
+        window = TTM_MONTHS
+        padded = np.concatenate([np.zeros(dense.shape[:-1] + (window - 1,)), dense], axis=-1)
+        ttm = np.lib.stride_tricks.sliding_window_view(padded, window, axis=-1).sum(axis=-1)
+        
+        # A TTM needs a full window of the category's months, and its growth
+        # needs the TTM of 12 months earlier to be a full window as well
+        months = np.arange(dense.shape[-1])
+        keep = (months - first[:, np.newaxis] >= window - 1) & (months <= last[:, np.newaxis])
+        with_growth = dense.shape[-1] >= 2 * window
+        if with_growth:
+            keep &= months - first[:, np.newaxis] >= 2 * window - 1
+            previous = np.full_like(ttm, np.nan)
+            previous[..., window:] = ttm[..., :-window]
+        
+        category_index, month_index = np.nonzero(keep)
+        columns = {'_category': category_index, 'date': month_dates[month_index]}
+        for i, col in enumerate(value_cols):
+            columns[f'{col}_ttm'] = ttm[i, category_index, month_index]
+            if with_growth:
+                prev = previous[i, category_index, month_index]
+                columns[f'{col}_ttm_prev'] = prev
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    columns[f'{col}_growth'] = (columns[f'{col}_ttm'] - prev) / prev * 100
+        return pd.DataFrame(columns)
+    
+    def _monthly_totals(self, data: pd.DataFrame, date_col: str, value_cols: List[str],
+                        category_col: Optional[str] = None) -> pd.DataFrame:
+        """
+        Monthly sums of value columns, by optional category
+        
+        Reads the rollup cube when analyze found one; otherwise groups the rows.
+        
+        Args:
+            data: Prepared DataFrame
+            date_col: Date column name
+            value_cols: Columns to sum
+            category_col: Optional category column
+            
+        Returns:
+            DataFrame with 'year_month', the optional category and value columns
+        """
+        if self._rollup is not None:
+            monthly_data = self._rollup.rollup('monthly', value_cols, category_col).reset_index()
+            return monthly_data.rename(columns={'period': 'year_month'})
+        
+        group_keys = [data[date_col].dt.to_period('M').rename('year_month')]
+        if category_col:
+            group_keys.append(category_col)
+        return data.groupby(group_keys, observed=True).agg(
+            {col: 'sum' for col in value_cols}
+        ).reset_index()
+    
     def _calculate_variance(self, data: pd.DataFrame, date_col: str, actual_col: str, budget_col: str, category_col: Optional[str] = None) -> Dict[str, Any]:
         """
         Calculate budget vs actual quantitative analysis
@@ -400,15 +513,16 @@ class FinancialAnalyzer(BaseAnalyzer):
         data['variance_pct'] = (data['variance'] / data[budget_col]) * 100
         
         # Group by year-month and optional category
-        if category_col:
-            grouped_data = data.groupby(['year_month', category_col]).agg({
-                actual_col: 'sum',
-                budget_col: 'sum',
-                'variance': 'sum',
-                'variance_pct': 'mean'  # Average percentage variance
-            }).reset_index()
+        group_keys = ['year_month', category_col] if category_col else ['year_month']
+        if self._rollup is not None:
+            # Sums come from the rollup cube; the mean row-level percentage
+            # still needs the rows
+            grouped_data = self._monthly_totals(data, date_col, [actual_col, budget_col], category_col)
+            grouped_data['variance'] = grouped_data[actual_col] - grouped_data[budget_col]
+            mean_pct = data.groupby(group_keys, observed=True)['variance_pct'].mean().reset_index()
+            grouped_data = grouped_data.merge(mean_pct, on=group_keys, how='left')
         else:
-            grouped_data = data.groupby('year_month').agg({
+            grouped_data = data.groupby(group_keys, observed=True).agg({
                 actual_col: 'sum',
                 budget_col: 'sum',
                 'variance': 'sum',
@@ -450,7 +564,7 @@ class FinancialAnalyzer(BaseAnalyzer):
         # Format for response
         if category_col:
             result_data = []
-            for category, group in grouped_data.groupby(category_col):
+            for category, group in grouped_data.groupby(category_col, observed=True):
                 group_data = group.sort_values('date')
                 
                 cat_total_actual = group_data[actual_col].sum()
@@ -481,59 +595,8 @@ class FinancialAnalyzer(BaseAnalyzer):
             }
         
         # Add largest variances
-        top_variances = []
-        
-        for _, row in largest_over.iterrows():
-            period = row['date'].strftime('%Y-%m')
-            variance = float(row['variance'])
-            variance_pct = float(row['variance_pct'])
-            
-            if category_col:
-                category = row[category_col]
-                top_variances.append({
-                    'period': period,
-                    'category': category,
-                    'variance': variance,
-                    'variance_formatted': self.formatter.format_currency(variance),
-                    'variance_pct': variance_pct,
-                    'variance_pct_formatted': self.formatter.format_percentage(variance_pct / 100),
-                    'type': 'over_budget'
-                })
-            else:
-                top_variances.append({
-                    'period': period,
-                    'variance': variance,
-                    'variance_formatted': self.formatter.format_currency(variance),
-                    'variance_pct': variance_pct,
-                    'variance_pct_formatted': self.formatter.format_percentage(variance_pct / 100),
-                    'type': 'over_budget'
-                })
-        
-        for _, row in largest_under.iterrows():
-            period = row['date'].strftime('%Y-%m')
-            variance = float(row['variance'])
-            variance_pct = float(row['variance_pct'])
-            
-            if category_col:
-                category = row[category_col]
-                top_variances.append({
-                    'period': period,
-                    'category': category,
-                    'variance': variance,
-                    'variance_formatted': self.formatter.format_currency(variance),
-                    'variance_pct': variance_pct,
-                    'variance_pct_formatted': self.formatter.format_percentage(variance_pct / 100),
-                    'type': 'under_budget'
-                })
-            else:
-                top_variances.append({
-                    'period': period,
-                    'variance': variance,
-                    'variance_formatted': self.formatter.format_currency(variance),
-                    'variance_pct': variance_pct,
-                    'variance_pct_formatted': self.formatter.format_percentage(variance_pct / 100),
-                    'type': 'under_budget'
-                })
+        top_variances = (self._variance_records(largest_over, category_col, 'over_budget') +
+                         self._variance_records(largest_under, category_col, 'under_budget'))
         
         return {
             'data': result_data,
@@ -542,6 +605,28 @@ class FinancialAnalyzer(BaseAnalyzer):
             'date_range': f"{min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}"
         }
     
+    def _variance_records(self, rows: pd.DataFrame, category_col: Optional[str], variance_type: str) -> List[Dict[str, Any]]:
+        """
+        Format variance rows as top-variance records, a column at a time
+        
+        Args:
+            rows: Monthly rows with 'date', 'variance', 'variance_pct' and optional category
+            category_col: Optional category column
+            variance_type: 'over_budget' or 'under_budget'
+            
+        Returns:
+            List of records with formatted variance and variance percentage
+        """
+        records = pd.DataFrame({'period': rows['date'].dt.strftime('%Y-%m').to_numpy()})
+        if category_col:
+            records['category'] = rows[category_col].to_numpy()
+        records['variance'] = rows['variance'].to_numpy(dtype=float)
+        records['variance_formatted'] = self.formatter.format_currency_column(records['variance'])
+        records['variance_pct'] = rows['variance_pct'].to_numpy(dtype=float)
+        records['variance_pct_formatted'] = self.formatter.format_percentage_column(records['variance_pct'] / 100)
+        records['type'] = variance_type
+        return records.to_dict('records')
+    
     def _calculate_trend(self, data: pd.DataFrame, date_col: str, value_col: str, category_col: Optional[str] = None) -> Dict[str, Any]:
         """
         Calculate trend analysis
@@ -562,18 +647,8 @@ class FinancialAnalyzer(BaseAnalyzer):
         min_date = data[date_col].min()
         max_date = data[date_col].max()
         
-        # Create month-level aggregation
-        data['year_month'] = data[date_col].dt.to_period('M')
-        
-        # Group by year-month and optional category
-        if category_col:
-            monthly_data = data.groupby(['year_month', category_col]).agg({
-                value_col: 'sum'
-            }).reset_index()
-        else:
-            monthly_data = data.groupby('year_month').agg({
-                value_col: 'sum'
-            }).reset_index()
+        # Create month-level aggregation, grouped by optional category
+        monthly_data = self._monthly_totals(data, date_col, [value_col], category_col)
         
         # Convert year_month to datetime (first day of month)
         monthly_data['date'] = monthly_data['year_month'].dt.to_timestamp()
@@ -583,7 +658,7 @@ class FinancialAnalyzer(BaseAnalyzer):
         
         # Calculate month-over-month percentage change
         if category_col:
-            monthly_data[f'{value_col}_pct_change'] = monthly_data.groupby(category_col)[value_col].pct_change() * 100
+            monthly_data[f'{value_col}_pct_change'] = monthly_data.groupby(category_col, observed=True)[value_col].pct_change() * 100
         else:
             monthly_data[f'{value_col}_pct_change'] = monthly_data[value_col].pct_change() * 100
         
@@ -592,7 +667,7 @@ class FinancialAnalyzer(BaseAnalyzer):
             # Calculate overall trend direction for each category
             trend_data = []
             
-            for category, group in monthly_data.groupby(category_col):
+            for category, group in monthly_data.groupby(category_col, observed=True):
                 # Linear regression for trend
                 x = np.arange(len(group))
                 y = group[value_col].values
@@ -1085,7 +1160,7 @@ class FinancialAnalyzer(BaseAnalyzer):
         
         # 2. Key metrics
         key_metrics = {
-            "Current_TTM_Value": metrics.get('current_ttm', 0),
+            "Current_TTM_Value": metrics['current_ttm'] if metrics.get('current_ttm') is not None else "N/A",
             "Period_Coverage": metrics.get('date_range', 'N/A')
         }
         
@@ -1143,19 +1218,19 @@ class FinancialAnalyzer(BaseAnalyzer):
         if top_variances:
             formatted_output += "\n\n📊 **NOTABLE VARIANCES TABLE:**\n"
             
-            table_data = []
-            for variance in top_variances[:10]:  # Top 10
-                table_data.append({
-                    "Period": variance.get('period', 'N/A'),
-                    "Category": variance.get('category', 'All'),
-                    "Actual": variance.get('actual', 0),
-                    "Budget": variance.get('budget', 0),
-                    "Variance": variance.get('variance', 0),
-                    "Variance_Pct": f"{variance.get('variance_pct', 0):.1f}%"
-                })
+            variances = pd.DataFrame(top_variances[:10])  # Top 10
+            table_data = pd.DataFrame({
+                "Period": variances.get('period', 'N/A'),
+                "Category": variances.get('category', 'All'),
+                "Actual": variances.get('actual', 0),
+                "Budget": variances.get('budget', 0),
+                "Variance": variances.get('variance', 0),
+                "Variance_Pct": variances.get('variance_pct', 0)
+            }, index=variances.index)
             
-            headers = ["Period", "Category", "Actual", "Budget", "Variance", "Variance_Pct"]
-            formatted_output += "\n" + self.formatter.create_banded_table(table_data, headers, max_rows=10)
+            formatted_output += "\n" + self.formatter.create_table(
+                table_data, formats={"Variance_Pct": "percent_points"}, max_rows=10
+            )
         
         # 4. Insights and recommendations
         clean_findings = [finding.replace('🎯 **', '').replace('**', '') for finding in insights.get('key_findings', [])]
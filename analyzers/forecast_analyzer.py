@@ -11,6 +11,9 @@ Key Features:
 - Seasonal pattern detection
 - Confidence interval calculation
 - Multiple forecast horizons
+- Batch forecasting of every group × metric series
+- Method selection by rolling-origin backtesting (optional)
+- Incremental updates from the persisted state of each series
 - Integration with caching system
 
 Author: AI Assistant
@@ -18,12 +21,53 @@ Date: July 2025
 Phase: 3B - Advanced Analytics Core
 """
 
+import multiprocessing
+import os
+import threading
+import time
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 import warnings
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from data.dataset_profile import get_dataset_profile
+from utils.data_fingerprint import compute_fingerprint
+
+
+# Below this many series (or backtest fits) a process pool costs more than it saves
+PARALLEL_MIN_SERIES = 200
+
+# Worker start method: forking a multi-threaded server (Gradio) can copy a
+# lock another thread holds into the child and deadlock it
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Method selection modes
+HEURISTIC = 'heuristic'
+BACKTEST = 'backtest'
+
+# (method, parameters) candidates compared by backtesting: every method in
+# forecast_methods, the smoothing methods over a small parameter grid
+BACKTEST_CANDIDATES: List[Tuple[str, Dict[str, float]]] = (
+    [('linear_regression', {})]
+    + [('simple_exponential_smoothing', {'alpha': alpha}) for alpha in (0.1, 0.3, 0.5, 0.8)]
+    + [('double_exponential_smoothing', {'alpha': alpha, 'beta': beta})
+       for alpha in (0.3, 0.5, 0.8) for beta in (0.1, 0.3)]
+    + [('seasonal_decomposition', {})]
+)
+
+# Backtest selections kept per (series fingerprint, horizon, origins)
+MAX_CACHED_SELECTIONS = 4096
+
+# Forecast states an analyzer keeps for update/update_groups, least recently
+# used first out (linear and seasonal states hold their whole history)
+MAX_FORECAST_STATES = 10000
+
+_selections: "OrderedDict[tuple, BacktestSelection]" = OrderedDict()
+_selections_lock = threading.Lock()
 
 
 @dataclass
@@ -46,6 +90,61 @@ class ForecastResult:
     forecast_horizon: int          # Number of periods forecasted
 
 
+@dataclass
+class BacktestSelection:
+    """
+    Method chosen for one series by rolling-origin backtesting.
+    
+    errors maps each evaluated candidate's label to its mean out-of-sample
+    absolute error; it is empty when the heuristic selection was used.
+    """
+    method: str                    # Selected forecasting method
+    params: Dict[str, float]       # Parameters for the method (alpha, beta)
+    errors: Dict[str, float] = field(default_factory=dict)  # Candidate label -> mean MAE
+    origins: int = 0               # Rolling origins evaluated
+    complete: bool = False         # Every candidate finished within the time budget
+    
+    @property
+    def label(self) -> str:
+        """Candidate label of the selected method and parameters"""
+        return candidate_label(self.method, self.params)
+
+
+@dataclass
+class ForecastState:
+    """
+    Final state of one forecast series, enough to extend it with new observations.
+    
+    The smoothing methods are causal, so their final level, trend and running
+    residual sums (see forecast_methods.smoothing_state) carry everything an
+    update needs. Linear regression and seasonal decomposition are global fits
+    that move with every new point; their state keeps the history to refit.
+    """
+    method: str                    # Forecasting method used
+    params: Dict[str, float]       # Parameters for the method (alpha, beta)
+    last_date: Any                 # Date of the last observation
+    last_value: float              # Last observation
+    observations: int              # Observations seen so far
+    smoothing: Dict[str, float] = field(default_factory=dict)  # Smoothing level, trend and residual sums
+    history: Optional[pd.Series] = None  # Full series, for methods refitted on update
+
+
+def candidate_label(method: str, params: Dict[str, float]) -> str:
+    """
+    Readable label for a (method, parameters) candidate.
+    
+    Args:
+        method (str): Forecasting method name
+        params (Dict[str, float]): Method parameters
+        
+    Returns:
+        str: e.g. 'double_exponential_smoothing(alpha=0.5, beta=0.1)'
+    """
+    if not params:
+        return method
+    return f"{method}({', '.join(f'{name}={value}' for name, value in sorted(params.items()))})"
+
+
 class ForecastingAnalyzer:
     """
     Advanced forecasting analyzer for financial time series data.
@@ -54,18 +153,42 @@ class ForecastingAnalyzer:
     statistical methods to predict future values of financial metrics.
     """
     
-    def __init__(self, confidence_level: float = 0.95):
+    def __init__(self, confidence_level: float = 0.95,
+                 selection: str = HEURISTIC,
+                 backtest_origins: int = 3,
+                 backtest_time_budget: float = 10.0,
+                 max_workers: Optional[int] = None,
+                 max_states: int = MAX_FORECAST_STATES):
         """
         Initialize the forecasting analyzer.
         
         Args:
             confidence_level (float): Confidence level for prediction intervals (default: 0.95)
+            selection (str): 'heuristic' picks methods from data characteristics;
+                'backtest' picks them by rolling-origin backtesting
+            backtest_origins (int): Rolling origins per series when backtesting (default: 3)
+            backtest_time_budget (float): Seconds a backtest selection may take (default: 10)
+            max_workers (int, optional): Worker processes for batch work (default: CPU count)
+            max_states (int): Series states kept for incremental updates (default: MAX_FORECAST_STATES)
+            
+        Raises:
+            ValueError: If the selection mode is unknown
         """
+        if selection not in (HEURISTIC, BACKTEST):
+            raise ValueError(f"Unknown selection mode '{selection}'")
+        
         self.confidence_level = confidence_level
         self.min_data_points = 3  # Minimum points needed for forecasting
         self.max_forecast_horizon = 12  # Maximum periods to forecast
+        self.selection = selection
+        self.backtest_origins = backtest_origins
+        self.backtest_time_budget = backtest_time_budget
+        self.max_workers = max_workers
+        self.max_states = max_states
+        # Series key -> state after the last forecast or update, least recently used first
+        self.states: "OrderedDict[Any, ForecastState]" = OrderedDict()
         
-        print(f"📈 ForecastingAnalyzer initialized: confidence_level={confidence_level}")
+        print(f"📈 ForecastingAnalyzer initialized: confidence_level={confidence_level}, selection={selection}")
     
     def analyze_time_series(self, data: pd.DataFrame, 
                            target_column: str,
@@ -100,12 +223,21 @@ class ForecastingAnalyzer:
             characteristics = self._analyze_data_characteristics(ts_data)
             
             # Select best forecasting method
-            method = self._select_forecasting_method(characteristics)
+            params = {}
+            choice = None
+            if self.selection == BACKTEST:
+                choice = self.select_by_backtest({target_column: ts_data}, horizon=periods)[target_column]
+                method, params = choice.method, choice.params
+            else:
+                method = self._select_forecasting_method(characteristics)
             
             # Generate forecast
             forecast_result = self._generate_forecast(
-                ts_data, method, periods, target_column
+                ts_data, method, periods, target_column, params
             )
+            if choice is not None and choice.errors:
+                forecast_result.accuracy_metrics['backtest_mae'] = choice.errors[choice.label]
+            self._store_states(_initial_states({target_column: ts_data}, {target_column: (method, params)}))
             
             print(f"✅ Forecast generated: {method} method, {periods} periods")
             return forecast_result
@@ -114,6 +246,502 @@ class ForecastingAnalyzer:
             print(f"❌ Forecasting error: {str(e)}")
             raise ValueError(f"Failed to generate forecast: {str(e)}")
     
+    def forecast_by_group(self, data: pd.DataFrame,
+                          group_columns: Union[str, List[str]],
+                          target_columns: Optional[List[str]] = None,
+                          date_column: str = 'Date',
+                          periods: int = 6,
+                          max_workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Forecast every group × metric series of a frame in one call.
+        
+        The frame is aggregated once to one row per group and date (values
+        on the same date are summed) and split into one series per group and
+        target column. Each series gets the method _select_forecasting_method
+        picks for it, as in analyze_time_series, and series sharing a method
+        are fitted together. With many series the work is spread over a
+        process pool, one chunk of series per worker. The final state of each
+        series is kept for update_groups, up to max_states across calls.
+        
+        Args:
+            data (pd.DataFrame): Input data
+            group_columns (str or List[str]): Columns defining the series (e.g. ['Region', 'Product'])
+            target_columns (List[str], optional): Columns to forecast (default: every numeric column)
+            date_column (str): Date column name (default: 'Date')
+            periods (int): Number of periods to forecast (default: 6)
+            max_workers (int, optional): Worker processes (default: CPU count; 1 runs in-process)
+            
+        Returns:
+            pd.DataFrame: One row per series and forecast period with the group
+            columns, 'metric', 'method', 'period', 'forecast_date', 'forecast',
+            'lower', 'upper', 'trend_direction', 'observations' and 'rmse'.
+            Series with fewer than min_data_points dates are left out.
+            
+        Raises:
+            ValueError: If a column is missing or a target column is not numeric
+        """
+        group_columns = [group_columns] if isinstance(group_columns, str) else list(group_columns)
+        if target_columns is None:
+            target_columns = [col for col in get_dataset_profile(data).numeric_columns
+                              if col not in group_columns and col != date_column]
+        self._validate_group_columns(data, group_columns, target_columns, date_column)
+        
+        periods = min(periods, self.max_forecast_horizon)
+        series, skipped = self._split_group_series(data, group_columns, target_columns, date_column)
+        
+        workers = max_workers or self.max_workers or os.cpu_count() or 1
+        selections = None
+        if self.selection == BACKTEST:
+            selections = self.select_by_backtest(series, horizon=periods, max_workers=workers)
+        
+        fitted = None
+        if workers > 1 and len(series) >= PARALLEL_MIN_SERIES:
+            fitted = self._forecast_in_pool(series, periods, workers, selections)
+        else:
+            workers = 1
+        if fitted is None:
+            fitted = _forecast_series_chunk(series, periods, self.confidence_level, selections)
+        results, states = fitted
+        self._store_states(states)
+        
+        print(f"✅ Batch forecast: {len(series)} series ({skipped} too short), "
+              f"{periods} periods, {workers} process(es)")
+        return self._forecast_frame(results, states, group_columns, periods)
+    
+    def update(self, new_observations: pd.DataFrame,
+               target_column: str,
+               date_column: str = 'Date',
+               periods: int = 6) -> ForecastResult:
+        """
+        Extend the last analyze_time_series forecast of a column with new observations.
+        
+        The persisted state is advanced over the rows dated after the last
+        observation seen; earlier rows are ignored. The method and parameters
+        chosen at the first fit are kept, so the result equals analyze_time_series
+        on the full history with that method, without re-running the smoothing
+        over it.
+        
+        Args:
+            new_observations (pd.DataFrame): Rows to append (at least the date and target columns)
+            target_column (str): Column forecast by analyze_time_series
+            date_column (str): Date column name (default: 'Date')
+            periods (int): Number of periods to forecast (default: 6)
+            
+        Returns:
+            ForecastResult: Forecast from the advanced state
+            
+        Raises:
+            ValueError: If the column has no forecast state or the new data is invalid
+        """
+        if target_column not in self.states:
+            raise ValueError(f"No forecast state for '{target_column}'; run analyze_time_series first")
+        
+        for col in (target_column, date_column):
+            if col not in new_observations.columns:
+                raise ValueError(f"Column '{col}' not found in data")
+        if not pd.api.types.is_numeric_dtype(new_observations[target_column]):
+            raise ValueError(f"Target column '{target_column}' must be numeric")
+        
+        state = self.states[target_column]
+        ts_data = self._prepare_time_series(new_observations, target_column, date_column)
+        ts_data = ts_data[ts_data.index > state.last_date]
+        
+        state = _advance_states({target_column: state}, {target_column: ts_data})[target_column]
+        self._store_states({target_column: state})
+        
+        periods = min(periods, self.max_forecast_horizon)
+        forecast_result = _forecast_from_states({target_column: state}, periods, self.confidence_level)[target_column]
+        print(f"✅ Forecast updated: {state.method} method, {len(ts_data)} new observations")
+        return forecast_result
+    
+    def update_groups(self, new_observations: pd.DataFrame,
+                      group_columns: Union[str, List[str]],
+                      target_columns: Optional[List[str]] = None,
+                      date_column: str = 'Date',
+                      periods: int = 6) -> pd.DataFrame:
+        """
+        Extend the forecasts of forecast_by_group with new observations.
+        
+        New rows are aggregated the same way as in forecast_by_group and each
+        group × metric state is advanced over the dates after its last
+        observation. Every series with a state is forecast again, whether or
+        not it received new rows; series without one are ignored.
+        
+        Args:
+            new_observations (pd.DataFrame): Rows to append
+            group_columns (str or List[str]): Columns defining the series
+            target_columns (List[str], optional): Columns to update (default: every numeric column)
+            date_column (str): Date column name (default: 'Date')
+            periods (int): Number of periods to forecast (default: 6)
+            
+        Returns:
+            pd.DataFrame: Tidy forecast frame as returned by forecast_by_group
+            
+        Raises:
+            ValueError: If a column is missing or a target column is not numeric
+        """
+        group_columns = [group_columns] if isinstance(group_columns, str) else list(group_columns)
+        if target_columns is None:
+            target_columns = [col for col in get_dataset_profile(new_observations).numeric_columns
+                              if col not in group_columns and col != date_column]
+        self._validate_group_columns(new_observations, group_columns, target_columns, date_column)
+        
+        new_series, _ = self._split_group_series(new_observations, group_columns, target_columns,
+                                                 date_column, min_points=1)
+        keys = [key for key in self.states
+                if isinstance(key, tuple) and len(key) == len(group_columns) + 1 and key[-1] in target_columns]
+        states = {key: self.states[key] for key in keys}
+        new_series = {
+            key: ts_data[ts_data.index > states[key].last_date]
+            for key, ts_data in new_series.items() if key in states
+        }
+        
+        states.update(_advance_states({key: states[key] for key in new_series}, new_series))
+        self._store_states(states)
+        
+        periods = min(periods, self.max_forecast_horizon)
+        results = _forecast_from_states(states, periods, self.confidence_level)
+        print(f"✅ Batch forecast updated: {len(new_series)} of {len(states)} series received new observations")
+        return self._forecast_frame(results, states, group_columns, periods)
+    
+    def _store_states(self, states: Dict[Any, ForecastState]) -> None:
+        """Keep forecast states for updates, evicting the least recently used beyond max_states"""
+        for key, state in states.items():
+            self.states[key] = state
+            self.states.move_to_end(key)
+        while len(self.states) > self.max_states:
+            self.states.popitem(last=False)
+    
+    def select_by_backtest(self, series: Dict[Any, pd.Series],
+                           horizon: int = 6,
+                           time_budget: Optional[float] = None,
+                           max_workers: Optional[int] = None) -> Dict[Any, BacktestSelection]:
+        """
+        Choose a method and parameters per series by rolling-origin backtesting.
+        
+        Each candidate in BACKTEST_CANDIDATES is fitted on the history up to
+        each of backtest_origins origins and scored by mean absolute error
+        on the observations that follow; the lowest mean error wins. Series
+        of a chunk that share a training length are fitted together, and the
+        candidate × chunk tasks run in worker processes when there are enough
+        of them. Tasks still pending when the time budget runs out are
+        dropped: a series is then chosen among the candidates that finished,
+        or by _select_forecasting_method if none did. Selections that
+        evaluated every candidate are cached per series fingerprint.
+        
+        Args:
+            series (Dict[Any, pd.Series]): Date-indexed series to select methods for
+            horizon (int): Periods ahead scored at each origin (shortened for short series)
+            time_budget (float, optional): Seconds available (default: backtest_time_budget)
+            max_workers (int, optional): Worker processes (default: max_workers or CPU count)
+            
+        Returns:
+            Dict[Any, BacktestSelection]: Selection per series key
+        """
+        budget = self.backtest_time_budget if time_budget is None else time_budget
+        deadline = time.time() + budget
+        horizon = max(1, min(horizon, self.max_forecast_horizon))
+        
+        selections = {}
+        windows = {}
+        cache_keys = {}
+        for key, ts_data in series.items():
+            cache_key = (compute_fingerprint(ts_data.to_frame()), horizon, self.backtest_origins)
+            cached = _cached_selection(cache_key)
+            if cached is not None:
+                selections[key] = cached
+                continue
+            
+            window = self._backtest_window(ts_data.to_numpy(dtype=float), horizon)
+            if window is None:
+                selections[key] = self._heuristic_selection(ts_data)
+            else:
+                windows[key] = window
+                cache_keys[key] = cache_key
+        
+        timed_out = 0
+        if windows:
+            errors = self._run_backtests(windows, deadline, max_workers)
+            for key in windows:
+                selection = self._best_candidate(errors.get(key, {}), len(windows[key][1]))
+                if selection is None:
+                    selection = self._heuristic_selection(series[key])
+                if selection.complete:
+                    _store_selection(cache_keys[key], selection)
+                else:
+                    timed_out += 1
+                selections[key] = selection
+
+        print(f"✅ Backtest selection: {len(windows)} of {len(series)} series backtested, "
+              f"{timed_out} cut short by the {budget:g}s budget")
+        return {key: selections[key] for key in series}
+
+    def _backtest_window(self, values: np.ndarray, horizon: int) -> Optional[Tuple[np.ndarray, List[int], int]]:
+        """
+        Rolling origins for one series: non-overlapping test windows ending at the last observation.
+
+        Args:
+            values (np.ndarray): Series values
+            horizon (int): Requested periods ahead per origin
+
+        Returns:
+            Optional[Tuple[np.ndarray, List[int], int]]: Values, training lengths
+            (one per origin) and the horizon used, or None if the series is too
+            short to hold out even one period per origin
+        """
+        min_train = max(self.min_data_points, 4)
+        horizon = min(horizon, (len(values) - min_train) // self.backtest_origins)
+        if horizon < 1:
+            return None
+
+        cuts = [len(values) - horizon * (self.backtest_origins - i) for i in range(self.backtest_origins)]
+        return values, cuts, horizon
+
+    def _run_backtests(self, windows: Dict[Any, Tuple[np.ndarray, List[int], int]],
+                       deadline: float,
+                       max_workers: Optional[int]) -> Dict[Any, Dict[str, float]]:
+        """
+        Score every candidate on every series, stopping at the deadline.
+
+        Args:
+            windows (Dict[Any, Tuple]): Backtest window per series key
+            deadline (float): time.time() by which results must be in
+            max_workers (int, optional): Worker processes
+
+        Returns:
+            Dict[Any, Dict[str, float]]: Mean out-of-sample MAE per series and
+            candidate label, for the tasks that finished in time
+        """
+        keys = list(windows)
+        workers = max_workers or self.max_workers or os.cpu_count() or 1
+        use_pool = workers > 1 and len(keys) * len(BACKTEST_CANDIDATES) >= PARALLEL_MIN_SERIES
+        chunk_count = min(workers, len(keys)) if use_pool else 1
+        chunks = [
+            {keys[i]: windows[keys[i]] for i in positions}
+            for positions in np.array_split(np.arange(len(keys)), chunk_count)
+            if len(positions)
+        ]
+        # Chunk-major, so a budget cut leaves whole series unscored rather
+        # than the same candidates missing everywhere
+        tasks = [(chunk, method, params) for chunk in chunks for method, params in BACKTEST_CANDIDATES]
+
+        errors: Dict[Any, Dict[str, float]] = {key: {} for key in keys}
+
+        def record(method, params, scores):
+            if scores is not None:
+                for key, error in scores.items():
+                    errors[key][candidate_label(method, params)] = error
+
+        if use_pool:
+            try:
+                pool = _process_pool(workers)
+                try:
+                    futures = {
+                        pool.submit(_backtest_candidate, method, params, chunk, deadline): (method, params)
+                        for chunk, method, params in tasks
+                    }
+                    done, _ = wait(futures, timeout=max(0.0, deadline - time.time()))
+                    for future in done:
+                        record(*futures[future], future.result())
+                finally:
+                    # Running tasks check the deadline themselves; nothing to wait for
+                    pool.shutdown(wait=False, cancel_futures=True)
+                return errors
+            except (OSError, RuntimeError) as e:
+                print(f"⚠️ Backtest process pool unavailable ({e}); backtesting in-process")
+
+        for chunk, method, params in tasks:
+            if time.time() > deadline:
+                break
+            record(method, params, _backtest_candidate(method, params, chunk, deadline))
+        return errors
+
+    def _best_candidate(self, errors: Dict[str, float], origins: int) -> Optional[BacktestSelection]:
+        """
+        Pick the candidate with the lowest finite backtest error.
+
+        Args:
+            errors (Dict[str, float]): Mean MAE per candidate label
+            origins (int): Rolling origins evaluated
+
+        Returns:
+            Optional[BacktestSelection]: The selection, or None if no candidate was scored
+        """
+        finite = {label: float(error) for label, error in errors.items() if np.isfinite(error)}
+        if not finite:
+            return None
+
+        best = min(finite, key=finite.get)
+        method, params = _CANDIDATES_BY_LABEL[best]
+        return BacktestSelection(
+            method=method,
+            params=dict(params),
+            errors=finite,
+            origins=origins,
+            complete=len(errors) == len(BACKTEST_CANDIDATES)
+        )
+
+    def _heuristic_selection(self, ts_data: pd.Series) -> BacktestSelection:
+        """Fallback selection from _select_forecasting_method, for series that could not be backtested"""
+        method = self._select_forecasting_method(self._analyze_data_characteristics(ts_data))
+        return BacktestSelection(method=method, params={})
+    
+    def _validate_group_columns(self, data: pd.DataFrame,
+                                group_columns: List[str],
+                                target_columns: List[str],
+                                date_column: str) -> None:
+        """
+        Validate the columns of a batch forecast.
+        
+        Args:
+            data (pd.DataFrame): Input data
+            group_columns (List[str]): Columns defining the series
+            target_columns (List[str]): Columns to forecast
+            date_column (str): Date column name
+            
+        Raises:
+            ValueError: If a column is missing or a target column is not numeric
+        """
+        if not target_columns:
+            raise ValueError("No numeric target columns to forecast")
+        
+        for col in group_columns + target_columns + [date_column]:
+            if col not in data.columns:
+                raise ValueError(f"Column '{col}' not found in data")
+        
+        if date_column in group_columns:
+            raise ValueError(f"Date column '{date_column}' cannot also be a group column")
+        
+        for col in target_columns:
+            if not pd.api.types.is_numeric_dtype(data[col]):
+                raise ValueError(f"Target column '{col}' must be numeric")
+    
+    def _split_group_series(self, data: pd.DataFrame,
+                            group_columns: List[str],
+                            target_columns: List[str],
+                            date_column: str,
+                            min_points: Optional[int] = None) -> Tuple[Dict[tuple, pd.Series], int]:
+        """
+        Split a frame into one date-indexed series per group and target column.
+        
+        Args:
+            data (pd.DataFrame): Input data
+            group_columns (List[str]): Columns defining the series
+            target_columns (List[str]): Columns to forecast
+            date_column (str): Date column name
+            min_points (int, optional): Points a series needs to be kept (default: min_data_points)
+            
+        Returns:
+            Tuple[Dict[tuple, pd.Series], int]: Series keyed by (group values..., target),
+            and the number of series left out for having too few points
+        """
+        min_points = self.min_data_points if min_points is None else min_points
+        frame = data[group_columns + [date_column] + target_columns]
+        if not pd.api.types.is_datetime64_any_dtype(frame[date_column]):
+            frame = frame.assign(**{date_column: pd.to_datetime(frame[date_column])})
+        
+        # One sort-and-sum gives every series, ordered by group then date
+        aggregated = frame.groupby(group_columns + [date_column], observed=True, sort=True)[target_columns].sum(min_count=1)
+        if aggregated.empty:
+            return {}, 0
+        
+        # Each group is one contiguous run of rows
+        group_ids = aggregated.groupby(level=list(range(len(group_columns))), observed=True, sort=False).ngroup().to_numpy()
+        starts = np.flatnonzero(np.r_[True, group_ids[1:] != group_ids[:-1]])
+        ends = np.r_[starts[1:], len(group_ids)]
+        group_keys = aggregated.index.droplevel(-1)[starts]
+        dates = aggregated.index.get_level_values(-1)
+        values = {col: aggregated[col].to_numpy(dtype=float, na_value=np.nan) for col in target_columns}
+        
+        series = {}
+        skipped = 0
+        for group_key, start, end in zip(group_keys, starts, ends):
+            group_key = group_key if isinstance(group_key, tuple) else (group_key,)
+            for col in target_columns:
+                ts_data = pd.Series(values[col][start:end], index=dates[start:end], name=col)
+                if ts_data.hasnans:
+                    ts_data = ts_data.dropna()
+                if len(ts_data) >= min_points:
+                    series[group_key + (col,)] = ts_data
+                else:
+                    skipped += 1
+        return series, skipped
+    
+    def _forecast_in_pool(self, series: Dict[tuple, pd.Series],
+                          periods: int,
+                          workers: int,
+                          selections: Optional[Dict[tuple, BacktestSelection]] = None
+                          ) -> Optional[Tuple[Dict[tuple, ForecastResult], Dict[tuple, ForecastState]]]:
+        """
+        Forecast series in worker processes, one contiguous chunk per worker.
+        
+        Args:
+            series (Dict[tuple, pd.Series]): Series to forecast
+            periods (int): Number of periods to forecast
+            workers (int): Worker processes
+            selections (Dict[tuple, BacktestSelection], optional): Backtested
+                method per series (default: heuristic selection)
+            
+        Returns:
+            Optional[Tuple[Dict, Dict]]: Forecast and state per series key, or
+            None if worker processes are unavailable here
+        """
+        keys = list(series)
+        chunks = [
+            {keys[i]: series[keys[i]] for i in positions}
+            for positions in np.array_split(np.arange(len(keys)), workers)
+            if len(positions)
+        ]
+        try:
+            with _process_pool(workers) as pool:
+                futures = [
+                    pool.submit(_forecast_series_chunk, chunk, periods, self.confidence_level,
+                                None if selections is None else {key: selections[key] for key in chunk})
+                    for chunk in chunks
+                ]
+                results, states = {}, {}
+                for future in futures:
+                    chunk_results, chunk_states = future.result()
+                    results.update(chunk_results)
+                    states.update(chunk_states)
+            return results, states
+        except (OSError, RuntimeError) as e:
+            print(f"⚠️ Forecast process pool unavailable ({e}); forecasting in-process")
+            return None
+    
+    def _forecast_frame(self, results: Dict[tuple, ForecastResult],
+                        states: Dict[tuple, ForecastState],
+                        group_columns: List[str],
+                        periods: int) -> pd.DataFrame:
+        """
+        Lay batch forecast results out as a tidy frame, one row per series and period.
+        
+        Args:
+            results (Dict[tuple, ForecastResult]): Forecast per (group values..., target) key
+            states (Dict[tuple, ForecastState]): State per series key
+            group_columns (List[str]): Columns defining the series
+            periods (int): Number of periods forecast
+            
+        Returns:
+            pd.DataFrame: Tidy forecast frame
+        """
+        keys = list(results)
+        columns = {col: [key[i] for key in keys for _ in range(periods)]
+                   for i, col in enumerate(group_columns)}
+        columns['metric'] = [key[-1] for key in keys for _ in range(periods)]
+        columns['method'] = [results[key].method for key in keys for _ in range(periods)]
+        columns['period'] = np.tile(np.arange(1, periods + 1), len(keys))
+        columns['forecast_date'] = pd.to_datetime([date for key in keys for date in results[key].forecast_dates])
+        for column, attribute in (('forecast', 'forecast_values'),
+                                  ('lower', 'confidence_lower'),
+                                  ('upper', 'confidence_upper')):
+            columns[column] = np.array([value for key in keys for value in getattr(results[key], attribute)],
+                                       dtype=float)
+        columns['trend_direction'] = [results[key].trend_direction for key in keys for _ in range(periods)]
+        columns['observations'] = np.repeat([states[key].observations for key in keys], periods).astype(np.int64)
+        columns['rmse'] = np.repeat([float(results[key].accuracy_metrics['rmse']) for key in keys], periods)
+        return pd.DataFrame(columns)
+    
     def _validate_input_data(self, data: pd.DataFrame, 
                             target_column: str, 
                             date_column: str) -> None:
@@ -195,6 +823,48 @@ class ForecastingAnalyzer:
         
         return characteristics
     
+    @staticmethod
+    def _analyze_batch_characteristics(values: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Characteristics of a stack of equal-length series, one dict per row.
+        
+        Computes the same statistics as _analyze_data_characteristics (trend
+        correlation, sample standard deviation, IQR outliers) with row-wise
+        array reductions, for series that have no missing values.
+        
+        Args:
+            values (np.ndarray): (series, observations) array
+            
+        Returns:
+            List[Dict[str, Any]]: Data characteristics per series
+        """
+        rows, n = values.shape
+        
+        # Row-wise correlation with time, as np.corrcoef(x, row)[0, 1]
+        x_centered = np.arange(n) - (n - 1) / 2
+        centered = values - values.mean(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = (centered @ x_centered) / np.sqrt((x_centered @ x_centered) * (centered ** 2).sum(axis=1))
+        
+        volatility = values.std(axis=1, ddof=1) if n > 1 else np.full(rows, np.nan)
+        
+        q1, q3 = np.quantile(values, [0.25, 0.75], axis=1)
+        iqr = q3 - q1
+        outliers = ((values < (q1 - 1.5 * iqr)[:, np.newaxis]) |
+                    (values > (q3 + 1.5 * iqr)[:, np.newaxis])).sum(axis=1)
+        
+        return [
+            {
+                'length': n,
+                'has_trend': bool(abs(correlation[i]) > 0.3),
+                'has_seasonality': bool(n >= 12),
+                'volatility': volatility[i],
+                'missing_values': 0,
+                'outliers': int(outliers[i])
+            }
+            for i in range(rows)
+        ]
+    
     def _detect_trend(self, ts_data: pd.Series) -> bool:
         """
         Detect if there's a significant trend in the data.
@@ -262,7 +932,8 @@ class ForecastingAnalyzer:
         outliers = ((ts_data < lower_bound) | (ts_data > upper_bound)).sum()
         return outliers
     
-    def _select_forecasting_method(self, characteristics: Dict[str, Any]) -> str:
+    @staticmethod
+    def _select_forecasting_method(characteristics: Dict[str, Any]) -> str:
         """
         Select the best forecasting method based on data characteristics.
         
@@ -285,7 +956,8 @@ class ForecastingAnalyzer:
     def _generate_forecast(self, ts_data: pd.Series, 
                           method: str, 
                           periods: int, 
-                          target_column: str) -> ForecastResult:
+                          target_column: str,
+                          params: Optional[Dict[str, float]] = None) -> ForecastResult:
         """
         Generate forecast using the selected method.
         
@@ -294,6 +966,7 @@ class ForecastingAnalyzer:
             method (str): Forecasting method to use
             periods (int): Number of periods to forecast
             target_column (str): Target column name
+            params (Dict[str, float], optional): Smoothing parameters (alpha, beta)
             
         Returns:
             ForecastResult: Forecast results
@@ -312,9 +985,11 @@ class ForecastingAnalyzer:
         if method == 'linear_regression':
             return linear_regression_forecast(ts_data, periods, target_column, self.confidence_level)
         elif method == 'simple_exponential_smoothing':
-            return simple_exponential_smoothing_forecast(ts_data, periods, target_column, self.confidence_level)
+            return simple_exponential_smoothing_forecast(ts_data, periods, target_column, self.confidence_level,
+                                                         **(params or {}))
         elif method == 'double_exponential_smoothing':
-            return double_exponential_smoothing_forecast(ts_data, periods, target_column, self.confidence_level)
+            return double_exponential_smoothing_forecast(ts_data, periods, target_column, self.confidence_level,
+                                                         **(params or {}))
         elif method == 'seasonal_decomposition':
             return seasonal_forecast(ts_data, periods, target_column, self.confidence_level)
         else:
@@ -373,3 +1048,242 @@ class ForecastingAnalyzer:
             output += "• Seasonal patterns incorporated in forecast\n"
         
         return output
+
+
+_CANDIDATES_BY_LABEL = {candidate_label(method, params): (method, params)
+                        for method, params in BACKTEST_CANDIDATES}
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool whose workers are started with POOL_START_METHOD, never plain fork"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+
+
+def _cached_selection(cache_key: tuple) -> Optional[BacktestSelection]:
+    """Backtest selection cached for a series fingerprint, if any"""
+    with _selections_lock:
+        selection = _selections.get(cache_key)
+        if selection is not None:
+            _selections.move_to_end(cache_key)
+        return selection
+
+
+def _store_selection(cache_key: tuple, selection: BacktestSelection) -> None:
+    """Cache a complete backtest selection, evicting the least recently used"""
+    with _selections_lock:
+        _selections[cache_key] = selection
+        _selections.move_to_end(cache_key)
+        while len(_selections) > MAX_CACHED_SELECTIONS:
+            _selections.popitem(last=False)
+
+
+def _backtest_candidate(method: str,
+                        params: Dict[str, float],
+                        windows: Dict[Any, Tuple[np.ndarray, List[int], int]],
+                        deadline: float) -> Optional[Dict[Any, float]]:
+    """
+    Mean out-of-sample absolute error of one candidate on a chunk of series.
+    
+    Module-level so ForecastingAnalyzer.select_by_backtest can run it in
+    worker processes. (Series, origin) pairs sharing a training length and
+    horizon are fitted as one stack.
+    
+    Args:
+        method (str): Forecasting method name
+        params (Dict[str, float]): Method parameters
+        windows (Dict[Any, Tuple]): Per series key: values, training lengths and horizon
+        deadline (float): time.time() after which the task gives up
+        
+    Returns:
+        Optional[Dict[Any, float]]: Mean MAE per series key, or None if the
+        deadline passed first
+    """
+    from .forecast_methods import forecast_array
+    
+    stacks: Dict[Tuple[int, int], List[Any]] = {}
+    for key, (values, cuts, horizon) in windows.items():
+        for cut in cuts:
+            stacks.setdefault((cut, horizon), []).append(key)
+    
+    totals = dict.fromkeys(windows, 0.0)
+    for (cut, horizon), keys in stacks.items():
+        if time.time() > deadline:
+            return None
+        train = np.vstack([windows[key][0][:cut] for key in keys])
+        actual = np.vstack([windows[key][0][cut:cut + horizon] for key in keys])
+        with warnings.catch_warnings(), np.errstate(all='ignore'):
+            warnings.simplefilter('ignore')
+            forecast = forecast_array(train, horizon, method, **params)
+        for key, error in zip(keys, np.abs(forecast - actual).mean(axis=1)):
+            totals[key] += error
+    return {key: totals[key] / len(windows[key][1]) for key in windows}
+
+
+def _forecast_series_chunk(series: Dict[tuple, pd.Series],
+                           periods: int,
+                           confidence_level: float,
+                           selections: Optional[Dict[tuple, BacktestSelection]] = None
+                           ) -> Tuple[Dict[tuple, ForecastResult], Dict[tuple, ForecastState]]:
+    """
+    Select a method for each series and fit the series batched by method.
+    
+    Module-level so ForecastingAnalyzer.forecast_by_group can run it in
+    worker processes; it takes only the settings it needs, so submitting a
+    chunk does not pickle the analyzer and its stored states.
+    
+    Args:
+        series (Dict[tuple, pd.Series]): Series to forecast
+        periods (int): Number of periods to forecast
+        confidence_level (float): Confidence level for intervals
+        selections (Dict[tuple, BacktestSelection], optional): Backtested
+            method per series (default: heuristic selection)
+        
+    Returns:
+        Tuple[Dict, Dict]: Forecast and state per series key
+    """
+    from .forecast_methods import FORECAST_METHODS
+    
+    choices: Dict[tuple, Tuple[str, Dict[str, float]]] = {}
+    if selections is not None:
+        for key in series:
+            choices[key] = (selections[key].method, selections[key].params)
+    else:
+        # Characteristics are computed for equal-length series together
+        by_length: Dict[int, List[tuple]] = {}
+        for key, ts_data in series.items():
+            by_length.setdefault(len(ts_data), []).append(key)
+        
+        for keys in by_length.values():
+            values = np.vstack([series[key].to_numpy(dtype=float) for key in keys])
+            for key, characteristics in zip(keys, ForecastingAnalyzer._analyze_batch_characteristics(values)):
+                method = ForecastingAnalyzer._select_forecasting_method(characteristics)
+                if method not in FORECAST_METHODS:
+                    method = 'linear_regression'  # Same default as _generate_forecast
+                choices[key] = (method, {})
+    
+    states = _initial_states(series, choices)
+    return _forecast_from_states(states, periods, confidence_level), states
+
+
+def _initial_states(series: Dict[Any, pd.Series],
+                    choices: Dict[Any, Tuple[str, Dict[str, float]]]) -> Dict[Any, ForecastState]:
+    """
+    Forecast state of each series under its chosen method and parameters.
+    
+    Args:
+        series (Dict[Any, pd.Series]): Date-indexed series
+        choices (Dict[Any, Tuple[str, Dict[str, float]]]): (method, parameters) per series key
+        
+    Returns:
+        Dict[Any, ForecastState]: State per series key
+    """
+    from .forecast_methods import FORECAST_METHODS, SMOOTHING_METHODS, smoothing_state
+    
+    states = {}
+    stacks: Dict[Tuple[str, tuple, int], List[Any]] = {}
+    for key, ts_data in series.items():
+        method, params = choices[key]
+        if method not in FORECAST_METHODS:
+            method, params = 'linear_regression', {}  # Same default as _generate_forecast
+        states[key] = ForecastState(
+            method=method,
+            params=dict(params),
+            last_date=ts_data.index[-1],
+            last_value=float(ts_data.iloc[-1]),
+            observations=len(ts_data),
+            history=None if method in SMOOTHING_METHODS else ts_data
+        )
+        if method in SMOOTHING_METHODS:
+            stacks.setdefault((method, tuple(sorted(params.items())), len(ts_data)), []).append(key)
+    
+    # Equal-length series sharing a method are smoothed as one stack
+    for (method, params, _), keys in stacks.items():
+        values = np.vstack([series[key].to_numpy(dtype=float) for key in keys])
+        _unstack_smoothing(states, keys, smoothing_state(values, method, **dict(params)))
+    return states
+
+
+def _advance_states(states: Dict[Any, ForecastState],
+                    new_series: Dict[Any, pd.Series]) -> Dict[Any, ForecastState]:
+    """
+    Advance forecast states over new observations.
+    
+    Args:
+        states (Dict[Any, ForecastState]): Current state per series key
+        new_series (Dict[Any, pd.Series]): Observations after each state's last date
+        
+    Returns:
+        Dict[Any, ForecastState]: Advanced states (the inputs are not modified)
+    """
+    from .forecast_methods import SMOOTHING_METHODS, advance_smoothing_state
+    
+    advanced = {}
+    stacks: Dict[Tuple[str, tuple, int], List[Any]] = {}
+    for key, state in states.items():
+        ts_data = new_series[key]
+        if ts_data.empty:
+            advanced[key] = state
+            continue
+        advanced[key] = ForecastState(
+            method=state.method,
+            params=state.params,
+            last_date=ts_data.index[-1],
+            last_value=float(ts_data.iloc[-1]),
+            observations=state.observations + len(ts_data),
+            smoothing=state.smoothing,
+            history=None if state.history is None else pd.concat([state.history, ts_data])
+        )
+        if state.method in SMOOTHING_METHODS:
+            stacks.setdefault((state.method, tuple(sorted(state.params.items())), len(ts_data)), []).append(key)
+    
+    for (method, params, _), keys in stacks.items():
+        values = np.vstack([new_series[key].to_numpy(dtype=float) for key in keys])
+        smoothing = advance_smoothing_state(_stack_smoothing(states, keys), values, method, **dict(params))
+        _unstack_smoothing(advanced, keys, smoothing)
+    return advanced
+
+
+def _forecast_from_states(states: Dict[Any, ForecastState],
+                          periods: int,
+                          confidence_level: float) -> Dict[Any, ForecastResult]:
+    """
+    Forecast each series from its state, batched by method and parameters.
+    
+    Args:
+        states (Dict[Any, ForecastState]): State per series key
+        periods (int): Number of periods to forecast
+        confidence_level (float): Confidence level for intervals
+        
+    Returns:
+        Dict[Any, ForecastResult]: Forecast per series key, in the order of states
+    """
+    from .forecast_methods import SMOOTHING_METHODS, batch_forecast, smoothing_results_from_state
+    
+    by_method: Dict[Tuple[str, tuple], List[Any]] = {}
+    for key, state in states.items():
+        by_method.setdefault((state.method, tuple(sorted(state.params.items()))), []).append(key)
+    
+    results = {}
+    for (method, params), keys in by_method.items():
+        if method in SMOOTHING_METHODS:
+            last_points = [(states[key].last_date, states[key].last_value) for key in keys]
+            results.update(zip(keys, smoothing_results_from_state(
+                _stack_smoothing(states, keys), last_points, periods, confidence_level, method, **dict(params)
+            )))
+        else:
+            results.update(batch_forecast({key: states[key].history for key in keys},
+                                          periods, method, confidence_level, **dict(params)))
+    return {key: results[key] for key in states}
+
+
+def _stack_smoothing(states: Dict[Any, ForecastState], keys: List[Any]) -> Dict[str, np.ndarray]:
+    """Smoothing states of the given series as arrays, one row per key"""
+    return {name: np.array([states[key].smoothing[name] for key in keys])
+            for name in states[keys[0]].smoothing}
+
+
+def _unstack_smoothing(states: Dict[Any, ForecastState], keys: List[Any],
+                       smoothing: Dict[str, np.ndarray]) -> None:
+    """Store per-row smoothing arrays on the states of the given series"""
+    for i, key in enumerate(keys):
+        states[key].smoothing = {name: values[i].item() for name, values in smoothing.items()}
@@ -10,6 +10,11 @@ Methods Implemented:
 - Double Exponential Smoothing (Holt's method)
 - Seasonal Decomposition Forecasting
 
+Every method is implemented once over a 2-D array of equal-length series
+(exponential smoothing as a vectorised linear recurrence rather than a loop
+over observations), so batch_forecast can fit many series at once and the
+single-series functions are the one-row case.
+
 Author: AI Assistant
 Date: July 2025
 Phase: 3B - Advanced Analytics Core
@@ -18,7 +23,8 @@ Phase: 3B - Advanced Analytics Core
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Optional, Tuple, Any, Union
 from .forecast_analyzer import ForecastResult
 
 
@@ -41,61 +47,7 @@ def linear_regression_forecast(ts_data: pd.Series,
     Returns:
         ForecastResult: Forecast results with linear trend
     """
-    # Prepare data for linear regression
-    n = len(ts_data)
-    x = np.arange(n)
-    y = ts_data.values
-    
-    # Calculate linear regression coefficients
-    slope, intercept = np.polyfit(x, y, 1)
-    
-    # Generate forecast values
-    forecast_x = np.arange(n, n + periods)
-    forecast_values = [slope * xi + intercept for xi in forecast_x]
-    
-    # Calculate residuals for confidence intervals
-    fitted_values = slope * x + intercept
-    residuals = y - fitted_values
-    residual_std = np.std(residuals)
-    
-    # Calculate confidence intervals
-    z_score = 1.96 if confidence_level == 0.95 else 2.576  # 95% or 99%
-    margin_of_error = z_score * residual_std
-    
-    confidence_upper = [val + margin_of_error for val in forecast_values]
-    confidence_lower = [val - margin_of_error for val in forecast_values]
-    
-    # Generate forecast dates
-    last_date = ts_data.index[-1]
-    forecast_dates = _generate_forecast_dates(last_date, periods)
-    
-    # Calculate accuracy metrics
-    r_squared = _calculate_r_squared(y, fitted_values)
-    mae = _calculate_mae(y, fitted_values)
-    rmse = _calculate_rmse(y, fitted_values)
-    
-    accuracy_metrics = {
-        'r_squared': r_squared,
-        'mae': mae,
-        'rmse': rmse,
-        'method_confidence': 'high' if r_squared > 0.7 else 'medium' if r_squared > 0.4 else 'low'
-    }
-    
-    # Determine trend direction
-    trend_direction = 'increasing' if slope > 0 else 'decreasing' if slope < 0 else 'stable'
-    
-    return ForecastResult(
-        method='Linear Regression',
-        forecast_values=forecast_values,
-        forecast_dates=forecast_dates,
-        confidence_upper=confidence_upper,
-        confidence_lower=confidence_lower,
-        accuracy_metrics=accuracy_metrics,
-        seasonal_detected=False,
-        trend_direction=trend_direction,
-        last_actual_value=float(ts_data.iloc[-1]),
-        forecast_horizon=periods
-    )
+    return _linear_regression_results([ts_data], _stack([ts_data]), periods, confidence_level)[0]
 
 
 def simple_exponential_smoothing_forecast(ts_data: pd.Series, 
@@ -119,58 +71,8 @@ def simple_exponential_smoothing_forecast(ts_data: pd.Series,
     Returns:
         ForecastResult: Forecast results with exponential smoothing
     """
-    values = ts_data.values
-    n = len(values)
-    
-    # Initialize smoothed values
-    smoothed = np.zeros(n)
-    smoothed[0] = values[0]
-    
-    # Apply exponential smoothing
-    for i in range(1, n):
-        smoothed[i] = alpha * values[i] + (1 - alpha) * smoothed[i-1]
-    
-    # Forecast future values (constant at last smoothed value)
-    last_smoothed = smoothed[-1]
-    forecast_values = [last_smoothed] * periods
-    
-    # Calculate residuals and confidence intervals
-    residuals = values - smoothed
-    residual_std = np.std(residuals)
-    
-    z_score = 1.96 if confidence_level == 0.95 else 2.576
-    margin_of_error = z_score * residual_std
-    
-    confidence_upper = [val + margin_of_error for val in forecast_values]
-    confidence_lower = [val - margin_of_error for val in forecast_values]
-    
-    # Generate forecast dates
-    last_date = ts_data.index[-1]
-    forecast_dates = _generate_forecast_dates(last_date, periods)
-    
-    # Calculate accuracy metrics
-    mae = _calculate_mae(values, smoothed)
-    rmse = _calculate_rmse(values, smoothed)
-    
-    accuracy_metrics = {
-        'mae': mae,
-        'rmse': rmse,
-        'alpha': alpha,
-        'method_confidence': 'medium'
-    }
-    
-    return ForecastResult(
-        method='Simple Exponential Smoothing',
-        forecast_values=forecast_values,
-        forecast_dates=forecast_dates,
-        confidence_upper=confidence_upper,
-        confidence_lower=confidence_lower,
-        accuracy_metrics=accuracy_metrics,
-        seasonal_detected=False,
-        trend_direction='stable',
-        last_actual_value=float(ts_data.iloc[-1]),
-        forecast_horizon=periods
-    )
+    return _simple_smoothing_results([ts_data], _stack([ts_data]), periods, confidence_level,
+                                     alpha=alpha)[0]
 
 
 def double_exponential_smoothing_forecast(ts_data: pd.Series, 
@@ -196,72 +98,8 @@ def double_exponential_smoothing_forecast(ts_data: pd.Series,
     Returns:
         ForecastResult: Forecast results with trend smoothing
     """
-    values = ts_data.values
-    n = len(values)
-    
-    # Initialize level and trend
-    level = values[0]
-    trend = values[1] - values[0] if n > 1 else 0
-    
-    # Store smoothed values for error calculation
-    smoothed = np.zeros(n)
-    smoothed[0] = level
-    
-    # Apply double exponential smoothing
-    for i in range(1, n):
-        prev_level = level
-        level = alpha * values[i] + (1 - alpha) * (level + trend)
-        trend = beta * (level - prev_level) + (1 - beta) * trend
-        smoothed[i] = level
-    
-    # Generate forecast values
-    forecast_values = []
-    for h in range(1, periods + 1):
-        forecast_val = level + h * trend
-        forecast_values.append(forecast_val)
-    
-    # Calculate residuals and confidence intervals
-    residuals = values - smoothed
-    residual_std = np.std(residuals)
-    
-    z_score = 1.96 if confidence_level == 0.95 else 2.576
-    margin_of_error = z_score * residual_std
-    
-    confidence_upper = [val + margin_of_error for val in forecast_values]
-    confidence_lower = [val - margin_of_error for val in forecast_values]
-    
-    # Generate forecast dates
-    last_date = ts_data.index[-1]
-    forecast_dates = _generate_forecast_dates(last_date, periods)
-    
-    # Calculate accuracy metrics
-    mae = _calculate_mae(values, smoothed)
-    rmse = _calculate_rmse(values, smoothed)
-    
-    accuracy_metrics = {
-        'mae': mae,
-        'rmse': rmse,
-        'alpha': alpha,
-        'beta': beta,
-        'final_trend': trend,
-        'method_confidence': 'high' if abs(trend) > 0.1 else 'medium'
-    }
-    
-    # Determine trend direction
-    trend_direction = 'increasing' if trend > 0 else 'decreasing' if trend < 0 else 'stable'
-    
-    return ForecastResult(
-        method='Double Exponential Smoothing',
-        forecast_values=forecast_values,
-        forecast_dates=forecast_dates,
-        confidence_upper=confidence_upper,
-        confidence_lower=confidence_lower,
-        accuracy_metrics=accuracy_metrics,
-        seasonal_detected=False,
-        trend_direction=trend_direction,
-        last_actual_value=float(ts_data.iloc[-1]),
-        forecast_horizon=periods
-    )
+    return _double_smoothing_results([ts_data], _stack([ts_data]), periods, confidence_level,
+                                     alpha=alpha, beta=beta)[0]
 
 
 def seasonal_forecast(ts_data: pd.Series, 
@@ -283,69 +121,565 @@ def seasonal_forecast(ts_data: pd.Series,
     Returns:
         ForecastResult: Forecast results with seasonal patterns
     """
-    values = ts_data.values
-    n = len(values)
+    return _seasonal_results([ts_data], _stack([ts_data]), periods, confidence_level)[0]
+
+
+def batch_forecast(series: Union[Mapping[Any, pd.Series], Sequence[pd.Series]],
+                   periods: int,
+                   method: str = 'simple_exponential_smoothing',
+                   confidence_level: float = 0.95,
+                   **params) -> Union[Dict[Any, ForecastResult], List[ForecastResult]]:
+    """
+    Forecast many series at once with one method.
+    
+    Series of equal length are stacked into a 2-D array and fitted together,
+    so the cost per series is a few array operations rather than a Python
+    loop over its observations. Each result equals what the single-series
+    function returns for that series.
+    
+    Args:
+        series (Mapping or Sequence of pd.Series): Series to forecast, each
+            with a date index
+        periods (int): Number of periods to forecast
+        method (str): One of FORECAST_METHODS (the names used by
+            ForecastingAnalyzer._select_forecasting_method)
+        confidence_level (float): Confidence level for intervals
+        **params: Method parameters (alpha, beta)
+        
+    Returns:
+        Dict[Any, ForecastResult] keyed like `series` if it is a mapping,
+        otherwise List[ForecastResult] in input order
+        
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"Unknown forecasting method '{method}'")
+    
+    keyed = series if isinstance(series, Mapping) else dict(enumerate(series))
+    
+    # Group keys by series length so each group stacks into one array
+    by_length: Dict[int, List[Any]] = {}
+    for key, ts_data in keyed.items():
+        by_length.setdefault(len(ts_data), []).append(key)
+    
+    results = {}
+    for keys in by_length.values():
+        group = [keyed[key] for key in keys]
+        group_results = FORECAST_METHODS[method](group, _stack(group), periods, confidence_level, **params)
+        results.update(zip(keys, group_results))
+    
+    if isinstance(series, Mapping):
+        return {key: results[key] for key in keyed}
+    return [results[position] for position in range(len(keyed))]
+
+
+# Vectorised method implementations
+#
+# Each method has a fit, which takes a (series, observations) array and
+# returns the forecast and in-sample fitted values (plus method-specific
+# arrays), and a results function that turns a fit into one ForecastResult
+# per series.
+
+def _fit_linear_regression(values: np.ndarray, periods: int) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """Linear trend fit for a stack of equal-length series."""
+    n = values.shape[1]
+    x = np.arange(n)
+    
+    # One least-squares solve for every series
+    slope, intercept = np.polyfit(x, values.T, 1)
+    fitted = slope[:, np.newaxis] * x + intercept[:, np.newaxis]
+    forecast = slope[:, np.newaxis] * np.arange(n, n + periods) + intercept[:, np.newaxis]
+    return forecast, fitted, {'slope': slope}
+
+
+def _fit_simple_smoothing(values: np.ndarray, periods: int,
+                          alpha: float = 0.3) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """Simple exponential smoothing fit for a stack of equal-length series."""
+    smoothed = _smooth_simple(values, alpha)
+    
+    # Forecast future values (constant at last smoothed value)
+    forecast = np.repeat(smoothed[:, -1:], periods, axis=1)
+    return forecast, smoothed, {}
+
+
+def _fit_double_smoothing(values: np.ndarray, periods: int,
+                          alpha: float = 0.3, beta: float = 0.1) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """Holt's double exponential smoothing fit for a stack of equal-length series."""
+    levels, trends = _smooth_double(values, alpha, beta)
+    final_trend = trends[:, -1]
+    
+    forecast = levels[:, -1:] + np.arange(1, periods + 1) * final_trend[:, np.newaxis]
+    return forecast, levels, {'final_trend': final_trend}
+
+
+def _fit_seasonal(values: np.ndarray, periods: int) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """Seasonal decomposition fit for a stack of equal-length series."""
+    n = values.shape[1]
     
     # Simple seasonal decomposition (assuming monthly data)
     season_length = min(12, n // 2)  # Adaptive season length
     
-    # Calculate seasonal components
     seasonal_pattern = _calculate_seasonal_pattern(values, season_length)
-    
-    # Deseasonalize data
     deseasonalized = _deseasonalize_data(values, seasonal_pattern, season_length)
     
-    # Forecast trend component using linear regression
+    # Forecast the trend component and add the seasonal pattern back
     trend_forecast = _forecast_trend(deseasonalized, periods)
+    forecast = trend_forecast + seasonal_pattern[:, np.arange(periods) % season_length]
+    fitted = deseasonalized + seasonal_pattern[:, np.arange(n) % season_length]
+    return forecast, fitted, {'seasonal_pattern': seasonal_pattern}
+
+
+def _linear_regression_results(series_list: List[pd.Series], values: np.ndarray,
+                               periods: int, confidence_level: float) -> List[ForecastResult]:
+    """Linear regression forecasts for a stack of equal-length series."""
+    forecast, fitted, extras = _fit_linear_regression(values, periods)
+    
+    r_squared = _calculate_r_squared(values, fitted)
+    mae = _calculate_mae(values, fitted)
+    rmse = _calculate_rmse(values, fitted)
+    
+    accuracy_metrics = [
+        {
+            'r_squared': r_squared[i],
+            'mae': mae[i],
+            'rmse': rmse[i],
+            'method_confidence': 'high' if r_squared[i] > 0.7 else 'medium' if r_squared[i] > 0.4 else 'low'
+        }
+        for i in range(len(series_list))
+    ]
+    
+    return _build_results(
+        _last_points(series_list), 'Linear Regression', forecast,
+        _margin_of_error(values, fitted, confidence_level), accuracy_metrics,
+        seasonal_detected=False, trend_directions=_trend_directions(extras['slope'])
+    )
+
+
+def _simple_smoothing_results(series_list: List[pd.Series], values: np.ndarray,
+                              periods: int, confidence_level: float,
+                              alpha: float = 0.3) -> List[ForecastResult]:
+    """Simple exponential smoothing forecasts for a stack of equal-length series."""
+    state = smoothing_state(values, 'simple_exponential_smoothing', alpha=alpha)
+    return smoothing_results_from_state(state, _last_points(series_list), periods, confidence_level,
+                                        'simple_exponential_smoothing', alpha=alpha)
+
+
+def _double_smoothing_results(series_list: List[pd.Series], values: np.ndarray,
+                              periods: int, confidence_level: float,
+                              alpha: float = 0.3, beta: float = 0.1) -> List[ForecastResult]:
+    """Holt's double exponential smoothing forecasts for a stack of equal-length series."""
+    state = smoothing_state(values, 'double_exponential_smoothing', alpha=alpha, beta=beta)
+    return smoothing_results_from_state(state, _last_points(series_list), periods, confidence_level,
+                                        'double_exponential_smoothing', alpha=alpha, beta=beta)
+
+
+def _seasonal_results(series_list: List[pd.Series], values: np.ndarray,
+                      periods: int, confidence_level: float) -> List[ForecastResult]:
+    """Seasonal decomposition forecasts for a stack of equal-length series."""
+    forecast, fitted, extras = _fit_seasonal(values, periods)
+    
+    mae = _calculate_mae(values, fitted)
+    rmse = _calculate_rmse(values, fitted)
+    seasonal_strength = np.std(extras['seasonal_pattern'], axis=-1)
+    
+    accuracy_metrics = [
+        {
+            'mae': mae[i],
+            'rmse': rmse[i],
+            'seasonal_strength': seasonal_strength[i],
+            'method_confidence': 'high'
+        }
+        for i in range(len(series_list))
+    ]
+    
+    return _build_results(
+        _last_points(series_list), 'Seasonal Decomposition', forecast,
+        _margin_of_error(values, fitted, confidence_level), accuracy_metrics,
+        seasonal_detected=True, trend_directions=['seasonal'] * len(series_list)
+    )
+
+
+# Method name (as chosen by ForecastingAnalyzer) -> vectorised implementation
+FORECAST_METHODS = {
+    'linear_regression': _linear_regression_results,
+    'simple_exponential_smoothing': _simple_smoothing_results,
+    'double_exponential_smoothing': _double_smoothing_results,
+    'seasonal_decomposition': _seasonal_results,
+}
+
+# Method name -> fit returning (forecast, fitted, extras)
+_METHOD_FITS = {
+    'linear_regression': _fit_linear_regression,
+    'simple_exponential_smoothing': _fit_simple_smoothing,
+    'double_exponential_smoothing': _fit_double_smoothing,
+    'seasonal_decomposition': _fit_seasonal,
+}
+
+
+# Exponential smoothing state
+#
+# Smoothing is causal: a fitted value depends only on earlier observations,
+# so the final level and trend plus running sums of the residuals describe a
+# fit completely. Appending observations advances that state and gives the
+# same forecast, band and error metrics as refitting the whole history.
+
+SMOOTHING_METHODS = ('simple_exponential_smoothing', 'double_exponential_smoothing')
+
+
+def smoothing_state(values: np.ndarray, method: str,
+                    alpha: float = 0.3, beta: float = 0.1) -> Dict[str, np.ndarray]:
+    """
+    Final smoothing state of each row of a (series, observations) array.
+    
+    Args:
+        values (np.ndarray): Observations, one series per row
+        method (str): One of SMOOTHING_METHODS
+        alpha (float): Level smoothing parameter
+        beta (float): Trend smoothing parameter (double smoothing only)
+        
+    Returns:
+        Dict[str, np.ndarray]: Per-row 'level', 'trend', 'observations' and
+        residual sums ('residual_sum', 'residual_square_sum', 'residual_abs_sum')
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    if method == 'simple_exponential_smoothing':
+        smoothed = _smooth_simple(values, alpha)
+        trend = np.zeros(len(values))
+    else:
+        smoothed, trends = _smooth_double(values, alpha, beta)
+        trend = trends[:, -1]
     
-    # Add seasonal pattern to trend forecast
-    forecast_values = []
-    for i in range(periods):
-        seasonal_index = i % season_length
-        seasonal_factor = seasonal_pattern[seasonal_index]
-        forecast_val = trend_forecast[i] + seasonal_factor
-        forecast_values.append(forecast_val)
+    residuals = values - smoothed
+    return {
+        'level': smoothed[:, -1],
+        'trend': trend,
+        'observations': np.full(len(values), values.shape[1]),
+        'residual_sum': residuals.sum(axis=1),
+        'residual_square_sum': (residuals ** 2).sum(axis=1),
+        'residual_abs_sum': np.abs(residuals).sum(axis=1),
+    }
+
+
+def advance_smoothing_state(state: Dict[str, np.ndarray], new_values: np.ndarray, method: str,
+                            alpha: float = 0.3, beta: float = 0.1) -> Dict[str, np.ndarray]:
+    """
+    Advance smoothing states over newly appended observations.
     
-    # Calculate confidence intervals
-    residuals = values - (deseasonalized + np.tile(seasonal_pattern, n // season_length + 1)[:n])
-    residual_std = np.std(residuals)
+    Args:
+        state (Dict[str, np.ndarray]): States from smoothing_state (or a previous advance)
+        new_values (np.ndarray): New observations, one equal-length row per state
+        method (str): One of SMOOTHING_METHODS
+        alpha (float): Level smoothing parameter
+        beta (float): Trend smoothing parameter (double smoothing only)
+        
+    Returns:
+        Dict[str, np.ndarray]: The advanced states (the input is not modified)
+    """
+    new_values = np.atleast_2d(np.asarray(new_values, dtype=float))
+    rows, added = new_values.shape
+    
+    # Position 0 holds the carried state, positions 1.. the new inputs
+    if method == 'simple_exponential_smoothing':
+        states = np.empty((1, rows, added + 1))
+        states[0, :, 1:] = alpha * new_values
+        transition = np.array([[1 - alpha]])
+    else:
+        states = np.empty((2, rows, added + 1))
+        states[0, :, 1:] = alpha * new_values
+        states[1, :, 1:] = (alpha * beta) * new_values
+        states[1, :, 0] = state['trend']
+        transition = np.array([
+            [1 - alpha, 1 - alpha],
+            [-alpha * beta, 1 - alpha * beta],
+        ])
+    states[0, :, 0] = state['level']
+    _linear_recurrence(transition, states)
+    
+    residuals = new_values - states[0, :, 1:]
+    return {
+        'level': states[0, :, -1],
+        'trend': states[1, :, -1] if method != 'simple_exponential_smoothing' else state['trend'],
+        'observations': state['observations'] + added,
+        'residual_sum': state['residual_sum'] + residuals.sum(axis=1),
+        'residual_square_sum': state['residual_square_sum'] + (residuals ** 2).sum(axis=1),
+        'residual_abs_sum': state['residual_abs_sum'] + np.abs(residuals).sum(axis=1),
+    }
+
+
+def smoothing_results_from_state(state: Dict[str, np.ndarray],
+                                 last_points: List[Tuple[Any, float]],
+                                 periods: int,
+                                 confidence_level: float,
+                                 method: str,
+                                 alpha: float = 0.3,
+                                 beta: float = 0.1) -> List[ForecastResult]:
+    """
+    Forecast results of smoothing states, one per row.
+    
+    Args:
+        state (Dict[str, np.ndarray]): States from smoothing_state or advance_smoothing_state
+        last_points (List[Tuple[Any, float]]): Last date and value of each series
+        periods (int): Number of periods to forecast
+        confidence_level (float): Confidence level for intervals
+        method (str): One of SMOOTHING_METHODS
+        alpha (float): Level smoothing parameter
+        beta (float): Trend smoothing parameter (double smoothing only)
+        
+    Returns:
+        List[ForecastResult]: One result per row
+    """
+    count = state['observations']
+    mae = state['residual_abs_sum'] / count
+    mean_square = state['residual_square_sum'] / count
+    rmse = np.sqrt(mean_square)
+    residual_std = np.sqrt(np.maximum(mean_square - (state['residual_sum'] / count) ** 2, 0))
     
     z_score = 1.96 if confidence_level == 0.95 else 2.576
-    margin_of_error = z_score * residual_std
+    margins = z_score * residual_std
+    level, trend = state['level'], state['trend']
+    
+    if method == 'simple_exponential_smoothing':
+        # Forecast future values (constant at last smoothed value)
+        forecast = np.repeat(level[:, np.newaxis], periods, axis=1)
+        accuracy_metrics = [
+            {
+                'mae': mae[i],
+                'rmse': rmse[i],
+                'alpha': alpha,
+                'method_confidence': 'medium'
+            }
+            for i in range(len(level))
+        ]
+        return _build_results(
+            last_points, 'Simple Exponential Smoothing', forecast, margins, accuracy_metrics,
+            seasonal_detected=False, trend_directions=['stable'] * len(level)
+        )
+    
+    forecast = level[:, np.newaxis] + np.arange(1, periods + 1) * trend[:, np.newaxis]
+    accuracy_metrics = [
+        {
+            'mae': mae[i],
+            'rmse': rmse[i],
+            'alpha': alpha,
+            'beta': beta,
+            'final_trend': trend[i],
+            'method_confidence': 'high' if abs(trend[i]) > 0.1 else 'medium'
+        }
+        for i in range(len(level))
+    ]
+    return _build_results(
+        last_points, 'Double Exponential Smoothing', forecast, margins, accuracy_metrics,
+        seasonal_detected=False, trend_directions=_trend_directions(trend)
+    )
+
+
+def forecast_array(values: np.ndarray, periods: int,
+                   method: str = 'simple_exponential_smoothing', **params) -> np.ndarray:
+    """
+    Point forecasts for a stack of equal-length series, as a bare array.
+    
+    The same fit batch_forecast uses, without confidence bands, metrics or
+    dates; meant for backtesting, where only the forecast values are
+    compared with held-out observations.
+    
+    Args:
+        values (np.ndarray): (series, observations) array, or one series
+        periods (int): Number of periods to forecast
+        method (str): One of FORECAST_METHODS
+        **params: Method parameters (alpha, beta)
+        
+    Returns:
+        np.ndarray: (series, periods) forecasts
+        
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in _METHOD_FITS:
+        raise ValueError(f"Unknown forecasting method '{method}'")
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    return _METHOD_FITS[method](values, periods, **params)[0]
+
+
+# Helper functions for forecasting methods
+
+def _stack(series_list: List[pd.Series]) -> np.ndarray:
+    """Stack equal-length series into a float (series, observations) array."""
+    return np.vstack([ts_data.to_numpy(dtype=float) for ts_data in series_list])
+
+
+def _last_points(series_list: List[pd.Series]) -> List[Tuple[Any, float]]:
+    """Last date and value of each series."""
+    return [(ts_data.index[-1], ts_data.iloc[-1]) for ts_data in series_list]
+
+
+def _margin_of_error(values: np.ndarray, fitted: np.ndarray, confidence_level: float) -> np.ndarray:
+    """Half-width of the confidence band for each series, from its residual spread."""
+    z_score = 1.96 if confidence_level == 0.95 else 2.576  # 95% or 99%
+    return z_score * np.std(values - fitted, axis=-1)
+
+
+def _trend_directions(slopes: np.ndarray) -> List[str]:
+    """Map trend slopes to 'increasing', 'decreasing' or 'stable'."""
+    return ['increasing' if slope > 0 else 'decreasing' if slope < 0 else 'stable' for slope in slopes]
+
+
+def _build_results(last_points: List[Tuple[Any, float]],
+                   method: str,
+                   forecast: np.ndarray,
+                   margins: np.ndarray,
+                   accuracy_metrics: List[Dict[str, Any]],
+                   seasonal_detected: bool,
+                   trend_directions: List[str]) -> List[ForecastResult]:
+    """
+    Package per-series forecast rows as ForecastResult objects.
     
-    confidence_upper = [val + margin_of_error for val in forecast_values]
-    confidence_lower = [val - margin_of_error for val in forecast_values]
+    Args:
+        last_points (List[Tuple[Any, float]]): Last date and value of each series
+        method (str): Display name of the method
+        forecast (np.ndarray): Forecast values, shape (series, periods)
+        margins (np.ndarray): Confidence half-width per series
+        accuracy_metrics (List[Dict[str, Any]]): Metrics per series
+        seasonal_detected (bool): Whether the method models seasonality
+        trend_directions (List[str]): Trend label per series
+        
+    Returns:
+        List[ForecastResult]: One result per series
+    """
+    periods = forecast.shape[1]
+    upper = forecast + margins[:, np.newaxis]
+    lower = forecast - margins[:, np.newaxis]
     
-    # Generate forecast dates
-    last_date = ts_data.index[-1]
-    forecast_dates = _generate_forecast_dates(last_date, periods)
+    # Series grouped together usually share their last date
+    dates_by_last_date: Dict[Any, List[str]] = {}
     
-    # Calculate accuracy metrics
-    mae = _calculate_mae(values, deseasonalized + np.tile(seasonal_pattern, n // season_length + 1)[:n])
-    rmse = _calculate_rmse(values, deseasonalized + np.tile(seasonal_pattern, n // season_length + 1)[:n])
+    results = []
+    for i, (last_date, last_value) in enumerate(last_points):
+        if last_date not in dates_by_last_date:
+            dates_by_last_date[last_date] = _generate_forecast_dates(last_date, periods)
+        
+        results.append(ForecastResult(
+            method=method,
+            forecast_values=forecast[i].tolist(),
+            forecast_dates=list(dates_by_last_date[last_date]),
+            confidence_upper=upper[i].tolist(),
+            confidence_lower=lower[i].tolist(),
+            accuracy_metrics=accuracy_metrics[i],
+            seasonal_detected=seasonal_detected,
+            trend_direction=trend_directions[i],
+            last_actual_value=float(last_value),
+            forecast_horizon=periods
+        ))
+    return results
+
+
+# Observations stepped through together by _linear_recurrence
+RECURRENCE_BLOCK = 64
+
+
+def _linear_recurrence(transition: np.ndarray, states: np.ndarray,
+                       block: int = RECURRENCE_BLOCK) -> np.ndarray:
+    """
+    Solve s[t] = transition @ s[t-1] + u[t] along the last axis, in place.
     
-    accuracy_metrics = {
-        'mae': mae,
-        'rmse': rmse,
-        'seasonal_strength': np.std(seasonal_pattern),
-        'method_confidence': 'high'
-    }
+    Exponential smoothing is a linear recurrence, so rather than stepping
+    through every observation the time axis is cut into blocks: all blocks
+    (of every series) are stepped through together from a zero carry, the
+    true state at each block end is solved as the same recurrence over
+    blocks (with transition^block), and each block then adds
+    transition^(j+1) times the previous block's end state. That is about
+    2 * sqrt(n) array steps plus O(n) work, and gives the recursive result up
+    to floating-point rounding.
     
-    return ForecastResult(
-        method='Seasonal Decomposition',
-        forecast_values=forecast_values,
-        forecast_dates=forecast_dates,
-        confidence_upper=confidence_upper,
-        confidence_lower=confidence_lower,
-        accuracy_metrics=accuracy_metrics,
-        seasonal_detected=True,
-        trend_direction='seasonal',
-        last_actual_value=float(ts_data.iloc[-1]),
-        forecast_horizon=periods
-    )
+    Args:
+        transition (np.ndarray): (size, size) state transition matrix
+        states (np.ndarray): (size, series, n) array holding the initial
+            state at t=0 and the input u[t] for t >= 1
+        block (int): Observations stepped through together per block
+        
+    Returns:
+        np.ndarray: The same array, now holding s[t]
+    """
+    transition = np.asarray(transition, dtype=float)
+    size, rows, n = states.shape
+    
+    if n <= block:
+        stepped = np.ascontiguousarray(states.transpose(0, 2, 1))
+        _step_recurrence(transition, stepped)
+        states[...] = stepped.transpose(0, 2, 1)
+        return states
+    
+    # Time-major blocks, (size, block, series, blocks), so each step touches
+    # contiguous memory; the tail of the last block is zero padding
+    full, remainder = divmod(n, block)
+    blocks = full + (1 if remainder else 0)
+    local = np.zeros((size, block, rows, blocks))
+    by_time = local.transpose(0, 2, 3, 1)
+    by_time[:, :, :full] = states[..., :full * block].reshape(size, rows, full, block)
+    if remainder:
+        by_time[:, :, full, :remainder] = states[..., full * block:]
+    
+    # Every block from a zero carry
+    _step_recurrence(transition, local.reshape(size, block, rows * blocks))
+    
+    # True block-end states: E[b] = local_end[b] + transition^block @ E[b-1]
+    ends = local[:, -1].copy()
+    _linear_recurrence(np.linalg.matrix_power(transition, block), ends, block)
+    
+    # Carry each block's incoming state: local[j, b] += transition^(j+1) @ E[b-1]
+    powers = np.empty((block, size, size))
+    powers[0] = transition
+    for j in range(1, block):
+        powers[j] = powers[j - 1] @ transition
+    local[..., 1:] += np.einsum('jrc,csb->rjsb', powers, ends[..., :-1])
+    
+    states[..., :full * block] = by_time[:, :, :full].reshape(size, rows, full * block)
+    if remainder:
+        states[..., full * block:] = by_time[:, :, full, :remainder]
+    return states
 
 
-# Helper functions for forecasting methods
+def _step_recurrence(transition: np.ndarray, states: np.ndarray) -> None:
+    """Apply s[t] += transition @ s[t-1] position by position along axis 1."""
+    for t in range(1, states.shape[1]):
+        states[:, t] += transition @ states[:, t - 1]
+
+
+def _smooth_simple(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Simple exponential smoothing of each row.
+    
+    smoothed[0] = values[0]; smoothed[t] = alpha * values[t] + (1 - alpha) * smoothed[t-1]
+    """
+    values = np.atleast_2d(values)
+    states = alpha * values[np.newaxis]
+    states[0, :, 0] = values[:, 0]
+    return _linear_recurrence(np.array([[1 - alpha]]), states)[0]
+
+
+def _smooth_double(values: np.ndarray, alpha: float, beta: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Holt's level and trend for each row.
+    
+    Substituting the level update into the trend update gives
+    trend[t] = alpha*beta*values[t] - alpha*beta*level[t-1] + (1 - alpha*beta)*trend[t-1],
+    so (level, trend) is a two-state linear recurrence.
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Levels and trends, one row per series
+    """
+    values = np.atleast_2d(values)
+    states = np.stack([alpha * values, (alpha * beta) * values])
+    states[0, :, 0] = values[:, 0]
+    states[1, :, 0] = values[:, 1] - values[:, 0] if values.shape[1] > 1 else 0
+    
+    transition = np.array([
+        [1 - alpha, 1 - alpha],
+        [-alpha * beta, 1 - alpha * beta],
+    ])
+    level, trend = _linear_recurrence(transition, states)
+    return level, trend
+
 
 def _generate_forecast_dates(last_date: datetime, periods: int) -> List[str]:
     """Generate forecast dates based on the last date."""
@@ -356,63 +690,58 @@ def _generate_forecast_dates(last_date: datetime, periods: int) -> List[str]:
     return forecast_dates
 
 
-def _calculate_r_squared(actual: np.ndarray, predicted: np.ndarray) -> float:
-    """Calculate R-squared statistic."""
-    ss_res = np.sum((actual - predicted) ** 2)
-    ss_tot = np.sum((actual - np.mean(actual)) ** 2)
-    return 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+def _calculate_r_squared(actual: np.ndarray, predicted: np.ndarray) -> np.ndarray:
+    """Calculate R-squared statistic (per row for 2-D input)."""
+    ss_res = np.sum((actual - predicted) ** 2, axis=-1)
+    ss_tot = np.sum((actual - np.mean(actual, axis=-1, keepdims=True)) ** 2, axis=-1)
+    ratio = np.divide(ss_res, ss_tot, out=np.ones_like(ss_res), where=ss_tot != 0)
+    return 1 - ratio
 
 
-def _calculate_mae(actual: np.ndarray, predicted: np.ndarray) -> float:
-    """Calculate Mean Absolute Error."""
-    return np.mean(np.abs(actual - predicted))
+def _calculate_mae(actual: np.ndarray, predicted: np.ndarray) -> np.ndarray:
+    """Calculate Mean Absolute Error (per row for 2-D input)."""
+    return np.mean(np.abs(actual - predicted), axis=-1)
 
 
-def _calculate_rmse(actual: np.ndarray, predicted: np.ndarray) -> float:
-    """Calculate Root Mean Square Error."""
-    return np.sqrt(np.mean((actual - predicted) ** 2))
+def _calculate_rmse(actual: np.ndarray, predicted: np.ndarray) -> np.ndarray:
+    """Calculate Root Mean Square Error (per row for 2-D input)."""
+    return np.sqrt(np.mean((actual - predicted) ** 2, axis=-1))
 
 
 def _calculate_seasonal_pattern(values: np.ndarray, season_length: int) -> np.ndarray:
-    """Calculate seasonal pattern from time series data."""
-    n = len(values)
-    seasonal_sums = np.zeros(season_length)
-    seasonal_counts = np.zeros(season_length)
+    """Calculate seasonal pattern from time series data (per row for 2-D input)."""
+    values = np.asarray(values, dtype=float)
+    n = values.shape[-1]
+    rows = values.reshape(-1, n)
+    positions = np.arange(n) % season_length
     
-    for i, val in enumerate(values):
-        seasonal_index = i % season_length
-        seasonal_sums[seasonal_index] += val
-        seasonal_counts[seasonal_index] += 1
+    # One bincount over all rows: row r, position p goes to bin r * season_length + p
+    bins = (np.arange(len(rows))[:, np.newaxis] * season_length + positions).ravel()
+    seasonal_sums = np.bincount(bins, weights=rows.ravel(), minlength=len(rows) * season_length)
+    seasonal_counts = np.bincount(positions, minlength=season_length)
     
     # Calculate seasonal averages
-    seasonal_averages = seasonal_sums / seasonal_counts
-    overall_average = np.mean(values)
+    seasonal_averages = seasonal_sums.reshape(len(rows), season_length) / seasonal_counts
+    overall_average = np.mean(rows, axis=-1, keepdims=True)
     
     # Return seasonal factors (deviations from overall average)
-    return seasonal_averages - overall_average
+    return (seasonal_averages - overall_average).reshape(values.shape[:-1] + (season_length,))
 
 
 def _deseasonalize_data(values: np.ndarray, seasonal_pattern: np.ndarray, season_length: int) -> np.ndarray:
-    """Remove seasonal pattern from time series data."""
-    deseasonalized = np.zeros_like(values)
-    
-    for i, val in enumerate(values):
-        seasonal_index = i % season_length
-        deseasonalized[i] = val - seasonal_pattern[seasonal_index]
-    
-    return deseasonalized
+    """Remove seasonal pattern from time series data (per row for 2-D input)."""
+    positions = np.arange(np.shape(values)[-1]) % season_length
+    return np.asarray(values, dtype=float) - seasonal_pattern[..., positions]
 
 
-def _forecast_trend(deseasonalized: np.ndarray, periods: int) -> List[float]:
-    """Forecast trend component using linear regression."""
-    n = len(deseasonalized)
+def _forecast_trend(deseasonalized: np.ndarray, periods: int) -> np.ndarray:
+    """Forecast trend component using linear regression (per row for 2-D input)."""
+    n = deseasonalized.shape[-1]
     x = np.arange(n)
     
     # Linear regression on deseasonalized data
-    slope, intercept = np.polyfit(x, deseasonalized, 1)
+    slope, intercept = np.polyfit(x, deseasonalized.T, 1)
     
     # Generate trend forecast
     forecast_x = np.arange(n, n + periods)
-    trend_forecast = [slope * xi + intercept for xi in forecast_x]
-    
-    return trend_forecast
+    return slope[..., np.newaxis] * forecast_x + intercept[..., np.newaxis]
@@ -114,7 +114,7 @@ class NewsAnalyzer:
                 continue
             
             # Check data patterns (sample values) for common location patterns
-            if col in data.select_dtypes(include=['object']).columns:
+            if col in data.select_dtypes(include=['object', 'category']).columns:
                 sample_values = data[col].dropna().unique()[:10]  # Check first 10 unique values
                 
                 if len(sample_values) == 0:
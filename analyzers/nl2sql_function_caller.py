@@ -312,7 +312,7 @@ Focus on understanding the intent and mapping column names correctly.
         """Apply aggregation functions"""
         if group_by:
             # Group by specified columns
-            grouped = df.groupby(group_by)
+            grouped = df.groupby(group_by, observed=True)
             
             agg_dict = {}
             for agg in aggregations:
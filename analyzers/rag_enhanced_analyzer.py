@@ -9,6 +9,17 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 from analyzers.rag_document_manager import RAGDocumentManager
 
+
+def _json_default(value: Any) -> Any:
+    """
+    JSON fallback for analysis results: DataFrames (such as the long-format
+    multi-pair variances, usually sliced first) become lists of row records
+    """
+    if hasattr(value, 'columns') and hasattr(value, 'to_dict'):
+        return value.to_dict('records')
+    return str(value)
+
+
 class RAGEnhancedAnalyzer:
     """
     Enhances data analysis with RAG (Retrieval-Augmented Generation) pattern
@@ -295,7 +306,7 @@ DATA ANALYSIS CONTEXT:
 {context}
 
 QUANTITATIVE ANALYSIS DATA:
-{json.dumps(variance_data, indent=2, default=str)}
+{json.dumps(variance_data, indent=2, default=_json_default)}
 
 {enhanced_context}
 
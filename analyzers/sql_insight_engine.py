@@ -7,6 +7,8 @@ import pandas as pd
 import json
 import uuid
 import sqlite3
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 import requests
@@ -19,7 +21,7 @@ class SQLInsightEngine:
     
     This class provides:
     1. AI-powered field type inference using Ollama/Gemma
-    2. Safe SQL query execution on CSV data
+    2. Safe SQL query execution on CSV data, loaded into SQLite once per dataset
     3. LLM-powered insight generation from query results
     4. Interactive field picker for query building
     5. Query template management and reusability
@@ -33,6 +35,8 @@ class SQLInsightEngine:
         self.field_metadata: Dict[str, Dict] = {}
         self.saved_queries: Dict[str, Dict] = {}
         self.query_history: List[Dict] = []
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_lock = threading.Lock()
         print("🧠 Enhanced SQL Insight Engine initialized with AI-powered field detection")
     
     def load_dataset(self, df: pd.DataFrame, dataset_name: str = "dataset") -> Dict[str, Any]:
@@ -50,6 +54,9 @@ class SQLInsightEngine:
             self.data = df.copy()
             self.table_name = dataset_name
             
+            # Load the table once; every query until the next load reuses it
+            self._open_dataset_connection()
+            
             # Generate enhanced schema with AI
             print("🔍 Analyzing dataset structure with AI...")
             self.schema = self._ai_analyze_schema(df)
@@ -75,6 +82,38 @@ class SQLInsightEngine:
                 "message": f"Failed to load dataset: {str(e)}"
             }
     
+    def _open_dataset_connection(self) -> None:
+        """
+        Build the SQLite table for the current dataset, replacing any previous one
+        """
+        conn = self._build_dataset_connection()
+        with self._connection_lock:
+            old_connection, self._connection = self._connection, conn
+        
+        if old_connection is not None:
+            old_connection.close()
+    
+    def _build_dataset_connection(self) -> sqlite3.Connection:
+        """
+        Create a read-only SQLite connection holding the current dataset
+        """
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        try:
+            self.data.to_sql(self.table_name, conn, index=False, if_exists='replace')
+            # Queries are validated as read-only, but enforce it on the connection too
+            conn.execute("PRAGMA query_only=ON")
+        except Exception:
+            conn.close()
+            raise
+        return conn
+    
+    def close(self) -> None:
+        """Release the SQLite connection held for the loaded dataset"""
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
     def _ai_analyze_schema(self, df: pd.DataFrame) -> Dict[str, str]:
         """
         Use AI to analyze DataFrame schema with intelligent type inference
@@ -341,16 +380,16 @@ class SQLInsightEngine:
                 "message": f"Query validation failed: {safety_check['reason']}"
             }
         
+        start_time = time.perf_counter()
         try:
-            # Create in-memory SQLite database
-            conn = sqlite3.connect(':memory:')
-            
-            # Load data into SQLite
-            self.data.to_sql(self.table_name, conn, index=False, if_exists='replace')
-            
-            # Execute query
-            result_df = pd.read_sql_query(query, conn)
-            conn.close()
+            # Reuse the connection built in load_dataset (rebuild if it was
+            # closed); checked under the lock so a concurrent close() cannot
+            # leave the query without one
+            with self._connection_lock:
+                if self._connection is None:
+                    self._connection = self._build_dataset_connection()
+                result_df = pd.read_sql_query(query, self._connection)
+            execution_time_ms = round((time.perf_counter() - start_time) * 1000, 2)
             
             # Prepare results
             query_results = {
@@ -360,6 +399,7 @@ class SQLInsightEngine:
                 "columns": list(result_df.columns),
                 "row_count": len(result_df),
                 "execution_time": datetime.now().isoformat(),
+                "execution_time_ms": execution_time_ms,
                 "query": query
             }
             
@@ -375,6 +415,7 @@ class SQLInsightEngine:
                 "timestamp": query_results["execution_time"],
                 "query": query,
                 "row_count": len(result_df),
+                "execution_time_ms": execution_time_ms,
                 "status": "success",
                 "has_insights": generate_insights
             })
@@ -389,6 +430,7 @@ class SQLInsightEngine:
                 "timestamp": datetime.now().isoformat(),
                 "query": query,
                 "error": str(e),
+                "execution_time_ms": round((time.perf_counter() - start_time) * 1000, 2),
                 "status": "error"
             })
             
@@ -486,7 +528,7 @@ class SQLInsightEngine:
                 }
         
         # Analyze text columns
-        text_cols = df.select_dtypes(include=['object']).columns
+        text_cols = df.select_dtypes(include=['object', 'category']).columns
         for col in text_cols:
             if col in df.columns:
                 summary["text_stats"][col] = {
@@ -677,7 +719,7 @@ class SQLInsightEngine:
             insights.append("")
         
         # Categorical analysis
-        cat_cols = df.select_dtypes(include=['object']).columns
+        cat_cols = df.select_dtypes(include=['object', 'category']).columns
         if len(cat_cols) > 0:
             insights.append("🏷️ **Categorical Data:**")
             for col in cat_cols[:2]:
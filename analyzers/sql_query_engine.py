@@ -1,12 +1,18 @@
 """
 SQL Query Engine for Quant Commander
-Executes SQL queries on CSV data using in-memory SQLite
+Executes SQL queries on CSV data using a shared read-only SQLite snapshot
 """
 
+import os
 import pandas as pd
+import queue
 import sqlite3
 import re
+import tempfile
 import threading
+import time
+from contextlib import contextmanager
+from urllib.request import pathname2url
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from .base_analyzer import AnalysisFormatter
@@ -25,76 +31,292 @@ class SQLQueryResult:
             self.row_count = len(self.data)
 
 
+@dataclass
+class _PooledConnection:
+    """A pool slot holding a snapshot connection and the snapshot it was opened on"""
+    version: int = -1
+    connection: Optional[sqlite3.Connection] = None
+
+
 class SQLQueryEngine:
-    """Execute SQL queries on CSV data using in-memory SQLite with thread-safe connections"""
+    """
+    Execute SQL queries on CSV data using a shared read-only SQLite snapshot.
+
+    The DataFrame is written once into a file-backed SQLite database when it is
+    loaded. Queries run on a bounded pool of read-only, memory-mapped
+    connections to that snapshot. Each connection is used by one query at a
+    time, so independent queries run concurrently and waiting callers are
+    served first-come, first-served up to a maximum wait.
+    """
+    
+    backend = "sqlite"
     
     def __init__(self, settings: Dict = None):
         self.settings = settings or {}
-        self.connections = {}  # Store connections per thread
-        self.data_df = None  # Store the DataFrame for thread recreation
+        self.data_df = None  # Reference to the loaded DataFrame for snapshot rebuilds
+        self.column_info: Optional[Dict] = None  # CSVLoader column analysis used for indexing
+        self.indexes: List[Dict[str, Any]] = []
         self.table_name = "financial_data"
         self.schema_info = {}
         self.formatter = AnalysisFormatter()
-        self._lock = threading.Lock()  # Thread safety lock
+        self._lock = threading.Lock()  # Guards snapshot state and pool statistics
+        self._snapshot_path: Optional[str] = None
+        self._snapshot_version = 0
+        self._retired_snapshots: List[str] = []
+        self._mmap_size = int(self.settings.get('sql_mmap_size', 256 * 1024 * 1024))
         
-    def _get_thread_connection(self) -> sqlite3.Connection:
-        """Get or create a SQLite connection for the current thread"""
-        thread_id = threading.get_ident()
+        # Connection pool: a FIFO queue of slots, one query per slot at a time
+        self.pool_size = max(1, int(self.settings.get('sql_pool_size', os.cpu_count() or 4)))
+        self.max_wait = float(self.settings.get('sql_pool_max_wait', 30.0))
+        self._pool: queue.Queue = queue.Queue()
+        self._all_slots = [_PooledConnection() for _ in range(self.pool_size)]
+        for slot in self._all_slots:
+            self._pool.put(slot)
+        self._pool_stats = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'waiting': 0,
+            'max_waiting': 0,
+            'in_use': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0
+        }
+    
+    @contextmanager
+    def _checkout_connection(self):
+        """
+        Borrow a pooled connection for the duration of one query.
         
-        # Thread-safe connection retrieval/creation
+        Waiters are served in arrival order. Raises TimeoutError if no
+        connection frees up within ``max_wait`` seconds.
+        """
         with self._lock:
-            if thread_id not in self.connections or self.connections[thread_id] is None:
-                # Create new connection for this thread
-                try:
-                    # Create in-memory database with thread-safe settings
-                    conn = sqlite3.connect(':memory:', check_same_thread=False, timeout=30.0)
-                    
-                    # Set SQLite pragmas for better performance and safety
-                    conn.execute("PRAGMA journal_mode=WAL")
-                    conn.execute("PRAGMA synchronous=NORMAL")
-                    conn.execute("PRAGMA cache_size=10000")
-                    conn.execute("PRAGMA temp_store=memory")
-                    
-                    self.connections[thread_id] = conn
-                    
-                    # Reload data if available
-                    if self.data_df is not None:
-                        df_clean = self.data_df.copy()
-                        df_clean.columns = [self._clean_column_name(col) for col in df_clean.columns]
-                        df_clean.to_sql(self.table_name, conn, index=False, if_exists='replace')
-                        print(f"[SQL] Created new thread connection {thread_id} and loaded {len(df_clean)} rows")
-                    
-                except Exception as e:
-                    print(f"[SQL ERROR] Failed to create thread connection: {str(e)}")
-                    self.connections[thread_id] = None
-                    
-            return self.connections[thread_id]
+            self._pool_stats['waiting'] += 1
+            self._pool_stats['max_waiting'] = max(
+                self._pool_stats['max_waiting'], self._pool_stats['waiting']
+            )
+        
+        start = time.perf_counter()
+        try:
+            slot = self._pool.get(timeout=self.max_wait)
+        except queue.Empty:
+            with self._lock:
+                self._pool_stats['waiting'] -= 1
+                self._pool_stats['timeouts'] += 1
+            raise TimeoutError(
+                f"No SQL connection became available within {self.max_wait:.1f}s"
+            )
+        
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._pool_stats['waiting'] -= 1
+            self._pool_stats['in_use'] += 1
+            self._pool_stats['checkouts'] += 1
+            self._pool_stats['total_wait_time'] += waited
+            self._pool_stats['max_wait_time'] = max(self._pool_stats['max_wait_time'], waited)
+        
+        try:
+            self._ensure_current(slot)
+            yield slot.connection
+        finally:
+            with self._lock:
+                self._pool_stats['in_use'] -= 1
+            self._pool.put(slot)
+    
+    def _ensure_current(self, slot: _PooledConnection):
+        """(Re)open a slot's connection if it is missing or points at an old snapshot"""
+        with self._lock:
+            version, path = self._snapshot_version, self._snapshot_path
+        
+        if slot.connection is not None and slot.version == version:
+            return
+        
+        if slot.connection is not None:
+            self._close_quietly(slot.connection)
+            slot.connection = None
+        
+        slot.connection = self._open_reader_connection(path)
+        slot.version = version
+    
+    def _open_reader_connection(self, path: Optional[str]) -> sqlite3.Connection:
+        """Open a read-only connection to a snapshot file"""
+        if path is None:
+            # No data loaded yet - an empty database keeps error handling uniform
+            return sqlite3.connect(':memory:', check_same_thread=False, timeout=30.0)
+        
+        uri = f"file:{pathname2url(path)}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=30.0)
+        
+        # Pages are served from the shared OS page cache through mmap,
+        # so additional readers do not duplicate the table in memory
+        conn.execute(f"PRAGMA mmap_size={self._mmap_size}")
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA temp_store=memory")
+        return conn
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics.
+        
+        Returns:
+            Dict with pool size, connections in use, current and peak queue
+            depth, checkout/timeout counts and wait times in milliseconds
+        """
+        with self._lock:
+            stats = dict(self._pool_stats)
+        
+        checkouts = stats.pop('checkouts')
+        total_wait = stats.pop('total_wait_time')
+        return {
+            'pool_size': self.pool_size,
+            'max_wait_seconds': self.max_wait,
+            'checkouts': checkouts,
+            'timeouts': stats['timeouts'],
+            'in_use': stats['in_use'],
+            'queue_depth': stats['waiting'],
+            'max_queue_depth': stats['max_waiting'],
+            'avg_wait_ms': round(total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+            'max_wait_ms': round(stats['max_wait_time'] * 1000, 3)
+        }
+    
+    def _build_snapshot(self, df_clean: pd.DataFrame, index_plan: List[Tuple[str, List[str]]],
+                        analyze: bool) -> str:
+        """Write the cleaned DataFrame and its indexes into a new snapshot database file"""
+        fd, path = tempfile.mkstemp(
+            prefix='quantcommander_', suffix='.sqlite',
+            dir=self.settings.get('sql_snapshot_dir')
+        )
+        os.close(fd)
+        
+        conn = sqlite3.connect(path)
+        try:
+            # The snapshot is rebuilt from the DataFrame if lost, so skip durability work
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            df_clean.to_sql(self.table_name, conn, index=False, if_exists='replace')
+            self._create_indexes(conn, index_plan, analyze)
+            conn.commit()
+        except Exception:
+            conn.close()
+            self._remove_snapshot_file(path)
+            raise
+        conn.close()
+        return path
+    
+    def _plan_indexes(self, df: pd.DataFrame, column_info: Optional[Dict] = None) -> List[Tuple[str, List[str]]]:
+        """
+        Decide which indexes to build for the filter and GROUP BY columns.
+        
+        Category and date columns come from CSVLoader's ``column_info`` when
+        given, otherwise from low-cardinality text and datetime dtypes. Each
+        key column gets one index that also carries the value columns, so
+        WHERE/GROUP BY aggregates over those measures are answered from the
+        index alone.
+        
+        Args:
+            df: DataFrame with original (uncleaned) column names
+            column_info: Optional output of CSVLoader._profile_data
+            
+        Returns:
+            List of (index_name, cleaned_columns) tuples
+        """
+        if column_info:
+            financial_cols = column_info.get('financial_columns', {}) or {}
+            category_cols = list(financial_cols.get('category_columns', []) or [])
+            date_cols = list(column_info.get('date_columns', []) or [])
+            value_cols = list(financial_cols.get('value_columns', []) or column_info.get('numeric_columns', []) or [])
+        else:
+            cardinality_limit = max(1, int(len(df) * 0.05))
+            category_cols = [
+                col for col in df.select_dtypes(include=['object', 'string', 'category']).columns
+                if df[col].nunique(dropna=True) <= cardinality_limit
+            ]
+            date_cols = df.select_dtypes(include=['datetime', 'datetimetz']).columns.tolist()
+            value_cols = df.select_dtypes(include=['number']).columns.tolist()
+        
+        max_covering = int(self.settings.get('sql_covering_max_columns', 4))
+        max_indexes = int(self.settings.get('sql_max_indexes', 8))
+        covering = [self._clean_column_name(col) for col in value_cols if col in df.columns][:max_covering]
+        
+        plan = []
+        for col in date_cols + category_cols:
+            if col not in df.columns or len(plan) >= max_indexes:
+                continue
+            key = self._clean_column_name(col)
+            if any(columns[0] == key for _, columns in plan):
+                continue
+            plan.append((f"idx_{self.table_name}_{key}", [key] + [c for c in covering if c != key]))
+        return plan
+    
+    def _create_indexes(self, connection: sqlite3.Connection, index_plan: List[Tuple[str, List[str]]],
+                        analyze: bool) -> None:
+        """Create the planned indexes and optionally gather planner statistics"""
+        self.indexes = []
+        for index_name, columns in index_plan:
+            column_sql = ", ".join(f'"{col}"' for col in columns)
+            try:
+                connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{self.table_name}" ({column_sql})'
+                )
+                self.indexes.append({"name": index_name, "columns": columns})
+            except sqlite3.Error as e:
+                print(f"[SQL] Skipped index {index_name}: {str(e)}")
+        
+        if analyze and self.indexes:
+            # Sample-based ANALYZE keeps the cost bounded on large tables
+            connection.execute("PRAGMA analysis_limit=1000")
+            connection.execute("ANALYZE")
+        
+        if self.indexes:
+            print(f"[SQL] Created {len(self.indexes)} indexes on '{self.table_name}'"
+                  f"{' and analyzed' if analyze else ''}")
+    
+    def load_dataframe_to_sql(self, df: pd.DataFrame, table_name: str = None,
+                              column_info: Optional[Dict] = None,
+                              analyze: Optional[bool] = None) -> bool:
+        """
+        Load pandas DataFrame into the shared SQLite snapshot for querying.
         
-    def load_dataframe_to_sql(self, df: pd.DataFrame, table_name: str = None) -> bool:
-        """Load pandas DataFrame into SQLite for querying with thread-safe handling"""
+        Args:
+            df: DataFrame to load
+            table_name: Table name to use (keeps the current name if omitted)
+            column_info: Optional CSVLoader column analysis used to pick the
+                category and date columns that get indexes
+            analyze: Run ANALYZE after indexing (defaults to the
+                ``sql_analyze_on_load`` setting, on by default)
+        """
         try:
             if table_name:
                 self.table_name = table_name
-                
-            # Store the DataFrame for thread recreation
-            self.data_df = df.copy()
+            if analyze is None:
+                analyze = bool(self.settings.get('sql_analyze_on_load', True))
             
-            # Clean column names for SQL compatibility
-            df_clean = df.copy()
-            df_clean.columns = [self._clean_column_name(col) for col in df_clean.columns]
+            # Clean column names for SQL compatibility without copying the data
+            clean_columns = [self._clean_column_name(col) for col in df.columns]
+            df_clean = df.copy(deep=False)
+            df_clean.columns = clean_columns
             
-            # Get thread-specific connection
-            connection = self._get_thread_connection()
-            if connection is None:
-                return False
+            # Build the table and its indexes once; pooled readers attach read-only
+            index_plan = self._plan_indexes(df, column_info)
+            snapshot_path = self._build_snapshot(df_clean, index_plan, analyze)
             
-            # Load DataFrame into SQLite
-            df_clean.to_sql(self.table_name, connection, index=False, if_exists='replace')
+            with self._lock:
+                if self._snapshot_path:
+                    self._retired_snapshots.append(self._snapshot_path)
+                self._snapshot_path = snapshot_path
+                self._snapshot_version += 1
+                self.data_df = df
+                self.column_info = column_info
+            
+            # Idle connections still point at the old file; release them now
+            self._close_idle_connections()
+            self._remove_retired_snapshots()
             
             # Store schema information
             self.schema_info = self._extract_schema_info(df_clean)
+            self.schema_info['indexes'] = list(self.indexes)
             
-            print(f"[SQL] Loaded {len(df)} rows into table '{self.table_name}' (thread {threading.get_ident()})")
+            print(f"[SQL] Loaded {len(df)} rows into table '{self.table_name}' snapshot (thread {threading.get_ident()})")
             return True
             
         except Exception as e:
@@ -102,16 +324,8 @@ class SQLQueryEngine:
             return False
     
     def execute_query(self, sql_query: str) -> SQLQueryResult:
-        """Execute SQL query and return results with complete thread safety"""
+        """Execute SQL query on a pooled connection and return results"""
         try:
-            # Get thread-specific connection
-            connection = self._get_thread_connection()
-            if not connection:
-                return SQLQueryResult(
-                    success=False,
-                    error_message="Failed to establish database connection for current thread"
-                )
-            
             # Security: Basic SQL injection prevention
             if not self._is_safe_query(sql_query):
                 return SQLQueryResult(
@@ -119,9 +333,8 @@ class SQLQueryEngine:
                     error_message="Query contains potentially unsafe operations"
                 )
             
-            # Execute query with thread-safe connection
             try:
-                with self._lock:  # Use lock for query execution
+                with self._checkout_connection() as connection:
                     result_df = pd.read_sql_query(sql_query, connection)
                     
                 print(f"[SQL] Query executed successfully on thread {threading.get_ident()}, returned {len(result_df)} rows")
@@ -130,15 +343,21 @@ class SQLQueryEngine:
                     data=result_df
                 )
                 
+            except TimeoutError as e:
+                return SQLQueryResult(
+                    success=False,
+                    error_message=f"SQL Error: {str(e)}. The server is busy, please try again."
+                )
+                
             except sqlite3.OperationalError as e:
                 error_msg = str(e)
                 if "no such table" in error_msg.lower():
-                    # Table doesn't exist, try to recreate it
+                    # Snapshot missing or stale, rebuild it from the loaded DataFrame
                     if self.data_df is not None:
-                        print(f"[SQL] Table missing, recreating for thread {threading.get_ident()}")
-                        self._recreate_table_for_thread(connection)
+                        print(f"[SQL] Table missing, rebuilding snapshot for thread {threading.get_ident()}")
+                        self._rebuild_snapshot()
                         # Retry the query
-                        with self._lock:
+                        with self._checkout_connection() as connection:
                             result_df = pd.read_sql_query(sql_query, connection)
                         return SQLQueryResult(success=True, data=result_df)
                     else:
@@ -168,23 +387,76 @@ class SQLQueryEngine:
                 error_message=f"SQL Error: {error_msg}"
             )
     
-    def _recreate_table_for_thread(self, connection: sqlite3.Connection):
-        """Recreate the table in the current thread's connection"""
-        if self.data_df is not None:
-            df_clean = self.data_df.copy()
-            df_clean.columns = [self._clean_column_name(col) for col in df_clean.columns]
-            df_clean.to_sql(self.table_name, connection, index=False, if_exists='replace')
-            print(f"[SQL] Recreated table '{self.table_name}' in thread {threading.get_ident()}")
+    def _rebuild_snapshot(self) -> bool:
+        """Rebuild the shared snapshot from the loaded DataFrame"""
+        if self.data_df is None:
+            return False
+        return self.load_dataframe_to_sql(self.data_df, column_info=self.column_info)
+    
+    @staticmethod
+    def _close_quietly(connection: sqlite3.Connection):
+        """Close a connection, ignoring errors from already-closed handles"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+    
+    def _close_idle_connections(self) -> int:
+        """
+        Close connections of idle pool slots.
+        
+        Slots that are checked out keep their connection until the query
+        finishes; they are reopened on the current snapshot at next checkout.
+        
+        Returns:
+            Number of connections closed
+        """
+        idle_slots = []
+        while True:
+            try:
+                idle_slots.append(self._pool.get_nowait())
+            except queue.Empty:
+                break
+        
+        closed = 0
+        for slot in idle_slots:
+            if slot.connection is not None:
+                self._close_quietly(slot.connection)
+                slot.connection = None
+                slot.version = -1
+                closed += 1
+            self._pool.put(slot)
+        return closed
+    
+    def _remove_retired_snapshots(self):
+        """Delete replaced snapshot files that no connection still holds open"""
+        with self._lock:
+            retired, self._retired_snapshots = self._retired_snapshots, []
+        
+        open_paths = []
+        for path in retired:
+            if os.path.exists(path) and not self._remove_snapshot_file(path):
+                # Still open elsewhere (e.g. Windows file locking); retry later
+                open_paths.append(path)
+        
+        if open_paths:
+            with self._lock:
+                self._retired_snapshots.extend(open_paths)
+    
+    @staticmethod
+    def _remove_snapshot_file(path: str) -> bool:
+        """Delete a snapshot database file, best effort"""
+        try:
+            os.remove(path)
+            return True
+        except OSError as e:
+            print(f"[SQL] Could not remove snapshot file {path}: {str(e)}")
+            return False
     
     def get_table_schema(self) -> Dict:
         """Get information about the loaded table structure with thread-safe access"""
-        connection = self._get_thread_connection()
-        if not connection:
-            return {"error": "No database connection available"}
-            
         try:
-            # Use thread-safe cursor creation
-            with self._lock:
+            with self._checkout_connection() as connection:
                 cursor = connection.cursor()
                 cursor.execute(f"PRAGMA table_info({self.table_name})")
                 columns = cursor.fetchall()
@@ -218,24 +490,18 @@ class SQLQueryEngine:
             return {"error": f"Schema extraction failed: {str(e)}"}
     
     def refresh_connection(self, df: pd.DataFrame = None) -> bool:
-        """Refresh the SQLite connection to handle threading issues"""
+        """Refresh the pooled connections to handle stale or broken handles"""
         try:
-            thread_id = threading.get_ident()
+            # New data means a new snapshot, which resets every pooled connection
+            if df is not None:
+                return self.load_dataframe_to_sql(df)
             
+            # Busy connections reopen on their next checkout
             with self._lock:
-                # Close existing connection for this thread
-                if thread_id in self.connections and self.connections[thread_id]:
-                    self.connections[thread_id].close()
-                    self.connections[thread_id] = None
-                
-                # Update data if provided
-                if df is not None:
-                    self.data_df = df.copy()
+                self._snapshot_version += 1
+            self._close_idle_connections()
                 
-                # Force creation of new connection
-                self._get_thread_connection()
-                
-            print(f"[SQL] Connection refreshed for thread {thread_id}")
+            print(f"[SQL] Connection pool refreshed (thread {threading.get_ident()})")
             return True
                 
         except Exception as e:
@@ -243,14 +509,9 @@ class SQLQueryEngine:
             return False
     
     def is_connection_valid(self) -> bool:
-        """Check if the SQLite connection is valid and accessible for current thread"""
+        """Check if a pooled SQLite connection is valid and accessible"""
         try:
-            connection = self._get_thread_connection()
-            if not connection:
-                return False
-            
-            # Test the connection with a simple query
-            with self._lock:
+            with self._checkout_connection() as connection:
                 cursor = connection.cursor()
                 cursor.execute("SELECT 1")
                 cursor.fetchone()
@@ -267,7 +528,7 @@ class SQLQueryEngine:
             "dtypes": {str(k): str(v) for k, v in df.dtypes.to_dict().items()},
             "numeric_columns": df.select_dtypes(include=['number']).columns.tolist(),
             "date_columns": df.select_dtypes(include=['datetime']).columns.tolist(),
-            "categorical_columns": df.select_dtypes(include=['object']).columns.tolist(),
+            "categorical_columns": df.select_dtypes(include=['object', 'category']).columns.tolist(),
             "row_count": len(df),
             "null_counts": df.isnull().sum().to_dict()
         }
@@ -331,13 +592,8 @@ class SQLQueryEngine:
                 
                 output += "\n\n📊 **QUERY RESULTS:**\n"
                 
-                # Convert DataFrame to list of dictionaries for the formatter
-                table_data = display_df.to_dict('records')
-                headers = list(display_df.columns)
-                
-                output += "\n" + self.formatter.create_banded_table(
-                    table_data, 
-                    headers, 
+                output += "\n" + self.formatter.create_table(
+                    display_df,
                     max_rows=52  # 50 data rows + 2 for headers
                 )
                 
@@ -380,20 +636,44 @@ class SQLQueryEngine:
             return f"❌ **Results formatting error**: {str(e)}"
     
     def close_connection(self):
-        """Close all SQLite connections for all threads"""
+        """Close all pooled SQLite connections and drop the snapshot"""
         with self._lock:
-            for thread_id, connection in self.connections.items():
-                if connection:
-                    try:
-                        connection.close()
-                        print(f"[SQL] Connection closed for thread {thread_id}")
-                    except Exception as e:
-                        print(f"[SQL ERROR] Error closing connection for thread {thread_id}: {str(e)}")
-            
-            self.connections.clear()
-            print("[SQL] All connections closed")
+            snapshot_path, self._snapshot_path = self._snapshot_path, None
+            if snapshot_path:
+                self._retired_snapshots.append(snapshot_path)
+            self._snapshot_version += 1
+        
+        closed = self._close_idle_connections()
+        self._remove_retired_snapshots()
+        print(f"[SQL] All connections closed ({closed} pooled)")
     
     def __del__(self):
         """Cleanup on object destruction"""
-        self.close_connection()
+        if hasattr(self, '_pool'):
+            self.close_connection()
+
 
+def create_sql_engine(settings: Dict = None) -> SQLQueryEngine:
+    """
+    Create the SQL engine for the configured execution backend.
+    
+    Args:
+        settings: Engine settings; ``sql_backend`` selects 'sqlite' (default)
+            or 'duckdb'
+            
+    Returns:
+        A SQLQueryEngine, or DuckDBQueryEngine when DuckDB is requested and
+        installed. Falls back to SQLite otherwise.
+    """
+    settings = settings or {}
+    backend = str(settings.get('sql_backend', 'sqlite')).lower()
+    
+    if backend == 'duckdb':
+        from .duckdb_query_engine import DuckDBQueryEngine, DUCKDB_AVAILABLE
+        if DUCKDB_AVAILABLE:
+            return DuckDBQueryEngine(settings)
+        print("[SQL] DuckDB backend requested but duckdb is not installed, using SQLite")
+    elif backend != 'sqlite':
+        print(f"[SQL] Unknown SQL backend '{backend}', using SQLite")
+    
+    return SQLQueryEngine(settings)
@@ -8,6 +8,16 @@ import numpy as np
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from .base_analyzer import BaseAnalyzer, AnalysisError
+from data.rollup_cube import get_rollup_cube
+
+
+# Aggregation time scale -> (rollup grain, period column name)
+TIME_SCALES = {
+    "weekly": ("weekly", "week"),
+    "monthly": ("monthly", "month"),
+    "quarterly": ("quarterly", "quarter"),
+    "yearly": ("yearly", "year"),
+}
 
 
 class TimescaleAnalyzer(BaseAnalyzer):
@@ -59,14 +69,25 @@ class TimescaleAnalyzer(BaseAnalyzer):
                 print("[DEBUG][TimescaleAnalyzer] No numeric columns found for analysis")
                 raise AnalysisError("No numeric columns found for analysis")
             
-            # Prepare data
-            print(f"[DEBUG][TimescaleAnalyzer] Preparing data")
-            analysis_data = self._prepare_data(data, date_col, value_cols)
-            print(f"[DEBUG][TimescaleAnalyzer] Data prepared, shape: {analysis_data.shape}")
+            # Aggregate from the dataset's rollup cube when it covers these columns
+            cube = get_rollup_cube(data, date_col, value_cols)
+            if cube is not None:
+                print(f"[DEBUG][TimescaleAnalyzer] Using rollup cube ({len(cube.daily[None])} days)")
+                aggregations = self._rollup_aggregations(cube, value_cols)
+                data_rows = cube.row_count
+                date_range = f"{cube.first_date} to {cube.last_date}"
+            else:
+                # Prepare data
+                print(f"[DEBUG][TimescaleAnalyzer] Preparing data")
+                analysis_data = self._prepare_data(data, date_col, value_cols)
+                print(f"[DEBUG][TimescaleAnalyzer] Data prepared, shape: {analysis_data.shape}")
+                aggregations = self._prepare_aggregations(analysis_data, date_col, value_cols)
+                data_rows = len(analysis_data)
+                date_range = f"{analysis_data[date_col].min()} to {analysis_data[date_col].max()}"
             
             # Perform timescale analysis
             print(f"[DEBUG][TimescaleAnalyzer] Performing timescale analysis")
-            results = self._perform_timescale_analysis(analysis_data, date_col, value_cols)
+            results = self._perform_timescale_analysis(aggregations, value_cols)
             print(f"[DEBUG][TimescaleAnalyzer] Analysis complete")
             
             # Store results
@@ -77,8 +98,8 @@ class TimescaleAnalyzer(BaseAnalyzer):
                 'parameters': {
                     'date_col': date_col,
                     'value_cols': value_cols,
-                    'data_rows': len(analysis_data),
-                    'date_range': f"{analysis_data[date_col].min()} to {analysis_data[date_col].max()}"
+                    'data_rows': data_rows,
+                    'date_range': date_range
                 }
             }
             
@@ -111,11 +132,8 @@ class TimescaleAnalyzer(BaseAnalyzer):
         
         return prepared_data
     
-    def _perform_timescale_analysis(self, data: pd.DataFrame, date_col: str, value_cols: List[str]) -> Dict:
-        """Perform the core timescale analysis"""
-        
-        # Prepare aggregations at different time scales
-        aggregations = self._prepare_aggregations(data, date_col, value_cols)
+    def _perform_timescale_analysis(self, aggregations: Dict, value_cols: List[str]) -> Dict:
+        """Perform the core timescale analysis on prepared aggregations"""
         
         # Calculate period-over-period analysis
         pop_analysis = self._calculate_pop_analysis(aggregations, value_cols)
@@ -177,6 +195,19 @@ class TimescaleAnalyzer(BaseAnalyzer):
         
         return aggregations
     
+    def _rollup_aggregations(self, cube, value_cols: List[str]) -> Dict:
+        """Aggregations at each time scale, read from a rollup cube"""
+        aggregations = {}
+        for time_scale, (grain, period_col) in TIME_SCALES.items():
+            totals = cube.rollup(grain, value_cols)
+            frame = totals.reset_index()
+            frame.insert(0, period_col, frame.pop('period').astype(str))
+            aggregations[time_scale] = {
+                "data": frame,
+                "periods": frame[period_col].tolist()
+            }
+        return aggregations
+    
     def _calculate_pop_analysis(self, aggregations: Dict, value_cols: List[str]) -> Dict:
         """Calculate period-over-period metrics"""
         result = {
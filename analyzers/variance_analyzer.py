@@ -15,6 +15,33 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 import re
+import threading
+from collections import OrderedDict
+
+from data.rollup_cube import GRAIN_FREQUENCIES, get_rollup_cube
+from utils.data_fingerprint import get_fingerprint
+
+
+# Minimum date span (days) before a time grain is analysed
+GRAIN_MIN_SPAN_DAYS = {
+    'daily': 1,
+    'weekly': 7,
+    'monthly': 30,
+    'quarterly': 90,
+    'yearly': 365,
+}
+
+# Columns of the long-format multi-pair variance frame, before any category column
+VARIANCE_KEY_COLUMNS = ['pair', 'actual_col', 'planned_col', 'type', 'grain', 'period']
+
+# Default cap on nodes returned by a hierarchical drill-down
+DEFAULT_MAX_NODES = 500
+
+# Leaf totals kept for repeated drill-downs ((fingerprint, hierarchy, actual, planned) -> totals)
+MAX_CACHED_LEAF_TOTALS = 8
+
+_leaf_totals: "OrderedDict[Tuple[str, Tuple[str, ...], str, str], pd.DataFrame]" = OrderedDict()
+_leaf_totals_lock = threading.Lock()
 
 
 class QuantAnalyzer:
@@ -80,7 +107,7 @@ class QuantAnalyzer:
             col_lower = col.lower()
             
             # Only consider numeric columns for quantitative analysis
-            if df[col].dtype in ['int64', 'float64']:
+            if pd.api.types.is_numeric_dtype(df[col]):
                 for category, pattern_list in patterns.items():
                     if any(pattern in col_lower for pattern in pattern_list):
                         detected_columns[category].append(col)
@@ -228,7 +255,7 @@ class QuantAnalyzer:
         
         # Group-by analysis if requested
         if group_by_col and 'group' in work_df.columns:
-            group_analysis = work_df.groupby('group').agg({
+            group_analysis = work_df.groupby('group', observed=True).agg({
                 actual_col: ['sum', 'mean'],
                 comparison_col: ['sum', 'mean'], 
                 'variance_absolute': ['sum', 'mean'],
@@ -487,27 +514,32 @@ class QuantAnalyzer:
             
             # Time-based analysis if date column provided
             if date_col and date_col in data.columns:
-                # Convert date column to datetime
-                data_with_dates = data.copy()
-                data_with_dates[date_col] = pd.to_datetime(data_with_dates[date_col])
+                # Period totals come from the dataset's rollup cube when it has them
+                cube = get_rollup_cube(data, date_col, [actual_col, planned_col])
+                if cube is not None:
+                    data_with_dates = data
+                else:
+                    # Convert date column to datetime
+                    data_with_dates = data.copy()
+                    data_with_dates[date_col] = pd.to_datetime(data_with_dates[date_col])
                 
                 # Analyze different time periods
-                time_periods = self._analyze_time_periods(data_with_dates, actual_col, planned_col, date_col)
+                time_periods = self._analyze_time_periods(data_with_dates, actual_col, planned_col, date_col, cube)
                 results['time_periods'] = time_periods
             
-            # Statistical analysis
-            data['variance'] = data[actual_col] - data[planned_col]
-            data['variance_pct'] = (data['variance'] / data[planned_col] * 100).replace([np.inf, -np.inf], 0)
+            # Statistical analysis (the caller's frame is left unchanged, so its
+            # fingerprint and the caches keyed by it stay valid)
+            variance = data[actual_col] - data[planned_col]
             
             results['statistical_analysis'] = {
-                'variance_mean': float(data['variance'].mean()),
-                'variance_std': float(data['variance'].std()),
-                'variance_min': float(data['variance'].min()),
-                'variance_max': float(data['variance'].max()),
-                'variance_median': float(data['variance'].median()),
-                'positive_variances': int((data['variance'] > 0).sum()),
-                'negative_variances': int((data['variance'] < 0).sum()),
-                'zero_variances': int((data['variance'] == 0).sum())
+                'variance_mean': float(variance.mean()),
+                'variance_std': float(variance.std()),
+                'variance_min': float(variance.min()),
+                'variance_max': float(variance.max()),
+                'variance_median': float(variance.median()),
+                'positive_variances': int((variance > 0).sum()),
+                'negative_variances': int((variance < 0).sum()),
+                'zero_variances': int((variance == 0).sum())
             }
             
             # Generate insights
@@ -518,7 +550,8 @@ class QuantAnalyzer:
         except Exception as e:
             return {'error': f"Comprehensive quantitative analysis failed: {str(e)}"}
     
-    def _analyze_time_periods(self, data: pd.DataFrame, actual_col: str, planned_col: str, date_col: str) -> Dict[str, Any]:
+    def _analyze_time_periods(self, data: pd.DataFrame, actual_col: str, planned_col: str, date_col: str,
+                              cube=None) -> Dict[str, Any]:
         """
         Analyze variance across different time periods.
         
@@ -527,6 +560,7 @@ class QuantAnalyzer:
             actual_col (str): Actual values column
             planned_col (str): Planned values column
             date_col (str): Date column name
+            cube (RollupCube, optional): Rollup cube of data to read period totals from
             
         Returns:
             Dict[str, Any]: Time period analysis results
@@ -534,15 +568,15 @@ class QuantAnalyzer:
         time_analysis = {}
         
         # Determine data span
-        date_range = data[date_col].max() - data[date_col].min()
+        if cube is not None:
+            date_range = cube.last_date - cube.first_date
+        else:
+            date_range = data[date_col].max() - data[date_col].min()
         
         try:
             # Daily analysis (if data spans multiple days)
             if date_range.days > 1:
-                daily_data = data.groupby(data[date_col].dt.date).agg({
-                    actual_col: 'sum',
-                    planned_col: 'sum'
-                })
+                daily_data = self._period_totals(data, date_col, actual_col, planned_col, 'daily', cube)
                 daily_data['variance'] = daily_data[actual_col] - daily_data[planned_col]
                 daily_data['variance_pct'] = (daily_data['variance'] / daily_data[planned_col] * 100).replace([np.inf, -np.inf], 0)
                 
@@ -564,10 +598,7 @@ class QuantAnalyzer:
         try:
             # Weekly analysis (if data spans multiple weeks)
             if date_range.days > 7:
-                weekly_data = data.groupby(data[date_col].dt.to_period('W')).agg({
-                    actual_col: 'sum',
-                    planned_col: 'sum'
-                })
+                weekly_data = self._period_totals(data, date_col, actual_col, planned_col, 'weekly', cube)
                 weekly_data['variance'] = weekly_data[actual_col] - weekly_data[planned_col]
                 weekly_data['variance_pct'] = (weekly_data['variance'] / weekly_data[planned_col] * 100).replace([np.inf, -np.inf], 0)
                 
@@ -589,10 +620,7 @@ class QuantAnalyzer:
         try:
             # Monthly analysis (if data spans multiple months)
             if date_range.days > 30:
-                monthly_data = data.groupby(data[date_col].dt.to_period('M')).agg({
-                    actual_col: 'sum',
-                    planned_col: 'sum'
-                })
+                monthly_data = self._period_totals(data, date_col, actual_col, planned_col, 'monthly', cube)
                 monthly_data['variance'] = monthly_data[actual_col] - monthly_data[planned_col]
                 monthly_data['variance_pct'] = (monthly_data['variance'] / monthly_data[planned_col] * 100).replace([np.inf, -np.inf], 0)
                 
@@ -614,10 +642,7 @@ class QuantAnalyzer:
         try:
             # Quarterly analysis (if data spans multiple quarters)
             if date_range.days > 90:
-                quarterly_data = data.groupby(data[date_col].dt.to_period('Q')).agg({
-                    actual_col: 'sum',
-                    planned_col: 'sum'
-                })
+                quarterly_data = self._period_totals(data, date_col, actual_col, planned_col, 'quarterly', cube)
                 quarterly_data['variance'] = quarterly_data[actual_col] - quarterly_data[planned_col]
                 quarterly_data['variance_pct'] = (quarterly_data['variance'] / quarterly_data[planned_col] * 100).replace([np.inf, -np.inf], 0)
                 
@@ -639,10 +664,7 @@ class QuantAnalyzer:
         try:
             # Yearly analysis (if data spans multiple years)
             if date_range.days > 365:
-                yearly_data = data.groupby(data[date_col].dt.to_period('Y')).agg({
-                    actual_col: 'sum',
-                    planned_col: 'sum'
-                })
+                yearly_data = self._period_totals(data, date_col, actual_col, planned_col, 'yearly', cube)
                 yearly_data['variance'] = yearly_data[actual_col] - yearly_data[planned_col]
                 yearly_data['variance_pct'] = (yearly_data['variance'] / yearly_data[planned_col] * 100).replace([np.inf, -np.inf], 0)
                 
@@ -663,6 +685,599 @@ class QuantAnalyzer:
         
         return time_analysis
     
+    def _period_totals(self, data: pd.DataFrame, date_col: str, actual_col: str, planned_col: str,
+                       grain: str, cube=None) -> pd.DataFrame:
+        """
+        Actual and planned totals per period at one time grain.
+        
+        Args:
+            data (pd.DataFrame): Data with datetime column
+            actual_col (str): Actual values column
+            planned_col (str): Planned values column
+            date_col (str): Date column name
+            grain (str): 'daily', 'weekly', 'monthly', 'quarterly' or 'yearly'
+            cube (RollupCube, optional): Rollup cube of data to read the totals from
+            
+        Returns:
+            pd.DataFrame: Totals indexed by period
+        """
+        if cube is not None:
+            return cube.rollup(grain, [actual_col, planned_col])
+        
+        if grain == 'daily':
+            periods = data[date_col].dt.date
+        else:
+            periods = data[date_col].dt.to_period(GRAIN_FREQUENCIES[grain])
+        return data.groupby(periods).agg({
+            actual_col: 'sum',
+            planned_col: 'sum'
+        })
+    
+    def multi_pair_variance_analysis(self, data: pd.DataFrame,
+                                     pairs: Optional[List[Dict[str, str]]] = None,
+                                     date_col: Optional[str] = None,
+                                     category_col: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Variance of several actual/planned pairs across all periods and categories at once.
+        
+        Every column used by any pair is totalled in one grouped aggregation
+        (per day and category, from the dataset's rollup cube when it has
+        them); weekly to yearly totals are rolled up from those daily totals
+        and each pair's variance is computed for all rows together.
+        
+        Args:
+            data (pd.DataFrame): The data to analyze
+            pairs (List[Dict[str, str]], optional): Pairs with 'actual', 'planned'
+                and optional 'type' keys (default: detect_variance_pairs on the
+                numeric columns)
+            date_col (str, optional): Date column for per-period variance
+            category_col (str, optional): Column to split every grain by
+            
+        Returns:
+            Dict[str, Any]: 'pairs', 'grains', 'category_col', 'summary' (one
+            dict per pair) and 'variances', a long-format DataFrame with
+            VARIANCE_KEY_COLUMNS, the category column if given, and 'actual',
+            'planned', 'variance', 'variance_pct' (NaN where planned is 0) and
+            'is_favorable'. The 'total' grain has period 'All'. With a date
+            column, rows without a date are left out of every grain.
+        """
+        try:
+            if pairs is None:
+                numeric_columns = data.select_dtypes(include=['number']).columns.tolist()
+                pairs = self.detect_variance_pairs(numeric_columns)
+                # A detected pair and its reverse are the same comparison
+                unordered = {}
+                for pair in pairs:
+                    unordered.setdefault(frozenset((pair['actual'], pair['planned'])), pair)
+                pairs = list(unordered.values())
+            pairs = [pair for pair in pairs if pair['actual'] in data.columns and pair['planned'] in data.columns]
+            if not pairs:
+                return {'error': "No variance comparison pairs found in data"}
+            if category_col is not None and category_col not in data.columns:
+                return {'error': f"Category column '{category_col}' not found in data"}
+            
+            measures = list(dict.fromkeys(col for pair in pairs for col in (pair['actual'], pair['planned'])))
+            categories = [category_col] if category_col else []
+            
+            grain_totals = {}
+            if date_col and date_col in data.columns:
+                daily, first_date, last_date = self._daily_totals(data, date_col, measures, category_col)
+                grain_totals['total'] = daily.groupby(level=categories, observed=True).sum() if categories else daily.sum().to_frame().T
+                
+                span = (last_date - first_date).days if len(daily) else 0
+                periods = daily.index.get_level_values('period')
+                for grain, min_days in GRAIN_MIN_SPAN_DAYS.items():
+                    if span <= min_days:
+                        continue
+                    if grain == 'daily':
+                        grain_totals[grain] = daily
+                    else:
+                        keys = [periods.asfreq(GRAIN_FREQUENCIES[grain]).rename('period')]
+                        keys += [daily.index.get_level_values(col) for col in categories]
+                        grain_totals[grain] = daily.groupby(keys, observed=True, sort=True).sum()
+            elif categories:
+                grain_totals['total'] = data.groupby(category_col, observed=True, sort=True)[measures].sum()
+            else:
+                grain_totals['total'] = data[measures].sum().to_frame().T
+            
+            variances = pd.concat(
+                [self._pair_variances(totals, pairs, grain, measures) for grain, totals in grain_totals.items()],
+                ignore_index=True
+            )
+            # Group the rows by pair, keeping grain and period order within each
+            pair_order = {label: i for i, label in enumerate(variances['pair'].unique())}
+            variances = variances.sort_values('pair', key=lambda col: col.map(pair_order), kind='stable', ignore_index=True)
+            
+            # Per-pair totals, from the 'total' grain (summed over categories)
+            labels = [self._pair_label(pair) for pair in pairs]
+            overall = variances[variances['grain'] == 'total'].groupby('pair', sort=False)[['actual', 'planned']].sum()
+            overall = overall.reindex(labels)
+            variance_absolute = overall['actual'] - overall['planned']
+            planned_total = overall['planned'].to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                variance_percentage = np.where(planned_total != 0, variance_absolute.to_numpy() / planned_total * 100, 0.0)
+            summary = pd.DataFrame({
+                'pair': labels,
+                'actual_col': [pair['actual'] for pair in pairs],
+                'planned_col': [pair['planned'] for pair in pairs],
+                'actual_total': overall['actual'].to_numpy(dtype=float),
+                'planned_total': planned_total.astype(float),
+                'variance_absolute': variance_absolute.to_numpy(dtype=float),
+                'variance_percentage': variance_percentage,
+                'is_favorable': (variance_absolute > 0).to_numpy(),
+            }).to_dict('records')
+            
+            return {
+                'pairs': pairs,
+                'grains': list(grain_totals),
+                'category_col': category_col,
+                'summary': summary,
+                'variances': variances,
+            }
+            
+        except Exception as e:
+            return {'error': f"Multi-pair variance analysis failed: {str(e)}"}
+    
+    def _daily_totals(self, data: pd.DataFrame, date_col: str, measures: List[str],
+                      category_col: Optional[str] = None) -> Tuple[pd.DataFrame, pd.Timestamp, pd.Timestamp]:
+        """
+        Daily totals of several columns, optionally per category, in one aggregation.
+        
+        Args:
+            data (pd.DataFrame): The data to analyze
+            date_col (str): Date column name
+            measures (List[str]): Columns to total
+            category_col (str, optional): Category column to split by
+            
+        Returns:
+            Tuple[pd.DataFrame, pd.Timestamp, pd.Timestamp]: Totals indexed by
+            'period' (daily pd.Period) or ('period', category), and the first
+            and last date
+        """
+        cube = get_rollup_cube(data, date_col, measures, category_col)
+        if cube is not None:
+            return cube.rollup('daily', measures, category_col), cube.first_date, cube.last_date
+        
+        dates = pd.to_datetime(data[date_col])
+        keys = [dates.dt.to_period('D').rename('period')]
+        if category_col:
+            keys.append(data[category_col])
+        daily = data[measures].groupby(keys, observed=True, sort=True).sum()
+        return daily, dates.min(), dates.max()
+    
+    def _pair_variances(self, totals: pd.DataFrame, pairs: List[Dict[str, str]], grain: str,
+                        measures: List[str]) -> pd.DataFrame:
+        """
+        Long-format variance rows of every pair for one grain's totals.
+        
+        Args:
+            totals (pd.DataFrame): Column totals, indexed by period and/or
+                category (the overall total has a plain index)
+            pairs (List[Dict[str, str]]): Actual/planned pairs
+            grain (str): Grain label for the rows
+            measures (List[str]): Total columns
+            
+        Returns:
+            pd.DataFrame: One row per pair and totals row
+        """
+        actual = totals[[pair['actual'] for pair in pairs]].to_numpy(dtype=float)
+        planned = totals[[pair['planned'] for pair in pairs]].to_numpy(dtype=float)
+        row_count, pair_count = actual.shape
+        
+        keys = totals.drop(columns=measures).reset_index()
+        keys = keys[[col for col in keys.columns if col != 'index']]
+        if 'period' in keys.columns:
+            keys['period'] = keys['period'].astype(str)
+        else:
+            keys.insert(0, 'period', 'All')
+        
+        pair_index = np.repeat(np.arange(pair_count), row_count)
+        variances = keys.iloc[np.tile(np.arange(row_count), pair_count)].reset_index(drop=True)
+        variances.insert(0, 'pair', np.array([self._pair_label(pair) for pair in pairs], dtype=object)[pair_index])
+        variances.insert(1, 'actual_col', np.array([pair['actual'] for pair in pairs], dtype=object)[pair_index])
+        variances.insert(2, 'planned_col', np.array([pair['planned'] for pair in pairs], dtype=object)[pair_index])
+        variances.insert(3, 'type', np.array([pair.get('type', 'custom') for pair in pairs], dtype=object)[pair_index])
+        variances.insert(4, 'grain', grain)
+        
+        variances['actual'] = actual.T.ravel()
+        variances['planned'] = planned.T.ravel()
+        variances['variance'] = variances['actual'] - variances['planned']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance_pct = variances['variance'].to_numpy() / variances['planned'].to_numpy() * 100
+        variances['variance_pct'] = np.where(np.isfinite(variance_pct), variance_pct, np.nan)
+        variances['is_favorable'] = variances['variance'] > 0
+        return variances
+    
+    @staticmethod
+    def _pair_label(pair: Dict[str, str]) -> str:
+        """Display label of an actual/planned pair"""
+        return f"{pair['actual']} vs {pair['planned']}"
+    
+    def select_variances(self, results: Dict[str, Any], pair: Optional[str] = None,
+                         grain: Optional[str] = None, category: Optional[Any] = None) -> pd.DataFrame:
+        """
+        Slice the long-format variances of multi_pair_variance_analysis.
+        
+        Args:
+            results (Dict[str, Any]): Results from multi_pair_variance_analysis
+            pair (str, optional): Pair label ('Sales vs Budget') or actual column
+            grain (str, optional): 'total', 'daily', 'weekly', 'monthly', 'quarterly' or 'yearly'
+            category (Any, optional): Category value (needs a category column)
+            
+        Returns:
+            pd.DataFrame: Matching rows
+        """
+        variances = results['variances']
+        mask = np.ones(len(variances), dtype=bool)
+        if pair is not None:
+            mask &= (variances['pair'] == pair).to_numpy() | (variances['actual_col'] == pair).to_numpy()
+        if grain is not None:
+            mask &= (variances['grain'] == grain).to_numpy()
+        if category is not None and results.get('category_col'):
+            mask &= (variances[results['category_col']] == category).to_numpy()
+        return variances[mask]
+    
+    def format_multi_pair_analysis(self, results: Dict[str, Any], grain: Optional[str] = None,
+                                   top_n: int = 3) -> str:
+        """
+        Format multi-pair variance results for display.
+        
+        Args:
+            results (Dict[str, Any]): Results from multi_pair_variance_analysis
+            grain (str, optional): Grain for the largest-variance periods
+                (default: monthly if analysed, else the finest grain)
+            top_n (int): Largest favorable and unfavorable rows shown per pair
+            
+        Returns:
+            str: Formatted analysis report
+        """
+        try:
+            if 'error' in results:
+                return f"❌ **Variance Analysis Error**: {results['error']}"
+            
+            # Imported here: the formatter pulls in the settings, which this module does not need
+            from analyzers.base_analyzer import AnalysisFormatter
+            
+            output_lines = ["## 📊 **Multi-Measure Variance Analysis**", ""]
+            
+            summary = pd.DataFrame(results['summary'])
+            output_lines.append("### 📋 **Summary by Pair**")
+            output_lines.append(AnalysisFormatter.create_table(
+                pd.DataFrame({
+                    'Pair': summary['pair'],
+                    'Actual': summary['actual_total'],
+                    'Planned': summary['planned_total'],
+                    'Variance': summary['variance_absolute'],
+                    'Variance_Pct': summary['variance_percentage'],
+                }),
+                formats={'Actual': 'currency', 'Planned': 'currency', 'Variance': 'currency',
+                         'Variance_Pct': 'percent_points'},
+                max_rows=None
+            ))
+            output_lines.append("")
+            
+            period_grains = [g for g in results['grains'] if g != 'total']
+            if grain is None and period_grains:
+                grain = 'monthly' if 'monthly' in period_grains else period_grains[0]
+            if grain is None:
+                grain = 'total'
+            
+            rows = self.select_variances(results, grain=grain)
+            if len(rows):
+                label_columns = ['period'] + ([results['category_col']] if results.get('category_col') else [])
+                ranked = rows.sort_values('variance', kind='stable')
+                by_pair = ranked.groupby('pair', sort=False)
+                extremes = pd.concat([by_pair.tail(top_n).iloc[::-1], by_pair.head(top_n)])
+                extremes = extremes.drop_duplicates().sort_values('pair', key=lambda col: col.map(
+                    {label: i for i, label in enumerate(summary['pair'])}), kind='stable')
+                
+                output_lines.append(f"### 📅 **Largest {grain.title()} Variances**")
+                output_lines.append(AnalysisFormatter.create_table(
+                    pd.DataFrame({
+                        'Pair': extremes['pair'],
+                        **{col.title(): extremes[col].astype(str) for col in label_columns},
+                        'Variance': extremes['variance'],
+                        'Variance_Pct': extremes['variance_pct'],
+                    }),
+                    formats={'Variance': 'currency', 'Variance_Pct': 'percent_points'},
+                    max_rows=None
+                ))
+                output_lines.append("")
+            
+            favorable = int(summary['is_favorable'].sum())
+            output_lines.append("### 💡 **Key Insights**")
+            output_lines.append(f"• **{favorable} of {len(summary)}** pairs are favorable (actual above planned)")
+            largest = summary.loc[summary['variance_absolute'].abs().idxmax()]
+            output_lines.append(
+                f"• **Largest gap**: {largest['pair']} at ${largest['variance_absolute']:,.2f} "
+                f"({largest['variance_percentage']:+.1f}%)"
+            )
+            
+            return "\n".join(output_lines)
+            
+        except Exception as e:
+            return f"❌ **Formatting Error**: {str(e)}"
+    
+    def hierarchical_variance_analysis(self, data: pd.DataFrame, actual_col: str, planned_col: str,
+                                       hierarchy: List[str], top_n: int = 5,
+                                       max_nodes: int = DEFAULT_MAX_NODES) -> Dict[str, Any]:
+        """
+        Drill-down variance attribution down a category hierarchy.
+        
+        The rows are grouped once, by the full hierarchy (the leaves); every
+        higher level is rolled up from those leaf totals. Starting from the
+        top level, the top_n children of each kept node are kept, ranked by
+        how much they push in the direction of their parent's variance (the
+        biggest shortfalls under a miss, the biggest gains under a beat).
+        Drilling stops once max_nodes nodes are kept, so the cost of the
+        ranking stays bounded however many leaf combinations there are.
+        
+        Args:
+            data (pd.DataFrame): The data to analyze
+            actual_col (str): Column with actual values
+            planned_col (str): Column with planned/comparison values
+            hierarchy (List[str]): Category columns from top to bottom
+                (e.g. ['Region', 'State', 'City'])
+            top_n (int): Children kept per node
+            max_nodes (int): Maximum nodes kept across all levels
+            
+        Returns:
+            Dict[str, Any]: 'total' (actual, planned, variance, variance_pct),
+            'nodes' (DataFrame in drill-down order with 'depth', 'level',
+            'path', the hierarchy columns, 'actual', 'planned', 'variance',
+            'variance_pct', 'share_of_parent' (% of the parent's variance)
+            and 'rank' within the parent), 'top_leaves' (the leaves that
+            contribute most to the total variance, ranked the same way),
+            'leaf_count', 'node_count' and 'truncated' (whether max_nodes
+            stopped the drill-down)
+        """
+        try:
+            missing = [col for col in [actual_col, planned_col] + list(hierarchy) if col not in data.columns]
+            if missing:
+                return {'error': f"Columns not found in data: {', '.join(missing)}"}
+            if not hierarchy:
+                return {'error': "At least one hierarchy column is required"}
+            hierarchy = list(hierarchy)
+            
+            leaves = self._hierarchy_leaf_totals(data, hierarchy, actual_col, planned_col)
+            
+            total = leaves[['actual', 'planned', 'variance']].sum()
+            total_direction = np.sign(total['variance']) or 1.0
+            
+            levels = []
+            scope = leaves
+            kept_parents = None
+            parent_totals = None
+            node_count = 0
+            truncated = False
+            for depth in range(1, len(hierarchy) + 1):
+                if node_count >= max_nodes:
+                    truncated = True
+                    break
+                
+                # Only leaves under kept nodes are rolled up to this level
+                if depth > 1:
+                    scope = scope[scope.index.droplevel(hierarchy[depth - 1:]).isin(kept_parents.index)]
+                keys = hierarchy[:depth]
+                totals = scope if depth == len(hierarchy) else scope.groupby(level=keys, observed=True, sort=False).sum()
+                
+                if depth == 1:
+                    parent_variance = pd.Series(total['variance'], index=totals.index)
+                    parent_ranks = None
+                else:
+                    parent_index = totals.index.droplevel(-1)
+                    parent_variance = pd.Series(parent_totals['variance'].reindex(parent_index).to_numpy(), index=totals.index)
+                    parent_ranks = kept_parents.reindex(parent_index)
+                
+                nodes = totals.copy()
+                direction = np.sign(parent_variance.to_numpy())
+                nodes['_key'] = nodes['variance'].to_numpy() * np.where(direction == 0, 1.0, direction)
+                nodes['share_of_parent'] = self._percent_of(nodes['variance'].to_numpy(), parent_variance.to_numpy())
+                if parent_ranks is not None:
+                    for col in parent_ranks.columns:
+                        nodes[col] = parent_ranks[col].to_numpy()
+                
+                nodes = nodes.sort_values('_key', ascending=False, kind='stable')
+                if depth == 1:
+                    nodes = nodes.head(top_n)
+                    nodes['rank'] = np.arange(1, len(nodes) + 1)
+                else:
+                    by_parent = nodes.groupby(level=hierarchy[:depth - 1], observed=True, sort=False)
+                    nodes = nodes[by_parent.cumcount().to_numpy() < top_n].copy()
+                    nodes['rank'] = nodes.groupby(level=hierarchy[:depth - 1], observed=True, sort=False).cumcount().to_numpy() + 1
+                
+                remaining = max_nodes - node_count
+                if len(nodes) > remaining:
+                    nodes = nodes.sort_values('_key', ascending=False, kind='stable').head(remaining)
+                    truncated = True
+                nodes[f'_rank_{depth}'] = nodes['rank']
+                
+                node_count += len(nodes)
+                levels.append(nodes)
+                kept_parents = nodes[[f'_rank_{d}' for d in range(1, depth + 1)]]
+                parent_totals = nodes[['variance']]
+                if truncated:
+                    break
+            
+            node_frame = self._drilldown_frame(levels, hierarchy)
+            
+            # Positional top N: Series.nlargest drops labels on the MultiIndex one at a time
+            leaf_key = np.nan_to_num(leaves['variance'].to_numpy() * total_direction, nan=-np.inf)
+            top_n_leaves = min(top_n, len(leaf_key))
+            picked = np.argpartition(-leaf_key, top_n_leaves - 1)[:top_n_leaves] if top_n_leaves else np.array([], dtype=int)
+            picked = picked[np.argsort(-leaf_key[picked], kind='stable')]
+            top_leaves = leaves.iloc[picked].reset_index()
+            top_leaves['variance_pct'] = self._percent_of(top_leaves['variance'].to_numpy(), top_leaves['planned'].to_numpy())
+            top_leaves['share_of_total'] = self._percent_of(top_leaves['variance'].to_numpy(), total['variance'])
+            
+            return {
+                'actual_col': actual_col,
+                'planned_col': planned_col,
+                'hierarchy': hierarchy,
+                'total': {
+                    'actual': float(total['actual']),
+                    'planned': float(total['planned']),
+                    'variance': float(total['variance']),
+                    'variance_pct': float(total['variance'] / total['planned'] * 100) if total['planned'] != 0 else 0.0,
+                },
+                'nodes': node_frame,
+                'top_leaves': top_leaves,
+                'leaf_count': len(leaves),
+                'node_count': node_count,
+                'truncated': truncated,
+            }
+            
+        except Exception as e:
+            return {'error': f"Hierarchical variance analysis failed: {str(e)}"}
+    
+    def _hierarchy_leaf_totals(self, data: pd.DataFrame, hierarchy: List[str],
+                               actual_col: str, planned_col: str) -> pd.DataFrame:
+        """
+        Actual, planned and variance totals per leaf combination of a hierarchy.
+        
+        The only pass over the rows; memoised by dataset fingerprint so a
+        further drill-down of the same data (another top_n or node budget)
+        starts from the leaf totals.
+        
+        Args:
+            data (pd.DataFrame): The data to analyze
+            hierarchy (List[str]): Category columns from top to bottom
+            actual_col (str): Column with actual values
+            planned_col (str): Column with planned/comparison values
+            
+        Returns:
+            pd.DataFrame: 'actual', 'planned' and 'variance' indexed by the hierarchy
+        """
+        key = (get_fingerprint(data), tuple(hierarchy), actual_col, planned_col)
+        with _leaf_totals_lock:
+            leaves = _leaf_totals.get(key)
+            if leaves is not None:
+                _leaf_totals.move_to_end(key)
+                return leaves
+        
+        leaves = data.groupby(hierarchy, observed=True, sort=False)[[actual_col, planned_col]].sum()
+        leaves.columns = ['actual', 'planned']
+        leaves['variance'] = leaves['actual'] - leaves['planned']
+        
+        with _leaf_totals_lock:
+            _leaf_totals[key] = leaves
+            while len(_leaf_totals) > MAX_CACHED_LEAF_TOTALS:
+                _leaf_totals.popitem(last=False)
+        return leaves
+    
+    def _drilldown_frame(self, levels: List[pd.DataFrame], hierarchy: List[str]) -> pd.DataFrame:
+        """
+        Combine the kept nodes of each level into one frame in drill-down order.
+        
+        Args:
+            levels (List[pd.DataFrame]): Kept nodes per depth, indexed by the
+                hierarchy prefix, with '_rank_<depth>' columns of their ancestry
+            hierarchy (List[str]): Category columns from top to bottom
+            
+        Returns:
+            pd.DataFrame: Nodes with each parent directly before its children
+        """
+        frames = []
+        for depth, nodes in enumerate(levels, 1):
+            frame = nodes.reset_index()
+            frame.insert(0, 'depth', depth)
+            frame.insert(1, 'level', hierarchy[depth - 1])
+            path = frame[hierarchy[0]].astype(str)
+            for col in hierarchy[1:depth]:
+                path = path + " > " + frame[col].astype(str)
+            frame.insert(2, 'path', path)
+            frames.append(frame)
+        
+        rank_columns = [f'_rank_{depth}' for depth in range(1, len(levels) + 1)]
+        columns = ['depth', 'level', 'path'] + hierarchy + [
+            'actual', 'planned', 'variance', 'variance_pct', 'share_of_parent', 'rank'
+        ]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        
+        nodes = pd.concat(frames, ignore_index=True)
+        nodes['variance_pct'] = self._percent_of(nodes['variance'].to_numpy(), nodes['planned'].to_numpy())
+        # Ancestors' ranks, then own rank; a parent (no deeper rank) sorts first
+        nodes = nodes.sort_values(rank_columns, na_position='first', kind='stable', ignore_index=True)
+        return nodes.reindex(columns=columns)
+    
+    @staticmethod
+    def _percent_of(values: np.ndarray, bases: Any) -> np.ndarray:
+        """values / bases * 100, NaN where the base is 0"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent = np.asarray(values, dtype=float) / bases * 100
+        return np.where(np.isfinite(percent), percent, np.nan)
+    
+    def format_hierarchical_variance(self, results: Dict[str, Any]) -> str:
+        """
+        Format a hierarchical variance drill-down for display.
+        
+        Args:
+            results (Dict[str, Any]): Results from hierarchical_variance_analysis
+            
+        Returns:
+            str: Formatted drill-down report
+        """
+        try:
+            if 'error' in results:
+                return f"❌ **Variance Analysis Error**: {results['error']}"
+            
+            # Imported here: the formatter pulls in the settings, which this module does not need
+            from analyzers.base_analyzer import AnalysisFormatter
+            
+            total = results['total']
+            hierarchy = results['hierarchy']
+            direction = "above" if total['variance'] > 0 else "below"
+            output_lines = [
+                f"## 🔎 **Variance Drill-Down: {' → '.join(hierarchy)}**",
+                "",
+                f"• **{results['actual_col']}** is ${abs(total['variance']):,.2f} {direction} "
+                f"**{results['planned_col']}** ({total['variance_pct']:+.1f}%)",
+                f"• **Leaf combinations**: {results['leaf_count']:,}; nodes shown: {results['node_count']:,}"
+                + (" (node budget reached)" if results['truncated'] else ""),
+                "",
+            ]
+            
+            nodes = results['nodes']
+            if len(nodes):
+                names = nodes[hierarchy].ffill(axis=1).iloc[:, -1].astype(str)
+                indents = np.array(["· " * (depth - 1) for depth in range(1, len(hierarchy) + 1)], dtype=object)
+                output_lines.append("### 📊 **Contributors by Level**")
+                output_lines.append(AnalysisFormatter.create_table(
+                    pd.DataFrame({
+                        'Node': indents[nodes['depth'].to_numpy() - 1] + names.to_numpy(dtype=object),
+                        'Level': nodes['level'],
+                        'Variance': nodes['variance'],
+                        'Variance_Pct': nodes['variance_pct'],
+                        'Share_Of_Parent': nodes['share_of_parent'],
+                    }),
+                    formats={'Variance': 'currency', 'Variance_Pct': 'percent_points',
+                             'Share_Of_Parent': 'percent_points'},
+                    max_rows=None
+                ))
+                output_lines.append("")
+            
+            leaves = results['top_leaves']
+            if len(leaves):
+                path = leaves[hierarchy[0]].astype(str)
+                for col in hierarchy[1:]:
+                    path = path + " > " + leaves[col].astype(str)
+                output_lines.append("### 🎯 **Leaves Explaining the Variance**")
+                output_lines.append(AnalysisFormatter.create_table(
+                    pd.DataFrame({
+                        'Leaf': path,
+                        'Variance': leaves['variance'],
+                        'Share_Of_Total': leaves['share_of_total'],
+                    }),
+                    formats={'Variance': 'currency', 'Share_Of_Total': 'percent_points'},
+                    max_rows=None
+                ))
+            
+            return "\n".join(output_lines)
+            
+        except Exception as e:
+            return f"❌ **Formatting Error**: {str(e)}"
+    
     def _generate_variance_insights(self, results: Dict[str, Any]) -> List[str]:
         """
         Generate business insights from quantitative analysis results.
@@ -21,7 +21,7 @@ from analyzers.contributor_analyzer import ContributorAnalyzer
 from analyzers.financial_analyzer import FinancialAnalyzer
 from analyzers.timescale_analyzer import TimescaleAnalyzer
 from analyzers.news_analyzer_v2 import NewsAnalyzer
-from analyzers.sql_query_engine import SQLQueryEngine
+from analyzers.sql_query_engine import create_sql_engine
 from analyzers.nl_to_sql_translator import NLToSQLTranslator
 from analyzers.enhanced_nl_to_sql_translator import EnhancedNLToSQLTranslator
 from analyzers.strategy_1_llm_enhanced import LLMEnhancedNLToSQL
@@ -57,7 +57,7 @@ class QuantCommanderApp:
         self.narrative_generator = NarrativeGenerator(self.llm_interpreter)
         
         # Initialize SQL components
-        self.sql_engine = SQLQueryEngine()
+        self.sql_engine = create_sql_engine({'sql_backend': self.settings.sql_backend})
         self.nl_to_sql = NLToSQLTranslator(self.settings)
         self.enhanced_nl_to_sql = EnhancedNLToSQLTranslator()
         self.llm_enhanced_sql = LLMEnhancedNLToSQL(self.llm_interpreter)
@@ -21,7 +21,7 @@ from analyzers.contributor_analyzer import ContributorAnalyzer
 from analyzers.financial_analyzer import FinancialAnalyzer
 from analyzers.timescale_analyzer import TimescaleAnalyzer
 from analyzers.news_analyzer_v2 import NewsAnalyzer
-from analyzers.sql_query_engine import SQLQueryEngine
+from analyzers.sql_query_engine import create_sql_engine
 from analyzers.nl_to_sql_translator import NLToSQLTranslator
 from analyzers.query_router import QueryRouter
 from ai.llm_interpreter import LLMInterpreter
@@ -45,7 +45,7 @@ class QuantCommanderApp:
         self.news_analyzer = NewsAnalyzer(self.settings)
         
         # Initialize SQL components
-        self.sql_engine = SQLQueryEngine()
+        self.sql_engine = create_sql_engine({'sql_backend': self.settings.sql_backend})
         self.nl_to_sql = NLToSQLTranslator(self.settings)
         self.query_router = QueryRouter(self.settings)
         
@@ -73,7 +73,9 @@ class QuantCommanderApp:
             
             # Load data into SQL engine for query capabilities
             try:
-                self.sql_engine.load_dataframe_to_sql(self.current_data, table_name="data")
+                self.sql_engine.load_dataframe_to_sql(
+                    self.current_data, table_name="data", column_info=self.csv_loader.column_info
+                )
                 self._sql_data_loaded = True
                 print("[DEBUG] Data loaded into SQL engine successfully")
             except Exception as e:
@@ -688,8 +690,8 @@ class QuantCommanderApp:
                     'first_few_rows': self.current_data.head(3).to_dict('records'),
                     'data_range': {
                         col: {
-                            'min': self.current_data[col].min() if self.current_data[col].dtype in ['int64', 'float64'] else None,
-                            'max': self.current_data[col].max() if self.current_data[col].dtype in ['int64', 'float64'] else None,
+                            'min': self.current_data[col].min() if pd.api.types.is_numeric_dtype(self.current_data[col]) else None,
+                            'max': self.current_data[col].max() if pd.api.types.is_numeric_dtype(self.current_data[col]) else None,
                             'unique_count': self.current_data[col].nunique()
                         } for col in self.current_data.columns[:5]  # Limit to first 5 columns
                     }
@@ -1026,8 +1028,8 @@ Provide a helpful, contextual response as Aria Sterling.
                     # File upload
                     gr.Markdown("### 📊 Upload Financial Data")
                     file_input = gr.File(
-                        label="Choose CSV File",
-                        file_types=[".csv"],
+                        label="Choose Data File (CSV, Parquet, Feather)",
+                        file_types=self.settings.supported_formats,
                         type="filepath"
                     )
                     
@@ -1810,11 +1812,11 @@ RESPOND ONLY WITH VALID JSON (no explanation):
             # Perform the Top/Bottom N analysis
             try:
                 # Group by the specified column and aggregate the value column
-                if self.current_data[value_col].dtype not in ['int64', 'float64']:
+                if not pd.api.types.is_numeric_dtype(self.current_data[value_col]):
                     return f"⚠️ **Non-numeric Value Column**: '{value_col}' must be numeric for ranking analysis."
                 
                 # Aggregate data
-                grouped = self.current_data.groupby(group_by_col)[value_col].agg(['sum', 'mean', 'count']).reset_index()
+                grouped = self.current_data.groupby(group_by_col, observed=True)[value_col].agg(['sum', 'mean', 'count']).reset_index()
                 grouped.columns = [group_by_col, f'{value_col}_Total', f'{value_col}_Average', 'Record_Count']
                 
                 # Sort and get top/bottom N
@@ -1945,7 +1947,9 @@ RESPOND ONLY WITH VALID JSON (no explanation):
                 not self.sql_engine.is_connection_valid()):
                 
                 print("[DEBUG] Loading/reloading data into SQL engine...")
-                success = self.sql_engine.load_dataframe_to_sql(self.current_data, table_name="data")
+                success = self.sql_engine.load_dataframe_to_sql(
+                    self.current_data, table_name="data", column_info=self.csv_loader.column_info
+                )
                 if success:
                     self._sql_data_loaded = True
                     print("[DEBUG] Data loaded into SQL engine successfully")
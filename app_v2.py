@@ -5,7 +5,7 @@ Main application orchestrator - focuses on interface coordination only
 
 import os
 import gradio as gr
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator
 
 # Import our modular components
 from core.app_core import AppCore
@@ -97,6 +97,19 @@ class QuantCommanderApp:
         """
         return self.file_handler.handle_upload(file, history)
     
+    def upload_csv_stream(self, file, history: List[Dict]) -> Iterator[tuple[str, List[Dict]]]:
+        """
+        Handle CSV file upload as a staged job, streaming progress to the UI
+        
+        Args:
+            file: The uploaded file object
+            history: Current chat history
+            
+        Yields:
+            tuple: (upload_status, updated_history) after each upload stage
+        """
+        yield from self.file_handler.handle_upload_stream(file, history)
+    
     def chat_response(self, message: str, history: List[Dict]) -> tuple[List[Dict], str]:
         """
         Handle chat messages - delegates to chat handler with RAG enhancement
@@ -600,7 +613,7 @@ Your documents are ready to enhance financial data analysis!"""
             
             # Event bindings - connecting UI to handlers
             file_input.change(
-                fn=self.upload_csv,
+                fn=self.upload_csv_stream,
                 inputs=[file_input, chatbot],
                 outputs=[upload_status, chatbot]
             )
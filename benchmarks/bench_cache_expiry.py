@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CacheManager lookups with thousands of entries and concurrent readers
+
+Compares the heap-ordered amortised expiry sweep with the previous behaviour
+of scanning every entry for expiry on each get, for growing cache sizes and
+reader thread counts.
+
+Usage:
+    python benchmarks/bench_cache_expiry.py [--entries 1000 5000 20000] [--lookups 20000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache_manager import CacheManager
+
+
+class FullScanCacheManager(CacheManager):
+    """CacheManager that scans every entry for expiry, as get() used to"""
+
+    def _sweep_expired(self, limit=None) -> int:
+        expired_keys = [key for key, entry in self.cache.items() if self._is_expired(entry)]
+        for key in expired_keys:
+            self._remove_entry(key)
+        return len(expired_keys)
+
+
+def fill(cache: CacheManager, entries: int):
+    """Cache `entries` small results, a tenth of them already expired"""
+    for i in range(entries):
+        cache.put(f"dataset_{i}", 'summary', {'value': i}, ttl=0.001 if i % 10 == 0 else 3600)
+    time.sleep(0.01)
+
+
+def run_readers(cache: CacheManager, entries: int, readers: int, lookups: int) -> float:
+    """Run `lookups` gets across `readers` threads and return lookups per second"""
+    def read(i: int):
+        cache.get(f"dataset_{(i * 7919) % entries}", 'summary')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=readers) as executor:
+        list(executor.map(read, range(lookups)))
+    return lookups / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--entries', type=int, nargs='+', default=[1_000, 5_000, 20_000])
+    parser.add_argument('--lookups', type=int, default=20_000)
+    parser.add_argument('--readers', type=int, nargs='+', default=[1, 8])
+    args = parser.parse_args()
+
+    print(f"📊 {args.lookups:,} lookups per run\n")
+    print(f"{'entries':>8} {'readers':>8} | {'full scan':>16} | {'expiry heap':>16}")
+
+    for entries in args.entries:
+        for readers in args.readers:
+            row = []
+            for cache_class in (FullScanCacheManager, CacheManager):
+                # Silence the per-call cache logging while timing
+                with contextlib.redirect_stdout(io.StringIO()):
+                    cache = cache_class(max_size=entries * 2, max_memory_bytes=1 << 40)
+                    fill(cache, entries)
+                    lookups = args.lookups if cache_class is CacheManager else min(args.lookups, 2_000)
+                    row.append(run_readers(cache, entries, readers, lookups))
+            print(f"{entries:>8} {readers:>8} | {row[0]:>12.0f} g/s | {row[1]:>12.0f} g/s")
+
+
+if __name__ == '__main__':
+    main()
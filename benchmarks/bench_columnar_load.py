@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CSV vs Parquet vs Feather uploads and Arrow snapshot restores
+
+Writes the same ledger as CSV, Parquet and Feather, loads each through
+CSVLoader, and then restores the session snapshot taken after the CSV load.
+
+Usage:
+    python benchmarks/bench_columnar_load.py [--rows 1000000] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from data.csv_loader import CSVLoader
+
+
+def make_ledger(rows: int) -> pd.DataFrame:
+    """Synthetic ledger with `rows` rows"""
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        'posting_date': (pd.Timestamp('2023-01-01')
+                         + pd.to_timedelta(rng.integers(0, 730, rows), unit='D')).strftime('%Y-%m-%d'),
+        'account': rng.choice([f'{4000 + i}-GL' for i in range(60)], rows),
+        'region': rng.choice(['North', 'South', 'East', 'West', 'Central'], rows),
+        'actual_amount': rng.normal(1000, 250, rows).round(2),
+        'budget_amount': rng.normal(1000, 200, rows).round(2),
+        'quantity': rng.integers(1, 500, rows),
+    })
+
+
+def best_time(load, repeat: int) -> float:
+    """Best wall time of `load()` in seconds, with loader logging silenced"""
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            load()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    settings = Settings(max_file_size=10 ** 12, max_rows=10 ** 9)
+    frame = make_ledger(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            'csv': os.path.join(tmp, 'ledger.csv'),
+            'parquet': os.path.join(tmp, 'ledger.parquet'),
+            'feather': os.path.join(tmp, 'ledger.feather'),
+        }
+        frame.to_csv(paths['csv'], index=False)
+        frame.to_parquet(paths['parquet'])
+        frame.to_feather(paths['feather'])
+
+        snapshot = os.path.join(tmp, 'session.arrow')
+        with contextlib.redirect_stdout(io.StringIO()):
+            loader = CSVLoader(settings)
+            loader.load_csv(paths['csv'])
+            loader.save_snapshot(snapshot)
+        paths['snapshot'] = snapshot
+
+        print(f"📊 {args.rows:,} rows\n")
+        print(f"{'source':>10} {'file MB':>9} {'load s':>8}")
+        for name, path in paths.items():
+            if name == 'snapshot':
+                seconds = best_time(lambda: CSVLoader(settings).load_snapshot(path), args.repeat)
+            else:
+                seconds = best_time(lambda: CSVLoader(settings).load_csv(path), args.repeat)
+            print(f"{name:>10} {os.path.getsize(path) / (1024 * 1024):>9.1f} {seconds:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
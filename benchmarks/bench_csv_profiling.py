@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CSVLoader column profiling on wide files
+
+Builds frames with hundreds of mixed-type columns (numbers, categories, ISO
+date strings and free text), writes them to CSV, and times parsing and the
+profiling step (column typing, date conversion and data quality) separately.
+
+Usage:
+    python benchmarks/bench_csv_profiling.py [--columns 500 900] [--rows 20000] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from data.csv_loader import CSVLoader
+
+
+def make_wide(columns: int, rows: int) -> pd.DataFrame:
+    """Build a frame cycling through numeric, category, date and text columns"""
+    rng = np.random.default_rng(3)
+    dates = pd.date_range('2020-01-01', periods=rows, freq='h').strftime('%Y-%m-%d %H:%M')
+    data = {}
+    for i in range(columns):
+        kind = i % 10
+        if kind < 4:
+            data[f'amount_{i}'] = rng.normal(100, 30, rows).round(2)
+        elif kind < 6:
+            data[f'units_{i}'] = rng.integers(0, 1000, rows)
+        elif kind < 8:
+            data[f'region_{i}'] = rng.choice(['North', 'South', 'East', 'West'], rows)
+        elif kind == 8:
+            data[f'posting_date_{i}'] = dates
+        else:
+            data[f'note_{i}'] = rng.choice(['ok', 'late', 'review', 'n/a', 'adjusted'], rows)
+    return pd.DataFrame(data)
+
+
+def time_profile(csv_text: str, repeat: int) -> tuple:
+    """Return best parse and best profile time in seconds"""
+    best_parse = best_profile = float('inf')
+    for _ in range(repeat):
+        loader = CSVLoader(Settings())
+        start = time.perf_counter()
+        loader.raw_data = pd.read_csv(io.StringIO(csv_text))
+        parsed = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            loader._profile_data()
+        best_parse = min(best_parse, parsed - start)
+        best_profile = min(best_profile, time.perf_counter() - parsed)
+    return best_parse, best_profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--columns', type=int, nargs='+', default=[500, 900])
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'columns':>8} {'rows':>8} {'CSV MB':>8} {'parse s':>9} {'profile s':>10}")
+    for columns in args.columns:
+        csv_text = make_wide(columns, args.rows).to_csv(index=False)
+        parse_s, profile_s = time_profile(csv_text, args.repeat)
+        print(f"{columns:>8} {args.rows:>8,} {len(csv_text) / (1024 * 1024):>8.1f} "
+              f"{parse_s:>9.2f} {profile_s:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass vs streaming CSV loads through CSVLoader
+
+Writes ledger-style CSV files of increasing size and loads each one in a
+single pass and streamed in chunks, reporting wall time and tracemalloc peak
+memory. Streaming keeps peak memory at a roughly constant multiple of the
+file size (the typed frame plus one chunk) instead of holding the parsed text
+alongside the typed copies.
+
+Usage:
+    python benchmarks/bench_csv_streaming.py [--rows 250000 1000000 2000000] [--chunk-rows 250000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from data.csv_loader import CSVLoader
+
+
+def write_ledger(path: str, rows: int):
+    """Write a synthetic monthly ledger export with `rows` rows"""
+    rng = np.random.default_rng(11)
+    pd.DataFrame({
+        'posting_date': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, rows), unit='D'),
+        'account': rng.choice([f'{4000 + i}' for i in range(60)], rows).astype(object) + '-GL',
+        'region': rng.choice(['North', 'South', 'East', 'West', 'Central'], rows),
+        'product_line': rng.choice([f'Line {i}' for i in range(25)], rows),
+        'actual_amount': rng.normal(1000, 250, rows).round(2),
+        'budget_amount': rng.normal(1000, 200, rows).round(2),
+        'quantity': rng.integers(1, 500, rows),
+    }).to_csv(path, index=False)
+
+
+def measure(path: str, streaming: bool, chunk_rows: int) -> dict:
+    """Load `path` once and return the loader's load_stats"""
+    settings = Settings(max_file_size=10 ** 12, max_rows=10 ** 9, csv_chunk_rows=chunk_rows)
+    loader = CSVLoader(settings)
+    loader.load_csv(path, streaming=streaming, track_memory=True)
+    return loader.load_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[250_000, 1_000_000, 2_000_000])
+    parser.add_argument('--chunk-rows', type=int, default=250_000)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f'ledger_{rows}.csv')
+            write_ledger(path, rows)
+            file_mb = os.path.getsize(path) / (1024 * 1024)
+            for streaming in (False, True):
+                stats = measure(path, streaming, args.chunk_rows)
+                results.append((rows, file_mb, stats))
+
+    print(f"\n{'rows':>10} {'file MB':>9} {'mode':>12} {'time s':>8} {'frame MB':>9} {'peak MB':>9} {'peak/file':>10}")
+    for rows, file_mb, stats in results:
+        peak_mb = stats['peak_memory_bytes'] / (1024 * 1024)
+        frame_mb = stats['frame_memory_bytes'] / (1024 * 1024)
+        print(f"{rows:>10,} {file_mb:>9.1f} {stats['mode']:>12} {stats['seconds']:>8.2f} "
+              f"{frame_mb:>9.1f} {peak_mb:>9.1f} {peak_mb / file_mb:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CSVLoader dtype compaction on a ledger-style upload
+
+Loads the same CSV with and without dtype compaction and reports the frame's
+memory footprint and the time of a category groupby like the one
+ContributorAnalyzer runs, which works on integer codes once labels are
+stored as category.
+
+Usage:
+    python benchmarks/bench_dtype_compaction.py [--rows 200000 1000000] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from data.csv_loader import CSVLoader
+
+
+def make_ledger(rows: int) -> str:
+    """CSV text of a synthetic ledger with `rows` rows"""
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        'posting_date': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, rows), unit='D'),
+        'account': rng.choice([f'{4000 + i}-GL' for i in range(60)], rows),
+        'region': rng.choice(['North', 'South', 'East', 'West', 'Central'], rows),
+        'product_line': rng.choice([f'Line {i}' for i in range(25)], rows),
+        'actual_amount': rng.normal(1000, 250, rows).round(2),
+        'quantity': rng.integers(1, 500, rows),
+    }).to_csv(index=False)
+
+
+def measure(csv_text: str, compact: bool, repeat: int) -> tuple:
+    """Return frame MB, best load time and best groupby time in seconds"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = CSVLoader(Settings(compact_dtypes=compact))
+        start = time.perf_counter()
+        df = loader.load_csv(io.StringIO(csv_text))
+        load_s = time.perf_counter() - start
+
+    best_group = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df.groupby(['product_line', 'region'], observed=True)['quantity'].agg(['sum', 'count', 'mean'])
+        best_group = min(best_group, time.perf_counter() - start)
+
+    frame_mb = df.memory_usage(deep=True).sum() / (1024 * 1024)
+    return frame_mb, load_s, best_group
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[200_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'mode':>10} {'frame MB':>9} {'load s':>8} {'groupby ms':>11}")
+    for rows in args.rows:
+        csv_text = make_ledger(rows)
+        for compact in (False, True):
+            frame_mb, load_s, group_s = measure(csv_text, compact, args.repeat)
+            mode = 'compact' if compact else 'parsed'
+            print(f"{rows:>10,} {mode:>10} {frame_mb:>9.1f} {load_s:>8.2f} {group_s * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
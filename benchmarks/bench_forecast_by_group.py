@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-series forecasting vs ForecastingAnalyzer.forecast_by_group
+
+Forecasts every Region x Product x metric series of a synthetic daily ledger,
+first by filtering the frame and calling analyze_time_series once per series
+(what a caller had to do before), then with forecast_by_group in-process and
+across worker processes.
+
+Usage:
+    python benchmarks/bench_forecast_by_group.py [--regions 10] [--products 30] [--days 1095] [--workers 4]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.forecast_analyzer import ForecastingAnalyzer
+
+
+METRICS = ['Revenue', 'Cost']
+
+
+def make_ledger(regions: int, products: int, days: int) -> pd.DataFrame:
+    """One row per region, product and day"""
+    rng = np.random.default_rng(21)
+    dates = pd.date_range('2022-01-01', periods=days, freq='D')
+    index = pd.MultiIndex.from_product(
+        [[f'Region {i}' for i in range(regions)], [f'Product {i}' for i in range(products)], dates],
+        names=['Region', 'Product', 'Date']
+    )
+    rows = len(index)
+    frame = index.to_frame(index=False)
+    frame['Revenue'] = 1000 + rng.normal(0, 40, rows).cumsum() / 50
+    frame['Cost'] = 600 + rng.normal(0, 25, rows)
+    return frame
+
+
+def per_series(analyzer: ForecastingAnalyzer, data: pd.DataFrame) -> int:
+    """Forecast every series with one analyze_time_series call each"""
+    count = 0
+    for _, group in data.groupby(['Region', 'Product']):
+        for metric in METRICS:
+            analyzer.analyze_time_series(group, metric, 'Date', periods=6)
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--regions', type=int, default=10)
+    parser.add_argument('--products', type=int, default=30)
+    parser.add_argument('--days', type=int, default=1095)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    data = make_ledger(args.regions, args.products, args.days)
+    series = args.regions * args.products * len(METRICS)
+    print(f"📊 {series:,} series x {args.days:,} days ({len(data):,} rows), {os.cpu_count()} CPU(s)\n")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = ForecastingAnalyzer()
+
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        per_series(analyzer, data)
+        timings.append(('per-series calls', time.perf_counter() - start))
+
+        for workers in sorted({1, args.workers}):
+            start = time.perf_counter()
+            analyzer.forecast_by_group(data, ['Region', 'Product'], METRICS, max_workers=workers)
+            timings.append((f'forecast_by_group x{workers}', time.perf_counter() - start))
+
+    baseline = timings[0][1]
+    print(f"{'approach':>24} {'seconds':>8} {'speedup':>8}")
+    for name, seconds in timings:
+        print(f"{name:>24} {seconds:>8.2f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
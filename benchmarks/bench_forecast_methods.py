@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorised exponential smoothing and batched forecasts
+
+Times the loop implementations the forecasting methods used to run (one
+Python step per observation) against the vectorised recurrences, on single
+long daily series and on a batch of series fitted with batch_forecast.
+
+Usage:
+    python benchmarks/bench_forecast_methods.py [--days 3650 36500] [--series 500] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.forecast_methods import batch_forecast, _smooth_double, _smooth_simple
+
+
+def loop_simple_smoothing(values: np.ndarray, alpha: float = 0.3) -> np.ndarray:
+    """Simple exponential smoothing as previously implemented"""
+    smoothed = np.zeros(len(values))
+    smoothed[0] = values[0]
+    for i in range(1, len(values)):
+        smoothed[i] = alpha * values[i] + (1 - alpha) * smoothed[i - 1]
+    return smoothed
+
+
+def loop_double_smoothing(values: np.ndarray, alpha: float = 0.3, beta: float = 0.1) -> np.ndarray:
+    """Holt's method as previously implemented"""
+    level = values[0]
+    trend = values[1] - values[0]
+    levels = np.zeros(len(values))
+    levels[0] = level
+    for i in range(1, len(values)):
+        prev_level = level
+        level = alpha * values[i] + (1 - alpha) * (level + trend)
+        trend = beta * (level - prev_level) + (1 - beta) * trend
+        levels[i] = level
+    return levels
+
+
+def best_time(run, repeat: int) -> float:
+    """Best wall time of `run()` in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_series(days: int, count: int) -> list:
+    """`count` synthetic daily revenue series of `days` observations"""
+    rng = np.random.default_rng(11)
+    dates = pd.date_range('2000-01-01', periods=days, freq='D')
+    trend = np.arange(days)
+    return [
+        pd.Series(1000 + rng.uniform(-0.2, 0.2) * trend + rng.normal(0, 25, days).cumsum(), index=dates)
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--days', type=int, nargs='+', default=[3650, 36500])
+    parser.add_argument('--series', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'days':>8} {'series':>7} {'method':>8} {'loop ms':>10} {'vector ms':>10} {'speedup':>8} {'max rel err':>12}")
+    for days in args.days:
+        # Single long series: the smoothing recurrences themselves
+        values = make_series(days, 1)[0].to_numpy()
+        for name, loop, vectorised in (
+            ('simple', loop_simple_smoothing, lambda v: _smooth_simple(v, 0.3)[0]),
+            ('holt', loop_double_smoothing, lambda v: _smooth_double(v, 0.3, 0.1)[0][0]),
+        ):
+            expected = loop(values)
+            error = np.max(np.abs(vectorised(values) - expected) / np.abs(expected))
+            loop_s = best_time(lambda: loop(values), args.repeat)
+            vector_s = best_time(lambda: vectorised(values), args.repeat)
+            print(f"{days:>8,} {1:>7} {name:>8} {loop_s * 1000:>10.1f} {vector_s * 1000:>10.2f} "
+                  f"{loop_s / vector_s:>7.0f}x {error:>12.1e}")
+
+        # Many series: per-series loops vs one batched fit
+        series = make_series(days, args.series)
+        stacked = [ts_data.to_numpy() for ts_data in series]
+        loop_s = best_time(lambda: [loop_double_smoothing(v) for v in stacked], 1)
+        batch_s = best_time(lambda: batch_forecast(series, periods=6, method='double_exponential_smoothing'),
+                            args.repeat)
+        print(f"{days:>8,} {args.series:>7} {'batch':>8} {loop_s * 1000:>10.1f} {batch_s * 1000:>10.2f} "
+              f"{loop_s / batch_s:>7.0f}x {'':>12}")
+
+
+if __name__ == '__main__':
+    main()
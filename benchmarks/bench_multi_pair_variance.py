@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one variance analysis per pair vs QuantAnalyzer.multi_pair_variance_analysis
+
+Compares Sales, COGS and Opex against budget on a synthetic ledger, first
+with one comprehensive_variance_analysis call per pair (each grouping the
+rows once per time grain), then with a single multi-pair call. The rollup
+cube is switched off so both read the raw rows.
+
+Usage:
+    python benchmarks/bench_multi_pair_variance.py [--rows 1000000] [--pairs 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyzers.variance_analyzer as variance_analyzer
+from analyzers.variance_analyzer import QuantAnalyzer
+
+
+MEASURES = ['Sales', 'COGS', 'Opex', 'Freight', 'Payroll', 'Marketing']
+
+
+def make_ledger(rows: int, pairs: int) -> pd.DataFrame:
+    """Hourly rows over three years with an actual and budget column per measure"""
+    rng = np.random.default_rng(24)
+    data = pd.DataFrame({
+        'Date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 3 * 365 * 24, rows), unit='h'),
+        'Region': rng.choice(['North', 'South', 'East', 'West'], rows),
+    })
+    for measure in MEASURES[:pairs]:
+        data[f'Actual {measure}'] = rng.normal(1000, 200, rows)
+        data[f'Budget {measure}'] = rng.normal(1000, 150, rows)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--pairs', type=int, default=3, choices=range(1, len(MEASURES) + 1))
+    args = parser.parse_args()
+
+    data = make_ledger(args.rows, args.pairs)
+    pairs = [{'actual': f'Actual {m}', 'planned': f'Budget {m}'} for m in MEASURES[:args.pairs]]
+    print(f"📊 {args.rows:,} rows, {len(pairs)} actual/budget pairs\n")
+
+    variance_analyzer.get_rollup_cube = lambda *args, **kwargs: None
+    analyzer = QuantAnalyzer()
+
+    timings = []
+    start = time.perf_counter()
+    for pair in pairs:
+        analyzer.comprehensive_variance_analysis(data, pair['actual'], pair['planned'], 'Date')
+    timings.append(('one call per pair', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    analyzer.multi_pair_variance_analysis(data, pairs, 'Date')
+    timings.append(('multi-pair', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    analyzer.multi_pair_variance_analysis(data, pairs, 'Date', 'Region')
+    timings.append(('multi-pair by region', time.perf_counter() - start))
+
+    baseline = timings[0][1]
+    print(f"{'approach':>22} {'seconds':>8} {'speedup':>8}")
+    for name, seconds in timings:
+        print(f"{name:>22} {seconds:>8.2f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
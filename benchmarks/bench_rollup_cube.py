@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time-based quick actions from raw rows vs the rollup cube
+
+Runs the analyses behind the trends and variance quick actions (timescale
+analysis, the quantitative period breakdown and the financial trend and
+budget variance) on a synthetic ledger, first grouping the raw rows as the
+analyzers used to, then reading the rollup cube built at upload time.
+
+Usage:
+    python benchmarks/bench_rollup_cube.py [--rows 1000000] [--years 3] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.financial_analyzer import FinancialAnalyzer
+from analyzers.timescale_analyzer import TimescaleAnalyzer
+from analyzers.variance_analyzer import QuantAnalyzer
+from config.settings import Settings
+from data.rollup_cube import get_rollup_cube
+from utils.data_fingerprint import register_fingerprint
+
+
+ANALYZER_MODULES = ['analyzers.timescale_analyzer', 'analyzers.variance_analyzer', 'analyzers.financial_analyzer']
+
+
+def make_ledger(rows: int, years: int) -> pd.DataFrame:
+    """Timestamped actual/planned rows across regions and products"""
+    rng = np.random.default_rng(17)
+    return pd.DataFrame({
+        'Date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, years * 365 * 24, rows), unit='h'),
+        'Region': rng.choice([f'Region {i}' for i in range(8)], rows),
+        'Product': rng.choice([f'Product {i}' for i in range(40)], rows),
+        'Actual': rng.normal(1000, 200, rows).round(2),
+        'Planned': rng.normal(1000, 150, rows).round(2),
+        'Units': rng.integers(1, 50, rows),
+    })
+
+
+def quick_actions(data: pd.DataFrame, settings: Settings) -> None:
+    """The analyses behind the trends and variance quick actions"""
+    TimescaleAnalyzer(settings).analyze(data, 'Date', ['Actual', 'Planned', 'Units'])
+    QuantAnalyzer().comprehensive_variance_analysis(data, 'Actual', 'Planned', 'Date')
+    FinancialAnalyzer(settings).analyze(data, 'Date', 'Actual', category_col='Region', analysis_type='trend')
+    FinancialAnalyzer(settings).analyze(data, 'Date', 'Actual', budget_col='Planned', analysis_type='variance')
+
+
+def best_time(run, repeat: int) -> float:
+    """Best wall time of `run()` in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = make_ledger(args.rows, args.years)
+    settings = Settings()
+    print(f"📊 {len(data):,} rows over {args.years} years\n")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Upload: fingerprint and cube are built once
+        start = time.perf_counter()
+        register_fingerprint(data)
+        get_rollup_cube(data, 'Date')
+        build_s = time.perf_counter() - start
+
+        with contextlib.ExitStack() as stack:
+            for module in ANALYZER_MODULES:
+                stack.enter_context(patch(f'{module}.get_rollup_cube', lambda *args, **kwargs: None))
+            rows_s = best_time(lambda: quick_actions(data, settings), args.repeat)
+
+        cube_s = best_time(lambda: quick_actions(data, settings), args.repeat)
+
+    print(f"{'path':>18} {'seconds':>8} {'speedup':>8}")
+    print(f"{'raw rows':>18} {rows_s:>8.3f} {1:>7.1f}x")
+    print(f"{'rollup cube':>18} {cube_s:>8.3f} {rows_s / cube_s:>7.1f}x")
+    print(f"\n🧊 Cube built once at upload in {build_s:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
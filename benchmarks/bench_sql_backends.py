@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SQLite vs DuckDB execution backends
+
+Scales sample_data/sales_budget_actuals.csv to millions of rows and times
+loading plus the aggregate-heavy variance and top-N queries the app runs,
+on both SQLQueryEngine backends.
+
+Usage:
+    python benchmarks/bench_sql_backends.py [--rows 2000000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analyzers.sql_query_engine import create_sql_engine
+from analyzers.duckdb_query_engine import DUCKDB_AVAILABLE
+
+
+QUERIES = {
+    'variance by region': (
+        "SELECT region, SUM(actual_sales) AS actual, SUM(budget_sales) AS budget, "
+        "SUM(actual_sales) - SUM(budget_sales) AS variance "
+        "FROM data GROUP BY region ORDER BY variance"
+    ),
+    'variance by region x line': (
+        "SELECT region, product_line, SUM(actual_sales - budget_sales) AS variance, "
+        "AVG(actual_price - budget_price) AS price_gap "
+        "FROM data GROUP BY region, product_line"
+    ),
+    'top 10 periods': (
+        "SELECT period_end, SUM(actual_sales) AS sales FROM data "
+        "GROUP BY period_end ORDER BY sales DESC LIMIT 10"
+    ),
+    'filtered top-N rows': (
+        "SELECT region, product_line, actual_sales FROM data "
+        "WHERE region = 'South' ORDER BY actual_sales DESC LIMIT 25"
+    ),
+}
+
+
+def scale_sample(rows: int) -> pd.DataFrame:
+    """Tile the sample file to `rows` rows, jittering the measures"""
+    base = pd.read_csv(os.path.join(ROOT, 'sample_data', 'sales_budget_actuals.csv'))
+    reps = int(np.ceil(rows / len(base)))
+    data = pd.concat([base] * reps, ignore_index=True).iloc[:rows]
+
+    rng = np.random.default_rng(7)
+    for col in data.select_dtypes(include=['number']).columns:
+        data[col] = data[col] * rng.uniform(0.9, 1.1, len(data))
+    return data
+
+
+def time_backend(backend: str, data: pd.DataFrame, repeat: int) -> dict:
+    """Return load time and best-of-`repeat` query times in milliseconds"""
+    engine = create_sql_engine({'sql_backend': backend})
+
+    start = time.perf_counter()
+    if not engine.load_dataframe_to_sql(data, 'data'):
+        raise RuntimeError(f"{backend}: load failed")
+    timings = {'load': (time.perf_counter() - start) * 1000}
+
+    for name, query in QUERIES.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = engine.execute_query(query)
+            best = min(best, time.perf_counter() - start)
+            if not result.success:
+                raise RuntimeError(f"{backend}: {name} failed: {result.error_message}")
+        timings[name] = best * 1000
+
+    engine.close_connection()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    backends = ['sqlite'] + (['duckdb'] if DUCKDB_AVAILABLE else [])
+    if not DUCKDB_AVAILABLE:
+        print("⚠️ duckdb is not installed; timing SQLite only")
+
+    data = scale_sample(args.rows)
+    print(f"📊 {len(data):,} rows x {len(data.columns)} columns\n")
+
+    results = {backend: time_backend(backend, data, args.repeat) for backend in backends}
+
+    print(f"\n{'step':<28}" + "".join(f"{b:>14}" for b in backends))
+    for step in ['load'] + list(QUERIES):
+        row = "".join(f"{results[b][step]:>11.1f} ms" for b in backends)
+        print(f"{step:<28}{row}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent aggregate queries through SQLQueryEngine
+
+Runs the same batch of GROUP BY queries with a single-connection pool
+(equivalent to the old global query lock) and with a pool sized to the
+machine's cores, for increasing numbers of client threads.
+
+Usage:
+    python benchmarks/bench_sql_concurrency.py [--rows 500000] [--queries 64]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.sql_query_engine import SQLQueryEngine
+
+
+QUERIES = [
+    "SELECT Region, SUM(Actual) AS actual, SUM(Budget) AS budget FROM data GROUP BY Region",
+    "SELECT Product, AVG(Actual - Budget) AS avg_variance FROM data GROUP BY Product",
+    "SELECT Region, Product, COUNT(*) AS n FROM data GROUP BY Region, Product",
+    "SELECT Channel, MAX(Actual) AS peak FROM data WHERE Actual > Budget GROUP BY Channel",
+]
+
+
+def make_data(rows: int) -> pd.DataFrame:
+    """Build a synthetic sales frame with a few low-cardinality dimensions"""
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        'Region': rng.choice(['North', 'South', 'East', 'West', 'Central'], rows),
+        'Product': rng.choice([f'Product_{i}' for i in range(40)], rows),
+        'Channel': rng.choice(['Online', 'Retail', 'Partner'], rows),
+        'Actual': rng.normal(1000, 250, rows).round(2),
+        'Budget': rng.normal(1000, 200, rows).round(2),
+    })
+
+
+def run_batch(engine: SQLQueryEngine, clients: int, total_queries: int) -> float:
+    """Run total_queries across `clients` threads and return queries per second"""
+    def run_one(i: int):
+        result = engine.execute_query(QUERIES[i % len(QUERIES)])
+        if not result.success:
+            raise RuntimeError(result.error_message)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(run_one, range(total_queries)))
+    return total_queries / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--queries', type=int, default=64)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    client_counts = sorted({1, 2, 4, cores})
+    data = make_data(args.rows)
+    print(f"📊 {args.rows:,} rows, {args.queries} aggregate queries per run, {cores} cores\n")
+
+    results = {}
+    for label, pool_size in [('pool=1 (serialised)', 1), (f'pool={cores}', cores)]:
+        engine = SQLQueryEngine({'sql_pool_size': pool_size, 'sql_pool_max_wait': 600})
+        engine.load_dataframe_to_sql(data, 'data')
+        engine.execute_query(QUERIES[0])  # warm the page cache
+        results[label] = [run_batch(engine, clients, args.queries) for clients in client_counts]
+        print(f"   {label}: {engine.get_pool_stats()}")
+        engine.close_connection()
+
+    print(f"\n{'clients':>8} | " + " | ".join(f"{label:>20}" for label in results))
+    for i, clients in enumerate(client_counts):
+        row = " | ".join(f"{results[label][i]:>16.1f} q/s" for label in results)
+        print(f"{clients:>8} | {row}")
+
+
+if __name__ == '__main__':
+    main()
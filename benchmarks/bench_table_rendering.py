@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cell-by-cell table rendering vs AnalysisFormatter.create_table
+
+Renders a synthetic results table as Markdown, first the way
+create_banded_table used to (row dictionaries built with iterrows, each
+cell type-checked and formatted on its own), then with create_table
+formatting whole columns at once.
+
+Usage:
+    python benchmarks/bench_table_rendering.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.base_analyzer import AnalysisFormatter
+
+
+def make_results(rows: int) -> pd.DataFrame:
+    """A query-result-shaped frame with text, currency, count and percentage columns"""
+    rng = np.random.default_rng(23)
+    return pd.DataFrame({
+        'Region': rng.choice(['North', 'South', 'East', 'West'], rows),
+        'Product': [f'SKU {i:05d}' for i in range(rows)],
+        'Revenue': rng.normal(50_000, 30_000, rows) * rng.random(rows) * 100,
+        'Cost': rng.normal(20_000, 5_000, rows),
+        'Units': rng.integers(1, 100_000, rows),
+        'Margin_Pct': rng.normal(25, 10, rows),
+    })
+
+
+def cell_by_cell(data: pd.DataFrame) -> str:
+    """Row dictionaries from iterrows, then one formatting decision per cell"""
+    records = [row.to_dict() for _, row in data.iterrows()]
+    headers = list(data.columns)
+
+    col_widths = {header: max([len(header)] + [len(str(row[header])) for row in records]) for header in headers}
+    lines = [
+        "| " + " | ".join(header.ljust(col_widths[header]) for header in headers) + " |",
+        "| " + " | ".join("-" * col_widths[header] for header in headers) + " |",
+    ]
+    for row in records:
+        cells = []
+        for header in headers:
+            value = row[header]
+            if isinstance(value, (int, float)) and not pd.isna(value):
+                if 'pct' in header.lower():
+                    value_str = f"{value:.1f}%"
+                elif header.lower() in ['revenue', 'cost']:
+                    value_str = AnalysisFormatter.format_currency(value)
+                else:
+                    value_str = AnalysisFormatter.format_number(value, 1)
+            else:
+                value_str = str(value)
+            cells.append(value_str.ljust(col_widths[header]))
+        lines.append(f"| {' | '.join(cells)} |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = make_results(args.rows)
+    print(f"📊 {args.rows:,} rows x {len(data.columns)} columns, best of {args.repeat}\n")
+
+    approaches = [
+        ('cell by cell', lambda: cell_by_cell(data)),
+        ('create_table', lambda: AnalysisFormatter.create_table(data, max_rows=None)),
+    ]
+    timings = []
+    for name, render in approaches:
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            render()
+            best = min(best, time.perf_counter() - start)
+        timings.append((name, best))
+
+    baseline = timings[0][1]
+    print(f"{'approach':>14} {'ms':>8} {'speedup':>8}")
+    for name, seconds in timings:
+        print(f"{name:>14} {seconds * 1000:>8.1f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-category TTM loop vs FinancialAnalyzer.calculate_ttm
+
+Computes trailing-twelve-month sums and YoY growth of two value columns for
+every SKU of a synthetic monthly ledger, first with a rolling window per
+SKU and column (what the groupby/apply path did), then with the dense
+month x category calculation in one call.
+
+Usage:
+    python benchmarks/bench_ttm.py [--skus 2000] [--months 48]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.financial_analyzer import FinancialAnalyzer
+from config.settings import Settings
+
+
+VALUE_COLUMNS = ['Revenue', 'Cost']
+
+
+def make_ledger(skus: int, months: int) -> pd.DataFrame:
+    """Four rows per SKU and month, with a tenth of SKU-months missing"""
+    rng = np.random.default_rng(22)
+    dates = pd.date_range('2020-01-01', periods=months, freq='MS')
+    index = pd.MultiIndex.from_product([[f'SKU {i:05d}' for i in range(skus)], dates], names=['SKU', 'Date'])
+    frame = index.to_frame(index=False)
+    frame = frame[rng.random(len(frame)) > 0.1]
+    frame = frame.loc[frame.index.repeat(4)].reset_index(drop=True)
+    frame['Date'] += pd.to_timedelta(rng.integers(0, 28, len(frame)), unit='D')
+    frame['Revenue'] = rng.normal(1000, 150, len(frame))
+    frame['Cost'] = rng.normal(600, 90, len(frame))
+    return frame
+
+
+def per_category(data: pd.DataFrame) -> int:
+    """Rolling 12-month sums and YoY growth one SKU and column at a time"""
+    count = 0
+    for _, group in data.groupby('SKU'):
+        monthly = group.groupby(group['Date'].dt.to_period('M'))[VALUE_COLUMNS].sum()
+        monthly = monthly.reindex(pd.period_range(monthly.index.min(), monthly.index.max(), freq='M'), fill_value=0)
+        for col in VALUE_COLUMNS:
+            ttm = monthly[col].rolling(12).sum()
+            previous = ttm.shift(12)
+            ((ttm - previous) / previous * 100).dropna()
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--skus', type=int, default=2000)
+    parser.add_argument('--months', type=int, default=48)
+    args = parser.parse_args()
+
+    data = make_ledger(args.skus, args.months)
+    print(f"📊 {args.skus:,} SKUs x {args.months} months x {len(VALUE_COLUMNS)} columns ({len(data):,} rows)\n")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = FinancialAnalyzer(Settings())
+
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        per_category(data)
+        timings.append(('per-category loop', time.perf_counter() - start))
+
+        start = time.perf_counter()
+        analyzer.calculate_ttm(data, 'Date', VALUE_COLUMNS, 'SKU')
+        timings.append(('calculate_ttm', time.perf_counter() - start))
+
+    baseline = timings[0][1]
+    print(f"{'approach':>20} {'seconds':>8} {'speedup':>8}")
+    for name, seconds in timings:
+        print(f"{name:>20} {seconds:>8.2f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
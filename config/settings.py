@@ -27,13 +27,29 @@ class Settings:
     llm_context_length: int = 8192
     
     # File Processing
-    max_file_size: int = 50_000_000  # 50MB
+    max_file_size: int = 50_000_000  # 50MB; larger files on disk are streamed
+    max_rows: int = 1_000_000  # Row cap for files read in one pass
+    max_stream_file_size: int = 5_000_000_000  # 5GB cap for streamed files
+    max_stream_rows: int = 100_000_000  # Row cap for streamed files
+    csv_chunk_rows: int = 250_000  # Rows parsed per chunk when streaming
+    compact_dtypes: bool = True  # Downcast numerics and encode text as category on load
+    category_max_ratio: float = 0.05  # Max distinct/rows ratio for category encoding
+    category_max_labels: int = 10_000  # Max distinct labels for category encoding
     supported_formats: List[str] = None
+    snapshot_dir: str = ""  # Directory for Arrow snapshots of loaded files; empty disables
     
     # UI Configuration
     gradio_port: int = 7860
     gradio_share: bool = False
     
+    # SQL Execution
+    sql_backend: str = "sqlite"  # 'sqlite' or 'duckdb' (needs the duckdb package)
+    
+    # Result Cache
+    cache_max_memory_mb: int = 256  # Memory budget for cached analysis results
+    cache_disk_dir: str = ""  # Directory for the restart-surviving disk tier ('' disables it)
+    cache_disk_max_mb: int = 1024  # Size cap for the disk tier
+    
     # Analysis Configuration
     contribution_threshold: float = 0.8  # For 80/20 analysis
     timescale_auto_detect: bool = True
@@ -46,7 +62,7 @@ class Settings:
     def __post_init__(self):
         """Initialize default values that need to be mutable"""
         if self.supported_formats is None:
-            self.supported_formats = ['.csv']
+            self.supported_formats = ['.csv', '.parquet', '.feather', '.arrow']
     
     @classmethod
     def from_env(cls) -> 'Settings':
@@ -63,6 +79,17 @@ class Settings:
             gradio_port=int(os.getenv('GRADIO_SERVER_PORT', '7860')),
             gradio_share=os.getenv('GRADIO_SHARE', 'false').lower() == 'true',
             contribution_threshold=float(os.getenv('QUANTCOMMANDER_CONTRIBUTION_THRESHOLD', '0.8')),
+            sql_backend=os.getenv('QUANTCOMMANDER_SQL_BACKEND', 'sqlite').lower(),
+            cache_max_memory_mb=int(os.getenv('QUANTCOMMANDER_CACHE_MAX_MEMORY_MB', '256')),
+            cache_disk_dir=os.getenv('QUANTCOMMANDER_CACHE_DISK_DIR', ''),
+            cache_disk_max_mb=int(os.getenv('QUANTCOMMANDER_CACHE_DISK_MAX_MB', '1024')),
+            max_stream_file_size=int(os.getenv('QUANTCOMMANDER_MAX_STREAM_FILE_SIZE', '5000000000')),
+            max_stream_rows=int(os.getenv('QUANTCOMMANDER_MAX_STREAM_ROWS', '100000000')),
+            csv_chunk_rows=int(os.getenv('QUANTCOMMANDER_CSV_CHUNK_ROWS', '250000')),
+            compact_dtypes=os.getenv('QUANTCOMMANDER_COMPACT_DTYPES', 'true').lower() == 'true',
+            category_max_ratio=float(os.getenv('QUANTCOMMANDER_CATEGORY_MAX_RATIO', '0.05')),
+            category_max_labels=int(os.getenv('QUANTCOMMANDER_CATEGORY_MAX_LABELS', '10000')),
+            snapshot_dir=os.getenv('QUANTCOMMANDER_SNAPSHOT_DIR', ''),
         )
     
     def validate(self) -> bool:
@@ -84,12 +111,33 @@ class Settings:
         if self.max_file_size <= 0:
             raise ValueError("Max file size must be positive")
         
+        if self.max_stream_file_size < self.max_file_size:
+            raise ValueError("Max streamed file size must be at least the max file size")
+        
+        if self.max_rows <= 0 or self.max_stream_rows <= 0 or self.csv_chunk_rows <= 0:
+            raise ValueError("Row limits and CSV chunk size must be positive")
+        
+        if not (0.0 < self.category_max_ratio <= 1.0):
+            raise ValueError("Category max ratio must be between 0.0 and 1.0")
+        
+        if self.category_max_labels <= 0:
+            raise ValueError("Category max labels must be positive")
+        
         if not (0.1 <= self.contribution_threshold <= 1.0):
             raise ValueError("Contribution threshold must be between 0.1 and 1.0")
         
         if not (1024 <= self.gradio_port <= 65535):
             raise ValueError("Gradio port must be between 1024 and 65535")
         
+        if self.cache_max_memory_mb <= 0:
+            raise ValueError("Cache memory budget must be positive")
+        
+        if self.cache_disk_max_mb <= 0:
+            raise ValueError("Disk cache size cap must be positive")
+        
+        if self.sql_backend not in ('sqlite', 'duckdb'):
+            raise ValueError("SQL backend must be 'sqlite' or 'duckdb'")
+        
         return True
     
     def get_ollama_config(self) -> dict:
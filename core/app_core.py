@@ -7,11 +7,15 @@ import uuid
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+import pandas as pd
+
 from .ollama_connector import OllamaConnector
 from analyzers.timescale_analyzer import TimescaleAnalyzer
 from analyzers.base_analyzer import AnalysisError
 from analyzers.nl2sql_function_caller import NL2SQLFunctionCaller
 from config.settings import Settings
+from utils.data_fingerprint import get_fingerprint
+from data.dataset_profile import DatasetProfile, get_dataset_profile
 
 
 class AppCore:
@@ -25,6 +29,7 @@ class AppCore:
         # Application state
         self.current_data: Optional[Any] = None
         self.data_summary: Optional[Dict] = None
+        self.data_fingerprint: Optional[str] = None
         self.gradio_status: str = "Initializing"
         
         # Initialize Ollama connector
@@ -100,12 +105,23 @@ class AppCore:
         """Get current Ollama connection status"""
         return self.ollama_connector.get_status()
     
-    def set_current_data(self, data: Any, summary: Optional[Dict] = None) -> None:
-        """Set current data and optional summary"""
+    def set_current_data(self, data: Any, summary: Optional[Dict] = None,
+                         fingerprint: Optional[str] = None) -> None:
+        """Set current data and optional summary, fingerprinting DataFrames once
+
+        Pass the fingerprint CSVLoader already registered to skip hashing the frame again.
+        """
         self.current_data = data
         self.data_summary = summary
+        if fingerprint is None and isinstance(data, pd.DataFrame):
+            fingerprint = get_fingerprint(data)
+        self.data_fingerprint = fingerprint if isinstance(data, pd.DataFrame) else None
         print(f"[DEBUG] Data updated in session {self.session_id}")
     
+    def get_profile(self) -> Optional[DatasetProfile]:
+        """Get the current dataset's profile, built once per upload and then reused"""
+        return get_dataset_profile(self.current_data)
+    
     def get_current_data(self) -> tuple[Any, Optional[Dict]]:
         """Get current data and summary"""
         return self.current_data, self.data_summary
@@ -118,6 +134,7 @@ class AppCore:
         """Clear current data and summary"""
         self.current_data = None
         self.data_summary = None
+        self.data_fingerprint = None
         print(f"[DEBUG] Data cleared in session {self.session_id}")
     
     def get_session_info(self) -> Dict[str, str]:
@@ -4,5 +4,7 @@ Handles CSV loading and data validation
 """
 
 from .csv_loader import CSVLoader
+from .dataset_profile import DatasetProfile, get_dataset_profile
+from .rollup_cube import RollupCube, get_rollup_cube
 
-__all__ = ['CSVLoader']
+__all__ = ['CSVLoader', 'DatasetProfile', 'get_dataset_profile', 'RollupCube', 'get_rollup_cube']
@@ -1,13 +1,31 @@
 """
 CSV Loader for Quant Commander
 Handles CSV file loading, validation, and column detection
+Also reads Parquet and Arrow IPC (Feather) files and Arrow session snapshots
 """
 
+import numpy as np
 import pandas as pd
+import hashlib
 import io
+import json
+import os
+import time
+import tracemalloc
+import warnings
 from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 from config.settings import Settings
+from utils.data_fingerprint import register_fingerprint
+
+# Optional Parquet / Arrow IPC support
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 
 class CSVLoadError(Exception):
@@ -15,6 +33,54 @@ class CSVLoadError(Exception):
     pass
 
 
+# Column-name hints for date columns (shared by streaming and column detection)
+DATE_NAME_TERMS = ['date', 'time', 'period', 'day', 'month', 'year']
+
+# Rows sampled (evenly spaced) to decide column types during profiling
+PROFILE_SAMPLE_ROWS = 1000
+
+# Non-null sampled values parsed to decide whether a text column holds dates
+DATE_SAMPLE_VALUES = 20
+
+# Largest magnitude an int64 column may hold to be stored as int32: products of
+# two such values, and sums over the column, must still fit in int32
+INT32_SAFE_MAGNITUDE = 46_340
+
+# Columnar file extensions read without parsing text ('.arrow' is Feather v2)
+COLUMNAR_FORMATS = ('.parquet', '.feather', '.arrow')
+
+# Schema metadata key holding the loader state in a session snapshot
+SNAPSHOT_METADATA_KEY = b'quant_commander'
+SNAPSHOT_VERSION = 1
+
+
+def read_columnar(file_path: str) -> pd.DataFrame:
+    """
+    Read a Parquet or Arrow IPC (Feather) file, memory-mapping it
+    
+    Args:
+        file_path: Path ending in one of ``COLUMNAR_FORMATS``
+        
+    Returns:
+        Loaded DataFrame
+        
+    Raises:
+        CSVLoadError: If pyarrow is missing or the file cannot be read
+    """
+    if not PYARROW_AVAILABLE:
+        raise CSVLoadError("Parquet and Arrow files require pyarrow (pip install pyarrow)")
+    
+    try:
+        if file_path.lower().endswith('.parquet'):
+            table = pq.read_table(file_path, memory_map=True)
+        else:
+            table = feather.read_table(file_path, memory_map=True)
+        return table.to_pandas()
+    except (OSError, pa.ArrowException) as e:
+        raise CSVLoadError(f"Unable to read {Path(file_path).suffix} file: {str(e)}")
+
+
+
 class CSVLoader:
     """
     Handles CSV file loading and basic validation
@@ -34,13 +100,33 @@ class CSVLoader:
         self.status: str = "not_loaded"
         self.column_info: Dict[str, any] = {}
         self.data_quality: Dict[str, any] = {}
+        self.fingerprint: Optional[str] = None
+        self.load_stats: Dict[str, any] = {}
+        self.dtype_report: Dict[str, any] = {}
     
-    def load_csv(self, file_input: Union[str, bytes, io.StringIO]) -> pd.DataFrame:
+    def load_csv(self, file_input: Union[str, bytes, io.StringIO],
+                 streaming: Optional[bool] = None,
+                 track_memory: bool = False) -> pd.DataFrame:
         """
         Load and validate CSV file from various input types
         
+        Files are either read in one pass or streamed in chunks of
+        ``settings.csv_chunk_rows`` rows. Streaming never holds the whole
+        file's text in memory, and it lifts the size and row caps to
+        ``max_stream_file_size`` and ``max_stream_rows``.
+        
+        Paths ending in ``.parquet``, ``.feather`` or ``.arrow`` are read
+        memory-mapped with pyarrow under the streaming caps. When
+        ``settings.snapshot_dir`` is set, each loaded file is snapshotted
+        there and later loads of the same file restore the snapshot.
+        
         Args:
             file_input: File path string, file bytes, or StringIO object
+            streaming: Force streaming on or off. By default, file paths larger
+                than ``max_file_size`` are streamed and everything else is
+                read in one pass
+            track_memory: Measure peak Python heap use during the load with
+                tracemalloc (reported in ``load_stats['peak_memory_bytes']``)
             
         Returns:
             Loaded DataFrame
@@ -48,6 +134,18 @@ class CSVLoader:
         Raises:
             CSVLoadError: If loading or validation fails
         """
+        started_tracing = False
+        if track_memory:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+        load_start = time.perf_counter()
+        stream = bool(streaming)
+        columnar = False
+        snapshot_path = None
+        
         try:
             # Handle different input types
             if isinstance(file_input, str):
@@ -56,54 +154,90 @@ class CSVLoader:
                 if not Path(file_input).exists():
                     raise CSVLoadError(f"File not found: {file_input}")
                 
+                snapshot_path = self._snapshot_path_for(file_input)
+                if snapshot_path and os.path.exists(snapshot_path):
+                    try:
+                        return self.load_snapshot(snapshot_path)
+                    except CSVLoadError as e:
+                        print(f"[CSVLoader] Ignoring unreadable snapshot: {str(e)}")
+                
                 # Check file size
                 file_size = Path(file_input).stat().st_size
-                if file_size > self.settings.max_file_size:
-                    raise CSVLoadError(
-                        f"File too large: {file_size:,} bytes. "
-                        f"Maximum allowed: {self.settings.max_file_size:,} bytes"
-                    )
+                columnar = Path(file_input).suffix.lower() in COLUMNAR_FORMATS
+                stream = streaming if streaming is not None else file_size > self.settings.max_file_size
                 
-                self.raw_data = pd.read_csv(file_input)
+                if columnar:
+                    # No text to parse, so only the streaming caps apply
+                    self._check_file_size(file_size, True)
+                    self.raw_data = read_columnar(file_input)
+                    stream = True
+                elif stream:
+                    self._check_file_size(file_size, stream)
+                    self.raw_data = self._read_csv_streaming(file_input)
+                else:
+                    self._check_file_size(file_size, stream)
+                    try:
+                        self.raw_data = pd.read_csv(file_input)
+                    except UnicodeDecodeError:
+                        self.raw_data = pd.read_csv(file_input, encoding='latin-1')
                 
             elif isinstance(file_input, bytes):
                 # File bytes
-                if len(file_input) > self.settings.max_file_size:
-                    raise CSVLoadError(
-                        f"File too large: {len(file_input):,} bytes. "
-                        f"Maximum allowed: {self.settings.max_file_size:,} bytes"
-                    )
+                self._check_file_size(len(file_input), stream)
                 
-                # Decode bytes to string and create StringIO
-                try:
-                    file_content = file_input.decode('utf-8')
-                except UnicodeDecodeError:
-                    # Try other encodings
+                if stream:
+                    self.raw_data = self._read_csv_streaming(io.BytesIO(file_input))
+                else:
+                    # Decode bytes to string and create StringIO
                     try:
-                        file_content = file_input.decode('latin-1')
+                        file_content = file_input.decode('utf-8')
                     except UnicodeDecodeError:
-                        raise CSVLoadError("Unable to decode file. Please ensure it's a valid CSV file.")
-                
-                self.raw_data = pd.read_csv(io.StringIO(file_content))
+                        # Try other encodings
+                        try:
+                            file_content = file_input.decode('latin-1')
+                        except UnicodeDecodeError:
+                            raise CSVLoadError("Unable to decode file. Please ensure it's a valid CSV file.")
+                    
+                    self.raw_data = pd.read_csv(io.StringIO(file_content))
                 
             elif isinstance(file_input, io.StringIO):
                 # StringIO object
-                self.raw_data = pd.read_csv(file_input)
+                if stream:
+                    self.raw_data = self._read_csv_streaming(file_input)
+                else:
+                    self.raw_data = pd.read_csv(file_input)
                 
             else:
                 raise CSVLoadError(f"Unsupported input type: {type(file_input)}")
             
             # Validate the loaded data
-            if not self._validate_structure():
+            max_rows = self.settings.max_stream_rows if stream else self.settings.max_rows
+            if not self._validate_structure(max_rows):
                 raise CSVLoadError("CSV validation failed")
             
-            # Detect column types
-            self.column_info = self._detect_columns()
+            # Detect column types and analyze data quality in one pass
+            self.column_info, self.data_quality = self._profile_data()
+            
+            # Shrink the typed frame before anything keeps a reference to it
+            if self.settings.compact_dtypes:
+                self.dtype_report = self._compact_dtypes()
+                for col, change in self.dtype_report['converted'].items():
+                    self.data_quality['data_types'][col] = change['to']
+            else:
+                self.dtype_report = {}
+            
+            # Fingerprint the typed frame once so cache lookups never re-hash it
+            self.fingerprint = register_fingerprint(self.raw_data)
             
-            # Analyze data quality
-            self.data_quality = self._analyze_data_quality()
+            mode = 'columnar' if columnar else ('streaming' if stream else 'single_pass')
+            self._record_load_stats(mode, time.perf_counter() - load_start, track_memory)
             
             self.status = "loaded"
+            if snapshot_path:
+                try:
+                    self.save_snapshot(snapshot_path)
+                except CSVLoadError as e:
+                    print(f"[CSVLoader] Snapshot not saved: {str(e)}")
             return self.raw_data
             
         except pd.errors.EmptyDataError:
@@ -114,11 +248,279 @@ class CSVLoader:
             if isinstance(e, CSVLoadError):
                 raise
             raise CSVLoadError(f"Unexpected error loading CSV: {str(e)}")
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+    
+    def save_snapshot(self, snapshot_path: str):
+        """
+        Write the loaded frame and its profile to an Arrow IPC file
+        
+        The file is uncompressed so ``load_snapshot`` can memory-map it, and
+        ``column_info``, ``data_quality``, ``dtype_report`` and the
+        fingerprint travel in the schema metadata.
+        
+        Args:
+            snapshot_path: Destination file (conventionally ``.arrow``)
+            
+        Raises:
+            CSVLoadError: If nothing is loaded, pyarrow is missing, or the
+                frame cannot be converted to Arrow
+        """
+        if self.raw_data is None:
+            raise CSVLoadError("No data loaded to snapshot")
+        if not PYARROW_AVAILABLE:
+            raise CSVLoadError("Snapshots require pyarrow (pip install pyarrow)")
+        
+        state = {
+            'version': SNAPSHOT_VERSION,
+            'column_info': self.column_info,
+            'data_quality': self.data_quality,
+            'dtype_report': self.dtype_report,
+            'fingerprint': self.fingerprint,
+        }
+        tmp_path = f"{snapshot_path}.tmp"
+        try:
+            table = pa.Table.from_pandas(self.raw_data, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[SNAPSHOT_METADATA_KEY] = json.dumps(state, default=str).encode()
+            table = table.replace_schema_metadata(metadata)
+            
+            os.makedirs(os.path.dirname(os.path.abspath(snapshot_path)), exist_ok=True)
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, snapshot_path)
+        except (OSError, TypeError, ValueError, pa.ArrowException) as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise CSVLoadError(f"Unable to write snapshot: {str(e)}")
+        
+        print(f"[CSVLoader] Snapshot saved to {snapshot_path}")
+    
+    def load_snapshot(self, snapshot_path: str) -> pd.DataFrame:
+        """
+        Restore a frame and its profile written by ``save_snapshot``
+        
+        Profiling, dtype compaction and fingerprinting are skipped; their
+        results come from the snapshot.
+        
+        Args:
+            snapshot_path: Snapshot file
+            
+        Returns:
+            Restored DataFrame
+            
+        Raises:
+            CSVLoadError: If the file is missing, unreadable or not a snapshot
+        """
+        if not PYARROW_AVAILABLE:
+            raise CSVLoadError("Snapshots require pyarrow (pip install pyarrow)")
+        
+        start = time.perf_counter()
+        try:
+            with pa.memory_map(snapshot_path) as source:
+                table = pa.ipc.open_file(source).read_all()
+            metadata = table.schema.metadata or {}
+            if SNAPSHOT_METADATA_KEY not in metadata:
+                raise CSVLoadError(f"{snapshot_path} is not a Quant Commander snapshot")
+            state = json.loads(metadata[SNAPSHOT_METADATA_KEY])
+            if state.get('version') != SNAPSHOT_VERSION:
+                raise CSVLoadError(f"Unsupported snapshot version: {state.get('version')}")
+            data = table.to_pandas()
+        except (OSError, ValueError, pa.ArrowException) as e:
+            raise CSVLoadError(f"Unable to read snapshot: {str(e)}")
+        
+        self.raw_data = data
+        self.column_info = state['column_info']
+        self.data_quality = state['data_quality']
+        self.dtype_report = state['dtype_report']
+        self.fingerprint = register_fingerprint(data, state['fingerprint'])
+        self._record_load_stats('snapshot', time.perf_counter() - start, False)
+        self.status = "loaded"
+        return self.raw_data
+    
+    def _snapshot_path_for(self, file_path: str) -> Optional[str]:
+        """
+        Snapshot location for a file, keyed by its content
+        
+        Args:
+            file_path: Source file
+            
+        Returns:
+            Path inside ``settings.snapshot_dir``, or None if snapshots are off
+        """
+        if not self.settings.snapshot_dir or not PYARROW_AVAILABLE:
+            return None
+        
+        # Same bytes loaded with the same typing rules give the same frame
+        rules = (f"v{SNAPSHOT_VERSION}:{self.settings.compact_dtypes}:"
+                 f"{self.settings.category_max_ratio}:{self.settings.category_max_labels}:")
+        digest = hashlib.sha256(rules.encode())
+        with open(file_path, 'rb') as handle:
+            for block in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(block)
+        return os.path.join(self.settings.snapshot_dir, digest.hexdigest() + '.arrow')
+    
+    def _check_file_size(self, file_size: int, stream: bool):
+        """
+        Enforce the size limit for the chosen load mode
+        
+        Args:
+            file_size: Size of the input in bytes
+            stream: Whether the input will be streamed
+            
+        Raises:
+            CSVLoadError: If the input exceeds the limit
+        """
+        limit = self.settings.max_stream_file_size if stream else self.settings.max_file_size
+        if file_size > limit:
+            raise CSVLoadError(
+                f"File too large: {file_size:,} bytes. "
+                f"Maximum allowed: {limit:,} bytes"
+            )
+    
+    def _read_csv_streaming(self, source: Union[str, io.IOBase]) -> pd.DataFrame:
+        """
+        Stream a CSV in chunks, retrying as latin-1 if it is not valid UTF-8
+        
+        Args:
+            source: File path or seekable buffer
+            
+        Returns:
+            Typed DataFrame assembled from the chunks
+        """
+        try:
+            return self._read_csv_chunks(source, 'utf-8')
+        except UnicodeDecodeError:
+            print("[CSVLoader] File is not valid UTF-8, restarting stream as latin-1")
+            return self._read_csv_chunks(source, 'latin-1')
+    
+    def _read_csv_chunks(self, source: Union[str, io.IOBase], encoding: str) -> pd.DataFrame:
+        """
+        Parse a CSV chunk by chunk into per-column typed arrays
+        
+        The first chunk fixes the schema: columns parsed as text there stay
+        text in every chunk, and text columns whose sampled values are dates
+        are converted to datetime as each chunk arrives. Only typed values are kept between
+        chunks, so peak memory is the final frame plus one chunk.
+        
+        Args:
+            source: File path or seekable buffer
+            encoding: Text encoding of the file
+            
+        Returns:
+            Typed DataFrame assembled from the chunks
+            
+        Raises:
+            CSVLoadError: If the file exceeds ``max_stream_rows``
+        """
+        chunk_rows = self.settings.csv_chunk_rows
+        
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        first = pd.read_csv(source, nrows=chunk_rows, encoding=encoding)
+        header = first.columns
+        dtypes, date_cols = self._infer_stream_schema(first)
+        del first
+        
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        
+        pieces: Dict[str, List[pd.Series]] = {col: [] for col in header}
+        rows = 0
+        with pd.read_csv(source, chunksize=chunk_rows, dtype=dtypes, encoding=encoding) as reader:
+            for chunk in reader:
+                for col in date_cols:
+                    chunk[col] = pd.to_datetime(chunk[col], errors='coerce')
+                
+                # Copy each column out so the chunk's blocks are freed now
+                for col in header:
+                    pieces[col].append(chunk[col].copy())
+                
+                rows += len(chunk)
+                del chunk
+                if rows > self.settings.max_stream_rows:
+                    raise CSVLoadError(
+                        f"Dataset too large: more than {self.settings.max_stream_rows:,} rows. "
+                        "Please consider splitting into smaller files."
+                    )
+        
+        # Concatenate one column at a time, releasing its chunks as we go
+        columns = {}
+        for col in header:
+            parts = pieces.pop(col)
+            columns[col] = (pd.concat(parts, ignore_index=True) if parts
+                            else pd.Series([], dtype=dtypes.get(col, object)))
+            del parts
+        
+        print(f"[CSVLoader] Streamed {rows:,} rows in chunks of {chunk_rows:,}")
+        # copy=False keeps one block per column instead of consolidating
+        return pd.DataFrame(columns, columns=header, copy=False)
+    
+    def _infer_stream_schema(self, first: pd.DataFrame) -> Tuple[Dict[str, type], List[str]]:
+        """
+        Decide per-column parsing from the first chunk of a streamed file
+        
+        Args:
+            first: First chunk, parsed with pandas' default inference
+            
+        Returns:
+            Tuple of (dtype overrides for read_csv, text columns whose
+            sampled values are dates, converted per chunk)
+        """
+        dtypes = {}
+        date_cols = []
+        for col in first.columns:
+            if first[col].dtype != object:
+                continue
+            
+            # Keep text columns as text even if a later chunk looks numeric
+            dtypes[col] = object
+            
+            date_named = any(term in str(col).lower() for term in DATE_NAME_TERMS)
+            if self._sample_is_dates(first[col], date_named):
+                date_cols.append(col)
+        
+        return dtypes, date_cols
+    
+    def _record_load_stats(self, mode: str, seconds: float, track_memory: bool):
+        """
+        Record and print how the last load went
+        
+        Args:
+            mode: 'single_pass', 'streaming', 'columnar' or 'snapshot'
+            seconds: Wall time of the load
+            track_memory: Whether tracemalloc measured the load
+        """
+        self.load_stats = {
+            'mode': mode,
+            'rows': len(self.raw_data),
+            'columns': len(self.raw_data.columns),
+            'seconds': round(seconds, 3),
+        }
+        if self.dtype_report:
+            self.load_stats['memory_saved_bytes'] = self.dtype_report['saved_bytes']
+        message = (f"[CSVLoader] Loaded {len(self.raw_data):,} rows "
+                   f"({self.load_stats['mode']}) in {seconds:.2f}s")
+        
+        if track_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            frame_bytes = int(self.raw_data.memory_usage(deep=True).sum())
+            self.load_stats['peak_memory_bytes'] = peak
+            self.load_stats['frame_memory_bytes'] = frame_bytes
+            message += (f", frame {frame_bytes / (1024 * 1024):.1f}MB, "
+                        f"peak {peak / (1024 * 1024):.1f}MB")
+        
+        print(message)
     
-    def _validate_structure(self) -> bool:
+    def _validate_structure(self, max_rows: Optional[int] = None) -> bool:
         """
         Validate CSV structure and basic requirements
         
+        Args:
+            max_rows: Row limit (defaults to ``settings.max_rows``)
+        
         Returns:
             True if validation passes
             
@@ -139,7 +541,7 @@ class CSVLoader:
             raise CSVLoadError("CSV file contains no rows")
         
         # Check for reasonable data size
-        if len(self.raw_data) > 1_000_000:  # 1M rows
+        if len(self.raw_data) > (max_rows or self.settings.max_rows):
             raise CSVLoadError(
                 f"Dataset too large: {len(self.raw_data):,} rows. "
                 "Please consider splitting into smaller files."
@@ -153,36 +555,31 @@ class CSVLoader:
         
         return True
     
-    def _detect_columns(self) -> Dict[str, any]:
+    def _profile_data(self) -> Tuple[Dict[str, any], Dict[str, any]]:
         """
-        Auto-detect column types and patterns
+        Type the columns and measure data quality in one vectorised sweep
+        
+        Types are decided on an evenly spaced row sample: text columns whose
+        sampled values mostly parse as dates are converted to datetime (in
+        place, without copying the frame), and nothing else is converted.
+        Null counts, dtypes, duplicate rows and numeric summary statistics are
+        then computed with whole-frame operations instead of per-column loops.
         
         Returns:
-            Dictionary with column analysis
+            Tuple of (column analysis, data quality information)
         """
         if self.raw_data is None:
-            return {}
-        
-        print(f"[DEBUG][CSVLoader] Detecting columns for data with shape: {self.raw_data.shape}")
-        print(f"[DEBUG][CSVLoader] Column dtypes: {self.raw_data.dtypes.to_dict()}")
+            return {}, {}
         
-        # First pass: convert potential date columns to datetime
-        raw_data_copy = self.raw_data.copy()
-        for col in self.raw_data.columns:
-            col_lower = col.lower()
-            
-            # Look for columns that might be dates
-            if any(term in col_lower for term in ['date', 'time', 'period', 'day', 'month', 'year']):
-                try:
-                    # Try to convert to datetime
-                    raw_data_copy[col] = pd.to_datetime(raw_data_copy[col], errors='coerce')
-                    if raw_data_copy[col].notna().sum() > 0:
-                        print(f"[DEBUG][CSVLoader] Successfully converted {col} to datetime")
-                except Exception as e:
-                    print(f"[DEBUG][CSVLoader] Failed to convert {col} to datetime: {str(e)}")
+        start = time.perf_counter()
+        data = self.raw_data
         
-        # Update the raw_data with the converted columns
-        self.raw_data = raw_data_copy
+        # Sample once for every type decision
+        if len(data) > PROFILE_SAMPLE_ROWS:
+            positions = np.unique(np.linspace(0, len(data) - 1, PROFILE_SAMPLE_ROWS).astype(np.int64))
+            sample = data.iloc[positions]
+        else:
+            sample = data
         
         column_info = {
             'numeric_columns': [],
@@ -190,119 +587,261 @@ class CSVLoader:
             'date_columns': [],
             'potential_date_columns': [],
             'financial_columns': {},
-            'total_columns': len(self.raw_data.columns),
-            'column_list': self.raw_data.columns.tolist()
+            'total_columns': len(data.columns),
+            'column_list': data.columns.tolist()
         }
-        
-        # Analyze each column
-        for col in self.raw_data.columns:
-            col_lower = col.lower()
-            dtype_str = str(self.raw_data[col].dtype)
-            print(f"[DEBUG][CSVLoader] Analyzing column: {col}, type: {dtype_str}")
+        financial = column_info['financial_columns']
+        
+        for col in data.columns:
+            col_lower = str(col).lower()
+            dtype = data[col].dtype
+            date_named = any(term in col_lower for term in DATE_NAME_TERMS)
+            if date_named:
+                column_info['potential_date_columns'].append(col)
             
-            # Check data types
-            if 'datetime' in dtype_str:
+            if pd.api.types.is_datetime64_any_dtype(dtype):
                 column_info['date_columns'].append(col)
-                print(f"[DEBUG][CSVLoader] {col} detected as datetime and added to date_columns")
-            elif self.raw_data[col].dtype in ['int64', 'float64', 'int32', 'float32']:
+            
+            elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
                 column_info['numeric_columns'].append(col)
-                print(f"[DEBUG][CSVLoader] {col} added to numeric_columns")
                 
                 # Check for financial patterns
                 if any(term in col_lower for term in ['sales', 'revenue', 'amount', 'value', 'price']):
-                    column_info['financial_columns']['value_columns'] = column_info['financial_columns'].get('value_columns', [])
-                    column_info['financial_columns']['value_columns'].append(col)
-                
+                    financial.setdefault('value_columns', []).append(col)
                 if any(term in col_lower for term in ['budget', 'target', 'plan']):
-                    column_info['financial_columns']['budget_columns'] = column_info['financial_columns'].get('budget_columns', [])
-                    column_info['financial_columns']['budget_columns'].append(col)
-                
+                    financial.setdefault('budget_columns', []).append(col)
                 if any(term in col_lower for term in ['actual', 'real']):
-                    column_info['financial_columns']['actual_columns'] = column_info['financial_columns'].get('actual_columns', [])
-                    column_info['financial_columns']['actual_columns'].append(col)
-            elif self.raw_data[col].dtype == 'object':
-                # Try to detect if it could be a date but wasn't converted
-                try:
-                    sample = self.raw_data[col].dropna().head(5)
-                    print(f"[DEBUG][CSVLoader] Checking if {col} might be a date. Sample: {sample.tolist()}")
-                    
-                    # Try to convert to datetime
-                    date_sample = pd.to_datetime(sample, errors='coerce')
-                    
-                    # If at least 80% could be converted, consider it a date
-                    valid_dates = date_sample.notna().sum()
-                    if len(sample) > 0 and valid_dates / len(sample) >= 0.8:
-                        # Convert the whole column
-                        self.raw_data[col] = pd.to_datetime(self.raw_data[col], errors='coerce')
-                        column_info['date_columns'].append(col)
-                        print(f"[DEBUG][CSVLoader] {col} identified as date. Sample converted: {date_sample}")
-                    else:
-                        column_info['text_columns'].append(col)
-                        print(f"[DEBUG][CSVLoader] {col} not a date. Valid conversions: {valid_dates}/{len(sample)}")
-                except Exception as e:
+                    financial.setdefault('actual_columns', []).append(col)
+            
+            elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype) \
+                    or isinstance(dtype, pd.CategoricalDtype):
+                if self._sample_is_dates(sample[col], date_named):
+                    # Convert only columns the sample confirmed
+                    data[col] = pd.to_datetime(data[col], errors='coerce')
+                    column_info['date_columns'].append(col)
+                else:
                     column_info['text_columns'].append(col)
-                    print(f"[DEBUG][CSVLoader] Error checking if {col} is a date: {str(e)}")
-                
-                # Check for category patterns if not identified as a date
-                if col not in column_info['date_columns'] and any(term in col_lower for term in ['product', 'category', 'region', 'customer']):
-                    column_info['financial_columns']['category_columns'] = column_info['financial_columns'].get('category_columns', [])
-                    column_info['financial_columns']['category_columns'].append(col)
-                    print(f"[DEBUG][CSVLoader] {col} added to category_columns")
+                    
+                    # Check for category patterns
+                    if any(term in col_lower for term in ['product', 'category', 'region', 'customer']):
+                        financial.setdefault('category_columns', []).append(col)
         
         # Ensure we have 'category_columns' in financial_columns
-        if 'category_columns' not in column_info['financial_columns']:
-            column_info['financial_columns']['category_columns'] = []
+        financial.setdefault('category_columns', [])
+        
+        # Use all numeric columns as value columns if no specific ones were detected
+        financial.setdefault('value_columns', column_info['numeric_columns'])
+        
+        # Data quality: one vectorised sweep over the typed frame
+        total_rows = len(data)
+        null_counts = data.isna().sum()
+        null_counts = null_counts[null_counts > 0]
+        
+        quality_info = {
+            'total_rows': total_rows,
+            'total_columns': len(data.columns),
+            'missing_data': {
+                col: {
+                    'count': int(count),
+                    'percentage': float(count / total_rows * 100)
+                }
+                for col, count in null_counts.items()
+            },
+            'duplicate_rows': self._count_duplicate_rows(data),
+            'data_types': data.dtypes.astype(str).to_dict(),
+            'summary_stats': {}
+        }
         
-        # Ensure we have 'value_columns' in financial_columns
-        if 'value_columns' not in column_info['financial_columns']:
-            # Use all numeric columns as value columns if no specific ones were detected
-            column_info['financial_columns']['value_columns'] = column_info['numeric_columns']
+        # Basic statistics for numeric columns
+        numeric_cols = data.select_dtypes(include=['number']).columns
+        if len(numeric_cols) > 0:
+            quality_info['summary_stats'] = self._numeric_summary(data[numeric_cols])
         
-        print(f"[DEBUG][CSVLoader] Final column detection results: {column_info}")
-        return column_info
+        print(f"[CSVLoader] Profiled {len(data.columns)} columns in {time.perf_counter() - start:.2f}s: "
+              f"{len(column_info['numeric_columns'])} numeric, {len(column_info['text_columns'])} text, "
+              f"{len(column_info['date_columns'])} date")
+        return column_info, quality_info
     
-    def _analyze_data_quality(self) -> Dict[str, any]:
+    @staticmethod
+    def _sample_is_dates(sample: pd.Series, date_named: bool) -> bool:
         """
-        Analyze data quality metrics
+        Decide from sampled values whether a text column holds dates
         
+        Args:
+            sample: Sampled values of the column
+            date_named: Whether the column name suggests a date
+            
         Returns:
-            Dictionary with data quality information
+            True if at least 80% of the sampled non-null values parse as dates
         """
-        if self.raw_data is None:
-            return {}
+        values = sample.dropna().astype(str).head(DATE_SAMPLE_VALUES)
+        if values.empty:
+            return False
+        
+        # Dates contain digits; skip the parse for plainly textual columns
+        if not date_named and values.str.contains(r'\d').mean() < 0.8:
+            return False
+        
+        with warnings.catch_warnings():
+            # Per-element format inference warnings are expected for non-dates
+            warnings.simplefilter('ignore', UserWarning)
+            parsed = pd.to_datetime(values, errors='coerce')
+        return parsed.notna().mean() >= 0.8
+    
+    @staticmethod
+    def _numeric_summary(numeric: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+        """
+        Same statistics as ``describe().to_dict()``, computed block-wise
         
-        quality_info = {
-            'total_rows': len(self.raw_data),
-            'total_columns': len(self.raw_data.columns),
-            'missing_data': {},
-            'duplicate_rows': 0,
-            'data_types': {},
-            'summary_stats': {}
-        }
+        ``describe`` summarises numeric columns one at a time; the frame-level
+        reductions below each run once over every column of a dtype.
         
-        # Check for missing data
-        for col in self.raw_data.columns:
-            missing_count = self.raw_data[col].isna().sum()
-            if missing_count > 0:
-                quality_info['missing_data'][col] = {
-                    'count': int(missing_count),
-                    'percentage': float(missing_count / len(self.raw_data) * 100)
-                }
+        Args:
+            numeric: Numeric columns of the loaded frame
+            
+        Returns:
+            Dictionary of column -> {count, mean, std, min, 25%, 50%, 75%, max}
+        """
+        quartiles = numeric.quantile([0.25, 0.5, 0.75])
+        stats = pd.DataFrame({
+            'count': numeric.count(),
+            'mean': numeric.mean(),
+            'std': numeric.std(),
+            'min': numeric.min(),
+            '25%': quartiles.iloc[0],
+            '50%': quartiles.iloc[1],
+            '75%': quartiles.iloc[2],
+            'max': numeric.max(),
+        }).astype(float)
+        return stats.T.to_dict()
+    
+    @staticmethod
+    def _count_duplicate_rows(data: pd.DataFrame) -> int:
+        """
+        Count duplicate rows, hashing column by column
         
-        # Check for duplicate rows
-        quality_info['duplicate_rows'] = int(self.raw_data.duplicated().sum())
+        Row hashes are combined one column at a time, and rows whose partial
+        hash is already unique are dropped from further hashing. Files without
+        duplicates usually finish after a few columns instead of a full pass.
         
-        # Data types summary
-        for col in self.raw_data.columns:
-            quality_info['data_types'][col] = str(self.raw_data[col].dtype)
+        Args:
+            data: Frame to check
+            
+        Returns:
+            Number of rows identical to an earlier row
+        """
+        try:
+            candidates = np.arange(len(data))
+            hashes = np.zeros(len(data), dtype=np.uint64)
+            for i in range(data.shape[1]):
+                column = data.iloc[:, i].to_numpy()[candidates]
+                hashes = (hashes * np.uint64(0x100000001B3)) ^ pd.util.hash_array(column)
+                
+                # Rows whose hash is unique so far cannot be duplicates
+                colliding = pd.Series(hashes).duplicated(keep=False).to_numpy()
+                if not colliding.any():
+                    return 0
+                candidates = candidates[colliding]
+                hashes = hashes[colliding]
+            
+            return int(pd.Series(hashes).duplicated().sum())
+        except TypeError:
+            # Unhashable cell values (e.g. lists) need pandas' general path
+            return int(data.astype(str).duplicated().sum())
+    
+    def _compact_dtypes(self) -> Dict[str, any]:
+        """
+        Store the loaded frame in the smallest dtypes that keep results exact
         
-        # Basic statistics for numeric columns
-        numeric_cols = self.raw_data.select_dtypes(include=['number']).columns
-        if len(numeric_cols) > 0:
-            stats = self.raw_data[numeric_cols].describe()
-            quality_info['summary_stats'] = stats.to_dict()
+        - Text columns whose distinct values are at most
+          ``settings.category_max_ratio`` of the rows (and at most
+          ``settings.category_max_labels``) become ``category``, so groupbys
+          and filters work on integer codes instead of strings.
+        - int64 columns whose values stay within ``INT32_SAFE_MAGNITUDE`` (and
+          whose total stays within int32) become int32.
+        
+        Floats are left as float64: float32 totals lose cents once they pass
+        a few million, even when every stored value round-trips exactly.
+        A column is only converted when its estimated size actually shrinks.
+        
+        Returns:
+            Dictionary with 'before_bytes', 'after_bytes', 'saved_bytes' and
+            'converted' (column -> {'from', 'to', 'saved_bytes'}); sizes of
+            text columns are estimated from a row sample
+        """
+        data = self.raw_data
+        rows = len(data)
+        before_bytes = sum(self._estimate_bytes(data[col]) for col in data.columns)
+        converted = {}
+        
+        for col in data.columns:
+            series = data[col]
+            dtype = series.dtype
+            compacted = None
+            
+            if dtype == np.int64 and rows > 0:
+                bound = max(abs(int(series.min())), abs(int(series.max())))
+                if bound <= INT32_SAFE_MAGNITUDE and bound * rows < 2 ** 31:
+                    compacted = series.astype(np.int32)
+            
+            elif dtype == object and rows > 0:
+                # Mixed columns (numbers and strings, lists, ...) stay object
+                if pd.api.types.infer_dtype(series, skipna=True) == 'string':
+                    # One hash pass both counts the labels and encodes them
+                    codes, labels = pd.factorize(series, sort=True)
+                    if len(labels) <= min(self.settings.category_max_ratio * rows,
+                                          self.settings.category_max_labels):
+                        compacted = pd.Series(pd.Categorical.from_codes(codes, labels),
+                                              index=series.index, name=col)
+            
+            if compacted is None:
+                continue
+            
+            saved = self._estimate_bytes(series) - self._estimate_bytes(compacted)
+            if saved <= 0:
+                continue
+            
+            data[col] = compacted
+            converted[col] = {
+                'from': str(dtype),
+                'to': str(compacted.dtype),
+                'saved_bytes': saved
+            }
+        
+        saved_bytes = sum(change['saved_bytes'] for change in converted.values())
+        after_bytes = before_bytes - saved_bytes
+        if converted:
+            print(f"[CSVLoader] Compacted {len(converted)} columns: "
+                  f"{before_bytes / (1024 * 1024):.1f}MB -> {after_bytes / (1024 * 1024):.1f}MB "
+                  f"({saved_bytes / max(before_bytes, 1):.0%} saved)")
+        
+        return {
+            'before_bytes': before_bytes,
+            'after_bytes': after_bytes,
+            'saved_bytes': saved_bytes,
+            'converted': converted
+        }
+    
+    @staticmethod
+    def _estimate_bytes(series: pd.Series) -> int:
+        """
+        Memory held by a column's values, sampling string sizes
+        
+        Exact ``memory_usage(deep=True)`` visits every Python string, which
+        costs more than the compaction itself on large text columns.
+        
+        Args:
+            series: Column to measure
+            
+        Returns:
+            Bytes used by the values (estimated for object columns)
+        """
+        if series.dtype != object or len(series) <= PROFILE_SAMPLE_ROWS:
+            return int(series.memory_usage(deep=True, index=False))
         
-        return quality_info
+        positions = np.linspace(0, len(series) - 1, PROFILE_SAMPLE_ROWS).astype(np.int64)
+        sample_bytes = series.iloc[positions].memory_usage(deep=True, index=False)
+        return int(sample_bytes / len(positions) * len(series))
     
     def get_column_suggestions(self) -> Dict[str, List[str]]:
         """
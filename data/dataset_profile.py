@@ -0,0 +1,208 @@
+"""
+Dataset Profile for Quant Commander
+
+A compact description of an uploaded DataFrame, computed once per dataset
+and shared by every handler and analyzer: column roles, dtypes,
+cardinalities, min/max, null counts and the columns whose values parse as
+dates. Handlers ask for the profile instead of re-scanning the frame (and
+re-parsing date samples) on every request.
+
+Profiles are memoised by dataset fingerprint, so the profile of the frame
+held by AppCore is built on first use after an upload and then reused.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data.csv_loader import CSVLoader, DATE_NAME_TERMS, PROFILE_SAMPLE_ROWS
+from utils.data_fingerprint import get_fingerprint
+
+
+# Column roles
+DATE = 'date'
+NUMERIC = 'numeric'
+BOOLEAN = 'boolean'
+CATEGORICAL = 'categorical'
+TEXT = 'text'
+
+# Text columns with at most this share of distinct values are categorical
+CATEGORICAL_MAX_RATIO = 0.5
+
+# Profiles kept for recently seen datasets (fingerprint -> profile)
+MAX_CACHED_PROFILES = 8
+
+_profiles: "OrderedDict[str, DatasetProfile]" = OrderedDict()
+_profiles_lock = threading.Lock()  # Guards _profiles and _building, never held while profiling
+_building: Dict[str, threading.Event] = {}  # Fingerprint -> set when its profile build ends
+
+
+@dataclass
+class DatasetProfile:
+    """Column roles and summary statistics of one dataset."""
+
+    row_count: int
+    columns: List[str]
+    dtypes: Dict[str, str]
+    roles: Dict[str, str]
+    cardinality: Dict[str, int]
+    null_counts: Dict[str, int]
+    minimums: Dict[str, Any] = field(default_factory=dict)
+    maximums: Dict[str, Any] = field(default_factory=dict)
+    date_columns: List[str] = field(default_factory=list)
+    date_named_columns: List[str] = field(default_factory=list)
+
+    @property
+    def numeric_columns(self) -> List[str]:
+        """Numeric (non-boolean) columns, in frame order"""
+        return self.columns_with_role(NUMERIC)
+
+    @property
+    def category_columns(self) -> List[str]:
+        """Low-cardinality text columns suitable for grouping"""
+        return self.columns_with_role(CATEGORICAL)
+
+    @property
+    def text_columns(self) -> List[str]:
+        """All text and categorical columns (what select_dtypes(['object', 'category']) returned)"""
+        return [col for col in self.columns if self.roles[col] in (CATEGORICAL, TEXT)]
+
+    def columns_with_role(self, role: str) -> List[str]:
+        """
+        Columns with the given role, in frame order.
+
+        Args:
+            role (str): One of 'date', 'numeric', 'boolean', 'categorical', 'text'
+
+        Returns:
+            List[str]: Matching column names
+        """
+        return [col for col in self.columns if self.roles[col] == role]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form for logging, prompts and JSON"""
+        return asdict(self)
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame) -> 'DatasetProfile':
+        """
+        Profile a DataFrame with whole-frame reductions.
+
+        Text columns are tested for dates on an evenly spaced sample, the
+        same way CSVLoader decides which columns to convert on load; no
+        column is converted here.
+
+        Args:
+            data (pd.DataFrame): Frame to profile
+
+        Returns:
+            DatasetProfile: The frame's profile
+        """
+        rows = len(data)
+        if rows > PROFILE_SAMPLE_ROWS:
+            positions = np.unique(np.linspace(0, rows - 1, PROFILE_SAMPLE_ROWS).astype(np.int64))
+            sample = data.iloc[positions]
+        else:
+            sample = data
+
+        null_counts = data.isna().sum()
+        cardinality = data.nunique()
+        roles = {}
+        date_columns = []
+        date_named = []
+
+        for col in data.columns:
+            dtype = data[col].dtype
+            named = any(term in str(col).lower() for term in DATE_NAME_TERMS)
+            if named:
+                date_named.append(col)
+
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                roles[col] = DATE
+            elif pd.api.types.is_bool_dtype(dtype):
+                roles[col] = BOOLEAN
+            elif pd.api.types.is_numeric_dtype(dtype):
+                roles[col] = NUMERIC
+            elif CSVLoader._sample_is_dates(sample[col], named):
+                roles[col] = DATE
+            elif isinstance(dtype, pd.CategoricalDtype) or cardinality[col] <= CATEGORICAL_MAX_RATIO * rows:
+                roles[col] = CATEGORICAL
+            else:
+                roles[col] = TEXT
+
+            if roles[col] == DATE:
+                date_columns.append(col)
+
+        # One reduction per dtype block for the ordered columns
+        ordered = [col for col in data.columns
+                   if pd.api.types.is_datetime64_any_dtype(data[col].dtype)
+                   or roles[col] == NUMERIC]
+        minimums, maximums = {}, {}
+        if ordered:
+            minimums = {col: _plain(value) for col, value in data[ordered].min().items()}
+            maximums = {col: _plain(value) for col, value in data[ordered].max().items()}
+
+        return cls(
+            row_count=rows,
+            columns=list(data.columns),
+            dtypes=data.dtypes.astype(str).to_dict(),
+            roles=roles,
+            cardinality={col: int(count) for col, count in cardinality.items()},
+            null_counts={col: int(count) for col, count in null_counts.items()},
+            minimums=minimums,
+            maximums=maximums,
+            date_columns=date_columns,
+            date_named_columns=date_named,
+        )
+
+
+def _plain(value: Any) -> Any:
+    """Convert numpy scalars to Python values (NaN/NaT become None)"""
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def get_dataset_profile(data: Optional[pd.DataFrame]) -> Optional[DatasetProfile]:
+    """
+    Get the profile of a DataFrame, building it once per dataset.
+
+    Args:
+        data (pd.DataFrame, optional): Frame to profile
+
+    Returns:
+        Optional[DatasetProfile]: The memoised profile, or None if data is
+        not a DataFrame
+    """
+    if not isinstance(data, pd.DataFrame):
+        return None
+
+    fingerprint = get_fingerprint(data)
+    while True:
+        with _profiles_lock:
+            profile = _profiles.get(fingerprint)
+            if profile is not None:
+                _profiles.move_to_end(fingerprint)
+                return profile
+            building = _building.get(fingerprint)
+            if building is None:
+                building = _building[fingerprint] = threading.Event()
+                break
+        # Concurrent first requests for this dataset share the one scan
+        building.wait()
+
+    try:
+        profile = DatasetProfile.from_dataframe(data)
+        with _profiles_lock:
+            _profiles[fingerprint] = profile
+            while len(_profiles) > MAX_CACHED_PROFILES:
+                _profiles.popitem(last=False)
+        return profile
+    finally:
+        with _profiles_lock:
+            _building.pop(fingerprint, None)
+        building.set()
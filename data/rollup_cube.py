@@ -0,0 +1,260 @@
+"""
+Rollup Cube for Quant Commander
+
+Daily totals of every numeric column of an uploaded DataFrame, overall and
+per category column, built once per dataset and shared by the time-based
+analyzers. Weekly, monthly, quarterly and yearly totals are derived from
+the daily level, so a timescale, variance or TTM request groups a few
+thousand daily rows instead of re-grouping the raw frame.
+
+Cubes are memoised by dataset fingerprint and date column, like the
+DatasetProfile: a changed dataset has a new fingerprint and gets a new cube.
+"""
+
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from data.dataset_profile import get_dataset_profile
+from utils.data_fingerprint import get_fingerprint
+
+
+# Grain -> pandas period frequency
+GRAIN_FREQUENCIES = {
+    'daily': 'D',
+    'weekly': 'W',
+    'monthly': 'M',
+    'quarterly': 'Q',
+    'yearly': 'Y',
+}
+
+# Cubes kept for recently seen datasets ((fingerprint, date column) -> cube)
+MAX_CACHED_CUBES = 8
+
+_cubes: "OrderedDict[Tuple[str, str], RollupCube]" = OrderedDict()
+_cubes_lock = threading.Lock()  # Guards _cubes and _building, never held while building
+_building: Dict[Tuple[str, str], threading.Event] = {}  # Key -> set when its cube build ends
+
+
+class RollupCube:
+    """
+    Per-day sums of a dataset's numeric columns, overall and per category.
+
+    Sums follow DataFrame.groupby(...).sum(): missing values are skipped and
+    an all-missing group sums to 0. Rows without a date are left out, as
+    are rows whose category is missing from that category's totals.
+    """
+
+    def __init__(self, date_column: str, measures: List[str],
+                 row_count: int, first_date: pd.Timestamp, last_date: pd.Timestamp):
+        """
+        Initialize an empty cube; use RollupCube.from_dataframe to build one.
+
+        Args:
+            date_column (str): Date column the totals are keyed by
+            measures (List[str]): Numeric columns summed
+            row_count (int): Rows with a date
+            first_date (pd.Timestamp): Earliest date
+            last_date (pd.Timestamp): Latest date
+        """
+        self.date_column = date_column
+        self.measures = measures
+        self.row_count = row_count
+        self.first_date = first_date
+        self.last_date = last_date
+
+        # Category column (None for the overall totals) -> daily totals
+        self.daily: Dict[Optional[str], pd.DataFrame] = {}
+        # Day of each row, parsed once (text date columns are not converted in the frame)
+        self.days: Optional[pd.Series] = None
+        # (grain, category column) -> totals derived from the daily level
+        self._rollups: Dict[Tuple[str, Optional[str]], pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame, date_column: str,
+                       categories: Optional[List[str]] = None) -> Optional['RollupCube']:
+        """
+        Build the daily totals of a DataFrame.
+
+        Args:
+            data (pd.DataFrame): Frame to summarise
+            date_column (str): Date column, datetime or text dates (as read
+                by pd.read_csv)
+            categories (List[str], optional): Category columns to total by
+                (default: the profile's categorical columns)
+
+        Returns:
+            Optional[RollupCube]: The cube, or None if the date column is
+            missing or does not hold dates
+        """
+        if date_column not in data.columns:
+            return None
+        dates = _parse_dates(data[date_column])
+        if dates is None:
+            return None
+
+        profile = get_dataset_profile(data)
+        if categories is None:
+            categories = profile.category_columns
+        cube = cls(
+            date_column=date_column,
+            measures=[col for col in profile.numeric_columns if col != date_column],
+            row_count=int(dates.notna().sum()),
+            first_date=dates.min(),
+            last_date=dates.max(),
+        )
+        cube.days = dates.dt.normalize().rename('date')
+        cube.add_dimension(data, None)
+        for col in categories:
+            cube.add_dimension(data, col)
+        return cube
+
+    def add_dimension(self, data: pd.DataFrame, category: Optional[str]) -> None:
+        """
+        Compute the daily totals per value of one category column.
+
+        Args:
+            data (pd.DataFrame): The frame this cube was built from
+            category (str, optional): Category column, or None for overall totals
+        """
+        if category in self.daily:
+            return
+
+        keys = [self.days]
+        if category is not None:
+            keys.append(data[category])
+        daily = data[self.measures].groupby(keys, observed=True, sort=True).sum()
+        with self._lock:
+            self.daily[category] = daily
+
+    def has_measures(self, measures: List[str]) -> bool:
+        """Whether every column in measures is totalled by this cube"""
+        return all(col in self.measures for col in measures)
+
+    def rollup(self, grain: str, measures: List[str], category: Optional[str] = None) -> pd.DataFrame:
+        """
+        Totals per period (and category) at a time grain.
+
+        Args:
+            grain (str): One of GRAIN_FREQUENCIES ('daily' through 'yearly')
+            measures (List[str]): Columns to return
+            category (str, optional): Category column to split by
+
+        Returns:
+            pd.DataFrame: Sums indexed by 'period' (pd.Period) or by
+            ('period', category), sorted by period
+
+        Raises:
+            KeyError: If the grain, a measure or the category dimension is unknown
+        """
+        key = (grain, category)
+        with self._lock:
+            totals = self._rollups.get(key)
+
+        if totals is None:
+            daily = self.daily[category]
+            dates = daily.index.get_level_values('date')
+            keys = [dates.to_period(GRAIN_FREQUENCIES[grain]).rename('period')]
+            if category is not None:
+                keys.append(daily.index.get_level_values(category))
+            totals = daily.groupby(keys, observed=True, sort=True).sum()
+            with self._lock:
+                self._rollups[key] = totals
+        return totals[measures].copy()
+
+
+def _parse_dates(column: pd.Series) -> Optional[pd.Series]:
+    """
+    A date column as datetime, parsing text dates the way the analyzers do.
+
+    Args:
+        column (pd.Series): Date column of the frame
+
+    Returns:
+        Optional[pd.Series]: Datetime values, or None if the column is
+        neither datetime nor text that pd.to_datetime parses in full
+    """
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column
+    if not (pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column)
+            or isinstance(column.dtype, pd.CategoricalDtype)):
+        return None
+    try:
+        with warnings.catch_warnings():
+            # Format inference warnings; the analyzers parse the same way
+            warnings.simplefilter('ignore', UserWarning)
+            return pd.to_datetime(column)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _cached_or_built_cube(data: pd.DataFrame, key: Tuple[str, str]) -> Optional[RollupCube]:
+    """
+    Memoised cube for a (fingerprint, date column) key, built outside the module lock.
+
+    Concurrent first requests for the same key wait for one build; lookups
+    of other keys are not blocked by it.
+    """
+    while True:
+        with _cubes_lock:
+            cube = _cubes.get(key)
+            if cube is not None:
+                _cubes.move_to_end(key)
+                return cube
+            building = _building.get(key)
+            if building is None:
+                building = _building[key] = threading.Event()
+                break
+        building.wait()
+
+    try:
+        cube = RollupCube.from_dataframe(data, key[1])
+        if cube is not None:
+            with _cubes_lock:
+                _cubes[key] = cube
+                while len(_cubes) > MAX_CACHED_CUBES:
+                    _cubes.popitem(last=False)
+        return cube
+    finally:
+        with _cubes_lock:
+            _building.pop(key, None)
+        building.set()
+
+
+def get_rollup_cube(data: Optional[pd.DataFrame], date_column: str,
+                    measures: Optional[List[str]] = None,
+                    category: Optional[str] = None) -> Optional[RollupCube]:
+    """
+    Get the rollup cube of a DataFrame, building it once per dataset.
+
+    Args:
+        data (pd.DataFrame, optional): Frame to summarise
+        date_column (str): Date column, datetime or text dates
+        measures (List[str], optional): Columns the caller needs totals of
+        category (str, optional): Category column the caller splits by; added
+            to the cube if it was not built with it
+
+    Returns:
+        Optional[RollupCube]: The memoised cube, or None if data is not a
+        DataFrame, the date column does not hold dates, or the cube cannot
+        answer for the measures or category
+    """
+    if not isinstance(data, pd.DataFrame):
+        return None
+
+    key = (get_fingerprint(data), date_column)
+    cube = _cached_or_built_cube(data, key)
+    if cube is None:
+        return None
+
+    if measures is not None and not cube.has_measures(measures):
+        return None
+    if category is not None:
+        if category not in data.columns or category == date_column or category in (measures or []):
+            return None
+        cube.add_dimension(data, category)
+    return cube
@@ -12,6 +12,8 @@ Following modular design principles to keep utilities focused and reusable.
 import pandas as pd
 from typing import List
 
+from data.dataset_profile import get_dataset_profile
+
 
 class DataUtils:
     """
@@ -24,31 +26,18 @@ class DataUtils:
     @staticmethod
     def detect_date_columns(df: pd.DataFrame) -> List[str]:
         """
-        Detect potential date columns in the DataFrame.
+        Detect date columns in the DataFrame.
+        
+        Uses the dataset's memoised profile, so samples are parsed once per
+        dataset rather than on every call.
         
         Args:
             df: The DataFrame to analyze
             
         Returns:
-            List[str]: List of potential date column names
+            List[str]: Columns holding (or parsing as) dates
         """
-        date_columns = []
-        
-        for col in df.columns:
-            col_lower = col.lower()
-            # Check for common date column names
-            if any(date_word in col_lower for date_word in ['date', 'time', 'day', 'month', 'year']):
-                date_columns.append(col)
-                continue
-            
-            # Check if the column can be parsed as dates
-            try:
-                pd.to_datetime(df[col].dropna().head(10), errors='raise')
-                date_columns.append(col)
-            except:
-                continue
-        
-        return date_columns
+        return list(get_dataset_profile(df).date_columns)
     
     @staticmethod
     def get_numeric_columns(df: pd.DataFrame) -> List[str]:
@@ -74,7 +63,7 @@ class DataUtils:
         Returns:
             List[str]: List of categorical column names
         """
-        return df.select_dtypes(include=['object']).columns.tolist()
+        return df.select_dtypes(include=['object', 'category']).columns.tolist()
     
     @staticmethod
     def get_data_overview(df: pd.DataFrame) -> dict:
@@ -87,12 +76,13 @@ class DataUtils:
         Returns:
             dict: Dictionary containing overview statistics
         """
+        profile = get_dataset_profile(df)
         return {
-            'row_count': len(df),
-            'column_count': len(df.columns),
+            'row_count': profile.row_count,
+            'column_count': len(profile.columns),
             'numeric_columns': len(DataUtils.get_numeric_columns(df)),
             'categorical_columns': len(DataUtils.get_categorical_columns(df)),
-            'date_columns': len(DataUtils.detect_date_columns(df)),
+            'date_columns': len(profile.date_columns),
             'memory_usage': df.memory_usage(deep=True).sum(),
-            'has_missing_values': df.isnull().any().any()
+            'has_missing_values': any(profile.null_counts.values())
         }
@@ -5,11 +5,24 @@ This module handles CSV file upload, validation, and initial data processing.
 It provides clean separation between file handling logic and the main application.
 
 Extracted from app_v2.py to follow modular design principles.
+
+Uploads run as a staged job: the file is parsed and previewed first, and
+profiling, time rollups, SQL context, automatic analysis and the data summary
+then run on a background worker while their progress streams into the chat.
 """
 
 import os
+import queue
+import threading
+import time
 import pandas as pd
-from typing import Tuple, Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Optional, Dict, Any, List, Iterator
+
+from config.settings import Settings
+from data.csv_loader import COLUMNAR_FORMATS, CSVLoader, CSVLoadError
+from data.dataset_profile import get_dataset_profile
+from data.rollup_cube import get_rollup_cube
 
 
 class FileHandler:
@@ -30,11 +43,23 @@ class FileHandler:
         self.app_core = app_core
         self.current_data: Optional[pd.DataFrame] = None
         self.data_summary: Optional[Dict[str, Any]] = None
+        # Loader of the last validated file: its fingerprint, load stats and dtype report
+        self.csv_loader: Optional[CSVLoader] = None
+        
+        # Post-parse upload stages run here; a newer upload supersedes older jobs
+        self._upload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload")
+        self._upload_lock = threading.Lock()
+        self._upload_generation = 0
     
     def validate_csv_file(self, file_path: str) -> Tuple[bool, str, Optional[pd.DataFrame]]:
         """
         Validate a CSV file and return its contents if valid.
         
+        Parquet and Feather/Arrow files are accepted too. Every format is
+        read through CSVLoader, so large CSVs are streamed, dtypes are
+        compacted, session snapshots are used when configured, and the
+        frame is fingerprinted once; the loader is kept in ``csv_loader``.
+        
         Performs comprehensive validation including:
         - File existence and extension checking
         - CSV format validation
@@ -59,48 +84,39 @@ class FileHandler:
                 return False, "File does not exist", None
             
             # Check file extension
-            if not file_path.lower().endswith('.csv'):
-                return False, "Please upload a CSV file (.csv extension required)", None
-            
-            # Try to read the CSV with different approaches
-            df = None
+            extension = os.path.splitext(file_path)[1].lower()
+            if extension != '.csv' and extension not in COLUMNAR_FORMATS:
+                return False, "Please upload a CSV, Parquet or Feather/Arrow file (.csv, .parquet, .feather, .arrow)", None
             
+            loader = CSVLoader(self._settings())
             try:
-                # First attempt: standard CSV reading
-                df = pd.read_csv(file_path)
-            except pd.errors.EmptyDataError:
-                return False, "The CSV file is empty. Please upload a file with data.", None
-            except pd.errors.ParserError as e:
-                return False, f"CSV format error: {str(e)}. Please check your file format.", None
-            except UnicodeDecodeError:
-                # Second attempt: try different encoding
-                try:
-                    df = pd.read_csv(file_path, encoding='latin1')
-                except Exception:
-                    return False, "Unable to read file. Please check the file encoding and format.", None
-            
-            # Validate data content
-            if df is None or df.empty:
-                return False, "The CSV file contains no data rows. Please upload a file with actual data.", None
-            
-            if len(df.columns) == 0:
-                return False, "The CSV file has no columns. Please check your file format.", None
+                df = loader.load_csv(file_path)
+            except CSVLoadError as e:
+                return False, f"{str(e)}. Please check your file format.", None
             
             # Check for potential formatting issues
-            if len(df.columns) == 1 and df.columns[0].count(',') > 0:
+            if extension == '.csv' and len(df.columns) == 1 and str(df.columns[0]).count(',') > 0:
                 return False, "It looks like your CSV might have formatting issues. Please ensure proper comma separation.", None
             
+            self.csv_loader = loader
             return True, "File validation successful", df
             
         except Exception as e:
             return False, f"Unexpected error reading file: {str(e)}", None
     
+    def _settings(self) -> Settings:
+        """Settings of the app core, or defaults when running without one."""
+        settings = getattr(self.app_core, 'settings', None)
+        return settings if isinstance(settings, Settings) else Settings()
+    
     def analyze_csv_data(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Analyze CSV data and create comprehensive summary.
         
         This method examines the DataFrame to extract metadata, statistics,
         and structural information useful for analysis and UI display.
+        Types, null counts, cardinalities and min/max come from the dataset's
+        memoised profile.
         
         Args:
             df (pd.DataFrame): The DataFrame to analyze
@@ -112,11 +128,12 @@ class FileHandler:
                 - Statistics for numeric columns
                 - Data quality metrics
         """
+        profile = get_dataset_profile(df)
         analysis = {
-            'row_count': len(df),
-            'column_count': len(df.columns),
-            'columns': list(df.columns),
-            'column_types': {},
+            'row_count': profile.row_count,
+            'column_count': len(profile.columns),
+            'columns': list(profile.columns),
+            'column_types': dict(profile.dtypes),
             'sample_data': {},
             'basic_stats': {},
             'data_quality': {}
@@ -124,36 +141,37 @@ class FileHandler:
         
         # Analyze each column
         for col in df.columns:
-            # Get column type
-            dtype = str(df[col].dtype)
-            analysis['column_types'][col] = dtype
-            
             # Get sample values (first 10 non-null values)
             sample_values = df[col].dropna().head(10).tolist()
             analysis['sample_data'][col] = sample_values
             
             # Data quality metrics
-            null_count = int(df[col].isnull().sum())
+            null_count = profile.null_counts[col]
             analysis['data_quality'][col] = {
                 'null_count': null_count,
                 'null_percentage': (null_count / len(df)) * 100,
-                'unique_count': int(df[col].nunique())
+                'unique_count': profile.cardinality[col]
             }
-            
-            # Basic statistics for numeric columns
-            if df[col].dtype in ['int64', 'float64']:
-                try:
-                    stats = {
-                        'min': float(df[col].min()),
-                        'max': float(df[col].max()),
-                        'mean': float(df[col].mean()),
-                        'median': float(df[col].median()),
-                        'std': float(df[col].std())
+        
+        # Basic statistics for numeric columns, one reduction per statistic
+        numeric_cols = profile.numeric_columns
+        if numeric_cols:
+            try:
+                numeric = df[numeric_cols]
+                moments = pd.DataFrame({
+                    'mean': numeric.mean(),
+                    'median': numeric.median(),
+                    'std': numeric.std()
+                }).astype(float)
+                for col in numeric_cols:
+                    analysis['basic_stats'][col] = {
+                        'min': float(profile.minimums[col]) if profile.minimums[col] is not None else float('nan'),
+                        'max': float(profile.maximums[col]) if profile.maximums[col] is not None else float('nan'),
+                        **moments.loc[col].to_dict()
                     }
-                    analysis['basic_stats'][col] = stats
-                except Exception:
-                    # Skip statistics if calculation fails
-                    pass
+            except Exception:
+                # Skip statistics if calculation fails
+                pass
         
         # Get sample rows for preview
         sample_rows = df.head(10).to_dict('records')
@@ -166,52 +184,18 @@ class FileHandler:
     
     def detect_date_columns(self, df: pd.DataFrame) -> List[str]:
         """
-        Detect potential date columns in the DataFrame.
+        Detect date columns in the DataFrame.
         
-        Uses multiple heuristics to identify date columns:
-        - Column name patterns
-        - Data type detection
-        - Sample data parsing
+        Uses the dataset's memoised profile: datetime columns plus text
+        columns whose sampled values parse as dates.
         
         Args:
             df (pd.DataFrame): The DataFrame to examine
             
         Returns:
-            List[str]: List of column names that appear to contain dates
+            List[str]: List of column names that contain dates
         """
-        date_columns = []
-        
-        for col in df.columns:
-            # Check column name patterns
-            col_lower = col.lower()
-            if any(date_word in col_lower for date_word in ['date', 'time', 'timestamp', 'created', 'updated', 'day', 'month', 'year']):
-                date_columns.append(col)
-                continue
-            
-            # Check data type
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
-                date_columns.append(col)
-                continue
-            
-            # Try to parse sample values as dates
-            sample_values = df[col].dropna().head(10)
-            if len(sample_values) > 0:
-                try:
-                    parsed_count = 0
-                    for value in sample_values:
-                        try:
-                            pd.to_datetime(str(value), infer_datetime_format=True)
-                            parsed_count += 1
-                        except Exception:
-                            pass
-                    
-                    # If most samples parse as dates, consider it a date column
-                    if parsed_count >= len(sample_values) * 0.7:  # 70% success rate
-                        date_columns.append(col)
-                except Exception:
-                    pass
-        
-        return date_columns
+        return list(get_dataset_profile(df).date_columns)
     
     def format_column_info(self, analysis: Dict[str, Any]) -> str:
         """
@@ -273,12 +257,15 @@ class FileHandler:
         if df is None:
             return []
             
-        return df.select_dtypes(include=['object']).columns.tolist()
+        return df.select_dtypes(include=['object', 'category']).columns.tolist()
     
     def handle_upload(self, file, history: List[Dict]) -> Tuple[str, List[Dict]]:
         """
         Handle CSV file upload with validation and analysis.
         
+        Runs every upload stage before returning; the UI uses
+        handle_upload_stream to show results as each stage finishes.
+        
         Args:
             file: The uploaded file object from Gradio
             history: Current chat history
@@ -286,59 +273,183 @@ class FileHandler:
         Returns:
             Tuple[str, List[Dict]]: (upload_status, updated_history)
         """
+        result = ("Please select a CSV file to upload.", history)
+        for result in self.handle_upload_stream(file, history):
+            pass
+        return result
+    
+    def handle_upload_stream(self, file, history: List[Dict]) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Handle an upload as a staged job, yielding progress as it goes.
+        
+        The first update arrives as soon as the file is parsed: the data is
+        already queryable and the chat shows a preview. Profiling, SQL
+        context, automatic analysis and the data summary then run on a
+        background worker, and each stage's progress and result is yielded
+        as it completes.
+        
+        Args:
+            file: The uploaded file object from Gradio
+            history: Current chat history
+            
+        Yields:
+            Tuple[str, List[Dict]]: (upload_status, updated_history)
+        """
         if file is None:
-            return "Please select a CSV file to upload.", history
+            yield "Please select a CSV file to upload.", history
+            return
         
         print(f"[DEBUG] Processing file: {file.name}")
+        started = time.perf_counter()
         
         # Validate file
         is_valid, message, df = self.validate_csv_file(file.name)
         
         if not is_valid:
-            return f"❌ **Upload Failed**: {message}", history
+            yield f"❌ **Upload Failed**: {message}", history
+            return
         
-        # Store the data
+        # Store the data; the loader fingerprinted it while parsing
         self.current_data = df
+        fingerprint = self.csv_loader.fingerprint
+        status = f"✅ **Upload Successful**\n\nFile: {file.name}\nRows: {len(df):,}\nColumns: {len(df.columns)}"
         
-        # Update app_core if available
-        if self.app_core:
-            # Analyze the data
-            analysis = self.analyze_csv_data(df)
-            self.data_summary = analysis
-            
-            # Generate summary using LLM if available
-            if self.app_core.is_ollama_available():
-                summary_text = self._generate_llm_summary(analysis)
-            else:
-                summary_text = self._generate_fallback_summary(analysis)
-            
-            # Store in app core
-            self.app_core.set_current_data(df, analysis)
-            
-            # Try automatic analysis if timescale analyzer is available
-            auto_analysis = self._attempt_automatic_analysis(df)
-            
-            # Add upload success message to chat
-            upload_message = {
-                "role": "assistant",
-                "content": f"✅ **File uploaded successfully!**\n\n{summary_text}"
-            }
-            
-            # Add auto-analysis if available
-            if auto_analysis:
-                auto_message = {
-                    "role": "assistant", 
-                    "content": auto_analysis
-                }
-                history.extend([upload_message, auto_message])
-            else:
-                history.append(upload_message)
-            
-            return f"✅ **Upload Successful**\n\nFile: {file.name}\nRows: {len(df):,}\nColumns: {len(df.columns)}", history
+        if not self.app_core:
+            # Fallback without app_core
+            yield status, history
+            return
+        
+        with self._upload_lock:
+            self._upload_generation += 1
+            generation = self._upload_generation
+            # Chat and quick actions can use the data while the stages run
+            self.app_core.set_current_data(df, None, fingerprint=fingerprint)
+        
+        progress = {"role": "assistant", "content": self._format_upload_progress([], None)}
+        history = history + [{"role": "assistant", "content": self._format_upload_preview(df)}, progress]
+        print(f"[DEBUG] Upload preview ready in {time.perf_counter() - started:.2f}s")
+        yield f"{status}\n\n⏳ Processing...", history
+        
+        events: queue.Queue = queue.Queue()
+        self._upload_executor.submit(self._run_upload_stages, df, fingerprint, generation, events)
+        
+        completed: List[str] = []
+        while True:
+            kind, label, content = events.get()
+            if kind == 'start':
+                progress["content"] = self._format_upload_progress(completed, label)
+            elif kind == 'finish':
+                completed.append(label)
+                progress["content"] = self._format_upload_progress(completed, None)
+                # Shown with the next stage's start
+                continue
+            elif kind == 'message':
+                history = history + [{"role": "assistant", "content": content}]
+            elif kind == 'done':
+                elapsed = time.perf_counter() - started
+                if content:
+                    progress["content"] = "⏹️ **Upload processing stopped**: a newer file was uploaded"
+                else:
+                    progress["content"] = f"✅ **Upload processed** in {elapsed:.1f}s"
+                yield status, list(history)
+                return
+            yield f"{status}\n\n⏳ {label or 'Processing'}...", list(history)
+    
+    def _run_upload_stages(self, df: pd.DataFrame, fingerprint: Optional[str],
+                           generation: int, events: queue.Queue) -> None:
+        """
+        Run the post-parse upload stages on the background worker.
+        
+        Each stage posts ('start', label, None) and ('finish', label, None)
+        events, plus ('message', label, text) when it produces a chat
+        message. A final ('done', None, superseded) event ends the job.
+        Stages stop early once a newer upload has started.
         
+        Args:
+            df (pd.DataFrame): The parsed upload
+            fingerprint (str, optional): The upload's fingerprint from CSVLoader
+            generation (int): Upload generation this job belongs to
+            events (queue.Queue): Progress events for handle_upload_stream
+        """
+        # Results handed from one stage to the next
+        state: Dict[str, Any] = {'fingerprint': fingerprint}
+        stages = [
+            ("Profiling columns", lambda: self._profile_upload(df, generation, state)),
+            ("Building time rollups", lambda: self._build_rollups(df)),
+            ("Preparing SQL queries", lambda: self._prepare_sql_context(df, state.get('analysis'))),
+            ("Running automatic analysis", lambda: self._attempt_automatic_analysis(df)),
+            ("Writing data summary", lambda: self._summarize_upload(state.get('analysis'))),
+        ]
+        
+        superseded = False
+        try:
+            for label, stage in stages:
+                if generation != self._upload_generation:
+                    superseded = True
+                    break
+                
+                events.put(('start', label, None))
+                stage_start = time.perf_counter()
+                try:
+                    message = stage()
+                except Exception as e:
+                    print(f"[DEBUG] Upload stage '{label}' failed: {e}")
+                    message = f"⚠️ **{label} failed**: {str(e)}"
+                print(f"[DEBUG] Upload stage '{label}' took {time.perf_counter() - stage_start:.2f}s")
+                
+                if message and generation == self._upload_generation:
+                    events.put(('message', label, message))
+                events.put(('finish', label, None))
+        finally:
+            events.put(('done', None, superseded))
+    
+    def _profile_upload(self, df: pd.DataFrame, generation: int, state: Dict[str, Any]) -> None:
+        """Analyze the upload and publish the summary unless a newer upload replaced it."""
+        state['analysis'] = self.analyze_csv_data(df)
+        with self._upload_lock:
+            if generation == self._upload_generation:
+                self.app_core.set_current_data(df, state['analysis'], fingerprint=state['fingerprint'])
+    
+    def _build_rollups(self, df: pd.DataFrame) -> None:
+        """Build the rollup cube the time-based analyzers read, for each detected date column."""
+        for date_col in get_dataset_profile(df).date_columns:
+            # Text dates CSVLoader left as text are parsed by the cube builder
+            get_rollup_cube(df, date_col)
+    
+    def _prepare_sql_context(self, df: pd.DataFrame, analysis: Optional[Dict[str, Any]]) -> None:
+        """Hand the new data and its column types to the NL2SQL engine, if any."""
+        engine = getattr(self.app_core, 'nl2sql_engine', None)
+        if engine is not None and analysis:
+            engine.set_data_context(df, analysis['column_types'])
+    
+    def _summarize_upload(self, analysis: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Write the upload summary chat message (LLM when available)."""
+        if not analysis:
+            # Profiling failed and already reported why
+            return None
+        if self.app_core.is_ollama_available():
+            summary_text = self._generate_llm_summary(analysis)
         else:
-            # Fallback without app_core
-            return f"✅ **Upload Successful**\n\nFile: {file.name}\nRows: {len(df):,}\nColumns: {len(df.columns)}", history
+            summary_text = self._generate_fallback_summary(analysis)
+        return f"✅ **File uploaded successfully!**\n\n{summary_text}"
+    
+    def _format_upload_preview(self, df: pd.DataFrame) -> str:
+        """Format the first chat message shown right after parsing."""
+        columns = list(df.columns)
+        preview = df.head(5).to_string(max_colwidth=20)
+        return (f"📥 **Data loaded**: {len(df):,} rows × {len(columns)} columns\n\n"
+                f"**Columns**: {', '.join(map(str, columns[:10]))}{'...' if len(columns) > 10 else ''}\n\n"
+                f"```\n{preview}\n```\n\n"
+                "*You can start asking questions now; profiling and analysis continue in the background.*")
+    
+    @staticmethod
+    def _format_upload_progress(completed: List[str], current: Optional[str]) -> str:
+        """Format the stage checklist shown while the upload job runs."""
+        lines = ["⏳ **Processing upload**"]
+        lines.extend(f"✅ {label}" for label in completed)
+        if current:
+            lines.append(f"🔄 {current}...")
+        return "\n".join(lines)
     
     def _generate_llm_summary(self, analysis: Dict) -> str:
         """Generate LLM-based summary of the data."""
@@ -405,7 +516,8 @@ Keep the response conversational and under 200 words.
         
         try:
             # Detect date columns
-            date_columns = self._detect_date_columns(df)
+            profile = get_dataset_profile(df)
+            date_columns = profile.date_columns
             
             if not date_columns:
                 return None
@@ -415,7 +527,7 @@ Keep the response conversational and under 200 words.
             print(f"[DEBUG] Using date column: {date_col}")
             
             # Auto-detect numeric columns for analysis
-            numeric_columns = df.select_dtypes(include=['number']).columns.tolist()
+            numeric_columns = profile.numeric_columns
             
             if not numeric_columns:
                 print("[DEBUG] No numeric columns found for timescale analysis")
@@ -451,22 +563,3 @@ Keep the response conversational and under 200 words.
             print(f"[DEBUG] Unexpected OOB Analysis error: {e}")
             return None
     
-    def _detect_date_columns(self, df: pd.DataFrame) -> List[str]:
-        """Detect potential date columns in the DataFrame."""
-        date_columns = []
-        
-        for col in df.columns:
-            col_lower = col.lower()
-            # Check for common date column names
-            if any(date_word in col_lower for date_word in ['date', 'time', 'day', 'month', 'year']):
-                date_columns.append(col)
-                continue
-            
-            # Check if the column can be parsed as dates
-            try:
-                pd.to_datetime(df[col].dropna().head(10), errors='raise')
-                date_columns.append(col)
-            except:
-                continue
-        
-        return date_columns
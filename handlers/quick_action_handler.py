@@ -18,6 +18,7 @@ from typing import List, Dict, Any, Optional
 
 from handlers.timestamp_handler import TimestampHandler
 from analyzers.forecast_analyzer import ForecastingAnalyzer
+from data.dataset_profile import get_dataset_profile
 from utils.cache_manager import get_cache_manager
 from utils.performance_monitor import get_performance_monitor, performance_monitor
 
@@ -177,11 +178,24 @@ class QuickActionHandler:
             'data_summary_type': type(data_summary).__name__
         }
         
-        cached_result = self.cache_manager.get(current_data, 'summary', cache_key_params)
-        if cached_result is not None:
-            return cached_result
+        # Concurrent identical requests share one computation
+        return self.cache_manager.get_or_compute(
+            current_data, 'summary',
+            lambda: self._build_summary(current_data, data_summary),
+            cache_key_params
+        )
+    
+    def _build_summary(self, current_data: pd.DataFrame, data_summary) -> str:
+        """
+        Build the summary response on a cache miss.
         
-        # Only calculate these if we didn't get a cache hit
+        Args:
+            current_data (pd.DataFrame): Current dataset
+            data_summary: Summary produced when the data was loaded
+            
+        Returns:
+            str: Summary analysis response with RAG context if available
+        """
         row_count = len(current_data)
         col_count = len(current_data.columns)
         
@@ -204,7 +218,7 @@ class QuickActionHandler:
 
 **Columns**: {columns}
 
-**Data Types**: {len(current_data.select_dtypes(include=['number']).columns)} numeric, {len(current_data.select_dtypes(include=['object']).columns)} text
+**Data Types**: {len(current_data.select_dtypes(include=['number']).columns)} numeric, {len(current_data.select_dtypes(include=['object', 'category']).columns)} text
 
 💡 **Next Steps**: Try trends analysis or ask specific questions about your data!"""
         
@@ -218,7 +232,7 @@ class QuickActionHandler:
 Data Summary Analysis:
 - Dataset: {row_count:,} rows × {col_count} columns
 - Key columns: {', '.join(current_data.columns[:10])}
-- Data types: {len(current_data.select_dtypes(include=['number']).columns)} numeric, {len(current_data.select_dtypes(include=['object']).columns)} categorical
+- Data types: {len(current_data.select_dtypes(include=['number']).columns)} numeric, {len(current_data.select_dtypes(include=['object', 'category']).columns)} categorical
 """
                 
                 # Enhance with RAG
@@ -245,8 +259,6 @@ Data Summary Analysis:
 ---
 🔍 **RAG Enhancement**: Analysis enhanced with {enhanced_result.get('documents_used', 0)} document(s)"""
                     
-                    # Cache the RAG-enhanced result
-                    self.cache_manager.put(current_data, 'summary', final_result, cache_key_params)
                     return final_result
                 else:
                     print(f"⚠️ RAG enhancement failed: {enhanced_result.get('error', 'Unknown error')}")
@@ -254,8 +266,6 @@ Data Summary Analysis:
             except Exception as e:
                 print(f"❌ RAG enhancement error: {str(e)}")
         
-        # Cache the base summary result
-        self.cache_manager.put(current_data, 'summary', base_summary, cache_key_params)
         return base_summary
     
     @performance_monitor('trends_analysis')
@@ -282,7 +292,7 @@ Data Summary Analysis:
                 return "⚠️ **Trends Analysis**: No date columns detected in your data. Trends analysis requires time-based data."
             
             # Get numeric columns
-            numeric_columns = current_data.select_dtypes(include=['number']).columns.tolist()
+            numeric_columns = get_dataset_profile(current_data).numeric_columns
             
             if not numeric_columns:
                 return "⚠️ **Trends Analysis**: No numeric columns found. Trends analysis requires numerical data to analyze."
@@ -294,80 +304,87 @@ Data Summary Analysis:
                 'numeric_columns': numeric_columns[:3]  # Only first 3 columns affect analysis
             }
             
-            cached_result = self.cache_manager.get(current_data, 'trends', cache_key_params)
-            if cached_result is not None:
-                return cached_result
-            
-            # Get numeric columns
-            numeric_columns = current_data.select_dtypes(include=['number']).columns.tolist()
-            
-            if not numeric_columns:
-                return "⚠️ **Trends Analysis**: No numeric columns found. Trends analysis requires numerical data to analyze."
-            
-            # Perform the analysis
-            self.app_core.timescale_analyzer.analyze(
-                data=current_data,
-                date_col=date_columns[0],
-                value_cols=numeric_columns[:3]  # Limit to first 3 columns
+            # Concurrent identical requests share one computation; failures are not cached
+            return self.cache_manager.get_or_compute(
+                current_data, 'trends',
+                lambda: self._build_trends(current_data, date_columns, numeric_columns),
+                cache_key_params,
+                cacheable=lambda result: not result.startswith("❌")
             )
-            
-            if self.app_core.timescale_analyzer.status == "completed":
-                base_analysis = f"📈 **Trends Analysis**\n\n{self.app_core.timescale_analyzer.format_for_chat()}"
                 
-                # Enhance with RAG if available
-                if self.rag_manager and self.rag_analyzer and self.rag_manager.has_documents():
-                    try:
-                        print("🔍 Enhancing trends analysis with RAG context...")
-                        
-                        # Create analysis context for RAG enhancement
-                        analysis_context = f"""
+        except Exception as e:
+            return f"❌ **Trends Analysis Error**: {str(e)}"
+    
+    def _build_trends(self, current_data: pd.DataFrame, date_columns: List[str],
+                      numeric_columns: List[str]) -> str:
+        """
+        Run the trends analysis on a cache miss.
+        
+        Args:
+            current_data (pd.DataFrame): Current dataset
+            date_columns (List[str]): Detected date columns (the first is used)
+            numeric_columns (List[str]): Numeric columns (the first 3 are analyzed)
+            
+        Returns:
+            str: Trends analysis response with RAG context if available
+        """
+        # Perform the analysis
+        self.app_core.timescale_analyzer.analyze(
+            data=current_data,
+            date_col=date_columns[0],
+            value_cols=numeric_columns[:3]  # Limit to first 3 columns
+        )
+        
+        if self.app_core.timescale_analyzer.status == "completed":
+            base_analysis = f"📈 **Trends Analysis**\n\n{self.app_core.timescale_analyzer.format_for_chat()}"
+            
+            # Enhance with RAG if available
+            if self.rag_manager and self.rag_analyzer and self.rag_manager.has_documents():
+                try:
+                    print("🔍 Enhancing trends analysis with RAG context...")
+                    
+                    # Create analysis context for RAG enhancement
+                    analysis_context = f"""
 Trends Analysis Results:
 - Date column: {date_columns[0]}
 - Value columns analyzed: {', '.join(numeric_columns[:3])}
 - Dataset size: {len(current_data)} records
 - Analysis status: {self.app_core.timescale_analyzer.status}
 """
+                    
+                    # Enhance with RAG
+                    enhanced_result = self.rag_analyzer.enhance_trend_analysis(
+                        trend_data={'analysis': base_analysis, 'context': analysis_context},
+                        analysis_context=analysis_context
+                    )
+                    
+                    if enhanced_result.get('success'):
+                        print(f"✅ RAG-enhanced trends analysis generated with {enhanced_result.get('documents_used', 0)} document(s)")
                         
-                        # Enhance with RAG
-                        enhanced_result = self.rag_analyzer.enhance_trend_analysis(
-                            trend_data={'analysis': base_analysis, 'context': analysis_context},
-                            analysis_context=analysis_context
-                        )
+                        # Log the prompt being used for validation
+                        if 'prompt_used' in enhanced_result:
+                            print("📝 PROMPT USED FOR RAG ENHANCEMENT:")
+                            print("=" * 50)
+                            print(enhanced_result['prompt_used'])
+                            print("=" * 50)
                         
-                        if enhanced_result.get('success'):
-                            print(f"✅ RAG-enhanced trends analysis generated with {enhanced_result.get('documents_used', 0)} document(s)")
-                            
-                            # Log the prompt being used for validation
-                            if 'prompt_used' in enhanced_result:
-                                print("📝 PROMPT USED FOR RAG ENHANCEMENT:")
-                                print("=" * 50)
-                                print(enhanced_result['prompt_used'])
-                                print("=" * 50)
-                            
-                            final_result = f"""{base_analysis}
+                        final_result = f"""{base_analysis}
 
 {enhanced_result['enhanced_analysis']}
 
 ---
 🔍 **RAG Enhancement**: Analysis enhanced with {enhanced_result.get('documents_used', 0)} document(s)"""
-                            
-                            # Cache the RAG-enhanced result
-                            self.cache_manager.put(current_data, 'trends', final_result, cache_key_params)
-                            return final_result
-                        else:
-                            print(f"⚠️ RAG enhancement failed: {enhanced_result.get('error', 'Unknown error')}")
-                            
-                    except Exception as e:
-                        print(f"❌ RAG enhancement error: {str(e)}")
-                
-                # Cache the base analysis result
-                self.cache_manager.put(current_data, 'trends', base_analysis, cache_key_params)
-                return base_analysis
-            else:
-                return f"❌ **Trends Analysis Failed**: {self.app_core.timescale_analyzer.status}"
-                
-        except Exception as e:
-            return f"❌ **Trends Analysis Error**: {str(e)}"
+                        
+                        return final_result
+                    else:
+                        print(f"⚠️ RAG enhancement failed: {enhanced_result.get('error', 'Unknown error')}")
+                        
+                except Exception as e:
+                    print(f"❌ RAG enhancement error: {str(e)}")
+            
+            return base_analysis
+        else:
+            return f"❌ **Trends Analysis Failed**: {self.app_core.timescale_analyzer.status}"
     
     @performance_monitor('variance_analysis')
     def _handle_variance_action(self) -> str:
@@ -660,32 +677,15 @@ Variance Analysis Results:
     
     def _detect_date_columns(self, df) -> List[str]:
         """
-        Detect potential date columns in the DataFrame.
+        Detect date columns in the DataFrame from its memoised profile.
         
         Args:
             df: The DataFrame to analyze
             
         Returns:
-            List[str]: List of potential date column names
+            List[str]: Columns holding (or parsing as) dates
         """
-        date_columns = []
-        
-        for col in df.columns:
-            col_lower = col.lower()
-            # Check for common date column names
-            if any(date_word in col_lower for date_word in ['date', 'time', 'day', 'month', 'year']):
-                date_columns.append(col)
-                continue
-            
-            # Check if the column can be parsed as dates
-            try:
-                import pandas as pd
-                pd.to_datetime(df[col].dropna().head(10), errors='raise')
-                date_columns.append(col)
-            except:
-                continue
-        
-        return date_columns
+        return list(get_dataset_profile(df).date_columns)
     
     def _format_data_summary_dict(self, data_summary: dict, current_data) -> str:
         """
@@ -725,7 +725,7 @@ Variance Analysis Results:
             column_types = data_summary.get('column_types', {})
             if column_types:
                 numeric_cols = sum(1 for dtype in column_types.values() if 'int' in str(dtype).lower() or 'float' in str(dtype).lower())
-                text_cols = sum(1 for dtype in column_types.values() if 'object' in str(dtype).lower())
+                text_cols = sum(1 for dtype in column_types.values() if str(dtype).lower() in ('object', 'category'))
                 summary_parts.append(f"**Data Types**: {numeric_cols} numeric, {text_cols} text")
                 summary_parts.append("")
             
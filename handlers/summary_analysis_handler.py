@@ -82,7 +82,7 @@ class SummaryAnalysisHandler:
 
 **Columns**: {columns}
 
-**Data Types**: {len(current_data.select_dtypes(include=['number']).columns)} numeric, {len(current_data.select_dtypes(include=['object']).columns)} text
+**Data Types**: {len(current_data.select_dtypes(include=['number']).columns)} numeric, {len(current_data.select_dtypes(include=['object', 'category']).columns)} text
 
 💡 **Next Steps**: Try trends analysis or ask specific questions about your data!"""
     
@@ -108,7 +108,7 @@ class SummaryAnalysisHandler:
 Data Summary Analysis:
 - Dataset: {row_count:,} rows × {col_count} columns
 - Key columns: {', '.join(current_data.columns[:10])}
-- Data types: {len(current_data.select_dtypes(include=['number']).columns)} numeric, {len(current_data.select_dtypes(include=['object']).columns)} categorical
+- Data types: {len(current_data.select_dtypes(include=['number']).columns)} numeric, {len(current_data.select_dtypes(include=['object', 'category']).columns)} categorical
 """
             
             # Enhance with RAG
@@ -180,7 +180,7 @@ Data Summary Analysis:
             column_types = data_summary.get('column_types', {})
             if column_types:
                 numeric_cols = sum(1 for dtype in column_types.values() if 'int' in str(dtype).lower() or 'float' in str(dtype).lower())
-                text_cols = sum(1 for dtype in column_types.values() if 'object' in str(dtype).lower())
+                text_cols = sum(1 for dtype in column_types.values() if str(dtype).lower() in ('object', 'category'))
                 summary_parts.append(f"**Data Types**: {numeric_cols} numeric, {text_cols} text")
                 summary_parts.append("")
             
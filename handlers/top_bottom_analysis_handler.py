@@ -10,9 +10,12 @@ This module handles top/bottom N analysis functionality including:
 Following modular design principles to keep files focused and maintainable.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 
+from analyzers.base_analyzer import AnalysisFormatter
+
 
 class TopBottomAnalysisHandler:
     """
@@ -54,7 +57,7 @@ class TopBottomAnalysisHandler:
                 return f"⚠️ **{direction.title()} {n} Analysis**: No numeric columns found in your data."
             
             # Get categorical columns for grouping
-            categorical_columns = current_data.select_dtypes(include=['object']).columns.tolist()
+            categorical_columns = current_data.select_dtypes(include=['object', 'category']).columns.tolist()
             
             # Use the first numeric column for values
             value_col = numeric_columns[0]
@@ -113,7 +116,7 @@ class TopBottomAnalysisHandler:
             str: Formatted analysis results
         """
         # Group by category and sum values
-        grouped_data = current_data.groupby(category_col)[value_col].sum().reset_index()
+        grouped_data = current_data.groupby(category_col, observed=True)[value_col].sum().reset_index()
         
         # Sort and get top/bottom N
         if direction == "top":
@@ -122,12 +125,14 @@ class TopBottomAnalysisHandler:
             result_data = grouped_data.nsmallest(n, value_col)
             
         # Format results with more detail
-        result_text = ""
         total_sum = grouped_data[value_col].sum()
+        shares = result_data[value_col] / total_sum if total_sum > 0 else np.zeros(len(result_data))
         
-        for idx, (_, row) in enumerate(result_data.iterrows(), 1):
-            percentage = (row[value_col] / total_sum) * 100 if total_sum > 0 else 0
-            result_text += f"• **#{idx} {row[category_col]}**: ${row[value_col]:,.2f} ({percentage:.1f}% of total)\n"
+        ranks = AnalysisFormatter.rank_labels(len(result_data))
+        categories = result_data[category_col].astype(str).to_numpy(dtype=object)
+        amounts = AnalysisFormatter.format_amount_column(result_data[value_col])
+        percentages = AnalysisFormatter.format_percentage_column(shares)
+        result_text = "".join("• **#" + ranks + " " + categories + "**: " + amounts + " (" + percentages + " of total)\n")
         
         # Generate comprehensive analysis
         analysis_result = self._generate_enhanced_top_bottom_analysis(
@@ -233,9 +238,10 @@ class TopBottomAnalysisHandler:
         """
         try:
             # Show the actual values
-            result_text = ""
-            for idx, (_, row) in enumerate(result_data.iterrows(), 1):
-                result_text += f"• **#{idx}**: ${row[value_col]:,.2f}\n"
+            result_text = "".join(
+                "• **#" + AnalysisFormatter.rank_labels(len(result_data)) + "**: " +
+                AnalysisFormatter.format_amount_column(result_data[value_col]) + "\n"
+            )
             
             # Calculate insights
             top_value = result_data[value_col].iloc[0]
@@ -11,6 +11,7 @@ Phase: 3A - Performance Foundation
 """
 
 import unittest
+import numpy as np
 import pandas as pd
 import time
 import threading
@@ -21,7 +22,10 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.cache_manager import CacheManager, get_cache_manager, clear_global_cache
+from utils.cache_manager import CacheManager, get_cache_manager, clear_global_cache, estimate_size
+from utils.data_fingerprint import (
+    SAMPLED, compute_fingerprint, get_fingerprint, register_fingerprint
+)
 
 
 class TestCacheManager(unittest.TestCase):
@@ -325,5 +329,285 @@ class TestCacheManager(unittest.TestCase):
         self.assertEqual(self.cache_manager.get(different_data, 'summary'), "long_ttl")
 
 
+class TestCacheMemoryBudget(unittest.TestCase):
+    """
+    Test suite for byte-size accounting and memory-bounded eviction.
+    """
+    
+    def _frame(self, seed: int, rows: int = 1000) -> pd.DataFrame:
+        """Build a distinct frame of roughly rows * 16 bytes."""
+        return pd.DataFrame({'a': range(seed, seed + rows), 'b': [float(seed)] * rows})
+    
+    def test_estimate_size(self):
+        """Sizes reflect DataFrame buffers and nested container contents."""
+        frame = self._frame(0)
+        self.assertGreaterEqual(estimate_size(frame), 16_000)
+        self.assertGreater(estimate_size("x" * 10_000), 10_000)
+        nested = {'table': frame, 'text': "x" * 5_000}
+        self.assertGreater(estimate_size(nested), estimate_size(frame) + 5_000)
+    
+    def test_bytes_reported_per_analysis_type(self):
+        """get_stats reports total bytes and bytes per analysis type."""
+        cache = CacheManager(max_size=10)
+        cache.put("dataset", 'summary', "s" * 2_000)
+        cache.put("dataset", 'trends', self._frame(0))
+        
+        stats = cache.get_stats()
+        by_type = stats['bytes_by_analysis_type']
+        self.assertEqual(set(by_type), {'summary', 'trends'})
+        self.assertGreater(by_type['summary'], 2_000)
+        self.assertEqual(stats['memory_bytes'], sum(by_type.values()))
+        
+        cache.invalidate_data_cache("dataset")
+        self.assertEqual(cache.get_stats()['memory_bytes'], 0)
+    
+    def test_memory_budget_evicts(self):
+        """Inserting past the budget evicts entries until the new one fits."""
+        frame_bytes = estimate_size(self._frame(0))
+        cache = CacheManager(max_size=100, max_memory_bytes=frame_bytes * 3 + 100)
+        for i in range(5):
+            cache.put(f"dataset_{i}", 'summary', self._frame(i))
+        
+        stats = cache.get_stats()
+        self.assertLessEqual(stats['memory_bytes'], cache.max_memory_bytes)
+        self.assertEqual(stats['size'], 3)
+        self.assertEqual(stats['memory_evictions'], 2)
+        self.assertIsNotNone(cache.get("dataset_4", 'summary'))
+    
+    def test_large_stale_entry_evicted_before_small_ones(self):
+        """Eviction weighs size as well as recency."""
+        small = "x" * 1_000
+        large = "y" * 50_000
+        cache = CacheManager(max_size=100, max_memory_bytes=estimate_size(large) + 4 * estimate_size(small))
+        cache.put("dataset", 'small_1', small)
+        cache.put("dataset", 'large', large)
+        cache.put("dataset", 'small_2', small)
+        
+        cache.put("dataset", 'small_3', "z" * 20_000)
+        
+        self.assertIsNone(cache.get("dataset", 'large'))
+        self.assertIsNotNone(cache.get("dataset", 'small_1'))
+        self.assertIsNotNone(cache.get("dataset", 'small_2'))
+    
+    def test_oversize_result_not_cached(self):
+        """A value larger than the whole budget is rejected."""
+        cache = CacheManager(max_memory_bytes=1_000)
+        cache.put("dataset", 'summary', "x" * 5_000)
+        self.assertIsNone(cache.get("dataset", 'summary'))
+        self.assertEqual(cache.get_stats()['rejected_oversize'], 1)
+
+
+class TestCacheExpiry(unittest.TestCase):
+    """
+    Test suite for lazy per-key expiry and the amortised expiry sweep.
+    """
+    
+    def setUp(self):
+        """Set up a cache large enough that expiry, not capacity, drives removal."""
+        self.cache = CacheManager(max_size=1000, default_ttl=3600)
+    
+    def test_get_does_not_scan_cache(self):
+        """A lookup checks only its own entry, however many are cached."""
+        for i in range(500):
+            self.cache.put(f"dataset_{i}", 'summary', i)
+        
+        with patch.object(self.cache, '_is_expired', wraps=self.cache._is_expired) as spy:
+            self.assertEqual(self.cache.get("dataset_250", 'summary'), 250)
+        self.assertEqual(spy.call_count, 1)
+    
+    def test_expired_key_removed_on_lookup(self):
+        """An expired entry is dropped when it is looked up."""
+        self.cache.put("dataset", 'summary', "result", ttl=0.05)
+        time.sleep(0.1)
+        
+        self.assertIsNone(self.cache.get("dataset", 'summary'))
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['size'], 0)
+        self.assertEqual(stats['memory_bytes'], 0)
+        self.assertEqual(stats['expirations'], 1)
+    
+    def test_sweep_is_bounded_per_call(self):
+        """Each put removes at most expiry_sweep_batch due entries."""
+        cache = CacheManager(max_size=1000, expiry_sweep_batch=4)
+        for i in range(10):
+            cache.put(f"dataset_{i}", 'summary', i, ttl=0.05)
+        time.sleep(0.1)
+        
+        cache.put("fresh", 'summary', "result")
+        self.assertEqual(len(cache.cache), 10 - 4 + 1)
+        self.assertEqual(cache.cleanup_expired(), 6)
+        self.assertEqual(list(cache.cache), [cache._generate_cache_key("fresh", 'summary')])
+    
+    def test_replaced_entry_keeps_new_ttl(self):
+        """A stale heap item for a replaced entry does not expire the new value."""
+        self.cache.put("dataset", 'summary', "old", ttl=0.05)
+        self.cache.put("dataset", 'summary', "new", ttl=3600)
+        time.sleep(0.1)
+        
+        self.assertEqual(self.cache.cleanup_expired(), 0)
+        self.assertEqual(self.cache.get("dataset", 'summary'), "new")
+    
+    def test_expiry_heap_stays_bounded(self):
+        """Repeated replacement does not grow the expiry heap without limit."""
+        for i in range(2000):
+            self.cache.put("dataset", 'summary', i)
+        self.assertLessEqual(len(self.cache._expiry_heap), 2 * len(self.cache.cache) + 65)
+        self.assertEqual(self.cache.get("dataset", 'summary'), 1999)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Test suite for coalescing concurrent identical computations.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.cache = CacheManager(max_size=10)
+        self.release = threading.Event()
+        self.calls = 0
+    
+    def _slow_compute(self, value="result"):
+        """Compute that blocks until released, counting invocations."""
+        self.calls += 1
+        self.release.wait(5)
+        if isinstance(value, Exception):
+            raise value
+        return value
+    
+    def _run_concurrently(self, callers: int, compute, **kwargs) -> list:
+        """Start callers, release the computation once all but one are waiting."""
+        outcomes = [None] * callers
+        
+        def call(i):
+            try:
+                outcomes[i] = self.cache.get_or_compute("dataset", 'summary', compute, **kwargs)
+            except Exception as e:
+                outcomes[i] = e
+        
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+        for thread in threads:
+            thread.start()
+        deadline = time.time() + 5
+        while self.cache.stats['coalesced_requests'] < callers - 1 and time.time() < deadline:
+            time.sleep(0.01)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return outcomes
+    
+    def test_concurrent_callers_share_one_computation(self):
+        """Only one caller computes; the rest wait and get its result."""
+        outcomes = self._run_concurrently(8, self._slow_compute)
+        
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(outcomes, ["result"] * 8)
+        self.assertEqual(self.cache.get_stats()['coalesced_requests'], 7)
+        self.assertEqual(self.cache.get("dataset", 'summary'), "result")
+    
+    def test_cached_result_skips_compute(self):
+        """A cached result is returned without computing."""
+        self.cache.put("dataset", 'summary', "cached")
+        compute = MagicMock(return_value="fresh")
+        
+        self.assertEqual(self.cache.get_or_compute("dataset", 'summary', compute), "cached")
+        compute.assert_not_called()
+    
+    def test_error_reaches_all_waiters_and_is_not_cached(self):
+        """Every coalesced caller sees the failure, and the next call retries."""
+        error = RuntimeError("analysis failed")
+        outcomes = self._run_concurrently(4, lambda: self._slow_compute(error))
+        
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(outcome is error for outcome in outcomes))
+        self.assertEqual(self.cache.get_or_compute("dataset", 'summary', lambda: "retry"), "retry")
+    
+    def test_uncacheable_result_shared_but_not_stored(self):
+        """Results rejected by cacheable still reach waiters but are not cached."""
+        outcomes = self._run_concurrently(
+            3, lambda: self._slow_compute("❌ failed"),
+            cacheable=lambda result: not result.startswith("❌")
+        )
+        
+        self.assertEqual(outcomes, ["❌ failed"] * 3)
+        self.assertIsNone(self.cache.get("dataset", 'summary'))
+
+
+class TestDatasetFingerprint(unittest.TestCase):
+    """
+    Test suite for upload-time dataset fingerprints used in cache keys.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.cache_manager = CacheManager(max_size=10, default_ttl=3600)
+        self.test_data = pd.DataFrame({
+            'Region': ['North', 'South'] * 50,
+            'Revenue': range(100)
+        })
+    
+    def test_registered_frame_is_not_rehashed(self):
+        """Cache lookups on a registered frame reuse the stored fingerprint."""
+        fingerprint = register_fingerprint(self.test_data)
+        
+        with patch('pandas.util.hash_pandas_object') as mock_hash:
+            self.cache_manager.put(self.test_data, 'summary', "result")
+            self.assertEqual(self.cache_manager.get(self.test_data, 'summary'), "result")
+            self.cache_manager.invalidate_data_cache(self.test_data)
+            mock_hash.assert_not_called()
+        
+        self.assertEqual(get_fingerprint(self.test_data), fingerprint)
+    
+    def test_fingerprint_string_as_cache_data(self):
+        """A precomputed fingerprint can stand in for the DataFrame."""
+        fingerprint = register_fingerprint(self.test_data)
+        self.cache_manager.put(self.test_data, 'trends', "result")
+        self.assertEqual(self.cache_manager.get(fingerprint, 'trends'), "result")
+    
+    def test_equal_content_shares_fingerprint(self):
+        """Fingerprints depend on content, not object identity."""
+        self.assertEqual(get_fingerprint(self.test_data), get_fingerprint(self.test_data.copy()))
+    
+    def test_structural_mutation_refreshes_fingerprint(self):
+        """Adding a column produces a new fingerprint for the same object."""
+        before = register_fingerprint(self.test_data)
+        self.test_data['Cost'] = 1
+        self.assertNotEqual(get_fingerprint(self.test_data), before)
+    
+    def test_value_edit_refreshes_fingerprint(self):
+        """Edits at the sampled rows are seen; others need an explicit re-register."""
+        register_fingerprint(self.test_data)
+        self.cache_manager.put(self.test_data, 'summary', "old result")
+        
+        # Row 37 is not among the sampled rows
+        self.test_data.loc[37, 'Revenue'] = 1_000
+        register_fingerprint(self.test_data)
+        self.assertIsNone(self.cache_manager.get(self.test_data, 'summary'))
+        self.assertEqual(get_fingerprint(self.test_data), compute_fingerprint(self.test_data))
+        
+        before = get_fingerprint(self.test_data)
+        self.test_data.loc[0, 'Region'] = 'East'
+        self.assertNotEqual(get_fingerprint(self.test_data), before)
+    
+    def test_lookup_does_not_read_every_row(self):
+        """A registered frame's lookup reads only the sampled rows."""
+        large = pd.DataFrame({'value': np.arange(200_000, dtype=float), 'label': 'x'})
+        fingerprint = register_fingerprint(large)
+        
+        with patch('pandas.util.hash_pandas_object') as mock_hash, \
+                patch.object(pd.Series, 'sum') as mock_sum:
+            self.assertEqual(get_fingerprint(large), fingerprint)
+            mock_hash.assert_not_called()
+            mock_sum.assert_not_called()
+    
+    def test_sampled_fingerprint(self):
+        """Sampled fingerprints are stable and still see structural changes."""
+        large = pd.DataFrame({'value': range(50_000)})
+        first = compute_fingerprint(large, mode=SAMPLED, sample_size=100)
+        self.assertEqual(first, compute_fingerprint(large.copy(), mode=SAMPLED, sample_size=100))
+        
+        longer = pd.DataFrame({'value': range(50_001)})
+        self.assertNotEqual(first, compute_fingerprint(longer, mode=SAMPLED, sample_size=100))
+
+
 if __name__ == '__main__':
     unittest.main()
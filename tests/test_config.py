@@ -25,7 +25,7 @@ class TestSettings:
         
         # Test default file processing
         assert settings.max_file_size == 50_000_000
-        assert settings.supported_formats == ['.csv']
+        assert settings.supported_formats == ['.csv', '.parquet', '.feather', '.arrow']
         
         # Test default UI configuration
         assert settings.gradio_port == 7860
@@ -11,7 +11,7 @@ import os
 from pathlib import Path
 
 from config.settings import Settings
-from data.csv_loader import CSVLoader, CSVLoadError
+from data.csv_loader import CSVLoader, CSVLoadError, PYARROW_AVAILABLE
 
 
 class TestCSVLoader:
@@ -284,6 +284,332 @@ class TestCSVLoader:
             self.loader.load_csv(csv_io)
 
 
+
+class TestCSVProfiling:
+    """Test cases for the single-pass column profiling"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.loader = CSVLoader(Settings())
+    
+    def test_only_confirmed_date_columns_converted(self):
+        """Date-named columns are converted only if their values are dates"""
+        csv_data = pd.DataFrame({
+            'fiscal_year': [2023, 2024, 2024],
+            'time_note': ['late', 'on time', 'early'],
+            'booked': ['2024-01-05', '2024-02-05', '2024-03-05'],
+            'amount': [1.0, 2.0, 3.0]
+        })
+        result = self.loader.load_csv(io.StringIO(csv_data.to_csv(index=False)))
+        
+        info = self.loader.column_info
+        assert 'fiscal_year' in info['numeric_columns']
+        assert 'time_note' in info['text_columns']
+        assert 'booked' in info['date_columns']
+        assert pd.api.types.is_datetime64_any_dtype(result['booked'])
+        assert set(info['potential_date_columns']) == {'fiscal_year', 'time_note'}
+    
+    def test_summary_stats_match_describe(self):
+        """Block-wise statistics equal DataFrame.describe"""
+        numeric = pd.DataFrame({
+            'units': [1, 5, 3, 8, 2],
+            'price': [1.5, None, 2.5, 4.0, 3.25]
+        })
+        stats = CSVLoader._numeric_summary(numeric)
+        expected = numeric.describe().to_dict()
+        
+        for col, col_stats in expected.items():
+            for stat, value in col_stats.items():
+                assert stats[col][stat] == pytest.approx(value)
+    
+    def test_duplicate_rows_differing_in_last_column(self):
+        """Rows equal in early columns but not the last are not duplicates"""
+        csv_data = pd.DataFrame({
+            'region': ['North', 'North', 'North', 'South'],
+            'units': [1, 1, 1, 2],
+            'note': ['a', 'b', 'a', None]
+        })
+        self.loader.load_csv(io.StringIO(csv_data.to_csv(index=False)))
+        
+        assert self.loader.data_quality['duplicate_rows'] == 1
+        assert self.loader.data_quality['missing_data']['note']['count'] == 1
+
+class TestCSVStreaming:
+    """Test cases for chunked streaming loads"""
+    
+    def setup_method(self):
+        """Write a CSV spanning several chunks"""
+        rows = 95
+        self.data = pd.DataFrame({
+            'Date': pd.date_range('2024-01-01', periods=rows, freq='D').strftime('%Y-%m-%d'),
+            'Region': [['North', 'South', 'East'][i % 3] for i in range(rows)],
+            'Code': [f'A{i}' if i < 10 else str(i) for i in range(rows)],
+            'Units': list(range(rows)),
+            'Sales': [float(i) * 1.5 if i % 17 else None for i in range(rows)]
+        })
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            self.data.to_csv(f, index=False)
+            self.path = f.name
+    
+    def teardown_method(self):
+        """Remove the temporary CSV"""
+        os.unlink(self.path)
+    
+    def test_streaming_matches_single_pass(self):
+        """Chunked loading produces the same frame as a single read"""
+        single = CSVLoader(Settings()).load_csv(self.path, streaming=False)
+        loader = CSVLoader(Settings(csv_chunk_rows=20))
+        streamed = loader.load_csv(self.path, streaming=True)
+        
+        pd.testing.assert_frame_equal(streamed, single)
+        assert loader.load_stats['mode'] == 'streaming'
+        assert 'Date' in loader.column_info['date_columns']
+    
+    def test_first_chunk_fixes_text_columns(self):
+        """A text column stays text when later chunks look numeric"""
+        loader = CSVLoader(Settings(csv_chunk_rows=10))
+        result = loader.load_csv(self.path, streaming=True)
+        
+        assert result['Code'].dtype == object
+        assert result['Code'].iloc[50] == '50'
+    
+    def test_large_files_stream_past_single_pass_limits(self):
+        """Files over max_file_size are streamed instead of rejected"""
+        settings = Settings(max_file_size=100, max_rows=10, csv_chunk_rows=30)
+        loader = CSVLoader(settings)
+        
+        result = loader.load_csv(self.path)
+        
+        assert len(result) == 95
+        assert loader.load_stats['mode'] == 'streaming'
+    
+    def test_stream_row_limit(self):
+        """Streaming still enforces max_stream_rows"""
+        loader = CSVLoader(Settings(max_stream_rows=50, csv_chunk_rows=20))
+        
+        with pytest.raises(CSVLoadError, match="Dataset too large"):
+            loader.load_csv(self.path, streaming=True)
+    
+    def test_streaming_bytes_with_latin1(self):
+        """Byte input can be streamed, falling back to latin-1"""
+        content = "Region,Sales\nZürich,1\nGenève,2\n".encode('latin-1')
+        loader = CSVLoader(Settings(csv_chunk_rows=1))
+        
+        result = loader.load_csv(content, streaming=True)
+        
+        assert result['Region'].tolist() == ['Zürich', 'Genève']
+    
+    def test_peak_memory_reported(self):
+        """track_memory records peak and frame memory"""
+        loader = CSVLoader(Settings(csv_chunk_rows=20))
+        loader.load_csv(self.path, streaming=True, track_memory=True)
+        
+        assert loader.load_stats['peak_memory_bytes'] > 0
+        assert loader.load_stats['frame_memory_bytes'] > 0
+
+class TestDtypeCompaction:
+    """Lossless dtype compaction at load time"""
+    
+    def setup_method(self):
+        regions = ['North', 'South', 'East', 'West']
+        self.frame = pd.DataFrame({
+            'Region': [regions[i % 4] for i in range(200)],
+            'Invoice': [f'INV-{i:05d}' for i in range(200)],
+            'Units': [i % 50 for i in range(200)],
+            'Big': [3_000_000_000 + i for i in range(200)],
+            'Amount': [i * 10.1 for i in range(200)],
+        })
+        self.csv_text = self.frame.to_csv(index=False)
+    
+    def load(self, **overrides):
+        loader = CSVLoader(Settings(**overrides))
+        return loader, loader.load_csv(io.StringIO(self.csv_text))
+    
+    def test_low_cardinality_text_becomes_category(self):
+        """Repeated labels are encoded, near-unique text is left alone"""
+        loader, df = self.load()
+        
+        assert isinstance(df['Region'].dtype, pd.CategoricalDtype)
+        assert df['Invoice'].dtype == object
+        assert loader.data_quality['data_types']['Region'] == 'category'
+        assert 'Region' in loader.column_info['text_columns']
+    
+    def test_numeric_downcast_is_lossless(self):
+        """Small ints shrink to int32, large ints and floats keep their dtype"""
+        _, df = self.load()
+        
+        assert df['Units'].dtype == 'int32'
+        assert df['Big'].dtype == 'int64'
+        assert df['Amount'].dtype == 'float64'
+        assert df['Units'].sum() == self.frame['Units'].sum()
+        pd.testing.assert_series_equal(df['Region'].astype(object), self.frame['Region'])
+    
+    def test_memory_saved_is_reported(self):
+        """The report and load_stats account for the bytes saved"""
+        loader, df = self.load()
+        report = loader.dtype_report
+        
+        assert set(report['converted']) == {'Region', 'Units'}
+        assert report['saved_bytes'] > 0
+        assert report['after_bytes'] == report['before_bytes'] - report['saved_bytes']
+        assert report['after_bytes'] == int(df.memory_usage(deep=True, index=False).sum())
+        assert loader.load_stats['memory_saved_bytes'] == report['saved_bytes']
+    
+    def test_category_limits(self):
+        """Text over the distinct ratio or the label cap stays object"""
+        loader = CSVLoader(Settings())
+        loader.raw_data = pd.DataFrame({'Store': [f'Store {i % 20}' for i in range(200)]})
+        assert loader._compact_dtypes()['converted'] == {}
+
+        _, df = self.load(category_max_labels=3)
+        assert df['Region'].dtype == object
+
+    def test_category_only_when_smaller(self):
+        """Encoding is skipped when it would not shrink the column"""
+        _, df = self.load(category_max_ratio=1.0)
+
+        assert isinstance(df['Region'].dtype, pd.CategoricalDtype)
+        assert df['Invoice'].dtype == object
+
+    def test_compaction_can_be_disabled(self):
+        """compact_dtypes=False keeps pandas' parsed dtypes"""
+        loader, df = self.load(compact_dtypes=False)
+        
+        assert df['Region'].dtype == object
+        assert df['Units'].dtype == 'int64'
+        assert loader.dtype_report == {}
+    
+    def test_mixed_object_columns_stay_object(self):
+        """Columns mixing strings with other values are not encoded"""
+        loader = CSVLoader(Settings())
+        loader.raw_data = pd.DataFrame({'Mixed': ['a', 1] * 100})
+        
+        assert loader._compact_dtypes()['converted'] == {}
+        assert loader.raw_data['Mixed'].dtype == object
+    
+    def test_contributions_on_filtered_categories(self):
+        """Category groupbys only return labels present after filtering"""
+        from analyzers.contributor_analyzer import ContributorAnalyzer
+        
+        _, df = self.load()
+        subset = df[df['Region'].isin(['North', 'South'])]
+        
+        contributions = ContributorAnalyzer(Settings())._calculate_contributions(subset, 'Region', 'Units')
+        assert sorted(contributions['Region'].astype(str)) == ['North', 'South']
+        assert contributions['total_value'].sum() == subset['Units'].sum()
+
+    
+    def test_variance_on_filtered_categories(self):
+        """QuantAnalyzer's category groupbys only return observed labels after filtering"""
+        from analyzers.variance_analyzer import QuantAnalyzer
+        
+        frame = self.frame.assign(
+            Channel=[['Online', 'Retail', 'Partner', 'Direct'][i % 4 if i % 4 else i % 8 // 4] for i in range(200)],
+            Date=pd.date_range('2024-01-01', periods=200).strftime('%Y-%m-%d'),
+        )
+        df = CSVLoader(Settings()).load_csv(io.StringIO(frame.to_csv(index=False)))
+        assert isinstance(df['Channel'].dtype, pd.CategoricalDtype)
+        subset = df[df['Region'].isin(['North', 'South'])]
+        analyzer = QuantAnalyzer()
+        
+        pairs = [{'actual': 'Units', 'planned': 'Amount'}]
+        variances = analyzer.multi_pair_variance_analysis(subset, pairs, 'Date', 'Region')['variances']
+        assert set(variances['Region'].astype(str)) == {'North', 'South'}
+        
+        nodes = analyzer.hierarchical_variance_analysis(subset, 'Units', 'Amount', ['Region', 'Channel', 'Invoice'])['nodes']
+        observed = set(subset[['Region', 'Channel']].astype(str).itertuples(index=False, name=None))
+        children = nodes[nodes['depth'] == 2]
+        assert set(zip(children['Region'].astype(str), children['Channel'].astype(str))) <= observed
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+class TestColumnarFormats:
+    """Parquet / Feather ingestion and Arrow session snapshots"""
+    
+    def setup_method(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.frame = pd.DataFrame({
+            'Date': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04'],
+            'Region': ['North', 'South', 'North', 'North'],
+            'Sales': [1000.5, 1500.25, 1200.0, 900.75],
+            'Units': [10, 15, 12, 9],
+        })
+        self.csv_path = os.path.join(self.tmp.name, 'sales.csv')
+        self.frame.to_csv(self.csv_path, index=False)
+    
+    def teardown_method(self):
+        self.tmp.cleanup()
+    
+    def test_parquet_and_feather_match_csv(self):
+        """Columnar files load to the same typed frame and profile as CSV"""
+        csv_loader = CSVLoader(Settings())
+        expected = csv_loader.load_csv(self.csv_path)
+        
+        for name, write in [('sales.parquet', self.frame.to_parquet),
+                            ('sales.feather', self.frame.to_feather)]:
+            path = os.path.join(self.tmp.name, name)
+            write(path)
+            loader = CSVLoader(Settings())
+            df = loader.load_csv(path)
+            
+            pd.testing.assert_frame_equal(df, expected)
+            assert loader.column_info == csv_loader.column_info
+            assert loader.load_stats['mode'] == 'columnar'
+    
+    def test_snapshot_round_trip(self):
+        """A snapshot restores the frame, profile and fingerprint"""
+        loader = CSVLoader(Settings())
+        df = loader.load_csv(self.csv_path)
+        snapshot = os.path.join(self.tmp.name, 'session.arrow')
+        loader.save_snapshot(snapshot)
+        
+        restored = CSVLoader(Settings())
+        restored_df = restored.load_snapshot(snapshot)
+        
+        pd.testing.assert_frame_equal(restored_df, df)
+        assert restored.column_info == loader.column_info
+        assert restored.data_quality['data_types'] == loader.data_quality['data_types']
+        assert restored.fingerprint == loader.fingerprint
+        assert restored.load_stats['mode'] == 'snapshot'
+    
+    def test_snapshot_dir_reuses_snapshot(self):
+        """With snapshot_dir set, reloading the same file restores the snapshot"""
+        settings = Settings(snapshot_dir=os.path.join(self.tmp.name, 'snapshots'))
+        first = CSVLoader(settings)
+        first.load_csv(self.csv_path)
+        assert first.load_stats['mode'] == 'single_pass'
+        
+        second = CSVLoader(settings)
+        df = second.load_csv(self.csv_path)
+        assert second.load_stats['mode'] == 'snapshot'
+        assert second.fingerprint == first.fingerprint
+        assert len(df) == 4
+    
+    def test_plain_arrow_file_is_not_a_snapshot(self):
+        """Arrow files without loader metadata are rejected as snapshots"""
+        path = os.path.join(self.tmp.name, 'plain.arrow')
+        self.frame.to_feather(path)
+        
+        with pytest.raises(CSVLoadError, match="not a Quant Commander snapshot"):
+            CSVLoader(Settings()).load_snapshot(path)
+    
+    def test_file_handler_accepts_parquet(self):
+        """FileHandler validates Parquet uploads and rejects unknown formats"""
+        from handlers.file_handler import FileHandler
+        
+        path = os.path.join(self.tmp.name, 'sales.parquet')
+        self.frame.to_parquet(path)
+        is_valid, _, df = FileHandler().validate_csv_file(path)
+        assert is_valid
+        assert len(df) == 4
+        
+        other = os.path.join(self.tmp.name, 'sales.xlsx')
+        Path(other).write_bytes(b'not a spreadsheet')
+        is_valid, message, _ = FileHandler().validate_csv_file(other)
+        assert not is_valid
+        assert '.parquet' in message
+
+
 if __name__ == "__main__":
     # Run tests if executed directly
     import sys
@@ -0,0 +1,123 @@
+"""
+Unit tests for DatasetProfile
+
+Checks column roles, statistics and date detection, and that the profile is
+built once per dataset and shared by the handlers that consume it.
+"""
+
+import threading
+import unittest
+import pandas as pd
+from unittest.mock import patch
+
+# Add the parent directory to the path to import our modules
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.dataset_profile import DatasetProfile, get_dataset_profile
+from handlers.data_utils import DataUtils
+from handlers.file_handler import FileHandler
+
+
+class TestDatasetProfile(unittest.TestCase):
+    """Test suite for DatasetProfile and its memoisation."""
+
+    def setUp(self):
+        """Build a frame with one column of each role."""
+        self.data = pd.DataFrame({
+            'Date': ['2024-01-01', '2024-02-01', '2024-03-01', '2024-04-01'],
+            'Year': [2024, 2024, 2024, 2024],
+            'Region': ['North', 'South', 'North', 'South'],
+            'Invoice': ['A-1', 'A-2', 'A-3', 'A-4'],
+            'Sales': [100.0, None, 90.0, 130.0],
+            'Closed': [True, False, True, True],
+        })
+
+    def test_roles_and_statistics(self):
+        """Roles, nulls, cardinality and min/max are computed per column."""
+        profile = DatasetProfile.from_dataframe(self.data)
+
+        self.assertEqual(profile.roles, {
+            'Date': 'date', 'Year': 'numeric', 'Region': 'categorical',
+            'Invoice': 'text', 'Sales': 'numeric', 'Closed': 'boolean'
+        })
+        self.assertEqual(profile.date_columns, ['Date'])
+        self.assertEqual(profile.date_named_columns, ['Date', 'Year'])
+        self.assertEqual(profile.numeric_columns, ['Year', 'Sales'])
+        self.assertEqual(profile.text_columns, ['Region', 'Invoice'])
+        self.assertEqual(profile.null_counts['Sales'], 1)
+        self.assertEqual(profile.cardinality['Region'], 2)
+        self.assertEqual(profile.minimums['Sales'], 90.0)
+        self.assertEqual(profile.maximums['Sales'], 130.0)
+        self.assertIsInstance(profile.to_dict()['roles'], dict)
+
+    def test_profile_built_once_per_dataset(self):
+        """Repeated requests, from any consumer, reuse one profile."""
+        # Content not profiled by any other test
+        self.data['Sales'] = [101.0, None, 91.0, 131.0]
+        with patch.object(DatasetProfile, 'from_dataframe',
+                          wraps=DatasetProfile.from_dataframe) as build:
+            first = get_dataset_profile(self.data)
+            DataUtils.detect_date_columns(self.data)
+            FileHandler().detect_date_columns(self.data)
+            FileHandler().analyze_csv_data(self.data)
+
+        self.assertEqual(build.call_count, 1)
+        self.assertIs(get_dataset_profile(self.data), first)
+
+    def test_slow_build_does_not_block_cached_profiles(self):
+        """Cached profiles are served while a new dataset is profiled; its requests share one build."""
+        cached = get_dataset_profile(self.data)
+        new_data = self.data.assign(Sales=[102.0, None, 92.0, 132.0])
+        started, release = threading.Event(), threading.Event()
+        build = DatasetProfile.from_dataframe
+
+        def slow_build(data):
+            started.set()
+            release.wait(5)
+            return build(data)
+
+        results = []
+        with patch.object(DatasetProfile, 'from_dataframe', side_effect=slow_build) as mock_build:
+            threads = [threading.Thread(target=lambda: results.append(get_dataset_profile(new_data)))
+                       for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            self.assertTrue(started.wait(5))
+            lookup = []
+            reader = threading.Thread(target=lambda: lookup.append(get_dataset_profile(self.data)))
+            reader.start()
+            reader.join(2)
+            self.assertFalse(reader.is_alive())
+            self.assertIs(lookup[0], cached)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(mock_build.call_count, 1)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_changed_data_gets_new_profile(self):
+        """Adding a column invalidates the memoised profile."""
+        first = get_dataset_profile(self.data)
+        self.data['Margin'] = [10, 20, 30, 40]
+
+        second = get_dataset_profile(self.data)
+        self.assertIsNot(second, first)
+        self.assertIn('Margin', second.numeric_columns)
+
+    def test_analyze_csv_data_uses_profile_statistics(self):
+        """The upload summary reports the profile's types and statistics."""
+        analysis = FileHandler().analyze_csv_data(self.data)
+
+        self.assertEqual(analysis['data_quality']['Sales']['null_count'], 1)
+        self.assertEqual(analysis['data_quality']['Region']['unique_count'], 2)
+        self.assertEqual(analysis['basic_stats']['Sales']['min'], 90.0)
+        self.assertAlmostEqual(analysis['basic_stats']['Sales']['mean'], 320.0 / 3)
+        self.assertNotIn('Closed', analysis['basic_stats'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Unit tests for the disk cache tier
+
+Covers serialisation, persistence across instances (restarts), LRU eviction
+under the size cap, and promotion of disk hits into CacheManager's memory.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache_manager import CacheManager
+from utils.disk_cache import DiskCache, PARQUET_SUFFIX, PYARROW_AVAILABLE
+
+
+class TestDiskCache(unittest.TestCase):
+    """Tests for the standalone DiskCache store"""
+
+    def setUp(self):
+        """Create an empty cache directory"""
+        self.directory = tempfile.mkdtemp(prefix='qc_disk_cache_')
+        self.disk = DiskCache(self.directory, max_bytes=10 * 1024 * 1024)
+        self.frame = pd.DataFrame({
+            'Region': ['North', 'South', 'East'],
+            'Sales': [100.5, 200.25, 300.0]
+        })
+
+    def tearDown(self):
+        """Remove the cache directory"""
+        self.disk.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_round_trip(self):
+        """DataFrames and plain results come back unchanged with their metadata"""
+        expires_at = time.time() + 60
+        self.assertTrue(self.disk.put('fp:trends', self.frame, 'trends', {'window': 3}, expires_at))
+        self.assertTrue(self.disk.put('fp:summary', {'text': 'ok', 'rows': [1, 2]}, 'summary', None, expires_at))
+
+        frame, meta = self.disk.get('fp:trends')
+        pd.testing.assert_frame_equal(frame, self.frame)
+        self.assertEqual(meta['analysis_type'], 'trends')
+        self.assertEqual(meta['params'], {'window': 3})
+        self.assertAlmostEqual(meta['expires_at'], expires_at)
+
+        self.assertEqual(self.disk.get('fp:summary')[0], {'text': 'ok', 'rows': [1, 2]})
+        self.assertIsNone(self.disk.get('fp:missing'))
+
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow is not installed")
+    def test_dataframes_stored_as_parquet(self):
+        """DataFrames use Parquet when pyarrow is available"""
+        self.disk.put('fp:trends', self.frame, 'trends', None, time.time() + 60)
+        self.assertTrue(any(name.endswith(PARQUET_SUFFIX) for name in os.listdir(self.directory)))
+
+    def test_entries_survive_reopen(self):
+        """A new instance on the same directory sees earlier entries"""
+        self.disk.put('fp:summary', "report", 'summary', None, time.time() + 60)
+        self.disk.put('fp:stale', "old", 'summary', None, time.time() - 1)
+        self.disk.close()
+
+        self.disk = DiskCache(self.directory, max_bytes=10 * 1024 * 1024)
+        self.assertEqual(self.disk.get('fp:summary')[0], "report")
+        self.assertIsNone(self.disk.get('fp:stale'))
+        self.assertEqual(self.disk.get_stats()['entries'], 1)
+
+    def test_reconcile_keeps_foreign_files(self):
+        """Reopening removes orphaned entry files only; other files in the directory survive"""
+        self.disk.put('fp:summary', "report", 'summary', None, time.time() + 60)
+        self.disk.close()
+
+        orphan = os.path.join(self.directory, DiskCache._filename('fp:gone', '.pkl'))
+        interrupted = os.path.join(self.directory, DiskCache._filename('fp:gone') + '.abc123.tmp')
+        foreign = [os.path.join(self.directory, name) for name in ('notes.txt', 'report.pkl', 'draft.tmp')]
+        for path in [orphan, interrupted] + foreign:
+            with open(path, 'w') as handle:
+                handle.write('data')
+
+        self.disk = DiskCache(self.directory, max_bytes=10 * 1024 * 1024)
+        self.assertFalse(os.path.exists(orphan))
+        self.assertFalse(os.path.exists(interrupted))
+        self.assertTrue(all(os.path.exists(path) for path in foreign))
+        self.assertEqual(self.disk.get('fp:summary')[0], "report")
+
+    def test_lru_eviction_under_size_cap(self):
+        """The least recently used entry is evicted when the cap is exceeded"""
+        payload = "x" * 4_000
+        self.disk.max_bytes = 10_000
+        self.disk.put('fp:a', payload, 'summary', None, time.time() + 60)
+        self.disk.put('fp:b', payload, 'summary', None, time.time() + 60)
+        self.disk.get('fp:a')  # b is now least recently used
+
+        self.disk.put('fp:c', payload, 'summary', None, time.time() + 60)
+
+        self.assertIsNone(self.disk.get('fp:b'))
+        self.assertIsNotNone(self.disk.get('fp:a'))
+        self.assertIsNotNone(self.disk.get('fp:c'))
+        stats = self.disk.get_stats()
+        self.assertLessEqual(stats['bytes'], 10_000)
+        self.assertEqual(stats['evictions'], 1)
+
+    def test_invalidate_prefix(self):
+        """Invalidating a dataset removes only that dataset's entries"""
+        self.disk.put('fp1:summary', 1, 'summary', None, time.time() + 60)
+        self.disk.put('fp1:trends', 2, 'trends', None, time.time() + 60)
+        self.disk.put('fp2:summary', 3, 'summary', None, time.time() + 60)
+
+        self.assertEqual(self.disk.invalidate_prefix('fp1:'), 2)
+        self.assertIsNone(self.disk.get('fp1:summary'))
+        self.assertEqual(self.disk.get('fp2:summary')[0], 3)
+
+
+class TestCacheManagerDiskTier(unittest.TestCase):
+    """Tests for CacheManager with a disk tier attached"""
+
+    def setUp(self):
+        """Create a cache directory shared by 'before' and 'after restart' managers"""
+        self.directory = tempfile.mkdtemp(prefix='qc_disk_tier_')
+        self.disks = []
+
+    def tearDown(self):
+        """Close every disk cache and remove the directory"""
+        for disk in self.disks:
+            disk.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _manager(self, **kwargs) -> CacheManager:
+        """CacheManager backed by a fresh DiskCache on the shared directory"""
+        disk = DiskCache(self.directory)
+        self.disks.append(disk)
+        return CacheManager(max_size=10, disk_cache=disk, **kwargs)
+
+    def test_result_survives_restart_and_is_promoted(self):
+        """A result cached before a restart is served from disk, then from memory"""
+        self._manager().put("dataset", 'summary', "report", params={'top': 5})
+
+        restarted = self._manager()
+        self.assertEqual(restarted.get("dataset", 'summary', params={'top': 5}), "report")
+        self.assertEqual(len(restarted.cache), 1)
+
+        self.assertEqual(restarted.get("dataset", 'summary', params={'top': 5}), "report")
+        stats = restarted.get_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['disk_hits'], 1)
+        self.assertEqual(stats['disk']['entries'], 1)
+
+    def test_promoted_entry_keeps_remaining_ttl(self):
+        """Promotion does not restart the entry's TTL"""
+        self._manager().put("dataset", 'summary', "report", ttl=60)
+
+        restarted = self._manager()
+        restarted.get("dataset", 'summary')
+        entry = next(iter(restarted.cache.values()))
+        self.assertLessEqual(entry['ttl'], 60)
+
+    def test_too_large_for_memory_still_cached_on_disk(self):
+        """Results over the memory budget are still kept on disk"""
+        manager = self._manager(max_memory_bytes=1_000)
+        manager.put("dataset", 'summary', "x" * 5_000)
+
+        self.assertEqual(manager.get("dataset", 'summary'), "x" * 5_000)
+        self.assertEqual(manager.get_stats()['disk_hits'], 1)
+
+    def test_invalidation_reaches_disk(self):
+        """Invalidating a dataset also removes its disk entries"""
+        manager = self._manager()
+        manager.put("dataset", 'summary', "report")
+        manager.invalidate_data_cache("dataset")
+
+        self.assertIsNone(self._manager().get("dataset", 'summary'))
+
+
+if __name__ == '__main__':
+    unittest.main()
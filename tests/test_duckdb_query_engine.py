@@ -0,0 +1,149 @@
+"""
+Unit tests for DuckDBQueryEngine and the SQL backend factory
+
+The DuckDB tests are skipped when the optional duckdb package is missing.
+"""
+
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.sql_query_engine import SQLQueryEngine, create_sql_engine
+from analyzers.duckdb_query_engine import DuckDBQueryEngine, DUCKDB_AVAILABLE
+
+
+class TestCreateSQLEngine(unittest.TestCase):
+    """Tests for backend selection"""
+
+    def test_default_backend_is_sqlite(self):
+        """No setting selects the SQLite engine"""
+        engine = create_sql_engine()
+        self.assertEqual(engine.backend, "sqlite")
+        engine.close_connection()
+
+    def test_missing_duckdb_falls_back_to_sqlite(self):
+        """Requesting DuckDB without the package still returns a working engine"""
+        with patch('analyzers.duckdb_query_engine.DUCKDB_AVAILABLE', False):
+            engine = create_sql_engine({'sql_backend': 'duckdb'})
+        self.assertEqual(type(engine), SQLQueryEngine)
+        engine.close_connection()
+
+
+@unittest.skipUnless(DUCKDB_AVAILABLE, "duckdb is not installed")
+class TestDuckDBQueryEngine(unittest.TestCase):
+    """Tests for querying the DataFrame through DuckDB"""
+
+    def setUp(self):
+        """Register a small dataset"""
+        self.engine = create_sql_engine({'sql_backend': 'duckdb'})
+        self.data = pd.DataFrame({
+            'Product': ['Widget A', 'Widget B', 'Widget C', 'Widget A'],
+            'Sales Amount': [1000, 1500, 800, 1200],
+            'Region': ['North', 'South', 'North', 'East']
+        })
+        self.assertTrue(self.engine.load_dataframe_to_sql(self.data, "test_data"))
+
+    def tearDown(self):
+        """Release the engine"""
+        self.engine.close_connection()
+
+    def test_factory_selects_duckdb(self):
+        """The duckdb setting returns the DuckDB engine"""
+        self.assertIsInstance(self.engine, DuckDBQueryEngine)
+
+    def test_results_match_sqlite(self):
+        """Both backends return the same SQLQueryResult for the same query"""
+        query = "SELECT Region, SUM(Sales_Amount) AS total FROM test_data GROUP BY Region ORDER BY Region"
+        sqlite_engine = SQLQueryEngine()
+        sqlite_engine.load_dataframe_to_sql(self.data, "test_data")
+
+        duck_result = self.engine.execute_query(query)
+        sqlite_result = sqlite_engine.execute_query(query)
+        sqlite_engine.close_connection()
+
+        self.assertTrue(duck_result.success)
+        self.assertEqual(duck_result.row_count, sqlite_result.row_count)
+        self.assertEqual(duck_result.data['Region'].tolist(), sqlite_result.data['Region'].tolist())
+        self.assertEqual(duck_result.data['total'].tolist(), sqlite_result.data['total'].tolist())
+
+    def test_load_does_not_build_sqlite_table(self):
+        """Loading registers the frame without serialising it into SQLite"""
+        with patch.object(pd.DataFrame, 'to_sql') as mock_to_sql:
+            self.engine.load_dataframe_to_sql(self.data, "test_data")
+            self.engine.execute_query("SELECT COUNT(*) AS n FROM test_data")
+            mock_to_sql.assert_not_called()
+
+    def test_sqlite_only_query_falls_back(self):
+        """SQLite-dialect queries DuckDB rejects are answered by the SQLite snapshot"""
+        result = self.engine.execute_query(
+            "SELECT Region, total(Sales_Amount) AS total FROM test_data GROUP BY Region ORDER BY Region"
+        )
+        self.assertTrue(result.success, result.error_message)
+        self.assertEqual(result.data['total'].tolist(), [1200.0, 1800.0, 1500.0])
+
+    def test_query_errors_do_not_fall_back(self):
+        """Syntax errors and unknown columns come straight from DuckDB"""
+        with patch.object(SQLQueryEngine, 'load_dataframe_to_sql') as mock_build:
+            missing = self.engine.execute_query("SELECT Revenue FROM test_data")
+            syntax = self.engine.execute_query("SELECT Region FROM test_data GROUP Region")
+            mock_build.assert_not_called()
+
+        self.assertFalse(missing.success)
+        self.assertIn("Available columns: Product, Sales_Amount, Region", missing.error_message)
+        self.assertFalse(syntax.success)
+        self.assertIn("syntax error", syntax.error_message)
+
+    def test_unexpected_errors_return_failed_result(self):
+        """Errors outside duckdb.Error are reported, not raised"""
+        with patch.object(self.engine, '_cursor', side_effect=ValueError("cursor unavailable")):
+            result = self.engine.execute_query("SELECT Region FROM test_data")
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error_message, "SQL Error: cursor unavailable")
+
+    def test_concurrent_fallbacks_build_sqlite_once(self):
+        """Simultaneous first fallbacks share one SQLite snapshot build"""
+        build = SQLQueryEngine.load_dataframe_to_sql
+        builds = []
+
+        def slow_build(engine, *args, **kwargs):
+            builds.append(threading.get_ident())
+            time.sleep(0.05)
+            return build(engine, *args, **kwargs)
+
+        query = "SELECT total(Sales_Amount) AS total FROM test_data"
+        results = []
+        with patch.object(SQLQueryEngine, 'load_dataframe_to_sql', autospec=True, side_effect=slow_build):
+            threads = [threading.Thread(target=lambda: results.append(self.engine.execute_query(query)))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(builds), 1)
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual([result.data['total'][0] for result in results], [4500.0] * 4)
+
+    def test_unsafe_query_rejected(self):
+        """The shared safety check still applies"""
+        result = self.engine.execute_query("DROP TABLE test_data")
+        self.assertFalse(result.success)
+
+    def test_table_schema(self):
+        """Schema lists the cleaned column names with sample rows"""
+        schema = self.engine.get_table_schema()
+        names = [col['name'] for col in schema['columns']]
+        self.assertEqual(names, ['Product', 'Sales_Amount', 'Region'])
+        self.assertEqual(len(schema['sample_data']['Product']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Unit tests for the staged FileHandler upload pipeline
+
+Checks that the parsed data and a preview are available before the
+background stages finish, that stage results stream into the chat, and
+that a newer upload supersedes an older job.
+"""
+
+import unittest
+import pandas as pd
+import tempfile
+import threading
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to the path to import our modules
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.timescale_analyzer import TimescaleAnalyzer
+from config.settings import Settings
+from data.rollup_cube import RollupCube, get_rollup_cube
+from handlers.file_handler import FileHandler
+from utils import data_fingerprint
+
+
+class TestStagedUpload(unittest.TestCase):
+    """Test suite for FileHandler.handle_upload_stream."""
+
+    def setUp(self):
+        """Write a small CSV and build a handler around a mocked app core."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'sales.csv')
+        pd.DataFrame({
+            'Date': ['2024-01-01', '2024-02-01', '2024-03-01'],
+            'Region': ['North', 'South', 'North'],
+            'Sales': [100, 120, 90],
+        }).to_csv(self.path, index=False)
+
+        self.app_core = MagicMock()
+        self.app_core.is_ollama_available.return_value = False
+        self.app_core.timescale_analyzer = None
+        self.app_core.nl2sql_engine = MagicMock()
+        self.handler = FileHandler(self.app_core)
+        self.file = MagicMock()
+        self.file.name = self.path
+
+    def tearDown(self):
+        """Remove the temporary CSV."""
+        self.tmp.cleanup()
+
+    def test_preview_before_profiling(self):
+        """The first update arrives with the data set, before profiling runs."""
+        release = threading.Event()
+        original = self.handler.analyze_csv_data
+
+        def slow_analysis(df):
+            release.wait(5)
+            return original(df)
+        self.handler.analyze_csv_data = slow_analysis
+
+        stream = self.handler.handle_upload_stream(self.file, [])
+        status, history = next(stream)
+
+        self.assertIn('Upload Successful', status)
+        self.assertIn('Data loaded', history[0]['content'])
+        self.app_core.set_current_data.assert_called_once()
+        self.assertIsNone(self.app_core.set_current_data.call_args[0][1])
+
+        release.set()
+        for status, history in stream:
+            pass
+
+        self.assertNotIn('Processing', status)
+        self.assertIn('Upload processed', history[1]['content'])
+        self.assertIn('File uploaded successfully', history[-1]['content'])
+        self.assertEqual(self.app_core.set_current_data.call_args[0][1]['row_count'], 3)
+        self.app_core.nl2sql_engine.set_data_context.assert_called_once()
+
+    def test_failed_stage_reported_and_later_stages_run(self):
+        """A failing stage posts a warning instead of aborting the upload."""
+        self.handler._attempt_automatic_analysis = MagicMock(side_effect=RuntimeError("boom"))
+
+        status, history = self.handler.handle_upload(self.file, [])
+
+        contents = [message['content'] for message in history]
+        self.assertTrue(any('Running automatic analysis failed' in c for c in contents))
+        self.assertIn('File uploaded successfully', contents[-1])
+
+    def test_newer_upload_supersedes_running_job(self):
+        """Stages of an older upload stop once a newer upload starts."""
+        release = threading.Event()
+        original = self.handler.analyze_csv_data
+
+        def slow_analysis(df):
+            release.wait(5)
+            return original(df)
+        self.handler.analyze_csv_data = slow_analysis
+
+        first = self.handler.handle_upload_stream(self.file, [])
+        next(first)
+        next(first)  # profiling has started
+
+        second = self.handler.handle_upload_stream(self.file, [])
+        next(second)
+        release.set()
+
+        for _, first_history in first:
+            pass
+        self.assertIn('newer file was uploaded', first_history[1]['content'])
+        self.handler.analyze_csv_data = original
+
+        for _, second_history in second:
+            pass
+        self.assertIn('Upload processed', second_history[1]['content'])
+
+    def test_csv_upload_builds_shared_rollup_cube(self):
+        """Dates read from a CSV get the cube the analyzers then reuse."""
+        path = os.path.join(self.tmp.name, 'ledger.csv')
+        dates = pd.date_range('2023-01-01', periods=400, freq='D')
+        pd.DataFrame({
+            'Date': dates.strftime('%Y-%m-%d'),
+            'Region': ['North', 'South'] * 200,
+            'Actual': range(400),
+            'Budget': [390 - i for i in range(400)],
+        }).to_csv(path, index=False)
+        self.file.name = path
+
+        with patch.object(RollupCube, 'from_dataframe', wraps=RollupCube.from_dataframe) as build:
+            self.handler.handle_upload(self.file, [])
+            df = self.app_core.set_current_data.call_args[0][0]
+            self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['Date']))  # Parsed by CSVLoader
+            self.assertEqual(build.call_count, 1)
+
+            cube = get_rollup_cube(df, 'Date', ['Actual', 'Budget'])
+            result = TimescaleAnalyzer(Settings()).analyze(df, date_col='Date', value_cols=['Actual'])
+        self.assertEqual(build.call_count, 1)
+
+        self.assertEqual(cube.first_date, dates[0])
+        monthly = df.groupby(pd.to_datetime(df['Date']).dt.to_period('M'))[['Actual']].sum()
+        pd.testing.assert_frame_equal(cube.rollup('monthly', ['Actual']), monthly.rename_axis('period'))
+        self.assertNotIn('error', result)
+
+    def test_upload_parsed_by_csv_loader(self):
+        """Uploads go through CSVLoader and reuse its fingerprint instead of hashing again."""
+        with patch('utils.data_fingerprint.compute_fingerprint',
+                   wraps=data_fingerprint.compute_fingerprint) as hashed:
+            self.handler.handle_upload(self.file, [])
+        
+        loader = self.handler.csv_loader
+        self.assertEqual(loader.load_stats['rows'], 3)
+        self.assertEqual(hashed.call_count, 1)
+        for call in self.app_core.set_current_data.call_args_list:
+            self.assertEqual(call.kwargs['fingerprint'], loader.fingerprint)
+        self.assertIs(self.app_core.set_current_data.call_args[0][0], loader.raw_data)
+
+    def test_invalid_file_fails_immediately(self):
+        """Validation errors are reported without starting a job."""
+        self.file.name = os.path.join(self.tmp.name, 'missing.csv')
+
+        updates = list(self.handler.handle_upload_stream(self.file, []))
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn('Upload Failed', updates[0][0])
+        self.app_core.set_current_data.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
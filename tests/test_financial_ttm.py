@@ -0,0 +1,140 @@
+"""
+Unit tests for the dense TTM calculation
+
+Checks FinancialAnalyzer's month x category TTM and YoY growth against a
+per-category rolling-window loop, including categories with missing months
+and several value columns in one call.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the path to import our modules
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.financial_analyzer import FinancialAnalyzer
+from config.settings import Settings
+
+
+def loop_ttm(data, value_col, category_col):
+    """Reference: rolling 12-month sum and YoY growth one category at a time."""
+    frames = []
+    for category, group in data.groupby(category_col):
+        monthly = group.groupby(group['Date'].dt.to_period('M'))[value_col].sum()
+        months = pd.period_range(monthly.index.min(), monthly.index.max(), freq='M')
+        monthly = monthly.reindex(months, fill_value=0.0)
+        ttm = monthly.rolling(12).sum()
+        previous = ttm.shift(12)
+        frame = pd.DataFrame({
+            category_col: category,
+            'date': months.to_timestamp(),
+            f'{value_col}_ttm': ttm.to_numpy(),
+            f'{value_col}_ttm_prev': previous.to_numpy(),
+            f'{value_col}_growth': ((ttm - previous) / previous * 100).to_numpy(),
+        })
+        frames.append(frame.dropna(subset=[f'{value_col}_ttm_prev']))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestFinancialTTM(unittest.TestCase):
+    """Test suite for FinancialAnalyzer's TTM calculation."""
+
+    def setUp(self):
+        """Build three years of rows for four products, two of them sparse."""
+        rng = np.random.default_rng(22)
+        rows = 6000
+        data = pd.DataFrame({
+            'Date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 1100, rows), unit='D'),
+            'Product': rng.choice(['A', 'B', 'C', 'D'], rows),
+            'Revenue': rng.normal(500, 80, rows).round(2),
+            'Cost': rng.normal(300, 40, rows).round(2),
+        })
+        # C has no rows in every third month; D starts ten months in
+        data = data[~((data['Product'] == 'C') & (data['Date'].dt.month % 3 == 0))]
+        data = data[~((data['Product'] == 'D') & (data['Date'] < '2021-11-01'))]
+        self.data = data.reset_index(drop=True)
+        self.settings = Settings()
+
+    def test_matches_per_category_loop(self):
+        """Every category, sparse or late-starting, matches the loop."""
+        frame = FinancialAnalyzer(self.settings).calculate_ttm(self.data, 'Date', ['Revenue', 'Cost'], 'Product')
+
+        for value_col in ('Revenue', 'Cost'):
+            expected = loop_ttm(self.data, value_col, 'Product')
+            actual = frame[['Product', 'date'] + list(expected.columns[2:])]
+            pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected, check_dtype=False, rtol=1e-9)
+
+        self.assertTrue((frame.loc[frame['Product'] == 'D', 'date'] >= pd.Timestamp('2023-10-01')).all())
+
+    def test_analyze_ttm_with_and_without_category(self):
+        """analyze('ttm') reports each category's series and overall metrics."""
+        analyzer = FinancialAnalyzer(self.settings)
+        by_product = analyzer.analyze(self.data, date_col='Date', value_col='Revenue',
+                                      category_col='Product', analysis_type='ttm')
+        overall = FinancialAnalyzer(self.settings).analyze(self.data, date_col='Date', value_col='Revenue',
+                                                           analysis_type='ttm')
+
+        expected = loop_ttm(self.data, 'Revenue', 'Product')
+        self.assertEqual([entry['category'] for entry in by_product['data']], ['A', 'B', 'C', 'D'])
+        for entry in by_product['data']:
+            rows = expected[expected['Product'] == entry['category']]
+            self.assertEqual(entry['dates'], rows['date'].dt.strftime('%Y-%m').tolist())
+            np.testing.assert_allclose(entry['growth_values'], rows['Revenue_growth'], rtol=1e-9)
+
+        monthly = self.data.groupby(self.data['Date'].dt.to_period('M'))['Revenue'].sum()
+        self.assertAlmostEqual(overall['metrics']['current_ttm'], monthly.iloc[-12:].sum(), places=6)
+        self.assertAlmostEqual(by_product['metrics']['current_ttm'], overall['metrics']['current_ttm'], places=6)
+        self.assertEqual(len(overall['data']['dates']), len(monthly) - 23)
+
+    def test_short_history_has_no_growth(self):
+        """Under two years of data gives full-window TTM values and a warning, not growth."""
+        data = self.data[self.data['Date'] < '2022-07-01']
+        analyzer = FinancialAnalyzer(self.settings)
+        results = analyzer.analyze(data, date_col='Date', value_col='Revenue', analysis_type='ttm')
+
+        monthly = data.groupby(data['Date'].dt.to_period('M'))['Revenue'].sum()
+        self.assertEqual(results['data']['dates'], [str(month) for month in monthly.index[11:]])
+        np.testing.assert_allclose(results['data']['ttm_values'], monthly.rolling(12).sum().iloc[11:], rtol=1e-9)
+        self.assertNotIn('growth_values', results['data'])
+        self.assertNotIn('current_growth', results['metrics'])
+        self.assertTrue(any('year-over-year' in warning for warning in analyzer.warnings))
+
+    def test_under_a_year_warns_with_empty_ttm(self):
+        """Under a year of data warns and reports no TTM rows instead of failing."""
+        data = self.data[self.data['Date'] < '2021-10-01']
+        for category_col in (None, 'Product'):
+            analyzer = FinancialAnalyzer(self.settings)
+            results = analyzer.analyze(data, date_col='Date', value_col='Revenue',
+                                       category_col=category_col, analysis_type='ttm')
+
+            self.assertEqual(analyzer.status, 'completed')
+            self.assertIsNone(results['metrics']['current_ttm'])
+            self.assertEqual(results['metrics']['ttm_periods'], 0)
+            self.assertEqual(results['metrics']['months_covered'], 9)
+            self.assertEqual(analyzer.warnings, [
+                "Data spans only 9 months. TTM analysis typically requires at least 12 months of data."])
+            self.assertIn('**Current Ttm Value**: N/A', analyzer.format_for_chat())
+        self.assertEqual(results['data'], [])
+
+    def test_flat_series_has_zero_growth(self):
+        """Flat monthly sales grow 0%, with growth only once two full years are in."""
+        months = pd.date_range('2021-01-01', periods=26, freq='MS')
+        data = pd.DataFrame({'Date': months, 'Sales': 100.0})
+        frame = FinancialAnalyzer(self.settings).calculate_ttm(data, 'Date', 'Sales')
+
+        self.assertEqual(frame['date'].tolist(), list(months[23:]))
+        np.testing.assert_allclose(frame['Sales_ttm'], 1200.0)
+        np.testing.assert_allclose(frame['Sales_ttm_prev'], 1200.0)
+        np.testing.assert_allclose(frame['Sales_growth'], 0.0)
+
+        frame = FinancialAnalyzer(self.settings).calculate_ttm(data.iloc[:14], 'Date', 'Sales')
+        self.assertEqual(frame['date'].tolist(), list(months[11:14]))
+        np.testing.assert_allclose(frame['Sales_ttm'], 1200.0)
+        self.assertNotIn('Sales_growth', frame.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -29,7 +29,8 @@ import os
 # Add the parent directory to the path to import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from analyzers.forecast_analyzer import ForecastingAnalyzer, ForecastResult
+from analyzers import forecast_analyzer
+from analyzers.forecast_analyzer import ForecastingAnalyzer, ForecastResult, BACKTEST_CANDIDATES
 
 
 class TestForecastingAnalyzer(unittest.TestCase):
@@ -353,5 +354,268 @@ class TestForecastingAnalyzer(unittest.TestCase):
             self.assertGreater(interval_99, interval_95)
 
 
+class TestForecastByGroup(unittest.TestCase):
+    """Test suite for ForecastingAnalyzer.forecast_by_group."""
+    
+    def setUp(self):
+        """Build monthly Region x Product data with two metrics."""
+        self.analyzer = ForecastingAnalyzer(confidence_level=0.95)
+        rng = np.random.default_rng(4)
+        dates = pd.date_range('2022-01-01', periods=18, freq='MS')
+        frames = []
+        for i, (region, product) in enumerate([('North', 'A'), ('North', 'B'), ('South', 'A')]):
+            frames.append(pd.DataFrame({
+                'Date': dates,
+                'Region': region,
+                'Product': product,
+                'Revenue': 1000 + 40 * i * np.arange(18) + rng.normal(0, 30, 18),
+                'Cost': 600 + rng.normal(0, 20, 18),
+            }))
+        self.data = pd.concat(frames, ignore_index=True)
+    
+    def test_matches_single_series_forecasts(self):
+        """Every series gets the method and forecast analyze_time_series gives it."""
+        result = self.analyzer.forecast_by_group(self.data, ['Region', 'Product'], periods=4, max_workers=1)
+        
+        self.assertEqual(len(result), 3 * 2 * 4)
+        self.assertEqual(list(result.columns[:3]), ['Region', 'Product', 'metric'])
+        
+        for (region, product, metric), rows in result.groupby(['Region', 'Product', 'metric']):
+            subset = self.data[(self.data['Region'] == region) & (self.data['Product'] == product)]
+            expected = self.analyzer.analyze_time_series(subset, metric, 'Date', periods=4)
+            self.assertEqual(rows['method'].iloc[0], expected.method)
+            self.assertEqual(list(rows['period']), [1, 2, 3, 4])
+            np.testing.assert_allclose(rows['forecast'], expected.forecast_values, rtol=1e-10)
+            np.testing.assert_allclose(rows['upper'], expected.confidence_upper, rtol=1e-10)
+    
+    def test_same_date_rows_summed_and_short_series_skipped(self):
+        """Rows sharing a group and date are summed; too-short series are left out."""
+        doubled = pd.concat([self.data, self.data], ignore_index=True)
+        short = pd.DataFrame({'Date': pd.date_range('2022-01-01', periods=2, freq='MS'),
+                              'Region': 'West', 'Product': 'A', 'Revenue': [1.0, 2.0], 'Cost': [1.0, 2.0]})
+        
+        result = self.analyzer.forecast_by_group(pd.concat([doubled, short]), 'Region',
+                                                 target_columns=['Revenue'], periods=2, max_workers=1)
+        
+        self.assertEqual(sorted(result['Region'].unique()), ['North', 'South'])
+        south = result[result['Region'] == 'South']
+        self.assertEqual(south['observations'].iloc[0], 18)
+        
+        single = self.analyzer.forecast_by_group(self.data, 'Region', target_columns=['Revenue'],
+                                                 periods=2, max_workers=1)
+        self.assertAlmostEqual(south['forecast'].iloc[0] / single[single['Region'] == 'South']['forecast'].iloc[0], 2.0)
+    
+    def test_process_pool_matches_in_process(self):
+        """Fitting in worker processes gives the same frame as in-process."""
+        serial = self.analyzer.forecast_by_group(self.data, ['Region', 'Product'], max_workers=1)
+        with patch('analyzers.forecast_analyzer.PARALLEL_MIN_SERIES', 0), \
+                patch('analyzers.forecast_analyzer.ProcessPoolExecutor',
+                      wraps=forecast_analyzer.ProcessPoolExecutor) as pool:
+            pooled = self.analyzer.forecast_by_group(self.data, ['Region', 'Product'], max_workers=2)
+        
+        pd.testing.assert_frame_equal(serial, pooled)
+        # Workers are never forked from the (possibly multi-threaded) server
+        self.assertNotEqual(pool.call_args.kwargs['mp_context'].get_start_method(), 'fork')
+    
+    def test_batch_characteristics_match_per_series(self):
+        """Row-wise characteristics equal _analyze_data_characteristics per series."""
+        rng = np.random.default_rng(8)
+        values = np.vstack([
+            np.arange(14) * 3.0 + rng.normal(0, 1, 14),
+            np.r_[rng.normal(100, 5, 13), 400.0],
+            np.full(14, 7.0),
+        ])
+        dates = pd.date_range('2023-01-01', periods=14, freq='MS')
+        
+        for row, batched in zip(values, self.analyzer._analyze_batch_characteristics(values)):
+            expected = self.analyzer._analyze_data_characteristics(pd.Series(row, index=dates))
+            self.assertEqual(batched['has_trend'], expected['has_trend'])
+            self.assertEqual(batched['outliers'], expected['outliers'])
+            self.assertAlmostEqual(batched['volatility'], expected['volatility'])
+            self.assertEqual(self.analyzer._select_forecasting_method(batched),
+                             self.analyzer._select_forecasting_method(expected))
+    
+    def test_invalid_columns(self):
+        """Missing or non-numeric columns are rejected."""
+        with self.assertRaises(ValueError):
+            self.analyzer.forecast_by_group(self.data, ['Territory'])
+        with self.assertRaises(ValueError):
+            self.analyzer.forecast_by_group(self.data, 'Region', target_columns=['Product'])
+
+
+class TestBacktestSelection(unittest.TestCase):
+    """Test suite for rolling-origin backtest method selection."""
+    
+    def setUp(self):
+        """Clear cached selections and build a trending and a noisy series."""
+        forecast_analyzer._selections.clear()
+        self.analyzer = ForecastingAnalyzer(selection='backtest', backtest_origins=3)
+        rng = np.random.default_rng(12)
+        dates = pd.date_range('2021-01-01', periods=40, freq='MS')
+        self.series = {
+            'trend': pd.Series(200 + 8 * np.arange(40) + rng.normal(0, 1, 40), index=dates),
+            'noise': pd.Series(500 + rng.normal(0, 40, 40), index=dates),
+        }
+    
+    def test_selects_lowest_out_of_sample_error(self):
+        """Every candidate is scored and the lowest mean error wins."""
+        selections = self.analyzer.select_by_backtest(self.series, horizon=4)
+        
+        trend = selections['trend']
+        # Level-only forecasts lag a steady trend
+        self.assertNotEqual(trend.method, 'simple_exponential_smoothing')
+        self.assertTrue(trend.complete)
+        self.assertEqual(trend.origins, 3)
+        self.assertEqual(len(trend.errors), len(BACKTEST_CANDIDATES))
+        self.assertEqual(trend.errors[trend.label], min(trend.errors.values()))
+    
+    def test_selections_cached_per_series_fingerprint(self):
+        """Unchanged series reuse their selection; changed series are backtested again."""
+        first = self.analyzer.select_by_backtest(self.series, horizon=4)
+        with patch('analyzers.forecast_analyzer._backtest_candidate',
+                   wraps=forecast_analyzer._backtest_candidate) as run:
+            again = self.analyzer.select_by_backtest(self.series, horizon=4)
+            self.assertEqual(run.call_count, 0)
+            self.assertIs(again['trend'], first['trend'])
+            
+            changed = {'trend': self.series['trend'] * 2}
+            self.analyzer.select_by_backtest(changed, horizon=4)
+            self.assertEqual(run.call_count, len(BACKTEST_CANDIDATES))
+    
+    def test_exhausted_budget_falls_back_to_heuristic(self):
+        """With no time left the heuristic choice is used and nothing is cached."""
+        selections = self.analyzer.select_by_backtest(self.series, horizon=4, time_budget=0)
+        
+        expected = self.analyzer._select_forecasting_method(
+            self.analyzer._analyze_data_characteristics(self.series['noise']))
+        self.assertEqual(selections['noise'].method, expected)
+        self.assertFalse(selections['noise'].complete)
+        self.assertEqual(len(forecast_analyzer._selections), 0)
+    
+    def test_process_pool_matches_in_process(self):
+        """Scores computed in worker processes equal the in-process scores."""
+        serial = self.analyzer.select_by_backtest(self.series, horizon=4, max_workers=1)
+        forecast_analyzer._selections.clear()
+        with patch('analyzers.forecast_analyzer.PARALLEL_MIN_SERIES', 0), \
+                patch('analyzers.forecast_analyzer.ProcessPoolExecutor',
+                      wraps=forecast_analyzer.ProcessPoolExecutor) as pool:
+            pooled = self.analyzer.select_by_backtest(self.series, horizon=4, max_workers=2)
+        
+        self.assertNotEqual(pool.call_args.kwargs['mp_context'].get_start_method(), 'fork')
+        for key in self.series:
+            self.assertEqual(pooled[key].label, serial[key].label)
+            self.assertEqual(set(pooled[key].errors), set(serial[key].errors))
+            for label, error in serial[key].errors.items():
+                self.assertAlmostEqual(pooled[key].errors[label], error, places=6)
+    
+    def test_backtest_mode_forecasts(self):
+        """analyze_time_series and forecast_by_group use the backtested choice."""
+        data = pd.DataFrame({'Date': self.series['trend'].index, 'Revenue': self.series['trend'].values})
+        result = self.analyzer.analyze_time_series(data, 'Revenue', 'Date', periods=3)
+        
+        choice = self.analyzer.select_by_backtest({'Revenue': self.series['trend']}, horizon=3)['Revenue']
+        self.assertEqual(result.accuracy_metrics['backtest_mae'], choice.errors[choice.label])
+        
+        grouped = pd.concat([data.assign(Region='North'), data.assign(Region='South')])
+        frame = self.analyzer.forecast_by_group(grouped, 'Region', periods=3, max_workers=1)
+        self.assertEqual(len(frame), 2 * 3)
+        np.testing.assert_allclose(frame['forecast'].iloc[:3], result.forecast_values, rtol=1e-10)
+    
+    def test_unknown_selection_mode(self):
+        """Only 'heuristic' and 'backtest' selection modes are accepted."""
+        with self.assertRaises(ValueError):
+            ForecastingAnalyzer(selection='oracle')
+
+
+
+class TestIncrementalUpdate(unittest.TestCase):
+    """Test suite for ForecastingAnalyzer.update and update_groups."""
+    
+    def setUp(self):
+        """Build 60 days of trending, noisy data."""
+        self.analyzer = ForecastingAnalyzer(confidence_level=0.95)
+        rng = np.random.default_rng(12)
+        self.data = pd.DataFrame({
+            'Date': pd.date_range('2024-01-01', periods=60, freq='D'),
+            'Revenue': 500 + 2.5 * np.arange(60) + rng.normal(0, 15, 60),
+        })
+    
+    def assert_same_forecast(self, actual, expected):
+        """Forecasts, bands, dates and error metrics agree."""
+        self.assertEqual(actual.method, expected.method)
+        self.assertEqual(actual.forecast_dates, expected.forecast_dates)
+        self.assertEqual(actual.last_actual_value, expected.last_actual_value)
+        np.testing.assert_allclose(actual.forecast_values, expected.forecast_values, rtol=1e-9)
+        np.testing.assert_allclose(actual.confidence_lower, expected.confidence_lower, rtol=1e-9)
+        np.testing.assert_allclose(actual.confidence_upper, expected.confidence_upper, rtol=1e-9)
+        for metric in ('mae', 'rmse'):
+            self.assertAlmostEqual(actual.accuracy_metrics[metric], expected.accuracy_metrics[metric], places=8)
+    
+    def test_update_matches_full_refit(self):
+        """Advancing the state equals fitting the whole history, for every method."""
+        for method in ('simple_exponential_smoothing', 'double_exponential_smoothing', 'linear_regression'):
+            with self.subTest(method=method), \
+                    patch.object(self.analyzer, '_select_forecasting_method', return_value=method):
+                self.analyzer.analyze_time_series(self.data.iloc[:35], 'Revenue', periods=5)
+                # Overlapping rows already seen are ignored
+                self.analyzer.update(self.data.iloc[30:50], 'Revenue', periods=5)
+                updated = self.analyzer.update(self.data.iloc[50:], 'Revenue', periods=5)
+                
+                refit = ForecastingAnalyzer().analyze_time_series
+                with patch.object(ForecastingAnalyzer, '_select_forecasting_method', return_value=method):
+                    expected = refit(self.data, 'Revenue', periods=5)
+                self.assert_same_forecast(updated, expected)
+                self.assertEqual(self.analyzer.states['Revenue'].observations, 60)
+    
+    def test_update_without_new_rows_and_without_state(self):
+        """An update with nothing new re-forecasts; an unknown column is rejected."""
+        first = self.analyzer.analyze_time_series(self.data, 'Revenue', periods=3)
+        again = self.analyzer.update(self.data.iloc[:10], 'Revenue', periods=3)
+        self.assert_same_forecast(again, first)
+        
+        with self.assertRaises(ValueError):
+            self.analyzer.update(self.data, 'Cost')
+    
+    def test_update_groups_matches_refit(self):
+        """Grouped states advance to the forecast_by_group result on the full data."""
+        frames = []
+        for i, region in enumerate(['North', 'South', 'East']):
+            frames.append(self.data.assign(Region=region, Revenue=self.data['Revenue'] * (i + 1),
+                                           Cost=self.data['Revenue'] * 0.6 - 10 * i))
+        data = pd.concat(frames, ignore_index=True)
+        early = data[data['Date'] < '2024-02-10']
+        late = data[(data['Date'] >= '2024-02-10') & (data['Region'] != 'East')]
+        
+        with patch.object(ForecastingAnalyzer, '_select_forecasting_method',
+                          return_value='double_exponential_smoothing'):
+            self.analyzer.forecast_by_group(early, 'Region', periods=4, max_workers=1)
+            updated = self.analyzer.update_groups(late, 'Region', periods=4)
+            expected = ForecastingAnalyzer().forecast_by_group(
+                pd.concat([early, late]), 'Region', periods=4, max_workers=1)
+        
+        self.assertEqual(list(updated.columns), list(expected.columns))
+        updated = updated.sort_values(['Region', 'metric', 'period'], ignore_index=True)
+        expected = expected.sort_values(['Region', 'metric', 'period'], ignore_index=True)
+        pd.testing.assert_frame_equal(updated, expected, rtol=1e-9)
+        self.assertEqual(sorted(set(updated.loc[updated['Region'] == 'East', 'observations'])), [40])
+
+    
+    def test_states_bounded_least_recently_used(self):
+        """Beyond max_states the least recently used series states are dropped."""
+        analyzer = ForecastingAnalyzer(max_states=4)
+        data = pd.concat([self.data.assign(Region=region) for region in ['North', 'South', 'East']],
+                         ignore_index=True)
+        analyzer.analyze_time_series(self.data, 'Revenue', periods=3)
+        analyzer.forecast_by_group(data, 'Region', target_columns=['Revenue'], periods=3, max_workers=1)
+        
+        self.assertEqual(list(analyzer.states), ['Revenue', ('East', 'Revenue'),
+                                                 ('North', 'Revenue'), ('South', 'Revenue')])
+        analyzer.update(self.data.iloc[50:], 'Revenue', periods=3)
+        analyzer.forecast_by_group(data.assign(Region='West'), 'Region', target_columns=['Revenue'],
+                                   periods=3, max_workers=1)
+        self.assertEqual(list(analyzer.states), [('North', 'Revenue'), ('South', 'Revenue'),
+                                                 'Revenue', ('West', 'Revenue')])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,150 @@
+"""
+Unit tests for the vectorised forecasting methods
+
+Checks the vectorised smoothing and seasonal helpers against straightforward
+loop implementations of the same recurrences, and that batch_forecast
+returns the same results as the single-series functions.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the path to import our modules
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.forecast_methods import (
+    FORECAST_METHODS,
+    batch_forecast,
+    double_exponential_smoothing_forecast,
+    linear_regression_forecast,
+    seasonal_forecast,
+    simple_exponential_smoothing_forecast,
+    _calculate_seasonal_pattern,
+    _deseasonalize_data,
+    _smooth_double,
+    _smooth_simple,
+)
+
+
+def loop_simple_smoothing(values, alpha):
+    """Reference: simple exponential smoothing one observation at a time."""
+    smoothed = np.zeros(len(values))
+    smoothed[0] = values[0]
+    for i in range(1, len(values)):
+        smoothed[i] = alpha * values[i] + (1 - alpha) * smoothed[i - 1]
+    return smoothed
+
+
+def loop_double_smoothing(values, alpha, beta):
+    """Reference: Holt's method one observation at a time."""
+    level = values[0]
+    trend = values[1] - values[0] if len(values) > 1 else 0
+    levels = np.zeros(len(values))
+    levels[0] = level
+    for i in range(1, len(values)):
+        prev_level = level
+        level = alpha * values[i] + (1 - alpha) * (level + trend)
+        trend = beta * (level - prev_level) + (1 - beta) * trend
+        levels[i] = level
+    return levels, trend
+
+
+class TestVectorisedForecastMethods(unittest.TestCase):
+    """Test suite for the vectorised forecasting methods."""
+
+    def setUp(self):
+        """Build a long daily series with trend, weekly cycle and noise."""
+        rng = np.random.default_rng(3)
+        n = 3000
+        dates = pd.date_range('2015-01-01', periods=n, freq='D')
+        values = 1000 + 0.5 * np.arange(n) + 50 * np.sin(np.arange(n) * 2 * np.pi / 7) + rng.normal(0, 20, n)
+        self.series = pd.Series(values, index=dates)
+
+    def test_simple_smoothing_matches_recursion(self):
+        """The blocked recurrence reproduces the recursive smoothing."""
+        values = self.series.to_numpy()
+        for alpha in (0.05, 0.3, 0.9):
+            np.testing.assert_allclose(_smooth_simple(values, alpha)[0],
+                                       loop_simple_smoothing(values, alpha), rtol=1e-10)
+
+    def test_double_smoothing_matches_recursion(self):
+        """Levels and the final trend match Holt's recursion."""
+        values = self.series.to_numpy()
+        for alpha, beta in ((0.3, 0.1), (0.8, 0.5), (0.1, 0.9)):
+            levels, trends = _smooth_double(values, alpha, beta)
+            expected_levels, expected_trend = loop_double_smoothing(values, alpha, beta)
+            np.testing.assert_allclose(levels[0], expected_levels, rtol=1e-10)
+            self.assertAlmostEqual(trends[0, -1], expected_trend, places=8)
+
+    def test_seasonal_helpers_match_loops(self):
+        """Seasonal averages and deseasonalised values equal the loop versions."""
+        values = np.array([3, 8, 1, 4, 9, 2, 5, 7, 6, 2, 8], dtype=int)
+        season_length = 4
+
+        sums, counts = np.zeros(season_length), np.zeros(season_length)
+        for i, val in enumerate(values):
+            sums[i % season_length] += val
+            counts[i % season_length] += 1
+        expected = sums / counts - np.mean(values)
+
+        pattern = _calculate_seasonal_pattern(values, season_length)
+        np.testing.assert_array_equal(pattern, expected)
+        np.testing.assert_array_equal(
+            _deseasonalize_data(values, pattern, season_length),
+            [val - pattern[i % season_length] for i, val in enumerate(values)]
+        )
+
+    def test_forecasts_and_bands(self):
+        """Forecasts extend the final smoothed state; bands are symmetric."""
+        result = double_exponential_smoothing_forecast(self.series, 5, 'Sales')
+        levels, trend = loop_double_smoothing(self.series.to_numpy(), 0.3, 0.1)
+
+        np.testing.assert_allclose(result.forecast_values,
+                                   levels[-1] + np.arange(1, 6) * trend, rtol=1e-10)
+        margins = np.array(result.confidence_upper) - result.forecast_values
+        np.testing.assert_allclose(margins, np.array(result.forecast_values) - result.confidence_lower)
+        self.assertIsInstance(result.forecast_values[0], float)
+
+        simple = simple_exponential_smoothing_forecast(self.series, 3, 'Sales')
+        self.assertEqual(len(set(simple.forecast_values)), 1)
+
+    def test_batch_matches_single_series(self):
+        """Each batch result equals the single-series forecast, across lengths."""
+        series = {
+            ('North', 'Sales'): self.series,
+            ('South', 'Sales'): self.series * 1.5 - 200,
+            ('East', 'Sales'): self.series.iloc[:400],
+        }
+        single = {
+            'linear_regression': linear_regression_forecast,
+            'simple_exponential_smoothing': simple_exponential_smoothing_forecast,
+            'double_exponential_smoothing': double_exponential_smoothing_forecast,
+            'seasonal_decomposition': seasonal_forecast,
+        }
+        self.assertEqual(set(single), set(FORECAST_METHODS))
+
+        for method, forecast in single.items():
+            results = batch_forecast(series, periods=6, method=method)
+            self.assertEqual(list(results), list(series))
+            for key, ts_data in series.items():
+                expected = forecast(ts_data, 6, 'Sales')
+                self.assertEqual(results[key].method, expected.method)
+                self.assertEqual(results[key].forecast_dates, expected.forecast_dates)
+                np.testing.assert_allclose(results[key].forecast_values, expected.forecast_values, rtol=1e-10)
+                np.testing.assert_allclose(results[key].confidence_lower, expected.confidence_lower, rtol=1e-10)
+
+    def test_batch_sequence_and_unknown_method(self):
+        """A list of series returns a list in order; unknown methods are rejected."""
+        results = batch_forecast([self.series.iloc[:50], self.series], periods=2, alpha=0.5)
+        self.assertEqual(results[0].last_actual_value, float(self.series.iloc[49]))
+        self.assertEqual(results[1].accuracy_metrics['alpha'], 0.5)
+
+        with self.assertRaises(ValueError):
+            batch_forecast([self.series], periods=2, method='arima')
+
+
+if __name__ == '__main__':
+    unittest.main()
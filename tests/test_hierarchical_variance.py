@@ -0,0 +1,147 @@
+"""
+Unit tests for hierarchical drill-down variance
+
+Checks QuantAnalyzer.hierarchical_variance_analysis against direct groupbys
+of the rows at every level: the kept children of each node are its top
+contributors in the direction of its variance, the node budget caps the
+drill-down, and the rows are grouped only once.
+"""
+
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+# Add the parent directory to the path to import our modules
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.variance_analyzer import QuantAnalyzer
+
+
+HIERARCHY = ['Region', 'State', 'City']
+
+
+class TestHierarchicalVariance(unittest.TestCase):
+    """Test suite for QuantAnalyzer.hierarchical_variance_analysis."""
+
+    def setUp(self):
+        """Rows spread over a Region -> State -> City hierarchy, under plan overall."""
+        rng = np.random.default_rng(25)
+        rows = 20000
+        region = rng.choice(['North', 'South', 'East', 'West'], rows)
+        state = pd.Series(region).str[0] + rng.integers(0, 6, rows).astype(str)
+        city = state + '-' + rng.integers(0, 10, rows).astype(str)
+        self.data = pd.DataFrame({
+            'Region': region,
+            'State': state,
+            'City': city,
+            'Actual': rng.normal(100, 20, rows),
+            'Budget': rng.normal(101, 15, rows),
+        })
+        self.analyzer = QuantAnalyzer()
+
+    def test_levels_match_direct_groupby(self):
+        """Each kept node's totals equal a groupby of the rows at its level."""
+        results = self.analyzer.hierarchical_variance_analysis(self.data, 'Actual', 'Budget', HIERARCHY, top_n=3)
+        nodes = results['nodes']
+        self.assertAlmostEqual(results['total']['variance'], (self.data['Actual'] - self.data['Budget']).sum(), places=6)
+        self.assertEqual(results['leaf_count'], self.data.groupby(HIERARCHY).ngroups)
+
+        for depth in range(1, len(HIERARCHY) + 1):
+            keys = HIERARCHY[:depth]
+            expected = self.data.groupby(keys)[['Actual', 'Budget']].sum()
+            level = nodes[nodes['depth'] == depth].set_index(keys)
+            np.testing.assert_allclose(level['actual'], expected.loc[level.index, 'Actual'], rtol=1e-9)
+            np.testing.assert_allclose(level['variance'],
+                                       expected.loc[level.index, 'Actual'] - expected.loc[level.index, 'Budget'],
+                                       rtol=1e-9)
+
+    def test_children_are_top_contributors(self):
+        """Kept children are the top_n pushing in their parent's direction, in order."""
+        results = self.analyzer.hierarchical_variance_analysis(self.data, 'Actual', 'Budget', HIERARCHY, top_n=2)
+        nodes = results['nodes']
+        self.assertEqual(len(nodes), 2 + 4 + 8)
+
+        variance = self.data['Actual'] - self.data['Budget']
+        regions = variance.groupby(self.data['Region']).sum()
+        direction = np.sign(results['total']['variance'])
+        self.assertEqual(nodes.loc[nodes['depth'] == 1, 'Region'].tolist(),
+                         (regions * direction).sort_values(ascending=False).index[:2].tolist())
+
+        for _, parent in nodes[nodes['depth'] == 1].iterrows():
+            in_region = self.data['Region'] == parent['Region']
+            states = variance[in_region].groupby(self.data.loc[in_region, 'State']).sum()
+            ranked = (states * np.sign(parent['variance'])).sort_values(ascending=False).index[:2].tolist()
+            children = nodes[(nodes['depth'] == 2) & (nodes['Region'] == parent['Region'])]
+            self.assertEqual(children['State'].tolist(), ranked)
+            self.assertEqual(children['rank'].tolist(), [1, 2])
+            np.testing.assert_allclose(children['share_of_parent'], children['variance'] / parent['variance'] * 100)
+
+        # Each parent comes directly before its own children
+        depths = nodes['depth'].tolist()
+        self.assertEqual(depths[:4], [1, 2, 3, 3])
+
+        leaves = (self.data.groupby(HIERARCHY)['Actual'].sum() - self.data.groupby(HIERARCHY)['Budget'].sum())
+        self.assertEqual(results['top_leaves']['City'].tolist(),
+                         (leaves * direction).sort_values(ascending=False).index.get_level_values('City')[:2].tolist())
+
+    def test_node_budget(self):
+        """The drill-down stops at max_nodes and says so."""
+        results = self.analyzer.hierarchical_variance_analysis(self.data, 'Actual', 'Budget', HIERARCHY,
+                                                               top_n=4, max_nodes=10)
+        self.assertTrue(results['truncated'])
+        self.assertEqual(results['node_count'], 10)
+        self.assertEqual(len(results['nodes']), 10)
+        self.assertEqual(results['nodes']['depth'].max(), 2)
+
+        full = self.analyzer.hierarchical_variance_analysis(self.data, 'Actual', 'Budget', HIERARCHY, top_n=4)
+        self.assertFalse(full['truncated'])
+        self.assertEqual(full['node_count'], 4 + 16 + 64)
+
+    def test_rows_grouped_once(self):
+        """Every level comes from one leaf-level groupby, reused by later drill-downs."""
+        data = self.data.assign(Actual=self.data['Actual'] + 0.25)  # Content not used by any other test
+        with patch.object(pd.DataFrame, 'groupby', autospec=True, side_effect=pd.DataFrame.groupby) as groupby:
+            first = self.analyzer.hierarchical_variance_analysis(data, 'Actual', 'Budget', HIERARCHY)
+            second = self.analyzer.hierarchical_variance_analysis(data, 'Actual', 'Budget', HIERARCHY, top_n=2)
+        self.assertEqual([call.args[0] is data for call in groupby.call_args_list].count(True), 1)
+        self.assertEqual(first['leaf_count'], second['leaf_count'])
+        self.assertEqual(len(second['nodes']), 2 + 4 + 8)
+
+    def test_categorical_hierarchy(self):
+        """Category columns give the same drill-down, with no unobserved combinations."""
+        data = self.data.astype({col: 'category' for col in HIERARCHY})
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', FutureWarning)
+            results = self.analyzer.hierarchical_variance_analysis(data, 'Actual', 'Budget', HIERARCHY, top_n=3)
+            report = self.analyzer.format_hierarchical_variance(results)
+        expected = self.analyzer.hierarchical_variance_analysis(self.data, 'Actual', 'Budget', HIERARCHY, top_n=3)
+        
+        nodes = results['nodes']
+        self.assertEqual(results['leaf_count'], expected['leaf_count'])
+        self.assertEqual(nodes['path'].tolist(), expected['nodes']['path'].tolist())
+        np.testing.assert_allclose(nodes['variance'], expected['nodes']['variance'], rtol=1e-9)
+        
+        # Every state sits in its own region, every city in its own state
+        states = nodes[nodes['depth'] == 2]
+        self.assertTrue((states['State'].astype(str).str[0] == states['Region'].astype(str).str[0]).all())
+        cities = nodes[nodes['depth'] == 3]
+        self.assertTrue(all(city.startswith(f"{state}-") for state, city in zip(cities['State'], cities['City'])))
+        self.assertIn('Contributors by Level', report)
+    
+    def test_single_level_and_errors(self):
+        """One hierarchy level works; missing columns are reported."""
+        results = self.analyzer.hierarchical_variance_analysis(self.data, 'Actual', 'Budget', ['Region'])
+        self.assertEqual(results['nodes']['depth'].tolist(), [1, 1, 1, 1])
+        report = self.analyzer.format_hierarchical_variance(results)
+        self.assertIn('Variance Drill-Down: Region', report)
+        self.assertIn('Leaves Explaining the Variance', report)
+
+        self.assertIn('error', self.analyzer.hierarchical_variance_analysis(self.data, 'Actual', 'Budget', ['Country']))
+
+
+if __name__ == '__main__':
+    unittest.main()
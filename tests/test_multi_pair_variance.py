@@ -0,0 +1,140 @@
+"""
+Unit tests for multi-pair variance analysis
+
+Checks that QuantAnalyzer.multi_pair_variance_analysis returns, for every
+pair, the same totals and per-period extremes as one
+comprehensive_variance_analysis call per pair, and the same per-category
+totals as a groupby per pair.
+"""
+
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock, patch
+
+# Add the parent directory to the path to import our modules
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.rag_enhanced_analyzer import RAGEnhancedAnalyzer
+from analyzers.variance_analyzer import QuantAnalyzer, VARIANCE_KEY_COLUMNS
+
+
+PAIRS = [
+    {'actual': 'Actual Sales', 'planned': 'Budget Sales', 'type': 'actual_vs_planned'},
+    {'actual': 'Actual COGS', 'planned': 'Budget COGS', 'type': 'actual_vs_planned'},
+    {'actual': 'Actual Opex', 'planned': 'Budget Opex', 'type': 'actual_vs_planned'},
+]
+
+
+class TestMultiPairVariance(unittest.TestCase):
+    """Test suite for QuantAnalyzer.multi_pair_variance_analysis."""
+
+    def setUp(self):
+        """Two years of hourly rows with three actual/budget pairs."""
+        rng = np.random.default_rng(24)
+        rows = 4000
+        self.data = pd.DataFrame({
+            'Date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 730 * 24, rows), unit='h'),
+            'Region': rng.choice(['North', 'South', 'East'], rows),
+            'Actual Sales': rng.normal(1000, 200, rows),
+            'Budget Sales': rng.normal(1000, 150, rows),
+            'Actual COGS': rng.normal(600, 80, rows),
+            'Budget COGS': rng.normal(580, 60, rows),
+            'Actual Opex': rng.normal(200, 30, rows),
+            'Budget Opex': rng.normal(210, 20, rows),
+        })
+        self.analyzer = QuantAnalyzer()
+
+    def test_matches_per_pair_analysis(self):
+        """Totals and period extremes equal one comprehensive analysis per pair."""
+        results = self.analyzer.multi_pair_variance_analysis(self.data, PAIRS, 'Date')
+        self.assertEqual(results['grains'], ['total', 'daily', 'weekly', 'monthly', 'quarterly', 'yearly'])
+
+        suffixes = {'daily': 'day', 'weekly': 'week', 'monthly': 'month', 'quarterly': 'quarter', 'yearly': 'year'}
+        for pair, summary in zip(PAIRS, results['summary']):
+            expected = self.analyzer.comprehensive_variance_analysis(self.data, pair['actual'], pair['planned'], 'Date')
+            for key in ('actual_total', 'planned_total', 'variance_absolute', 'variance_percentage'):
+                self.assertAlmostEqual(summary[key], expected['summary'][key], places=6)
+
+            for grain, suffix in suffixes.items():
+                rows = self.analyzer.select_variances(results, pair=pair['actual'], grain=grain)
+                periods = expected['time_periods'][grain]
+                self.assertEqual(len(rows), periods['periods'])
+                best = rows.loc[rows['variance'].idxmax()]
+                self.assertEqual(best['period'], periods[f'best_{suffix}'].get('date', periods[f'best_{suffix}'].get('period')))
+                self.assertAlmostEqual(best['variance'], periods[f'best_{suffix}']['variance'], places=6)
+
+    def test_categories_and_long_format(self):
+        """Per-category rows equal a groupby per pair, in one long frame."""
+        results = self.analyzer.multi_pair_variance_analysis(self.data, PAIRS, 'Date', 'Region')
+        variances = results['variances']
+        self.assertEqual(list(variances.columns[:len(VARIANCE_KEY_COLUMNS) + 1]), VARIANCE_KEY_COLUMNS + ['Region'])
+        self.assertEqual(list(variances['pair'].unique()), [summary['pair'] for summary in results['summary']])
+
+        monthly = self.data.groupby([self.data['Date'].dt.to_period('M'), 'Region'])
+        for pair in PAIRS:
+            rows = self.analyzer.select_variances(results, pair=pair['actual'], grain='monthly')
+            expected = (monthly[pair['actual']].sum() - monthly[pair['planned']].sum()).reset_index(drop=True)
+            np.testing.assert_allclose(rows['variance'].to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+        north = self.analyzer.select_variances(results, grain='total', category='North')
+        self.assertEqual(len(north), len(PAIRS))
+
+    def test_filtered_categorical_has_no_phantom_rows(self):
+        """Categories filtered out of a categorical column appear in no grain."""
+        data = self.data.astype({'Region': 'category'})
+        east = data[data['Region'] == 'East']
+        for cube in (True, False):
+            with self.subTest(cube=cube), warnings.catch_warnings():
+                warnings.simplefilter('error', FutureWarning)
+                if cube:
+                    results = self.analyzer.multi_pair_variance_analysis(east, PAIRS, 'Date', 'Region')
+                else:
+                    with patch('analyzers.variance_analyzer.get_rollup_cube', lambda *args, **kwargs: None):
+                        results = self.analyzer.multi_pair_variance_analysis(east, PAIRS, 'Date', 'Region')
+                variances = results['variances']
+                self.assertEqual(set(variances['Region']), {'East'})
+                self.assertEqual(len(self.analyzer.select_variances(results, grain='total')), len(PAIRS))
+                totals = self.analyzer.select_variances(results, pair=PAIRS[0]['actual'], grain='total')
+                self.assertAlmostEqual(totals['actual'].iloc[0], east[PAIRS[0]['actual']].sum(), places=6)
+
+    def test_one_grouped_pass(self):
+        """All pairs and grains come from a single groupby of the rows."""
+        with patch('analyzers.variance_analyzer.get_rollup_cube', lambda *args, **kwargs: None), \
+                patch.object(pd.DataFrame, 'groupby', autospec=True, side_effect=pd.DataFrame.groupby) as groupby:
+            results = self.analyzer.multi_pair_variance_analysis(self.data, PAIRS, 'Date', 'Region')
+        raw_groupbys = [call for call in groupby.call_args_list if call.args[0] is self.data or len(call.args[0]) == len(self.data)]
+        self.assertEqual(len(raw_groupbys), 1)
+        self.assertEqual(len(results['grains']), 6)
+
+    def test_detected_pairs_without_dates(self):
+        """Default pairs come from detection, each comparison once; totals only."""
+        results = self.analyzer.multi_pair_variance_analysis(self.data.drop(columns='Date'))
+        comparisons = [frozenset((pair['actual'], pair['planned'])) for pair in results['pairs']]
+        self.assertEqual(len(comparisons), len(set(comparisons)))
+        self.assertIn(frozenset(('Actual Sales', 'Budget Sales')), comparisons)
+        self.assertEqual(results['grains'], ['total'])
+        self.assertTrue((results['variances']['period'] == 'All').all())
+
+        report = self.analyzer.format_multi_pair_analysis(results)
+        self.assertIn('Multi-Measure Variance Analysis', report)
+        self.assertIn('Actual Sales vs Budget Sales', report)
+
+        self.assertIn('error', self.analyzer.multi_pair_variance_analysis(self.data[['Date', 'Region']]))
+
+    def test_rag_prompt_gets_slice_records(self):
+        """A sliced variance frame reaches the RAG prompt as row records."""
+        results = self.analyzer.multi_pair_variance_analysis(self.data, PAIRS, 'Date')
+        yearly = self.analyzer.select_variances(results, grain='yearly')
+        prompt = RAGEnhancedAnalyzer(Mock())._create_variance_analysis_prompt(
+            {'summary': results['summary'], 'yearly': yearly}, 'context', ''
+        )
+        self.assertIn('"period": "2023"', prompt)
+        self.assertIn('"pair": "Actual Opex vs Budget Opex"', prompt)
+
+
+if __name__ == '__main__':
+    unittest.main()
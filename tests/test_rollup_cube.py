@@ -0,0 +1,210 @@
+"""
+Unit tests for RollupCube
+
+Checks that totals derived from the daily level equal groupbys of the raw
+rows at every grain, that the cube is built once per dataset and rebuilt
+when the data changes, and that the time-based analyzers return the same
+results from the cube as from the rows.
+"""
+
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+# Add the parent directory to the path to import our modules
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.financial_analyzer import FinancialAnalyzer
+from analyzers.timescale_analyzer import TimescaleAnalyzer
+from analyzers.variance_analyzer import QuantAnalyzer
+from config.settings import Settings
+from data.rollup_cube import GRAIN_FREQUENCIES, RollupCube, get_rollup_cube
+
+
+def without_cube(module: str):
+    """Patch an analyzer module onto its row-level path."""
+    return patch(f'analyzers.{module}.get_rollup_cube', lambda *args, **kwargs: None)
+
+
+class TestRollupCube(unittest.TestCase):
+    """Test suite for RollupCube and the analyzers that read it."""
+
+    def setUp(self):
+        """Build two years of timestamped rows across regions."""
+        rng = np.random.default_rng(5)
+        rows = 3000
+        self.data = pd.DataFrame({
+            'Date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 730 * 24, rows), unit='h'),
+            'Region': rng.choice(['North', 'South', 'East'], rows),
+            'Actual': rng.normal(1000, 200, rows).round(2),
+            'Planned': rng.normal(1000, 150, rows).round(2),
+            'Units': rng.integers(1, 50, rows),
+        })
+        self.settings = Settings()
+
+    def test_rollups_match_raw_groupby(self):
+        """Every grain, overall and by category, equals a groupby of the rows."""
+        data = self.data.copy()
+        data.loc[::97, 'Actual'] = np.nan
+        data.loc[::89, 'Region'] = None
+        cube = RollupCube.from_dataframe(data, 'Date', categories=['Region'])
+
+        for grain, freq in GRAIN_FREQUENCIES.items():
+            periods = data['Date'].dt.to_period(freq).rename('period')
+            expected = data.groupby(periods)[['Actual', 'Units']].sum()
+            pd.testing.assert_frame_equal(cube.rollup(grain, ['Actual', 'Units']), expected)
+
+            expected = data.groupby([periods, 'Region'])[['Actual']].sum()
+            pd.testing.assert_frame_equal(cube.rollup(grain, ['Actual'], 'Region'), expected)
+
+        self.assertEqual(cube.row_count, len(data))
+        self.assertEqual(cube.last_date, data['Date'].max())
+
+    def test_built_once_and_rebuilt_on_change(self):
+        """Repeated requests share one cube; changed data gets a new one."""
+        data = self.data.copy()
+        data['Actual'] += 0.5  # Content not used by any other test
+        with patch.object(RollupCube, 'from_dataframe', wraps=RollupCube.from_dataframe) as build:
+            first = get_rollup_cube(data, 'Date')
+            self.assertIs(get_rollup_cube(data, 'Date', ['Actual']), first)
+        self.assertEqual(build.call_count, 1)
+
+        data['Margin'] = data['Actual'] - data['Planned']
+        second = get_rollup_cube(data, 'Date', ['Margin'])
+        self.assertIsNot(second, first)
+        self.assertIn('Margin', second.measures)
+        self.assertIsNone(get_rollup_cube(data, 'Date', ['Region']))
+        self.assertIsNone(get_rollup_cube(data.assign(Date='soon'), 'Date'))
+        self.assertIsNone(get_rollup_cube(data, 'Units'))
+
+    def test_slow_build_does_not_block_cached_cubes(self):
+        """Cached cubes are served while another dataset's cube is built; its requests share one build."""
+        cached = get_rollup_cube(self.data, 'Date')
+        new_data = self.data.assign(Actual=self.data['Actual'] + 0.25)
+        started, release = threading.Event(), threading.Event()
+        build = RollupCube.from_dataframe
+
+        def slow_build(data, date_column, **kwargs):
+            started.set()
+            release.wait(5)
+            return build(data, date_column, **kwargs)
+
+        results = []
+        with patch.object(RollupCube, 'from_dataframe', side_effect=slow_build) as mock_build:
+            threads = [threading.Thread(target=lambda: results.append(get_rollup_cube(new_data, 'Date')))
+                       for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            self.assertTrue(started.wait(5))
+            lookup = []
+            reader = threading.Thread(target=lambda: lookup.append(get_rollup_cube(self.data, 'Date')))
+            reader.start()
+            reader.join(2)
+            self.assertFalse(reader.is_alive())
+            self.assertIs(lookup[0], cached)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(mock_build.call_count, 1)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_text_dates_parsed(self):
+        """Dates left as text (plain pd.read_csv) give the same totals as datetimes."""
+        text = self.data.assign(Date=self.data['Date'].dt.strftime('%Y-%m-%d %H:%M:%S'))
+        cube = RollupCube.from_dataframe(text, 'Date', categories=['Region'])
+        expected = RollupCube.from_dataframe(self.data, 'Date', categories=['Region'])
+        for grain in GRAIN_FREQUENCIES:
+            pd.testing.assert_frame_equal(cube.rollup(grain, ['Actual'], 'Region'),
+                                          expected.rollup(grain, ['Actual'], 'Region'))
+        self.assertEqual(cube.first_date, expected.first_date)
+
+    def test_timescale_analysis_matches_rows(self):
+        """TimescaleAnalyzer returns the same analysis from the cube."""
+        analyzer = TimescaleAnalyzer(self.settings)
+        from_cube = analyzer.analyze(self.data, 'Date', ['Actual', 'Units'])
+        with without_cube('timescale_analyzer'):
+            from_rows = analyzer.analyze(self.data, 'Date', ['Actual', 'Units'])
+
+        self.assertEqual(from_cube['parameters'], from_rows['parameters'])
+        for scale, metrics in from_rows['data'].items():
+            for metric, expected in metrics.items():
+                actual = from_cube['data'][scale][metric]
+                self.assertEqual(actual['periods'], expected['periods'])
+                np.testing.assert_allclose(actual['values'], expected['values'], rtol=1e-12)
+                np.testing.assert_allclose(actual['pct_changes'], expected['pct_changes'], rtol=1e-9)
+
+    def test_quant_time_periods_match_rows(self):
+        """QuantAnalyzer's period breakdown is the same from the cube."""
+        from_cube = QuantAnalyzer().comprehensive_variance_analysis(self.data.copy(), 'Actual', 'Planned', 'Date')
+        with without_cube('variance_analyzer'):
+            from_rows = QuantAnalyzer().comprehensive_variance_analysis(self.data.copy(), 'Actual', 'Planned', 'Date')
+
+        self.assertEqual(set(from_cube['time_periods']), {'daily', 'weekly', 'monthly', 'quarterly', 'yearly'})
+        for scale, expected in from_rows['time_periods'].items():
+            actual = from_cube['time_periods'][scale]
+            self.assertEqual(actual['periods'], expected['periods'])
+            for key, value in expected.items():
+                if isinstance(value, dict):
+                    self.assertEqual(str(actual[key].get('date', actual[key].get('period'))),
+                                     str(value.get('date', value.get('period'))))
+                    self.assertAlmostEqual(actual[key]['variance'], value['variance'], places=6)
+
+    def test_financial_analysis_matches_rows(self):
+        """TTM, variance and trend results are the same from the cube."""
+        for analysis_type, category in (('ttm', None), ('ttm', 'Region'),
+                                        ('trend', None), ('trend', 'Region'),
+                                        ('variance', None), ('variance', 'Region')):
+            with self.subTest(analysis_type=analysis_type, category=category):
+                analyzer = FinancialAnalyzer(self.settings)
+                kwargs = dict(date_col='Date', value_col='Actual', category_col=category,
+                              budget_col='Planned' if analysis_type == 'variance' else None,
+                              analysis_type=analysis_type)
+                from_cube = analyzer.analyze(self.data, **kwargs)
+                self.assertIsNotNone(analyzer._rollup)
+                with without_cube('financial_analyzer'):
+                    from_rows = FinancialAnalyzer(self.settings).analyze(self.data, **kwargs)
+
+                self.assertEqual(from_cube['metrics'].keys(), from_rows['metrics'].keys())
+                for key, value in from_rows['metrics'].items():
+                    if isinstance(value, float):
+                        self.assertAlmostEqual(from_cube['metrics'][key], value, delta=1e-9 * max(1, abs(value)))
+                    else:
+                        self.assertEqual(from_cube['metrics'][key], value)
+
+    def test_financial_falls_back_when_rows_dropped(self):
+        """Rows removed by cleaning are not in the cube, so the rows are used."""
+        data = self.data.copy()
+        data.loc[::50, 'Actual'] = np.nan
+        analyzer = FinancialAnalyzer(self.settings)
+        analyzer.analyze(data, date_col='Date', value_col='Actual', budget_col='Planned', analysis_type='variance')
+        self.assertIsNone(analyzer._rollup)
+
+    def test_variance_pct_matched_by_month_and_category(self):
+        """Mean row-level percentages land on their own month and category, whatever the cube's order."""
+        monthly_totals = FinancialAnalyzer._monthly_totals
+
+        def reversed_totals(analyzer, *args, **kwargs):
+            return monthly_totals(analyzer, *args, **kwargs).iloc[::-1].reset_index(drop=True)
+
+        kwargs = dict(date_col='Date', value_col='Actual', category_col='Region',
+                      budget_col='Planned', analysis_type='variance')
+        with patch.object(FinancialAnalyzer, '_monthly_totals', reversed_totals):
+            from_cube = FinancialAnalyzer(self.settings).analyze(self.data, **kwargs)
+        with without_cube('financial_analyzer'):
+            from_rows = FinancialAnalyzer(self.settings).analyze(self.data, **kwargs)
+
+        self.assertEqual([entry['category'] for entry in from_cube['data']],
+                         [entry['category'] for entry in from_rows['data']])
+        for actual, expected in zip(from_cube['data'], from_rows['data']):
+            self.assertEqual(actual['dates'], expected['dates'])
+            np.testing.assert_allclose(actual['variance_pct_values'], expected['variance_pct_values'], rtol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
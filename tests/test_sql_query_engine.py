@@ -0,0 +1,239 @@
+"""
+Unit tests for SQLQueryEngine
+
+Covers the shared read-only snapshot that every worker thread queries,
+so that loading a dataset happens once regardless of thread count.
+"""
+
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.sql_query_engine import SQLQueryEngine
+
+
+class TestSQLQueryEngineSnapshot(unittest.TestCase):
+    """Tests for the shared SQLite snapshot used by all threads"""
+
+    def setUp(self):
+        """Create an engine with a small dataset loaded"""
+        self.engine = SQLQueryEngine()
+        self.data = pd.DataFrame({
+            'Product': ['Widget A', 'Widget B', 'Widget C', 'Widget A'],
+            'Sales Amount': [1000, 1500, 800, 1200],
+            'Region': ['North', 'South', 'North', 'East']
+        })
+        self.assertTrue(self.engine.load_dataframe_to_sql(self.data, "test_data"))
+
+    def tearDown(self):
+        """Release connections and the snapshot file"""
+        self.engine.close_connection()
+
+    def test_query_on_loading_thread(self):
+        """Queries on the loading thread see the cleaned column names"""
+        result = self.engine.execute_query(
+            "SELECT Product, Sales_Amount FROM test_data ORDER BY Sales_Amount DESC"
+        )
+        self.assertTrue(result.success)
+        self.assertEqual(result.row_count, 4)
+        self.assertEqual(result.data.iloc[0]['Sales_Amount'], 1500)
+
+    def test_new_threads_do_not_reload_data(self):
+        """Worker threads attach to the snapshot instead of calling to_sql again"""
+        results = []
+
+        def worker():
+            results.append(self.engine.execute_query(
+                "SELECT Region, SUM(Sales_Amount) AS total FROM test_data GROUP BY Region"
+            ))
+
+        with patch.object(pd.DataFrame, 'to_sql') as mock_to_sql:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            mock_to_sql.assert_not_called()
+
+        self.assertEqual(len(results), 4)
+        for result in results:
+            self.assertTrue(result.success, result.error_message)
+            self.assertEqual(result.row_count, 3)
+
+    def test_pooled_connections_are_read_only(self):
+        """Pooled connections cannot modify the shared snapshot"""
+        with self.engine._checkout_connection() as connection:
+            with self.assertRaises(Exception):
+                connection.execute("DELETE FROM test_data")
+
+    def test_reload_replaces_snapshot(self):
+        """Loading new data swaps the snapshot and removes the old file"""
+        old_path = self.engine._snapshot_path
+        new_data = pd.DataFrame({'Product': ['Only'], 'Sales Amount': [1]})
+
+        self.assertTrue(self.engine.load_dataframe_to_sql(new_data, "test_data"))
+        result = self.engine.execute_query("SELECT COUNT(*) AS n FROM test_data")
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.data.iloc[0]['n'], 1)
+        self.assertNotEqual(old_path, self.engine._snapshot_path)
+        self.assertFalse(os.path.exists(old_path))
+
+    def test_close_connection_removes_snapshot(self):
+        """Closing the engine deletes the snapshot file"""
+        path = self.engine._snapshot_path
+        self.assertTrue(os.path.exists(path))
+        self.engine.close_connection()
+        self.assertFalse(os.path.exists(path))
+
+
+class TestSQLQueryEnginePool(unittest.TestCase):
+    """Tests for the bounded connection pool behind execute_query"""
+
+    def setUp(self):
+        """Create an engine with a two-connection pool and a short wait"""
+        self.engine = SQLQueryEngine({'sql_pool_size': 2, 'sql_pool_max_wait': 0.2})
+        data = pd.DataFrame({
+            'Region': ['North', 'South', 'East'] * 100,
+            'Sales': range(300)
+        })
+        self.engine.load_dataframe_to_sql(data, "sales")
+
+    def tearDown(self):
+        """Release connections and the snapshot file"""
+        self.engine.close_connection()
+
+    def test_concurrent_queries_share_pool(self):
+        """Concurrent queries succeed and never exceed the pool size"""
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            result = self.engine.execute_query(
+                "SELECT Region, SUM(Sales) AS total FROM sales GROUP BY Region"
+            )
+            with lock:
+                results.append(result)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(result.success for result in results))
+        stats = self.engine.get_pool_stats()
+        self.assertEqual(stats['pool_size'], 2)
+        self.assertGreaterEqual(stats['checkouts'], 8)
+        self.assertEqual(stats['in_use'], 0)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertGreaterEqual(stats['max_queue_depth'], 1)
+
+    def test_exhausted_pool_times_out(self):
+        """Queries fail cleanly once the maximum wait is exceeded"""
+        with self.engine._checkout_connection(), self.engine._checkout_connection():
+            result = self.engine.execute_query("SELECT COUNT(*) FROM sales")
+
+        self.assertFalse(result.success)
+        self.assertIn("No SQL connection became available", result.error_message)
+        self.assertEqual(self.engine.get_pool_stats()['timeouts'], 1)
+
+    def test_busy_connection_is_reopened_after_reload(self):
+        """A connection checked out during a reload picks up the new snapshot"""
+        with self.engine._checkout_connection():
+            self.engine.load_dataframe_to_sql(pd.DataFrame({'Sales': [1, 2]}), "sales")
+
+        for _ in range(self.engine.pool_size):
+            result = self.engine.execute_query("SELECT COUNT(*) AS n FROM sales")
+            self.assertTrue(result.success)
+            self.assertEqual(result.data.iloc[0]['n'], 2)
+
+
+class TestSQLQueryEngineIndexes(unittest.TestCase):
+    """Tests for automatic index creation at load time"""
+
+    def setUp(self):
+        """Build a frame shaped like a CSVLoader upload"""
+        self.engine = SQLQueryEngine()
+        self.data = pd.DataFrame({
+            'Date': pd.date_range('2024-01-01', periods=200, freq='D'),
+            'Region': ['North', 'South', 'East', 'West'] * 50,
+            'Sales Amount': range(200),
+            'Budget': range(200, 400)
+        })
+        self.column_info = {
+            'date_columns': ['Date'],
+            'numeric_columns': ['Sales Amount', 'Budget'],
+            'financial_columns': {
+                'category_columns': ['Region'],
+                'value_columns': ['Sales Amount']
+            }
+        }
+
+    def tearDown(self):
+        """Release connections and the snapshot file"""
+        self.engine.close_connection()
+
+    def _index_columns(self):
+        """Map index name to its column list as stored in the snapshot"""
+        with self.engine._checkout_connection() as connection:
+            names = [row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )]
+            return {
+                name: [row[2] for row in connection.execute(f'PRAGMA index_info("{name}")')]
+                for name in names
+            }
+
+    def test_indexes_from_column_info(self):
+        """Category and date columns get covering indexes over the value columns"""
+        self.engine.load_dataframe_to_sql(self.data, "data", column_info=self.column_info)
+
+        indexes = self._index_columns()
+        self.assertEqual(indexes['idx_data_Region'], ['Region', 'Sales_Amount'])
+        self.assertEqual(indexes['idx_data_Date'], ['Date', 'Sales_Amount'])
+        self.assertEqual(len(self.engine.schema_info['indexes']), 2)
+
+    def test_group_by_uses_covering_index(self):
+        """A GROUP BY aggregate on an indexed column is answered from the index"""
+        self.engine.load_dataframe_to_sql(self.data, "data", column_info=self.column_info)
+
+        with self.engine._checkout_connection() as connection:
+            plan = " ".join(row[-1] for row in connection.execute(
+                "EXPLAIN QUERY PLAN SELECT Region, SUM(Sales_Amount) FROM data GROUP BY Region"
+            ))
+        self.assertIn("COVERING INDEX idx_data_Region", plan)
+
+    def test_indexes_inferred_without_column_info(self):
+        """Without column_info, low-cardinality text and datetime columns are indexed"""
+        self.engine.load_dataframe_to_sql(self.data, "data", analyze=False)
+
+        indexes = self._index_columns()
+        self.assertIn('idx_data_Region', indexes)
+        self.assertIn('idx_data_Date', indexes)
+
+    def test_analyze_option(self):
+        """ANALYZE statistics are only gathered when requested"""
+        self.engine.load_dataframe_to_sql(self.data, "data", column_info=self.column_info, analyze=False)
+        with self.engine._checkout_connection() as connection:
+            has_stats = connection.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()[0]
+        self.assertEqual(has_stats, 0)
+
+        self.engine.load_dataframe_to_sql(self.data, "data", column_info=self.column_info, analyze=True)
+        with self.engine._checkout_connection() as connection:
+            has_stats = connection.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()[0]
+        self.assertEqual(has_stats, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Unit tests for the text column counts in the summary handlers
+
+CSVLoader encodes low-cardinality text as ``category``, so the summary
+handlers must count those columns as text alongside plain ``object`` ones.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to the path to import our modules
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from data.csv_loader import CSVLoader
+from handlers.file_handler import FileHandler
+from handlers.quick_action_handler import QuickActionHandler
+from handlers.summary_analysis_handler import SummaryAnalysisHandler
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'sample_variance_data.csv')
+
+
+class TestSummaryTextColumns(unittest.TestCase):
+    """Test suite for text column counting on compacted uploads."""
+
+    def setUp(self):
+        """Load the bundled sample through CSVLoader so text is compacted."""
+        self.data = CSVLoader(Settings()).load_csv(SAMPLE_PATH)
+        self.app_core = MagicMock()
+        self.app_core.is_ollama_available.return_value = False
+        self.app_core.get_current_data.return_value = (self.data, None)
+
+    def test_sample_is_compacted(self):
+        """The sample loads with category-encoded text columns."""
+        self.assertIn('category', {str(dtype) for dtype in self.data.dtypes})
+
+    def test_basic_summary_counts_category_columns(self):
+        """The basic summary counts category columns as text."""
+        summary = SummaryAnalysisHandler(self.app_core).handle_summary_analysis()
+        self.assertIn("3 numeric, 4 text", summary)
+
+    def test_cached_summary_counts_category_columns(self):
+        """The summary built from analyze_csv_data counts category columns."""
+        analysis = FileHandler(self.app_core).analyze_csv_data(self.data)
+        self.app_core.get_current_data.return_value = (self.data, analysis)
+        summary = SummaryAnalysisHandler(self.app_core).handle_summary_analysis()
+        self.assertIn("4 text", summary)
+
+    def test_quick_action_summary_counts_category_columns(self):
+        """The quick action summary counts category columns as text."""
+        handler = QuickActionHandler(self.app_core)
+        summary = handler._format_data_summary_dict(
+            FileHandler(self.app_core).analyze_csv_data(self.data), self.data)
+        self.assertIn("4 text", summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
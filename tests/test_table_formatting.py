@@ -0,0 +1,107 @@
+"""
+Unit tests for column-at-a-time table formatting
+
+Checks that AnalysisFormatter's column formatters return exactly what the
+scalar formatters return for each value, that create_table renders aligned
+Markdown, and that the top/bottom handlers list the same lines as a
+row-by-row loop.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the path to import our modules
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.base_analyzer import AnalysisFormatter
+from handlers.top_bottom_analyzer import TopBottomAnalyzer
+
+
+class TestTableFormatting(unittest.TestCase):
+    """Test suite for AnalysisFormatter's column formatting."""
+
+    def setUp(self):
+        """Values across every suffix range, with ties and missing values."""
+        rng = np.random.default_rng(23)
+        self.values = np.r_[
+            rng.normal(0, 1e6, 5000) * rng.random(5000),
+            [np.nan, 0, 999.996, 999_999.9, 1e9, -1e3, 1.115, 2.675, 0.125],
+        ]
+        self.formatter = AnalysisFormatter()
+
+    def test_columns_match_scalar_formatters(self):
+        """Every column formatter agrees with its scalar formatter."""
+        formatter = self.formatter
+        present = self.values[~np.isnan(self.values)]
+        pairs = [
+            (formatter.format_currency_column(self.values), [formatter.format_currency(v) for v in self.values]),
+            (formatter.format_number_column(self.values, 1), [formatter.format_number(v, 1) for v in self.values]),
+            (formatter.format_percentage_column(self.values / 1e6),
+             [formatter.format_percentage(v / 1e6) for v in self.values]),
+            (formatter.format_amount_column(present), [f"${v:,.2f}" for v in present]),
+        ]
+        for actual, expected in pairs:
+            self.assertEqual(list(actual), expected)
+
+    def test_create_table(self):
+        """Columns are formatted by header, padded to a common width and truncated."""
+        frame = pd.DataFrame({
+            'Region': ['North', 'South', 'East'],
+            'Sales': [1234.5, 12.0, np.nan],
+            'Growth_Pct': [5.25, -1.0, 0.0],
+            'Units': [1500, 20, 3],
+        })
+        table = self.formatter.create_table(frame, formats={'Units': 'count'}, max_rows=2)
+        lines = table.split('\n')
+
+        self.assertEqual(lines[0], '| Region | Sales  | Growth_Pct | Units |')
+        self.assertEqual(lines[1], '| ------ | ------ | ---------- | ----- |')
+        self.assertEqual(lines[2], '| North  | $1.2K  | 5.2%       | 1,500 |')
+        self.assertEqual(lines[3], '| South  | $12.00 | -1.0%      | 20    |')
+        self.assertEqual(lines[-1], '_Showing top 2 of 3 total rows_')
+        self.assertEqual(self.formatter.create_table(frame.iloc[:0]), '_No data to display_')
+
+        with self.assertRaises(ValueError):
+            self.formatter.create_table(frame, formats={'Sales': 'euros'})
+
+    def test_percent_formats_name_their_input(self):
+        """'percentage' takes fractions and 'percent_points' takes percents; bare 'percent' is rejected."""
+        values = np.array([0.25, 12.5])
+        self.assertEqual(list(self.formatter.format_column(values, 'Share', 'percentage')), ['25.0%', '1250.0%'])
+        self.assertEqual(list(self.formatter.format_column(values, 'Share', 'percent_points')), ['0.2%', '12.5%'])
+        with self.assertRaises(ValueError):
+            self.formatter.format_column(values, 'Share', 'percent')
+
+    def test_banded_table_from_records(self):
+        """create_banded_table renders records through the same path."""
+        records = [{'Category': 'A', 'Total': 2_500_000, 'Note': 'x'}, {'Category': 'B', 'Total': 10}]
+        table = self.formatter.create_banded_table(records, ['Category', 'Total'])
+        self.assertEqual(table.split('\n')[2:], ['| A        | $2.5M  |', '| B        | $10.00 |'])
+
+    def test_banded_table_missing_keys_are_blank(self):
+        """A record without a text key gets an empty cell, not 'nan'."""
+        table = self.formatter.create_banded_table([{'Name': 'a', 'Value': 1.5}, {'Value': 2}], ['Name', 'Value'])
+        self.assertEqual(table.split('\n')[2:], ['| a    | $1.50 |', '|      | $2.00 |'])
+
+        table = self.formatter.create_banded_table([{'Name': 'a'}], ['Name', 'Value'])
+        self.assertEqual(table.split('\n')[2:], ['| a    |       |'])
+
+    def test_top_bottom_lines_match_loop(self):
+        """Ranked lines equal the former row-by-row formatting."""
+        rng = np.random.default_rng(4)
+        data = pd.DataFrame({'Product': rng.choice(list('ABCDEFG'), 200), 'Sales': rng.normal(5000, 900, 200)})
+        text = TopBottomAnalyzer().analyze_top_bottom(data, 'top 5')
+
+        grouped = data.groupby('Product')['Sales'].sum().reset_index()
+        total = grouped['Sales'].sum()
+        expected = ""
+        for idx, (_, row) in enumerate(grouped.nlargest(5, 'Sales').iterrows(), 1):
+            expected += f"• **#{idx} {row['Product']}**: ${row['Sales']:,.2f} ({row['Sales'] / total * 100:.1f}% of total)\n"
+        self.assertIn(expected, text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for SQLInsightEngine
+
+Covers loading a dataset into SQLite once and reusing that table for every
+query until the next dataset is loaded.
+"""
+
+import threading
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from analyzers.sql_insight_engine import SQLInsightEngine
+
+
+class TestSQLInsightEngineQueries(unittest.TestCase):
+    """Tests for persistent per-dataset query execution"""
+
+    def setUp(self):
+        """Load a small dataset without calling the LLM"""
+        self.engine = SQLInsightEngine()
+        self.data = pd.DataFrame({
+            'Region': ['North', 'South', 'North', 'West'],
+            'Sales': [100, 200, 300, 400]
+        })
+        with patch.object(SQLInsightEngine, '_ai_analyze_schema', return_value={}):
+            result = self.engine.load_dataset(self.data, "sales")
+        self.assertEqual(result["status"], "success")
+
+    def tearDown(self):
+        """Release the dataset connection"""
+        self.engine.close()
+
+    def test_queries_do_not_reload_dataset(self):
+        """Repeated queries reuse the table built by load_dataset"""
+        with patch.object(pd.DataFrame, 'to_sql') as mock_to_sql:
+            for _ in range(3):
+                result = self.engine.execute_sql_query(
+                    "SELECT Region, SUM(Sales) AS total FROM sales GROUP BY Region",
+                    generate_insights=False
+                )
+                self.assertEqual(result["status"], "success")
+            mock_to_sql.assert_not_called()
+
+        self.assertEqual(result["row_count"], 3)
+
+    def test_history_records_execution_time(self):
+        """Successful and failed queries both record their execution time"""
+        self.engine.execute_sql_query("SELECT * FROM sales", generate_insights=False)
+        self.engine.execute_sql_query("SELECT missing FROM sales", generate_insights=False)
+
+        statuses = {record["status"]: record for record in self.engine.query_history}
+        self.assertIn("success", statuses)
+        self.assertIn("error", statuses)
+        for record in statuses.values():
+            self.assertIsInstance(record["execution_time_ms"], float)
+            self.assertGreaterEqual(record["execution_time_ms"], 0.0)
+
+    def test_new_dataset_replaces_table(self):
+        """Loading a new dataset makes queries see the new rows"""
+        new_data = pd.DataFrame({'Region': ['East'], 'Sales': [1]})
+        with patch.object(SQLInsightEngine, '_ai_analyze_schema', return_value={}):
+            self.engine.load_dataset(new_data, "sales")
+
+        result = self.engine.execute_sql_query("SELECT COUNT(*) AS n FROM sales", generate_insights=False)
+        self.assertEqual(result["data"][0]["n"], 1)
+
+    def test_queries_survive_concurrent_close(self):
+        """A query racing close() reopens the connection instead of failing"""
+        results = []
+
+        def query():
+            for _ in range(50):
+                results.append(self.engine.execute_sql_query("SELECT COUNT(*) AS n FROM sales",
+                                                             generate_insights=False))
+
+        def close():
+            for _ in range(50):
+                self.engine.close()
+
+        threads = [threading.Thread(target=query) for _ in range(3)] + [threading.Thread(target=close)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 150)
+        self.assertTrue(all(result["status"] == "success" for result in results))
+        self.assertEqual({result["data"][0]["n"] for result in results}, {4})
+
+    def test_connection_is_read_only(self):
+        """The shared connection refuses writes even if validation is bypassed"""
+        with self.assertRaises(Exception):
+            self.engine._connection.execute("DELETE FROM sales")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -201,8 +201,8 @@ class InterfaceBuilder:
                     # File upload section
                     gr.Markdown("### 📊 Upload Financial Data")
                     file_input = gr.File(
-                        label="CSV File",
-                        file_types=[".csv"],
+                        label="Data File (CSV, Parquet, Feather)",
+                        file_types=[".csv", ".parquet", ".feather", ".arrow"],
                         type="filepath"
                     )
                     
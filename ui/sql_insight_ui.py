@@ -264,7 +264,8 @@ class SQLInsightUI:
         
         if result["status"] == "success":
             results_df = pd.DataFrame(result["data"])
-            info_text = f"✅ Query executed successfully! {result['row_count']} rows returned."
+            info_text = (f"✅ Query executed successfully! {result['row_count']} rows returned "
+                         f"in {result['execution_time_ms']:.1f} ms.")
             
             return results_df, info_text, self._get_history_data()
         else:
@@ -7,10 +7,14 @@ analysis requests. It implements an LRU (Least Recently Used) cache with TTL
 
 Key Features:
 - In-memory LRU cache for analysis results
-- TTL-based cache expiration
+- TTL-based cache expiration (lazy per key, plus an amortised sweep ordered by expiry time)
 - Thread-safe operations
-- Memory usage monitoring
+- Memory usage monitoring with a byte budget and size-aware eviction
 - Cache statistics tracking
+- Cache keys built from the dataset fingerprint computed at upload time
+- Optional disk tier (utils.disk_cache) that survives restarts, with
+  automatic promotion of disk hits into memory
+- Single-flight get_or_compute: concurrent identical requests share one computation
 
 Author: AI Assistant
 Date: July 2025
@@ -18,14 +22,66 @@ Phase: 3A - Performance Foundation
 """
 
 import hashlib
+import heapq
+import itertools
+import sys
 import time
 from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 import threading
+import numpy as np
 import pandas as pd
 import json
 
+from utils.data_fingerprint import FULL, get_fingerprint
+from utils.disk_cache import DiskCache
+
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """
+    Estimate the in-memory size of a cached value in bytes.
+    
+    DataFrames and Series use pandas' deep memory usage, arrays their buffer
+    size, and containers are summed recursively (shared objects counted once).
+    
+    Args:
+        value (Any): Value to measure
+        
+    Returns:
+        int: Approximate size in bytes
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in value)
+    elif hasattr(value, '__dict__') and not isinstance(value, type):
+        size += estimate_size(vars(value), _seen)
+    return size
+
+
+@dataclass
+class _InFlight:
+    """A computation in progress that other callers for the same key wait on"""
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
 
 class CacheManager:
     """
@@ -35,42 +91,97 @@ class CacheManager:
     analysis results and avoiding redundant calculations for the same data.
     """
     
-    def __init__(self, max_size: int = 100, default_ttl: int = 3600):
+    def __init__(self, max_size: int = 100, default_ttl: int = 3600,
+                 fingerprint_mode: str = FULL,
+                 max_memory_bytes: int = 256 * 1024 * 1024,
+                 eviction_window: int = 8,
+                 expiry_sweep_batch: int = 16,
+                 disk_cache: Optional[DiskCache] = None):
         """
         Initialize the cache manager.
         
         Args:
             max_size (int): Maximum number of cache entries (default: 100)
             default_ttl (int): Default TTL in seconds (default: 3600 = 1 hour)
+            fingerprint_mode (str): How to fingerprint frames that were not
+                registered at upload or were mutated since: 'full' (exact) or
+                'sampled' (fast, hashes a row sample)
+            max_memory_bytes (int): Memory budget for cached values in bytes
+                (default: 256MB)
+            eviction_window (int): Number of least recently used entries
+                considered when evicting for memory; the largest, stalest of
+                them goes first (default: 8)
+            expiry_sweep_batch (int): Maximum expiry-heap items examined per
+                get/put, keeping each call's expiry work bounded (default: 16)
+            disk_cache (DiskCache, optional): Second tier written through on
+                put and consulted on memory misses
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
+        self.fingerprint_mode = fingerprint_mode
+        self.max_memory_bytes = max_memory_bytes
+        self.eviction_window = max(1, eviction_window)
+        self.expiry_sweep_batch = max(1, expiry_sweep_batch)
+        self.disk_cache = disk_cache
         self.cache: OrderedDict = OrderedDict()
         self.lock = threading.RLock()  # Reentrant lock for thread safety
-        self.stats = {
+        self.memory_bytes = 0
+        self.bytes_by_type: Dict[str, int] = {}
+        # (expires_at, seq, key) min-heap; items for replaced or evicted
+        # entries are skipped when popped (their seq no longer matches)
+        self._expiry_heap: list = []
+        self._entry_seq = itertools.count()
+        self._in_flight: Dict[str, _InFlight] = {}
+        self.stats = self._empty_stats()
+        
+        print(f"🔧 CacheManager initialized: max_size={max_size}, default_ttl={default_ttl}s, "
+              f"memory budget={max_memory_bytes / (1024 * 1024):.0f}MB, "
+              f"disk tier={'on' if disk_cache else 'off'}")
+    
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        """Fresh statistics counters."""
+        return {
             'hits': 0,
             'misses': 0,
             'evictions': 0,
+            'memory_evictions': 0,
+            'rejected_oversize': 0,
+            'expirations': 0,
+            'disk_hits': 0,
+            'coalesced_requests': 0,
             'size': 0
         }
+    
+    def _data_fingerprint(self, data: Union[pd.DataFrame, str]) -> str:
+        """
+        Resolve the dataset fingerprint used as the first cache key component.
         
-        print(f"🔧 CacheManager initialized: max_size={max_size}, default_ttl={default_ttl}s")
+        Args:
+            data (Union[pd.DataFrame, str]): The data, or its precomputed fingerprint
+            
+        Returns:
+            str: Dataset fingerprint (reused from upload time when registered)
+        """
+        if isinstance(data, str):
+            return data
+        return get_fingerprint(data, mutated_mode=self.fingerprint_mode)
     
-    def _generate_cache_key(self, data: pd.DataFrame, analysis_type: str, 
+    def _generate_cache_key(self, data: Union[pd.DataFrame, str], analysis_type: str, 
                           params: Optional[Dict] = None) -> str:
         """
         Generate a unique cache key based on data and analysis parameters.
         
         Args:
-            data (pd.DataFrame): The data being analyzed
+            data (Union[pd.DataFrame, str]): The data being analyzed, or its fingerprint
             analysis_type (str): Type of analysis (summary, trends, variance, etc.)
             params (Dict, optional): Additional parameters for the analysis
             
         Returns:
             str: Unique cache key
         """
-        # Create a hash of the data content
-        data_hash = hashlib.md5(pd.util.hash_pandas_object(data).values).hexdigest()
+        # Reuse the dataset fingerprint instead of hashing every row
+        data_hash = self._data_fingerprint(data)
         
         # Include analysis type and parameters in the key
         key_components = [data_hash, analysis_type]
@@ -96,143 +207,401 @@ class CacheManager:
         current_time = time.time()
         return current_time - entry['timestamp'] > entry['ttl']
     
+    def _schedule_expiry(self, key: str, entry: Dict):
+        """
+        Push an entry onto the expiry heap.
+        
+        The heap is rebuilt from live entries once stale items (left behind by
+        replaced, evicted or invalidated entries) outnumber the live ones, so
+        it stays O(n) in size.
+        
+        Args:
+            key (str): Cache key of the entry
+            entry (Dict): Entry carrying 'expires_at' and 'seq'
+        """
+        heapq.heappush(self._expiry_heap, (entry['expires_at'], entry['seq'], key))
+        
+        if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [(e['expires_at'], e['seq'], k) for k, e in self.cache.items()]
+            heapq.heapify(self._expiry_heap)
+    
+    def _sweep_expired(self, limit: Optional[int] = None) -> int:
+        """
+        Remove expired entries in expiry order.
+        
+        Only heap items that are already due are examined, so the cost is
+        proportional to the number of expired (or stale) items rather than to
+        the cache size, and O(1) when nothing has expired.
+        
+        Args:
+            limit (int, optional): Maximum heap items to examine; None drains
+                every item that is due
+            
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.time()
+        heap = self._expiry_heap
+        examined = removed = 0
+        while heap and heap[0][0] < now and (limit is None or examined < limit):
+            _, seq, key = heapq.heappop(heap)
+            examined += 1
+            entry = self.cache.get(key)
+            if entry is not None and entry['seq'] == seq:
+                self._remove_entry(key)
+                removed += 1
+        
+        if removed:
+            self.stats['expirations'] += removed
+            self.stats['size'] = len(self.cache)
+        return removed
+    
     def _evict_expired_entries(self) -> int:
         """
-        Remove expired entries from the cache.
+        Remove all expired entries from the cache.
         
         Returns:
             int: Number of entries evicted
         """
-        expired_keys = []
-        for key, entry in self.cache.items():
-            if self._is_expired(entry):
-                expired_keys.append(key)
+        return self._sweep_expired()
+    
+    def _remove_entry(self, key: str) -> Optional[Dict]:
+        """
+        Remove an entry and release its bytes from the memory accounting.
+        
+        Args:
+            key (str): Cache key to remove
+            
+        Returns:
+            Optional[Dict]: The removed entry, if it existed
+        """
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self.memory_bytes -= entry['size_bytes']
+            analysis_type = entry['analysis_type']
+            remaining = self.bytes_by_type.get(analysis_type, 0) - entry['size_bytes']
+            if remaining > 0:
+                self.bytes_by_type[analysis_type] = remaining
+            else:
+                self.bytes_by_type.pop(analysis_type, None)
+        return entry
+    
+    def _select_memory_victim(self) -> str:
+        """
+        Pick the entry to evict when over the memory budget.
         
-        for key in expired_keys:
-            del self.cache[key]
+        Looks at the least recently used entries and evicts the one with the
+        highest size x idle-time score, so one large stale report goes before
+        several small entries that were used almost as recently.
         
-        return len(expired_keys)
+        Returns:
+            str: Key of the entry to evict
+        """
+        now = time.time()
+        best_key, best_score = None, -1.0
+        for i, (key, entry) in enumerate(self.cache.items()):
+            if i >= self.eviction_window:
+                break
+            score = entry['size_bytes'] * (now - entry['last_access'] + 1.0)
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key
     
-    def _ensure_capacity(self):
+    def _ensure_capacity(self, incoming_bytes: int = 0):
         """
-        Ensure cache doesn't exceed maximum size by evicting oldest entries.
+        Ensure the cache stays within its entry count and memory budget.
+        
+        Args:
+            incoming_bytes (int): Size of the entry about to be inserted
         """
         while len(self.cache) >= self.max_size:
             # Remove oldest entry (first in OrderedDict)
             oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
+            self._remove_entry(oldest_key)
+            self.stats['evictions'] += 1
+        
+        while self.cache and self.memory_bytes + incoming_bytes > self.max_memory_bytes:
+            self._remove_entry(self._select_memory_victim())
             self.stats['evictions'] += 1
+            self.stats['memory_evictions'] += 1
     
-    def get(self, data: pd.DataFrame, analysis_type: str, 
+    def get(self, data: Union[pd.DataFrame, str], analysis_type: str, 
             params: Optional[Dict] = None) -> Optional[Any]:
         """
         Retrieve a cached analysis result.
         
         Args:
-            data (pd.DataFrame): The data being analyzed
+            data (Union[pd.DataFrame, str]): The data being analyzed, or its fingerprint
             analysis_type (str): Type of analysis
             params (Dict, optional): Analysis parameters
             
         Returns:
             Optional[Any]: Cached result if found and not expired, None otherwise
         """
-        with self.lock:
-            try:
-                # Generate cache key
-                cache_key = self._generate_cache_key(data, analysis_type, params)
-                
-                # Clean up expired entries
-                self._evict_expired_entries()
-                
-                # Check if key exists and is not expired
-                if cache_key in self.cache:
-                    entry = self.cache[cache_key]
-                    if not self._is_expired(entry):
-                        # Move to end (most recently used)
-                        self.cache.move_to_end(cache_key)
-                        self.stats['hits'] += 1
-                        print(f"🎯 Cache HIT for {analysis_type} analysis")
-                        return entry['result']
-                    else:
-                        # Remove expired entry
-                        del self.cache[cache_key]
-                
-                # Cache miss
+        try:
+            # Key generation only reads the fingerprint registry, so it runs
+            # outside the cache lock
+            cache_key = self._generate_cache_key(data, analysis_type, params)
+        except Exception as e:
+            print(f"⚠️ Cache get error: {str(e)}")
+            with self.lock:
                 self.stats['misses'] += 1
-                print(f"❌ Cache MISS for {analysis_type} analysis")
-                return None
-                
-            except Exception as e:
-                print(f"⚠️ Cache get error: {str(e)}")
+            return None
+        
+        return self._get_by_key(cache_key, analysis_type)
+    
+    def _get_by_key(self, cache_key: str, analysis_type: str) -> Optional[Any]:
+        """
+        Look up a key in memory, then on disk, promoting disk hits.
+        
+        Args:
+            cache_key (str): Cache key from _generate_cache_key
+            analysis_type (str): Type of analysis (for logging)
+            
+        Returns:
+            Optional[Any]: Cached result, or None on a miss
+        """
+        with self.lock:
+            # Bounded amortised sweep; this key is checked lazily below
+            self._sweep_expired(self.expiry_sweep_batch)
+            
+            entry = self.cache.get(cache_key)
+            if entry is not None and self._is_expired(entry):
+                self._remove_entry(cache_key)
+                self.stats['expirations'] += 1
+                self.stats['size'] = len(self.cache)
+                entry = None
+            
+            if entry is not None:
+                # Move to end (most recently used)
+                self.cache.move_to_end(cache_key)
+                entry['last_access'] = time.time()
+                self.stats['hits'] += 1
+                result = entry['result']
+            elif self.disk_cache is None:
                 self.stats['misses'] += 1
-                return None
+        
+        if entry is not None:
+            print(f"🎯 Cache HIT for {analysis_type} analysis")
+            return result
+        
+        if self.disk_cache is not None:
+            stored = self.disk_cache.get(cache_key)
+            with self.lock:
+                if stored is None:
+                    self.stats['misses'] += 1
+                else:
+                    self.stats['hits'] += 1
+                    self.stats['disk_hits'] += 1
+            
+            if stored is not None:
+                result, meta = stored
+                # Promote into memory for the rest of the entry's TTL
+                self._store_entry(cache_key, result, meta['analysis_type'], meta['params'],
+                                  meta['expires_at'] - time.time(), estimate_size(result))
+                print(f"🎯 Cache HIT (disk) for {analysis_type} analysis")
+                return result
+        
+        print(f"❌ Cache MISS for {analysis_type} analysis")
+        return None
     
-    def put(self, data: pd.DataFrame, analysis_type: str, result: Any,
+    def put(self, data: Union[pd.DataFrame, str], analysis_type: str, result: Any,
             params: Optional[Dict] = None, ttl: Optional[int] = None):
         """
         Store an analysis result in the cache.
         
         Args:
-            data (pd.DataFrame): The data that was analyzed
+            data (Union[pd.DataFrame, str]): The data that was analyzed, or its fingerprint
+            analysis_type (str): Type of analysis
+            result (Any): Analysis result to cache
+            params (Dict, optional): Analysis parameters
+            ttl (int, optional): TTL in seconds (uses default if not provided)
+        """
+        try:
+            cache_key = self._generate_cache_key(data, analysis_type, params)
+        except Exception as e:
+            print(f"⚠️ Cache put error: {str(e)}")
+            return
+        
+        self._put_by_key(cache_key, analysis_type, result, params, ttl)
+    
+    def _put_by_key(self, cache_key: str, analysis_type: str, result: Any,
+                    params: Optional[Dict] = None, ttl: Optional[int] = None):
+        """
+        Store a result under an already generated key in both tiers.
+        
+        Args:
+            cache_key (str): Cache key from _generate_cache_key
             analysis_type (str): Type of analysis
             result (Any): Analysis result to cache
             params (Dict, optional): Analysis parameters
             ttl (int, optional): TTL in seconds (uses default if not provided)
         """
+        try:
+            # Size is computed outside the cache lock
+            cache_ttl = ttl if ttl is not None else self.default_ttl
+            size_bytes = estimate_size(result)
+        except Exception as e:
+            print(f"⚠️ Cache put error: {str(e)}")
+            return
+        
+        if self._store_entry(cache_key, result, analysis_type, params, cache_ttl, size_bytes):
+            print(f"💾 Cached {analysis_type} analysis result ({size_bytes:,} bytes, TTL: {cache_ttl}s)")
+        
+        if self.disk_cache is not None:
+            # Written even when too large for memory; disk has its own budget
+            self.disk_cache.put(cache_key, result, analysis_type, params, time.time() + cache_ttl)
+    
+    def get_or_compute(self, data: Union[pd.DataFrame, str], analysis_type: str,
+                       compute: Callable[[], Any], params: Optional[Dict] = None,
+                       ttl: Optional[int] = None,
+                       cacheable: Optional[Callable[[Any], bool]] = None,
+                       wait_timeout: Optional[float] = None) -> Any:
+        """
+        Return the cached result, or compute it once for all concurrent callers.
+        
+        The first caller to miss on a key runs ``compute``; callers that miss
+        on the same key while it runs wait for that result instead of
+        computing it again, and are counted in 'coalesced_requests'. If the
+        computation raises, every waiting caller receives the same exception.
+        
+        Args:
+            data (Union[pd.DataFrame, str]): The data being analyzed, or its fingerprint
+            analysis_type (str): Type of analysis
+            compute (Callable[[], Any]): Produces the result on a miss
+            params (Dict, optional): Analysis parameters
+            ttl (int, optional): TTL in seconds (uses default if not provided)
+            cacheable (Callable[[Any], bool], optional): Decides whether a
+                computed result is stored (default: anything but None).
+                Waiting callers receive the result either way
+            wait_timeout (float, optional): Seconds a waiting caller waits
+                before computing the result itself (default: no limit)
+            
+        Returns:
+            Any: Cached or freshly computed result
+        """
+        try:
+            cache_key = self._generate_cache_key(data, analysis_type, params)
+        except Exception as e:
+            print(f"⚠️ Cache get error: {str(e)}")
+            return compute()
+        
+        result = self._get_by_key(cache_key, analysis_type)
+        if result is not None:
+            return result
+        
         with self.lock:
-            try:
-                # Generate cache key
-                cache_key = self._generate_cache_key(data, analysis_type, params)
-                
-                # Use provided TTL or default
-                cache_ttl = ttl if ttl is not None else self.default_ttl
-                
-                # Ensure we don't exceed capacity
-                self._ensure_capacity()
-                
-                # Store the result
-                self.cache[cache_key] = {
-                    'result': result,
-                    'timestamp': time.time(),
-                    'ttl': cache_ttl,
-                    'analysis_type': analysis_type,
-                    'params': params
-                }
-                
-                # Move to end (most recently used)
-                self.cache.move_to_end(cache_key)
-                
-                # Update stats
-                self.stats['size'] = len(self.cache)
-                print(f"💾 Cached {analysis_type} analysis result (TTL: {cache_ttl}s)")
-                
-            except Exception as e:
-                print(f"⚠️ Cache put error: {str(e)}")
+            flight = self._in_flight.get(cache_key)
+            leader = flight is None
+            if leader:
+                # Another leader may have stored the result since our miss
+                entry = self.cache.get(cache_key)
+                if entry is not None and not self._is_expired(entry):
+                    return entry['result']
+                flight = self._in_flight[cache_key] = _InFlight()
+            else:
+                self.stats['coalesced_requests'] += 1
+        
+        if not leader:
+            print(f"⏳ Waiting for in-flight {analysis_type} analysis")
+            if flight.done.wait(wait_timeout):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            print(f"⚠️ In-flight {analysis_type} analysis timed out, computing independently")
+            return compute()
+        
+        try:
+            flight.result = compute()
+            if cacheable(flight.result) if cacheable else flight.result is not None:
+                self._put_by_key(cache_key, analysis_type, flight.result, params, ttl)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self._in_flight.pop(cache_key, None)
+            flight.done.set()
+    
+    def _store_entry(self, cache_key: str, result: Any, analysis_type: str,
+                     params: Optional[Dict], cache_ttl: float, size_bytes: int) -> bool:
+        """
+        Insert an entry into the in-memory tier.
+        
+        Args:
+            cache_key (str): Cache key
+            result (Any): Analysis result to cache
+            analysis_type (str): Type of analysis
+            params (Dict, optional): Analysis parameters
+            cache_ttl (float): TTL in seconds
+            size_bytes (int): Estimated size of the result
+            
+        Returns:
+            bool: True if stored, False if the result exceeds the memory budget
+        """
+        with self.lock:
+            # Results larger than the whole budget are not worth caching
+            if size_bytes > self.max_memory_bytes:
+                self.stats['rejected_oversize'] += 1
+                print(f"⚠️ Not caching {analysis_type} result in memory: {size_bytes:,} bytes exceeds memory budget")
+                return False
+            
+            # Drop due entries first so they do not force capacity evictions
+            self._sweep_expired(self.expiry_sweep_batch)
+            
+            # Replacing an entry must not count against capacity
+            self._remove_entry(cache_key)
+            
+            # Ensure we don't exceed capacity
+            self._ensure_capacity(size_bytes)
+            
+            # Store the result
+            now = time.time()
+            entry = {
+                'result': result,
+                'timestamp': now,
+                'last_access': now,
+                'ttl': cache_ttl,
+                'expires_at': now + cache_ttl,
+                'seq': next(self._entry_seq),
+                'analysis_type': analysis_type,
+                'params': params,
+                'size_bytes': size_bytes
+            }
+            self.cache[cache_key] = entry
+            self._schedule_expiry(cache_key, entry)
+            self.memory_bytes += size_bytes
+            self.bytes_by_type[analysis_type] = self.bytes_by_type.get(analysis_type, 0) + size_bytes
+            
+            # Update stats
+            self.stats['size'] = len(self.cache)
+        return True
     
     def clear(self):
         """
-        Clear all cache entries.
+        Clear all cache entries, including the disk tier.
         """
         with self.lock:
             self.cache.clear()
-            self.stats = {
-                'hits': 0,
-                'misses': 0,
-                'evictions': 0,
-                'size': 0
-            }
-            print("🧹 Cache cleared")
+            self._expiry_heap = []
+            self.memory_bytes = 0
+            self.bytes_by_type = {}
+            self.stats = self._empty_stats()
+        if self.disk_cache is not None:
+            self.disk_cache.clear()
+        print("🧹 Cache cleared")
     
-    def invalidate_data_cache(self, data: pd.DataFrame):
+    def invalidate_data_cache(self, data: Union[pd.DataFrame, str]):
         """
         Invalidate all cache entries for a specific dataset.
         
         Args:
-            data (pd.DataFrame): Dataset to invalidate cache for
+            data (Union[pd.DataFrame, str]): Dataset to invalidate cache for, or its fingerprint
         """
         with self.lock:
             try:
-                data_hash = hashlib.md5(pd.util.hash_pandas_object(data).values).hexdigest()
+                data_hash = self._data_fingerprint(data) + ":"
                 
                 # Find all entries for this dataset
                 keys_to_remove = []
@@ -242,10 +611,13 @@ class CacheManager:
                 
                 # Remove found entries
                 for key in keys_to_remove:
-                    del self.cache[key]
+                    self._remove_entry(key)
                 
                 self.stats['size'] = len(self.cache)
-                print(f"🗑️ Invalidated {len(keys_to_remove)} cache entries for dataset")
+                removed = len(keys_to_remove)
+                if self.disk_cache is not None:
+                    removed += self.disk_cache.invalidate_prefix(data_hash)
+                print(f"🗑️ Invalidated {removed} cache entries for dataset")
                 
             except Exception as e:
                 print(f"⚠️ Cache invalidation error: {str(e)}")
@@ -258,7 +630,7 @@ class CacheManager:
             Dict: Cache statistics including hits, misses, size, etc.
         """
         with self.lock:
-            # Clean up expired entries for accurate stats
+            # Drain entries that are due (cost scales with expired entries only)
             expired_count = self._evict_expired_entries()
             self.stats['size'] = len(self.cache)
             
@@ -266,13 +638,22 @@ class CacheManager:
             total_requests = self.stats['hits'] + self.stats['misses']
             hit_rate = (self.stats['hits'] / total_requests * 100) if total_requests > 0 else 0
             
-            return {
+            stats = {
                 **self.stats,
                 'hit_rate': round(hit_rate, 2),
                 'expired_cleaned': expired_count,
                 'max_size': self.max_size,
-                'default_ttl': self.default_ttl
+                'default_ttl': self.default_ttl,
+                'memory_bytes': self.memory_bytes,
+                'max_memory_bytes': self.max_memory_bytes,
+                'memory_utilization': round(self.memory_bytes / self.max_memory_bytes * 100, 2)
+                                      if self.max_memory_bytes else 0.0,
+                'bytes_by_analysis_type': dict(self.bytes_by_type)
             }
+        
+        if self.disk_cache is not None:
+            stats['disk'] = self.disk_cache.get_stats()
+        return stats
     
     def cleanup_expired(self) -> int:
         """
@@ -302,7 +683,19 @@ def get_cache_manager() -> CacheManager:
     """
     global _cache_manager
     if _cache_manager is None:
-        _cache_manager = CacheManager()
+        from config.settings import get_settings
+        settings = get_settings()
+        
+        disk_cache = None
+        if settings.cache_disk_dir:
+            try:
+                disk_cache = DiskCache(settings.cache_disk_dir,
+                                       max_bytes=settings.cache_disk_max_mb * 1024 * 1024)
+            except Exception as e:
+                print(f"⚠️ Disk cache unavailable, using memory only: {str(e)}")
+        
+        _cache_manager = CacheManager(max_memory_bytes=settings.cache_max_memory_mb * 1024 * 1024,
+                                      disk_cache=disk_cache)
     return _cache_manager
 
 
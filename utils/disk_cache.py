@@ -0,0 +1,338 @@
+"""
+Disk Cache for Quant Commander
+
+This module provides the optional second cache tier behind CacheManager.
+Analysis results are written to a local directory keyed by the same
+fingerprint + analysis type + params key as the in-memory cache, so results
+computed before a restart or deploy are found again for the same file.
+
+Key Features:
+- Survives process restarts (SQLite index plus one file per entry)
+- Size cap with least-recently-used eviction
+- DataFrames stored as Parquet when pyarrow is installed, pickle otherwise
+- TTL carried over from the in-memory entry
+- Thread-safe operations
+
+Entries are unpickled on read, so the directory must only be writable by
+the application itself.
+
+Author: AI Assistant
+Date: July 2025
+Phase: 3A - Performance Foundation
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+# Optional Parquet serialisation for DataFrames
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+INDEX_FILE = 'index.sqlite'
+PARQUET_SUFFIX = '.parquet'
+PICKLE_SUFFIX = '.pkl'
+TEMP_SUFFIX = '.tmp'
+
+# Files this cache writes: sha256 of the key plus an entry or temp-file suffix.
+# Anything else in the directory is left alone.
+ENTRY_FILE_PATTERN = re.compile(r'[0-9a-f]{64}(\.parquet|\.pkl|\.[^/]*\.tmp)')
+
+
+class DiskCache:
+    """
+    Size-capped LRU store of analysis results on local disk.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Open (or create) a disk cache.
+
+        Args:
+            directory (str): Directory holding the index and entry files
+            max_bytes (int): Maximum total size of entry files in bytes
+                (default: 1GB)
+        """
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'write_errors': 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._index = sqlite3.connect(os.path.join(self.directory, INDEX_FILE),
+                                      check_same_thread=False)
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                analysis_type TEXT,
+                params TEXT,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._index.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+        self._index.commit()
+
+        self._reconcile()
+
+        print(f"💽 DiskCache opened at {self.directory}: {self._entry_count()} entries, "
+              f"{self.total_bytes / (1024 * 1024):.1f}MB of {max_bytes / (1024 * 1024):.0f}MB")
+
+    def _reconcile(self):
+        """
+        Bring the index and the directory back in sync after a restart.
+
+        Drops expired entries and index rows whose file is gone, and deletes
+        entry files (including interrupted writes) that the index does not
+        know. Files not named like cache entries are never touched, so the
+        directory may be shared.
+        """
+        now = time.time()
+        known = set()
+        for key, filename, expires_at in self._index.execute(
+                "SELECT key, filename, expires_at FROM entries").fetchall():
+            path = os.path.join(self.directory, filename)
+            if expires_at < now or not os.path.exists(path):
+                self._delete(key, filename)
+            else:
+                known.add(filename)
+
+        for filename in os.listdir(self.directory):
+            if filename in known or not ENTRY_FILE_PATTERN.fullmatch(filename):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass
+
+        self._index.commit()
+        self.total_bytes = self._index.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()[0]
+
+    def _entry_count(self) -> int:
+        """Number of entries in the index"""
+        return self._index.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @staticmethod
+    def _filename(key: str, suffix: str = '') -> str:
+        """File name for a cache key (keys contain characters unsafe for paths)"""
+        return hashlib.sha256(key.encode()).hexdigest() + suffix
+
+    def _delete(self, key: str, filename: str):
+        """Remove an entry's index row and file (caller holds the lock and commits)"""
+        self._index.execute("DELETE FROM entries WHERE key = ?", (key,))
+        try:
+            os.remove(os.path.join(self.directory, filename))
+        except OSError:
+            pass
+
+    def _serialise(self, key: str, value: Any) -> Tuple[str, str]:
+        """
+        Write a value to a temporary file in the cache directory.
+
+        Args:
+            key (str): Cache key (used for the final file name)
+            value (Any): Value to store
+
+        Returns:
+            Tuple[str, str]: Temporary path and final file name
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=self._filename(key) + '.',
+                                        suffix=TEMP_SUFFIX)
+        os.close(fd)
+        try:
+            if PYARROW_AVAILABLE and isinstance(value, pd.DataFrame):
+                try:
+                    value.to_parquet(tmp_path)
+                    return tmp_path, self._filename(key, PARQUET_SUFFIX)
+                except (ValueError, TypeError, ImportError, pyarrow.lib.ArrowException):
+                    # Non-string column labels, mixed object columns, ...
+                    pass
+
+            with open(tmp_path, 'wb') as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            return tmp_path, self._filename(key, PICKLE_SUFFIX)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def _deserialise(self, filename: str) -> Any:
+        """Read a stored value back"""
+        path = os.path.join(self.directory, filename)
+        if filename.endswith(PARQUET_SUFFIX):
+            return pd.read_parquet(path)
+        with open(path, 'rb') as handle:
+            return pickle.load(handle)
+
+    def get(self, key: str) -> Optional[Tuple[Any, Dict]]:
+        """
+        Read an entry and mark it as recently used.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Tuple[Any, Dict]]: The value and its metadata
+            ('analysis_type', 'params', 'expires_at'), or None if absent,
+            expired or unreadable
+        """
+        now = time.time()
+        with self.lock:
+            row = self._index.execute(
+                "SELECT filename, analysis_type, params, expires_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+
+            filename, analysis_type, params, expires_at = row
+            if expires_at < now:
+                self._remove_key(key, filename)
+                self.stats['misses'] += 1
+                return None
+
+            self._index.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self._index.commit()
+
+        try:
+            value = self._deserialise(filename)
+        except Exception as e:
+            print(f"⚠️ Disk cache read error, dropping entry: {str(e)}")
+            with self.lock:
+                self._remove_key(key, filename)
+                self.stats['misses'] += 1
+            return None
+
+        with self.lock:
+            self.stats['hits'] += 1
+        return value, {
+            'analysis_type': analysis_type,
+            'params': json.loads(params) if params else None,
+            'expires_at': expires_at
+        }
+
+    def _remove_key(self, key: str, filename: str):
+        """Remove one entry and update the byte total (caller holds the lock)"""
+        row = self._index.execute("SELECT size_bytes FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self.total_bytes -= row[0]
+        self._delete(key, filename)
+        self._index.commit()
+
+    def put(self, key: str, value: Any, analysis_type: str, params: Optional[Dict],
+            expires_at: float) -> bool:
+        """
+        Store an entry, evicting least recently used entries to stay in budget.
+
+        Args:
+            key (str): Cache key
+            value (Any): Result to store
+            analysis_type (str): Type of analysis
+            params (Dict, optional): Analysis parameters
+            expires_at (float): Epoch time after which the entry is stale
+
+        Returns:
+            bool: True if the entry was written
+        """
+        try:
+            tmp_path, filename = self._serialise(key, value)
+        except Exception as e:
+            with self.lock:
+                self.stats['write_errors'] += 1
+            print(f"⚠️ Disk cache cannot store {analysis_type} result: {str(e)}")
+            return False
+
+        size_bytes = os.path.getsize(tmp_path)
+        if size_bytes > self.max_bytes:
+            os.remove(tmp_path)
+            return False
+
+        with self.lock:
+            old = self._index.execute("SELECT filename FROM entries WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._remove_key(key, old[0])
+
+            # Least recently used first
+            while self.total_bytes + size_bytes > self.max_bytes:
+                victim = self._index.execute(
+                    "SELECT key, filename FROM entries ORDER BY last_access LIMIT 1").fetchone()
+                if victim is None:
+                    break
+                self._remove_key(*victim)
+                self.stats['evictions'] += 1
+
+            os.replace(tmp_path, os.path.join(self.directory, filename))
+            self._index.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, filename, size_bytes, analysis_type,
+                 json.dumps(params, sort_keys=True, default=str) if params else None,
+                 expires_at, time.time())
+            )
+            self._index.commit()
+            self.total_bytes += size_bytes
+            self.stats['writes'] += 1
+        return True
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Remove all entries whose key starts with prefix (e.g. one dataset).
+
+        Args:
+            prefix (str): Key prefix
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self.lock:
+            rows = self._index.execute(
+                "SELECT key, filename FROM entries WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix)
+            ).fetchall()
+            for key, filename in rows:
+                self._remove_key(key, filename)
+            return len(rows)
+
+    def clear(self):
+        """Remove every entry"""
+        with self.lock:
+            for key, filename in self._index.execute("SELECT key, filename FROM entries").fetchall():
+                self._delete(key, filename)
+            self._index.commit()
+            self.total_bytes = 0
+
+    def get_stats(self) -> Dict:
+        """
+        Get disk cache statistics.
+
+        Returns:
+            Dict: Hits, misses, writes, evictions, entry count and bytes used
+        """
+        with self.lock:
+            return {
+                **self.stats,
+                'entries': self._entry_count(),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'directory': self.directory
+            }
+
+    def close(self):
+        """Close the index database"""
+        with self.lock:
+            self._index.close()